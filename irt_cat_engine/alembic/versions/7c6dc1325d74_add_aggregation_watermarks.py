@@ -0,0 +1,37 @@
+"""Add aggregation watermarks for incremental item exposure counters
+
+No watermark row is written here: the first catch-up after upgrading
+(at application startup) finds none, resets item_exposure and rebuilds it
+from all responses, then keeps it current incrementally.
+
+Revision ID: 7c6dc1325d74
+Revises: bc0f0b03d099
+Create Date: 2026-10-16 20:05:12.418377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c6dc1325d74'
+down_revision: Union[str, Sequence[str], None] = 'bc0f0b03d099'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('aggregation_watermarks',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('last_response_id', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('aggregation_watermarks')
@@ -0,0 +1,31 @@
+"""Index responses.session_id for per-session streaming
+
+The MML recalibration job pages through responses a chunk of sessions at
+a time.
+
+Revision ID: a71c0e5f93b4
+Revises: e41a9b7d2c58
+Create Date: 2026-10-16 22:41:08.203517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a71c0e5f93b4'
+down_revision: Union[str, Sequence[str], None] = 'e41a9b7d2c58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_responses_session_id'), 'responses', ['session_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_responses_session_id'), table_name='responses')
@@ -0,0 +1,29 @@
+"""Record the item parameter version of each test session
+
+Revision ID: c3d8f1a6b250
+Revises: a71c0e5f93b4
+Create Date: 2026-10-16 23:52:37.418203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d8f1a6b250'
+down_revision: Union[str, Sequence[str], None] = 'a71c0e5f93b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('test_sessions', sa.Column('parameter_version', sa.String(length=40), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('test_sessions') as batch_op:
+        batch_op.drop_column('parameter_version')
@@ -0,0 +1,29 @@
+"""Add exposure_k checkpoint column to item_exposure
+
+Revision ID: e41a9b7d2c58
+Revises: 7c6dc1325d74
+Create Date: 2026-10-16 21:12:40.915203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41a9b7d2c58'
+down_revision: Union[str, Sequence[str], None] = '7c6dc1325d74'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('item_exposure', sa.Column('exposure_k', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('item_exposure') as batch_op:
+        batch_op.drop_column('exposure_k')
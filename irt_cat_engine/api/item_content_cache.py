@@ -0,0 +1,194 @@
+"""Bounded cache of pre-built item content variants.
+
+Building an item (stem, distractors, explanation) for every served item is
+repeated work: popular items are served thousands of times. The cache keeps
+several pre-built variants (different distractor sets) per
+``(item_id, question_type)``, so the request path only picks a variant and
+shuffles its options.
+
+- A miss builds one variant inline and queues the key for a background
+  thread, which fills it up to ``variants`` distractor sets.
+- Entries are evicted least-recently-used beyond ``max_keys``.
+- Every entry belongs to a data version (the vocabulary snapshot key);
+  ``invalidate(version)`` drops everything built from other data.
+"""
+import logging
+import queue
+import random
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+
+from ..config import ITEM_CACHE_MAX_KEYS, ITEM_CACHE_VARIANTS
+from ..middleware.metrics import (
+    ITEM_CONTENT_CACHE_ENTRIES,
+    ITEM_CONTENT_CACHE_EVICTIONS,
+    ITEM_CONTENT_CACHE_HITS,
+    ITEM_CONTENT_CACHE_MISSES,
+)
+
+logger = logging.getLogger("irt_cat_engine.item_content_cache")
+
+# build(word, question_type) -> one content variant, or None if the word has none
+VariantBuilder = Callable[[str, int], dict | None]
+
+_STOP = object()
+
+
+class ItemContentCache:
+    """LRU cache of content variants per (item_id, question_type)."""
+
+    def __init__(
+        self,
+        build: VariantBuilder,
+        max_keys: int = ITEM_CACHE_MAX_KEYS,
+        variants: int = ITEM_CACHE_VARIANTS,
+        version: str | None = None,
+        background: bool = True,
+    ):
+        self._build = build
+        self.max_keys = max_keys
+        self.variants = variants
+        self.version = version
+        self._entries: OrderedDict[tuple[int, int], tuple[str, list[dict]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._pending: queue.Queue = queue.Queue()
+        self._background = background
+        self._worker: threading.Thread | None = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, item_id: int, question_type: int, word: str) -> dict | None:
+        """A random variant for the key, building one inline on a miss."""
+        key = (item_id, question_type)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1]:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                ITEM_CONTENT_CACHE_HITS.labels(question_type=str(question_type)).inc()
+                return random.choice(entry[1])
+            self.misses += 1
+            version = self.version
+        ITEM_CONTENT_CACHE_MISSES.labels(question_type=str(question_type)).inc()
+
+        variant = self._build(word, question_type)
+        if variant is None:
+            return None
+        created = False
+        with self._lock:
+            if self.version == version:
+                entry = self._entries.get(key)
+                if entry is None:
+                    self._entries[key] = (word, [variant])
+                    self._evict()
+                    created = True
+                elif len(entry[1]) < self.variants:
+                    # Still queued from warm(): keep the inline build too
+                    entry[1].append(variant)
+        if created:
+            self._schedule(key, version)
+        return variant
+
+    def warm(self, keys: Iterable[tuple[int, int, str]]) -> None:
+        """Queue ``(item_id, question_type, word)`` keys for background building."""
+        with self._lock:
+            version = self.version
+            for item_id, question_type, word in keys:
+                key = (item_id, question_type)
+                if key not in self._entries and len(self._entries) < self.max_keys:
+                    self._entries[key] = (word, [])
+                    self._schedule(key, version)
+            ITEM_CONTENT_CACHE_ENTRIES.set(len(self._entries))
+
+    def invalidate(self, version: str | None) -> bool:
+        """Drop all entries if they were built for a different data version."""
+        with self._lock:
+            if version == self.version:
+                return False
+            dropped = len(self._entries)
+            self._entries.clear()
+            self.version = version
+            self.evictions += dropped
+            ITEM_CONTENT_CACHE_EVICTIONS.inc(dropped)
+            ITEM_CONTENT_CACHE_ENTRIES.set(0)
+        logger.info(f"Item content cache invalidated ({dropped} entries) for version {version}")
+        return True
+
+    def fill_pending(self) -> int:
+        """Build queued variants in the calling thread; returns keys processed."""
+        done = 0
+        while True:
+            try:
+                task = self._pending.get_nowait()
+            except queue.Empty:
+                return done
+            if task is not _STOP:
+                self._fill(*task)
+                done += 1
+
+    def stop(self) -> None:
+        if self._worker is not None:
+            self._pending.put(_STOP)
+            self._worker.join(timeout=5)
+            self._worker = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            variants = sum(len(v) for _, v in self._entries.values())
+            return {
+                "entries": len(self._entries),
+                "variants": variants,
+                "max_keys": self.max_keys,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / max(self.hits + self.misses, 1), 4),
+                "evictions": self.evictions,
+                "version": self.version,
+            }
+
+    # ── Internals ───────────────────────────────────────────────
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries beyond ``max_keys`` (lock held)."""
+        while len(self._entries) > self.max_keys:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+            ITEM_CONTENT_CACHE_EVICTIONS.inc()
+        ITEM_CONTENT_CACHE_ENTRIES.set(len(self._entries))
+
+    def _schedule(self, key: tuple[int, int], version: str | None) -> None:
+        self._pending.put((key, version))
+        if self._background and self._worker is None:
+            self._worker = threading.Thread(target=self._run, name="item-content-cache", daemon=True)
+            self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            task = self._pending.get()
+            if task is _STOP:
+                return
+            try:
+                self._fill(*task)
+            except Exception as e:
+                logger.error(f"Failed to pre-build item content for {task[0]}: {e}", exc_info=True)
+
+    def _fill(self, key: tuple[int, int], version: str | None) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self.version != version:
+                return
+            word, built = entry
+            missing = self.variants - len(built)
+        new = [v for v in (self._build(word, key[1]) for _ in range(missing)) if v is not None]
+        with self._lock:
+            if self._entries.get(key) is entry and self.version == version:
+                built.extend(new[:self.variants - len(built)])
+                if not built:
+                    # The word has no content for this type: don't keep an empty entry
+                    del self._entries[key]
+                    ITEM_CONTENT_CACHE_ENTRIES.set(len(self._entries))
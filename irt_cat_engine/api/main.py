@@ -1,4 +1,5 @@
 """FastAPI application for IRT CAT Engine."""
+import asyncio
 import os
 import threading
 import logging
@@ -7,7 +8,7 @@ import sentry_sdk
 from sentry_sdk.integrations.fastapi import FastApiIntegration
 from sentry_sdk.integrations.starlette import StarletteIntegration
 
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI, Request
 from slowapi import Limiter, _rate_limit_exceeded_handler
@@ -15,10 +16,12 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from fastapi.middleware.cors import CORSMiddleware
 
+from ..config import SESSION_FLUSH_PARTIAL
 from ..data.database import init_db, DATABASE_URL
-from .routes_test import router as test_router
+from .routes_test import flush_partial_result, router as test_router
 from .routes_admin import router as admin_router
 from .routes_learn import router as learn_router
+from .response_writer import response_writer
 from .session_manager import session_manager
 from ..logging_config import setup_logging
 from ..middleware.metrics import PrometheusMiddleware, get_metrics
@@ -80,10 +83,25 @@ async def lifespan(app: FastAPI):
     if not session_manager.is_loaded:
         logger.warning("Vocabulary data not loaded yet. Loading continues in background.")
 
+    # Evict idle sessions, recalibrate exposure control and pick up new
+    # calibrated parameter sets in the background
+    background = [
+        asyncio.create_task(session_manager.run_session_expiry(
+            on_evict=flush_partial_result if SESSION_FLUSH_PARTIAL else None,
+        )),
+        asyncio.create_task(session_manager.run_exposure_recalibration()),
+        asyncio.create_task(session_manager.run_parameter_refresh()),
+    ]
+
     yield
 
     # Shutdown: cleanup
-    pass
+    for task in background:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await asyncio.to_thread(response_writer.close)
+    session_manager.close()
 
 
 app = FastAPI(
@@ -0,0 +1,243 @@
+"""Write-behind logging of item responses.
+
+``/respond`` used to add a Response row and commit on every answer, one
+transaction per response (and SQLite WAL serializes those). Rows now go
+into a bounded queue; a daemon thread drains it and inserts up to
+``batch_size`` rows per transaction (a single executemany), waiting at
+most ``linger_ms`` for a batch to fill. ``flush`` blocks until everything
+queued before it is committed; ``flush_session`` waits only for one
+session's rows, which the routes use to make a test's responses durable
+before its result is returned. That covers this worker's queue only: with a
+shared session store, earlier responses may sit in another worker's queue,
+so the routes also check the stored row count. A batch that still fails
+after a few attempts is kept and retried with the next one; flushes
+waiting on it report the failure instead of returning as if it had been
+written.
+
+The item_exposure counters are folded from the inserted rows separately
+and periodically (see data/exposure_counts.py); a batch only takes a shared
+lock on their watermark, so writers in different workers don't queue
+behind each other.
+"""
+import logging
+import queue
+import threading
+import time
+
+from sqlalchemy import insert
+
+from ..config import RESPONSE_WRITE_BATCH_SIZE, RESPONSE_WRITE_LINGER_MS, RESPONSE_WRITE_QUEUE_SIZE
+from ..data.database import SessionLocal
+from ..data.db_models import Response
+from ..data.exposure_counts import share_watermark
+from ..middleware.metrics import (
+    RESPONSE_QUEUE_DEPTH, RESPONSE_QUEUE_FULL, RESPONSE_WRITE_BATCH, RESPONSE_WRITE_FAILURES,
+)
+
+logger = logging.getLogger("irt_cat_engine.api.response_writer")
+
+_WRITE_ATTEMPTS = 3
+_RETRY_SECONDS = 1.0  # Wait before retrying kept rows when nothing new arrives
+_STOP = object()
+
+
+class _Flush:
+    """Barrier in the queue; ``ok`` tells whether the rows before it were written."""
+
+    __slots__ = ("done", "ok")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.ok = False
+
+
+class ResponseWriter:
+    """Batches Response inserts on a background thread."""
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        batch_size: int = RESPONSE_WRITE_BATCH_SIZE,
+        linger_ms: int = RESPONSE_WRITE_LINGER_MS,
+        max_queue: int = RESPONSE_WRITE_QUEUE_SIZE,
+    ):
+        self._session_factory = session_factory
+        self.batch_size = batch_size
+        self.linger_seconds = linger_ms / 1000
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self._failed: list[dict] = []  # Rows of failed batches, written with the next one
+        # session_id -> rows queued or kept but not yet written; guarded by _cond
+        self._cond = threading.Condition()
+        self._pending: dict[str, int] = {}
+        self._cycle = 0  # Write attempts so far
+        self._failed_sessions: set[str] = set()  # Sessions with rows in the last failed batch
+        self.rows_written = 0
+        self.batches_written = 0
+
+    def start(self) -> None:
+        """Start the flusher thread if it isn't running."""
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="response-writer", daemon=True)
+                self._thread.start()
+
+    def offer(self, row: dict) -> bool:
+        """Queue a Response row without blocking.
+
+        Returns False when the queue is full; the caller should then wait
+        on ``put``.
+        """
+        self.start()
+        self._track([row], 1)
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self._track([row], -1)
+            RESPONSE_QUEUE_FULL.inc()
+            return False
+        RESPONSE_QUEUE_DEPTH.set(self._queue.qsize())
+        return True
+
+    def put(self, row: dict) -> None:
+        """Queue a Response row, waiting for room if the queue is full."""
+        self.start()
+        self._track([row], 1)
+        self._queue.put(row)
+        RESPONSE_QUEUE_DEPTH.set(self._queue.qsize())
+
+    def _track(self, rows: list[dict], delta: int) -> None:
+        with self._cond:
+            for row in rows:
+                session_id = row.get("session_id")
+                count = self._pending.get(session_id, 0) + delta
+                if count > 0:
+                    self._pending[session_id] = count
+                else:
+                    self._pending.pop(session_id, None)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every row queued so far has been written.
+
+        Returns False if the timeout ran out first or the rows could not be
+        written; they stay queued for the next attempt.
+        """
+        self.start()
+        barrier = _Flush()
+        self._queue.put(barrier)
+        return barrier.done.wait(timeout) and barrier.ok
+
+    def flush_session(self, session_id: str, timeout: float | None = None) -> bool:
+        """Wait until every row queued so far for ``session_id`` has been written.
+
+        Rows of other sessions queued after them are not waited for.
+        Returns False if the timeout ran out first or a batch holding the
+        session's rows failed; they stay queued for the next attempt.
+        """
+        self.start()
+        with self._cond:
+            if not self._pending.get(session_id):
+                return True
+            cycle = self._cycle
+        # Write the current batch right away instead of lingering
+        self._queue.put(_Flush())
+        with self._cond:
+            self._cond.wait_for(
+                lambda: not self._pending.get(session_id)
+                or (self._cycle > cycle and session_id in self._failed_sessions),
+                timeout,
+            )
+            return not self._pending.get(session_id)
+
+    def close(self, timeout: float | None = 10.0) -> None:
+        """Write what is queued and stop the flusher thread."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "failed_pending": len(self._failed),
+            "rows_written": self.rows_written,
+            "batches_written": self.batches_written,
+        }
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            rows, barriers = list(self._failed), []
+            try:
+                entry = self._queue.get(timeout=_RETRY_SECONDS) if rows else self._queue.get()
+            except queue.Empty:
+                entry = None
+            deadline = time.monotonic() + self.linger_seconds
+            while entry is not None:
+                if entry is _STOP:
+                    stopping = True
+                elif isinstance(entry, _Flush):
+                    barriers.append(entry)
+                else:
+                    rows.append(entry)
+                # A flush or shutdown writes right away instead of lingering
+                if stopping or barriers or len(rows) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                try:
+                    entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            written = self._write(rows)
+            if written:
+                self._failed = []
+                done = rows
+            else:
+                done = self._keep_failed(rows, stopping)
+            self._track(done, -1)
+            with self._cond:
+                self._cycle += 1
+                self._failed_sessions = {row.get("session_id") for row in self._failed}
+                self._cond.notify_all()
+            RESPONSE_QUEUE_DEPTH.set(self._queue.qsize())
+            for barrier in barriers:
+                barrier.ok = written
+                barrier.done.set()
+
+    def _keep_failed(self, rows: list[dict], stopping: bool) -> list[dict]:
+        """Keep a failed batch for the next one, up to the queue size; returns the dropped rows."""
+        limit = self._queue.maxsize if self._queue.maxsize > 0 else len(rows)
+        dropped = len(rows) if stopping else max(0, len(rows) - limit)
+        if dropped:
+            logger.error("Dropped %d responses after repeated failed inserts", dropped)
+            RESPONSE_WRITE_FAILURES.inc(dropped)
+        self._failed = rows[dropped:]
+        return rows[:dropped]
+
+    def _write(self, rows: list[dict]) -> bool:
+        """Insert ``rows`` in one transaction; False if every attempt failed."""
+        if not rows:
+            return True
+        for attempt in range(_WRITE_ATTEMPTS):
+            try:
+                with self._session_factory() as db:
+                    share_watermark(db)
+                    db.execute(insert(Response), rows)
+                    db.commit()
+            except Exception:
+                logger.warning("Response batch insert failed (attempt %d/%d)",
+                               attempt + 1, _WRITE_ATTEMPTS, exc_info=True)
+                time.sleep(0.1 * 2 ** attempt)
+                continue
+            self.rows_written += len(rows)
+            self.batches_written += 1
+            RESPONSE_WRITE_BATCH.observe(len(rows))
+            return True
+        logger.error("Response batch of %d rows failed %d times; keeping it for the next batch",
+                     len(rows), _WRITE_ATTEMPTS)
+        return False
+
+
+# Singleton instance
+response_writer = ResponseWriter()
@@ -1,12 +1,14 @@
 """Admin API routes for parameter management and analytics."""
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
 
 from ..data.database import get_db
-from ..data.db_models import Response, ItemExposure, TestSession
+from ..data.db_models import ItemExposure, TestSession
+from ..data.exposure_counts import catch_up_exposure
 from ..reporting.exposure_analysis import analyze_exposure, identify_expansion_needs
 from ..config import IRT_MODEL
+from .response_writer import response_writer
 from .schemas import RecalibrateResponse
 from .session_manager import session_manager
 
@@ -17,43 +19,22 @@ router = APIRouter(prefix="/api/v1/admin", tags=["admin"])
 def recalibrate_parameters(db: Session = Depends(get_db)):
     """Recalibrate item exposure parameters based on accumulated response data.
 
-    This updates the Sympson-Hetter exposure control parameters and
-    collects item-level statistics for future Bayesian parameter updates.
+    Only responses past the item_exposure watermark are read (those written
+    since the last scheduled fold). The
+    live Sympson-Hetter controller is then synced, recalibrated and
+    checkpointed, as the scheduled task does.
     """
-    from sqlalchemy import func, case
-
-    item_stats = (
-        db.query(
-            Response.item_id,
-            Response.word,
-            func.count(Response.id).label("admin_count"),
-            func.sum(case((Response.is_correct == True, 1), else_=0)).label("correct_count"),
-        )
-        .group_by(Response.item_id, Response.word)
-        .all()
-    )
+    # Include responses still in the write-behind queue
+    response_writer.flush()
 
-    updated = 0
-    for row in item_stats:
-        exposure = db.get(ItemExposure, row.item_id)
-        if exposure is None:
-            exposure = ItemExposure(
-                item_id=row.item_id,
-                word=row.word,
-                admin_count=row.admin_count,
-                correct_count=row.correct_count or 0,
-            )
-            db.add(exposure)
-        else:
-            exposure.admin_count = row.admin_count
-            exposure.correct_count = row.correct_count or 0
-        updated += 1
-
-    db.commit()
+    folded = catch_up_exposure(db)
+    recalibrated = session_manager.recalibrate_exposure()
+    updated = db.scalar(select(func.count()).select_from(ItemExposure))
 
+    status = "recalibrated" if recalibrated else "not recalibrated (too few tests or another worker did)"
     return RecalibrateResponse(
         items_recalibrated=updated,
-        message=f"Updated exposure statistics for {updated} items from response data.",
+        message=f"Folded {folded} new responses; exposure control {status}; {updated} items tracked.",
     )
 
 
@@ -65,9 +46,19 @@ def get_server_stats():
         "vocab_count": session_manager.vocab_count,
         "active_sessions": session_manager.active_session_count,
         "irt_model": IRT_MODEL,
+        "item_pools": session_manager.pool_memory(),
+        "item_content_cache": session_manager.content_cache_stats(),
+        "response_writer": response_writer.stats(),
     }
 
 
+@router.post("/reload")
+def reload_data():
+    """Reload vocabulary data if the snapshot sources changed (drops cached item content)."""
+    reloaded = session_manager.reload_data()
+    return {"reloaded": reloaded, "vocab_count": session_manager.vocab_count}
+
+
 @router.post("/cleanup")
 def cleanup_stale_sessions():
     """Remove stale sessions from memory."""
@@ -1,8 +1,9 @@
 """API routes for learning recommendations and goal-based learning."""
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ..data.database import get_db
+from ..data.database import get_async_db, get_db
 from ..data.db_models import TestSession, GoalLearningSession
 from ..reporting.recommendation_engine import generate_study_plan
 from ..reporting.matrix_generator import compute_vocab_matrix
@@ -32,9 +33,9 @@ router = APIRouter(prefix="/api/v1", tags=["learn"])
 
 
 @router.get("/learn/{session_id}/plan")
-def get_study_plan(session_id: str, db: Session = Depends(get_db)):
+async def get_study_plan(session_id: str, db: AsyncSession = Depends(get_async_db)):
     """Generate a personalized study plan from test results."""
-    db_session = db.get(TestSession, session_id)
+    db_session = await db.get(TestSession, session_id)
     if db_session is None:
         raise HTTPException(status_code=404, detail="Session not found")
 
@@ -62,9 +63,9 @@ def get_study_plan(session_id: str, db: Session = Depends(get_db)):
 
 
 @router.get("/learn/{session_id}/matrix")
-def get_vocab_matrix(session_id: str, db: Session = Depends(get_db)):
+async def get_vocab_matrix(session_id: str, db: AsyncSession = Depends(get_async_db)):
     """Generate vocabulary matrix visualization data."""
-    db_session = db.get(TestSession, session_id)
+    db_session = await db.get(TestSession, session_id)
     if db_session is None:
         raise HTTPException(status_code=404, detail="Session not found")
 
@@ -1,4 +1,5 @@
 """API routes for test sessions."""
+import asyncio
 from datetime import datetime, timezone
 import logging
 
@@ -7,17 +8,21 @@ from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 limiter = Limiter(key_func=get_remote_address)
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..data.database import get_db
-from ..data.db_models import User, TestSession, Response
+from ..config import RESPONSE_FLUSH_TIMEOUT
+from ..data.database import SessionLocal, get_async_db
+from ..data.db_models import Response, User, TestSession
 from .schemas import (
     TestStartRequest, TestStartResponse, TestRespondRequest, TestRespondResponse,
     TestResultsResponse, ItemResponse, TestProgressResponse,
     CEFRProbabilities, TopicAnalysis, DimensionScore,
     UserHistoryResponse, UserHistoryEntry,
 )
+from .response_writer import response_writer
 from .session_manager import session_manager
+from .session_store import ActiveSession
 from ..middleware.metrics import record_item_generation
 
 router = APIRouter(prefix="/api/v1", tags=["test"])
@@ -81,14 +86,18 @@ def _results_to_response(session_id: str, results: dict, termination_reason: str
 
 
 @router.post("/test/start", response_model=TestStartResponse)
-def start_test(req: TestStartRequest, db: Session = Depends(get_db)):
-    """Start a new adaptive test session."""
+async def start_test(req: TestStartRequest, db: AsyncSession = Depends(get_async_db)):
+    """Start a new adaptive test session.
+
+    The CAT work runs inline on the event loop (it is short and CPU-bound);
+    only database I/O is awaited.
+    """
     if not session_manager.is_loaded:
         raise HTTPException(status_code=503, detail="Server is still loading data. Try again shortly.")
 
     # Get or create user
     if req.user_id:
-        user = db.get(User, req.user_id)
+        user = await db.get(User, req.user_id)
         if not user:
             raise HTTPException(status_code=404, detail=f"User {req.user_id} not found")
     else:
@@ -99,15 +108,16 @@ def start_test(req: TestStartRequest, db: Session = Depends(get_db)):
             exam_experience=req.exam_experience,
         )
         db.add(user)
-        db.flush()
+        await db.flush()
 
     # Create DB session record
     db_session = TestSession(user_id=user.id)
     db.add(db_session)
-    db.flush()
+    await db.flush()
 
-    # Create in-memory CAT session
-    active = session_manager.create_session(
+    # Create the CAT session; the store write blocks on Redis, so off the event loop
+    active = await asyncio.to_thread(
+        session_manager.create_session,
         session_id=db_session.id,
         user_id=user.id,
         grade=req.grade,
@@ -118,22 +128,16 @@ def start_test(req: TestStartRequest, db: Session = Depends(get_db)):
 
     # Update DB with initial theta
     db_session.initial_theta = active.cat_session.initial_theta
-    db.commit()
+    db_session.parameter_version = active.parameter_version
+    await db.commit()
 
     # Get first item
     first_item_params = active.cat_session.get_next_item()
     if first_item_params is None:
         raise HTTPException(status_code=500, detail="Failed to select first item")
 
-    # Mixed mode: dynamically choose question type per item
-    if req.question_type == 0:
-        chosen_type = session_manager.choose_question_type(
-            first_item_params, items_completed=0, type_counts={}
-        )
-        session_manager.adjust_item_difficulty(first_item_params, chosen_type)
-        content_qt = chosen_type
-    else:
-        content_qt = req.question_type
+    # Mixed mode: the question type was selected together with the item
+    content_qt = first_item_params.question_type if req.question_type == 0 else req.question_type
 
     item_content = session_manager.generate_item_content(
         first_item_params, question_type=content_qt
@@ -169,7 +173,8 @@ def start_test(req: TestStartRequest, db: Session = Depends(get_db)):
         logger.debug("Failed to record item generation metric: %s", e)
 
     # Store pending item on the active session for later response matching
-    active._pending_item = first_item_params
+    active.pending_item = first_item_params
+    await asyncio.to_thread(session_manager.save_session, active)
 
     return TestStartResponse(
         session_id=db_session.id,
@@ -181,30 +186,32 @@ def start_test(req: TestStartRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/test/{session_id}/respond", response_model=TestRespondResponse)
-def respond_to_item(session_id: str, req: TestRespondRequest, db: Session = Depends(get_db)):
+async def respond_to_item(session_id: str, req: TestRespondRequest, db: AsyncSession = Depends(get_async_db)):
     """Submit a response and get the next item (or results if complete)."""
-    active = session_manager.get_session(session_id)
+    active = await asyncio.to_thread(session_manager.get_session, session_id)
     if active is None:
         raise HTTPException(status_code=404, detail="Session not found or expired")
 
     cat = active.cat_session
+    if cat.is_complete:
+        # A completion whose responses could not be saved: finish it without recording again
+        return await _complete_test(active, db)
 
     # Find the item by ID
-    pending = getattr(active, "_pending_item", None)
+    pending = active.pending_item
     if pending is None or pending.item_id != req.item_id:
         # Look up in pool
-        matching = [item for item in cat.item_pool if item.item_id == req.item_id]
-        if not matching:
+        pending = cat.item_pool.get(req.item_id)
+        if pending is None:
             raise HTTPException(status_code=400, detail=f"Item {req.item_id} not in pool")
-        pending = matching[0]
 
     # Record response
     theta_before = cat.current_theta
     se_before = cat.current_se
     cat.record_response(pending, req.is_correct, is_dont_know=req.is_dont_know)
 
-    # Save response to DB
-    db_response = Response(
+    # Queue the Response row for the batched write-behind insert
+    row = dict(
         session_id=session_id,
         item_id=pending.item_id,
         word=pending.word,
@@ -220,63 +227,24 @@ def respond_to_item(session_id: str, req: TestRespondRequest, db: Session = Depe
         difficulty_b=pending.difficulty_b,
         discrimination_a=pending.discrimination_a,
     )
-    db.add(db_response)
-
-    progress = _progress_from_session(cat)
+    if not response_writer.offer(row):
+        # Queue full: wait for the flusher rather than grow without bound
+        await asyncio.to_thread(response_writer.put, row)
 
     if cat.is_complete:
-        # Generate final results
-        results = cat.get_results()
-
-        # Update DB session
-        db_session = db.get(TestSession, session_id)
-        if db_session:
-            db_session.completed_at = datetime.now(timezone.utc)
-            db_session.final_theta = results["theta"]
-            db_session.final_se = results["se"]
-            db_session.reliability = results["reliability"]
-            db_session.cefr_level = results["cefr_level"]
-            db_session.cefr_probabilities = results["cefr_probabilities"]
-            db_session.curriculum_level = results["curriculum_level"]
-            db_session.vocab_size_estimate = results["vocab_size_estimate"]
-            db_session.total_items = results["total_items"]
-            db_session.total_correct = results["total_correct"]
-            db_session.accuracy = results["accuracy"]
-            db_session.termination_reason = cat.termination_reason
-            db_session.topic_strengths = results["topic_strengths"]
-            db_session.topic_weaknesses = results["topic_weaknesses"]
-            db_session.dimension_scores = results.get("dimension_scores", [])
+        return await _complete_test(active, db)
 
-        db.commit()
-
-        # Clean up memory
-        session_manager.remove_session(session_id)
-
-        return TestRespondResponse(
-            is_complete=True,
-            progress=progress,
-            next_item=None,
-            results=_results_to_response(session_id, results, cat.termination_reason),
-        )
+    progress = _progress_from_session(cat)
 
     # Get next item
     next_item_params = cat.get_next_item()
     if next_item_params is None:
-        db.commit()
+        active.pending_item = None
+        await asyncio.to_thread(session_manager.save_session, active)
         raise HTTPException(status_code=500, detail="Failed to select next item")
 
-    # Mixed mode: dynamically choose question type per item
-    if active.question_type == 0:
-        type_counts = cat.content_tracker.type_counts if hasattr(cat, 'content_tracker') else {}
-        chosen_type = session_manager.choose_question_type(
-            next_item_params,
-            items_completed=len(cat.responses),
-            type_counts=type_counts,
-        )
-        session_manager.adjust_item_difficulty(next_item_params, chosen_type)
-        content_qt = chosen_type
-    else:
-        content_qt = active.question_type
+    # Mixed mode: the question type was selected together with the item
+    content_qt = next_item_params.question_type if active.question_type == 0 else active.question_type
 
     item_content = session_manager.generate_item_content(
         next_item_params, question_type=content_qt
@@ -292,7 +260,8 @@ def respond_to_item(session_id: str, req: TestRespondRequest, db: Session = Depe
             )
         except Exception as e:
             logger.debug("Failed to record item generation metric: %s", e)
-        db.commit()
+        active.pending_item = None
+        await asyncio.to_thread(session_manager.save_session, active)
         raise HTTPException(status_code=500, detail="Failed to generate item content")
 
     try:
@@ -312,8 +281,8 @@ def respond_to_item(session_id: str, req: TestRespondRequest, db: Session = Depe
     except Exception as e:
         logger.debug("Failed to record item generation metric: %s", e)
 
-    active._pending_item = next_item_params
-    db.commit()
+    active.pending_item = next_item_params
+    await asyncio.to_thread(session_manager.save_session, active)
 
     return TestRespondResponse(
         is_complete=False,
@@ -323,16 +292,90 @@ def respond_to_item(session_id: str, req: TestRespondRequest, db: Session = Depe
     )
 
 
+async def _complete_test(active: ActiveSession, db: AsyncSession) -> TestRespondResponse:
+    """Store a finished test's result, once all its responses are stored."""
+    session_id = active.session_id
+    cat = active.cat_session
+    results = cat.get_results()
+
+    # The test's responses must be stored before its result is. This worker
+    # writes its own queued rows now; rows queued by other workers (shared
+    # session store) show up in the count once they are written. Until then,
+    # keep the session: resubmitting the response completes it.
+    flushed = await asyncio.to_thread(response_writer.flush_session, session_id, RESPONSE_FLUSH_TIMEOUT)
+    stored = flushed and await db.scalar(
+        select(func.count()).select_from(Response).where(Response.session_id == session_id)
+    ) == len(cat.state)
+    if not stored:
+        active.pending_item = None
+        await asyncio.to_thread(session_manager.save_session, active)
+        raise HTTPException(status_code=503, detail="Responses could not be saved; resubmit to complete the test")
+
+    # Update DB session
+    db_session = await db.get(TestSession, session_id)
+    if db_session:
+        db_session.completed_at = datetime.now(timezone.utc)
+        db_session.final_theta = results["theta"]
+        db_session.final_se = results["se"]
+        db_session.reliability = results["reliability"]
+        db_session.cefr_level = results["cefr_level"]
+        db_session.cefr_probabilities = results["cefr_probabilities"]
+        db_session.curriculum_level = results["curriculum_level"]
+        db_session.vocab_size_estimate = results["vocab_size_estimate"]
+        db_session.total_items = results["total_items"]
+        db_session.total_correct = results["total_correct"]
+        db_session.accuracy = results["accuracy"]
+        db_session.termination_reason = cat.termination_reason
+        db_session.topic_strengths = results["topic_strengths"]
+        db_session.topic_weaknesses = results["topic_weaknesses"]
+        db_session.dimension_scores = results.get("dimension_scores", [])
+
+    await db.commit()
+
+    # Clean up memory
+    await asyncio.to_thread(session_manager.remove_session, session_id)
+
+    return TestRespondResponse(
+        is_complete=True,
+        progress=_progress_from_session(cat),
+        next_item=None,
+        results=_results_to_response(session_id, results, cat.termination_reason),
+    )
+
+
+def flush_partial_result(active: ActiveSession):
+    """Record how far an abandoned session got before it was evicted.
+
+    Only item counts are written; final_theta stays empty, so the session
+    still reads as not completed.
+    """
+    state = active.cat_session.state
+    total = len(state)
+    correct = int(state.responses.sum())
+    db = SessionLocal()
+    try:
+        db_session = db.get(TestSession, active.session_id)
+        if db_session is None or db_session.completed_at is not None:
+            return
+        db_session.total_items = total
+        db_session.total_correct = correct
+        db_session.accuracy = round(correct / total, 3) if total else 0.0
+        db_session.termination_reason = "abandoned"
+        db.commit()
+    finally:
+        db.close()
+
+
 @router.get("/test/{session_id}/results", response_model=TestResultsResponse)
-def get_results(session_id: str, db: Session = Depends(get_db)):
+async def get_results(session_id: str, db: AsyncSession = Depends(get_async_db)):
     """Get results for a completed test session."""
-    db_session = db.get(TestSession, session_id)
+    db_session = await db.get(TestSession, session_id)
     if db_session is None:
         raise HTTPException(status_code=404, detail="Session not found")
 
     if db_session.final_theta is None:
         # Check if still active
-        active = session_manager.get_session(session_id)
+        active = await asyncio.to_thread(session_manager.get_session, session_id)
         if active is not None:
             raise HTTPException(status_code=400, detail="Test is still in progress")
         raise HTTPException(status_code=400, detail="Test was not completed")
@@ -363,14 +406,14 @@ def get_results(session_id: str, db: Session = Depends(get_db)):
 
 
 @router.get("/user/{user_id}/history", response_model=UserHistoryResponse)
-def get_user_history(user_id: str, db: Session = Depends(get_db)):
+async def get_user_history(user_id: str, db: AsyncSession = Depends(get_async_db)):
     """Get a user's test history."""
-    user = db.get(User, user_id)
+    user = await db.get(User, user_id)
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
     sessions = []
-    for s in user.sessions:
+    for s in await db.scalars(select(TestSession).where(TestSession.user_id == user_id)):
         sessions.append(UserHistoryEntry(
             session_id=s.id,
             started_at=s.started_at.isoformat() if s.started_at else "",
@@ -0,0 +1,64 @@
+"""Idle-session expiry tracking.
+
+``SessionExpiry`` keeps a min-heap of ``(deadline, session_id)`` where the
+deadline is last activity plus the idle timeout. Touching a session pushes
+a new entry; the superseded one is skipped when it reaches the top (the
+heap is rebuilt once stale entries outnumber live ones). Popping the
+expired sessions costs O(expired · log n) instead of a scan of every
+active session.
+"""
+import heapq
+import threading
+import time
+
+from ..config import SESSION_TTL_SECONDS
+
+
+class SessionExpiry:
+    """Deadlines of the sessions this process last touched."""
+
+    def __init__(self, idle_seconds: float = SESSION_TTL_SECONDS):
+        self.idle_seconds = idle_seconds
+        self._heap: list[tuple[float, float, str]] = []  # (deadline, last_active, session_id)
+        self._last_active: dict[str, float] = {}
+        # Requests touch sessions while the sweep pops them from another thread
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._last_active)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._last_active
+
+    def touch(self, session_id: str, last_active: float) -> None:
+        with self._lock:
+            self._last_active[session_id] = last_active
+            heapq.heappush(self._heap, (last_active + self.idle_seconds, last_active, session_id))
+            if len(self._heap) > 2 * len(self._last_active) + 64:
+                self._compact()
+
+    def discard(self, session_id: str) -> None:
+        with self._lock:
+            self._last_active.pop(session_id, None)
+
+    def pop_expired(self, now: float | None = None) -> list[tuple[str, float]]:
+        """Stop tracking sessions idle past the timeout.
+
+        Returns ``(session_id, last_active)`` pairs, oldest first.
+        """
+        now = time.time() if now is None else now
+        expired = []
+        with self._lock:
+            heap = self._heap
+            while heap and heap[0][0] <= now:
+                _, last_active, session_id = heapq.heappop(heap)
+                if self._last_active.get(session_id) == last_active:
+                    del self._last_active[session_id]
+                    expired.append((session_id, last_active))
+        return expired
+
+    def _compact(self) -> None:
+        """Drop superseded heap entries (lock held)."""
+        idle = self.idle_seconds
+        self._heap = [(last + idle, last, sid) for sid, last in self._last_active.items()]
+        heapq.heapify(self._heap)
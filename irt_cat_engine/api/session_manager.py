@@ -1,84 +1,381 @@
-"""In-memory CAT session manager with Redis-ready interface.
-
-Active test sessions live in memory for low-latency item selection.
-Completed sessions are persisted to the database.
-This can be swapped with a Redis-backed implementation later.
+"""CAT session manager: active sessions, item pools and item generation.
+
+Active test sessions live in a SessionStore: in process memory by default,
+or in Redis (``IRT_SESSION_STORE=redis``) so several workers can share them.
+Completed sessions are persisted to the database; sessions idle past the
+timeout are evicted by ``run_session_expiry``. Every session shares one
+Sympson-Hetter exposure controller (in-process, or in Redis across
+workers), seeded from item_exposure at startup; ``run_exposure_recalibration``
+folds new responses into item_exposure, recalibrates the controller and
+checkpoints k back to item_exposure. Item pools come
+from a ParameterRegistry: ``run_parameter_refresh`` swaps in newly
+calibrated parameter sets for new sessions while each in-flight session
+keeps the version it started with.
 """
+import asyncio
 import logging
 import random
+import threading
 import time
-from dataclasses import dataclass, field
+from collections.abc import Callable
 
 import numpy as np
 
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.orm import Session
+
+from ..cat.item_overlay import ItemOverlay
+from ..cat.item_selector import ExposureController
 from ..cat.session import CATSession
+from ..cat.session_state import SessionState
 from ..cat.stopping_rules import StoppingRules
-from ..data.load_vocabulary import VocabWord, load_vocabulary
+from ..data.database import SessionLocal
+from ..data.db_models import ItemExposure, TestSession
+from ..data.exposure_counts import catch_up_exposure
+from ..data.load_vocabulary import load_vocabulary
 from ..data.graph_connector import vocab_graph
+from ..data.snapshot import Snapshot, open_snapshot, snapshot_key
+from ..data.vocab_store import VocabStore
+from ..item_bank.bank import ItemBank
 from ..item_bank.distractor_engine import DistractorEngine
+from ..item_bank.information_table import get_information_table
+from ..item_bank.joint_pool import build_joint_pool, question_type_availability
 from ..item_bank.parameter_initializer import initialize_item_parameters
-from ..config import QUESTION_TYPE_B_MODIFIER
+from ..item_bank.parameter_registry import ParameterRegistry
+from ..item_bank.parameter_set import ParameterSet
+from ..config import (
+    EXPOSURE_BACKEND, EXPOSURE_RECALIBRATE_INTERVAL, PARAMETER_REFRESH_INTERVAL, PARAMETER_SET_DIR,
+    SESSION_EXPIRY_INTERVAL, SESSION_STORE_BACKEND, SNAPSHOT_ENABLED,
+)
+from ..middleware.metrics import ACTIVE_SESSIONS, SESSIONS_EXPIRED
 from ..models.irt_2pl import ItemParameters
+from ..reporting.score_mapper import get_score_curve
+from .item_content_cache import ItemContentCache
+from .session_expiry import SessionExpiry
+from .shared_exposure import RedisExposureController
+from .session_store import ActiveSession, InMemorySessionStore, RedisSessionStore, SessionStore
 
 logger = logging.getLogger("irt_cat_engine.session_manager")
 
 
-@dataclass
-class ActiveSession:
-    """An active CAT session with all required context."""
-    session_id: str
-    user_id: str
-    cat_session: CATSession
-    question_type: int
-    created_at: float = field(default_factory=time.time)
-
-
 class SessionManager:
     """Manages active CAT sessions and provides item generation."""
 
-    def __init__(self):
-        self._active: dict[str, ActiveSession] = {}
-        self._vocab: list[VocabWord] | None = None
-        self._items_by_type: dict[int, list[ItemParameters]] = {}
+    def __init__(
+        self,
+        store_backend: str = SESSION_STORE_BACKEND,
+        redis_client=None,
+        exposure_backend: str = EXPOSURE_BACKEND,
+        parameter_dir=PARAMETER_SET_DIR,
+    ):
+        if exposure_backend not in ("memory", "redis"):
+            raise ValueError(f"Unknown exposure backend: {exposure_backend!r}")
+        self._store = self._create_store(store_backend, redis_client)
+        self._redis_client = redis_client
+        self._exposure_backend = exposure_backend
+        self._expiry = SessionExpiry()
+        self._vocab: VocabStore | None = None
+        self._items_by_type: dict[int, ItemBank] = {}
+        # Reentrant: the pool of another type is built from the type-1 pool
+        self._base_lock = threading.RLock()
         self._distractor_engine: DistractorEngine | None = None
-        self._vocab_by_word: dict[str, VocabWord] = {}
+        self._snapshot: Snapshot | None = None
+        self._content_cache = ItemContentCache(self._build_item_variant)
+        self._exposure: ExposureController | None = None
+        self._checkpointed_k: np.ndarray | None = None
+        self._parameters = ParameterRegistry(self._build_pool, parameter_dir)
+
+    def _create_store(self, backend: str, redis_client=None) -> SessionStore:
+        if backend == "memory":
+            return InMemorySessionStore()
+        if backend == "redis":
+            if redis_client is not None:
+                return RedisSessionStore(redis_client, self._restore_session)
+            return RedisSessionStore.from_url(self._restore_session)
+        raise ValueError(f"Unknown session store backend: {backend!r}")
 
     @property
     def is_loaded(self) -> bool:
         return self._vocab is not None
 
     def load_data(self):
-        """Load vocabulary and initialize item parameters. Called once at startup."""
+        """Load vocabulary and initialize item parameters. Called once at startup.
+
+        Uses the compiled snapshot for the current source files (compiling it
+        on the first start) and falls back to parsing the CSV if the snapshot
+        cannot be read or written.
+        """
         if self._vocab is not None:
             return
 
-        self._vocab = load_vocabulary()
-        self._vocab_by_word = {w.word_display.lower(): w for w in self._vocab}
-
-        # Load graph for Strategy D distractors (optional, non-blocking)
-        try:
-            vocab_graph.load()
-            logger.info("Vocabulary graph loaded successfully")
-        except FileNotFoundError:
-            logger.warning("vocabulary_graph.json not found - enhanced distractors disabled")
-        except Exception as e:
-            logger.error(f"Failed to load vocabulary graph: {e}", exc_info=True)
+        self._snapshot = self._open_snapshot()
+        pools = None
+        if self._snapshot is not None:
+            vocab = self._snapshot.vocab_store()
+            pools = self._snapshot.distractor_pools()
+            vocab_graph.load_snapshot(self._snapshot)
+        else:
+            vocab = VocabStore.from_words(load_vocabulary())
+            # Load graph for Strategy D distractors (optional, non-blocking)
+            try:
+                vocab_graph.load()
+                logger.info("Vocabulary graph loaded successfully")
+            except FileNotFoundError:
+                logger.warning("vocabulary_graph.json not found - enhanced distractors disabled")
+            except Exception as e:
+                logger.error(f"Failed to load vocabulary graph: {e}", exc_info=True)
+
+        self._vocab = vocab
 
         self._distractor_engine = DistractorEngine(
             self._vocab,
             graph=vocab_graph if vocab_graph.is_loaded else None,
+            pools=pools,
         )
 
+        # Cached item content is only valid for the data it was built from
+        self._content_cache.invalidate(self._snapshot.key if self._snapshot else "csv")
+
         # Pre-initialize item parameters for question type 1 (baseline)
-        self._items_by_type[1] = initialize_item_parameters(self._vocab, question_type=1)
+        self._warm_content_cache(self.get_item_pool(1), question_type=1)
+        try:
+            self.refresh_parameters()
+        except Exception as e:
+            logger.warning(f"Calibrated parameters not loaded: {e}", exc_info=True)
+
+        try:
+            with SessionLocal() as db:
+                catch_up_exposure(db)
+                self.seed_exposure(db)
+        except Exception as e:
+            logger.warning(f"Exposure counters not loaded: {e}", exc_info=True)
 
-    def get_item_pool(self, question_type: int = 1) -> list[ItemParameters]:
-        """Get or lazily initialize item pool for a question type."""
-        if question_type not in self._items_by_type:
-            self._items_by_type[question_type] = initialize_item_parameters(
-                self._vocab, question_type=question_type
+    @property
+    def exposure_controller(self) -> ExposureController | None:
+        return self._exposure
+
+    def _create_exposure_controller(self, item_count: int) -> ExposureController:
+        if self._exposure_backend == "memory":
+            return ExposureController(item_count)
+        client = self._redis_client
+        if client is None and isinstance(self._store, RedisSessionStore):
+            client = self._store.client
+        if client is not None:
+            return RedisExposureController(client, item_count)
+        return RedisExposureController.from_url(item_count)
+
+    def seed_exposure(self, db: Session) -> int:
+        """Rebuild the exposure controller from item_exposure; returns the item count."""
+        rows = db.execute(
+            select(ItemExposure.item_id, ItemExposure.admin_count, ItemExposure.exposure_k)
+        ).all()
+        total_tests = db.scalar(
+            select(func.count(TestSession.id)).where(TestSession.completed_at.is_not(None))
+        ) or 0
+        started_tests = db.scalar(select(func.count(TestSession.id))) or 0
+        ids = np.array([r.item_id for r in rows], dtype=np.int64)
+        counts = np.array([r.admin_count for r in rows], dtype=np.int64)
+        k = np.array([1.0 if r.exposure_k is None else r.exposure_k for r in rows])
+        checkpointed = any(r.exposure_k is not None for r in rows)
+
+        bank = self._items_by_type.get(1)
+        size = int(bank.item_ids.max()) + 1 if bank is not None and len(bank) else 0
+        controller = self._create_exposure_controller(size)  # seed() grows it for larger persisted ids
+        controller.seed(ids, counts, total_tests, k if checkpointed else None, started_tests)
+        self._exposure = controller
+        self._checkpointed_k = controller.k.copy() if checkpointed else None
+        return len(rows)
+
+    def recalibrate_exposure(self) -> bool:
+        """Sync with other workers, recalibrate and checkpoint k.
+
+        Returns True if this worker recalibrated (and so checkpointed).
+        """
+        controller = self._exposure
+        if controller is None:
+            return False
+        controller.sync()
+        if not controller.recalibrate():
+            return False
+        with SessionLocal() as db:
+            self.checkpoint_exposure(db)
+        return True
+
+    def checkpoint_exposure(self, db: Session) -> int:
+        """Write k values changed since the last checkpoint to item_exposure."""
+        k = self._exposure.k.copy()
+        previous = self._checkpointed_k
+        if previous is None:
+            changed = np.arange(len(k))
+        else:
+            common = min(len(k), len(previous))
+            changed = np.concatenate([
+                np.flatnonzero(k[:common] != previous[:common]), np.arange(common, len(k)),
+            ])
+        if len(changed):
+            table = ItemExposure.__table__
+            db.execute(
+                update(table).where(table.c.item_id == bindparam("_item_id")).values(exposure_k=bindparam("_k")),
+                [{"_item_id": int(i), "_k": float(k[i])} for i in changed],
             )
-        return self._items_by_type[question_type]
+            db.commit()
+        self._checkpointed_k = k
+        return len(changed)
+
+    def fold_exposure(self) -> int:
+        """Fold responses written since the last fold into item_exposure."""
+        with SessionLocal() as db:
+            return catch_up_exposure(db)
+
+    async def run_exposure_recalibration(self, interval_seconds: float = EXPOSURE_RECALIBRATE_INTERVAL):
+        """Fold exposure counters and recalibrate exposure control every ``interval_seconds``."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await asyncio.to_thread(self.fold_exposure)
+            except Exception as e:
+                logger.error(f"Exposure counter fold failed: {e}", exc_info=True)
+            try:
+                # Off the event loop: this talks to Redis and the database
+                await asyncio.to_thread(self.recalibrate_exposure)
+            except Exception as e:
+                logger.error(f"Exposure recalibration failed: {e}", exc_info=True)
+
+    def reload_data(self) -> bool:
+        """Reload vocabulary and pools if the snapshot sources changed.
+
+        Returns False when the loaded snapshot is still current. Active
+        sessions keep the pools they were created with; the current
+        parameter set is re-applied to the new pools.
+        """
+        if self._snapshot is not None and SNAPSHOT_ENABLED and self._snapshot.key == snapshot_key():
+            return False
+        parameter_set = self._parameters.current.parameter_set
+        self._vocab = None
+        self._items_by_type = {}
+        self._snapshot = None
+        self._parameters = ParameterRegistry(self._build_pool, self._parameters.directory, self._parameters.keep)
+        self.load_data()
+        if parameter_set is not None and self._parameters.current.parameter_set is None:
+            self._parameters.load(parameter_set)
+        return True
+
+    def _warm_content_cache(self, bank: ItemBank, question_type: int):
+        """Queue pre-building of every item on the pool's ranked shortlists."""
+        table = get_information_table(bank, build=False)
+        if table is None:
+            return
+        rows = np.unique(table.top_rows).tolist()
+        self._content_cache.warm(
+            (int(bank.item_ids[r]), question_type, bank.words[r]) for r in rows
+        )
+
+    @staticmethod
+    def _open_snapshot() -> Snapshot | None:
+        if not SNAPSHOT_ENABLED:
+            return None
+        try:
+            return open_snapshot()
+        except Exception as e:
+            logger.warning(f"Snapshot unavailable, loading from CSV: {e}", exc_info=True)
+            return None
+
+    def _base_pool(self, question_type: int) -> ItemBank:
+        """The pool with the initial parameters (snapshot, else initialized).
+
+        Pools of other types differ from the type-1 pool only in a/b/c and
+        the question_type column, so they share its other columns.
+        """
+        bank = self._items_by_type.get(question_type)
+        if bank is not None:
+            return bank
+        # Pools of several versions / types may be built from different threads
+        with self._base_lock:
+            bank = self._items_by_type.get(question_type)
+            if bank is not None:
+                return bank
+            bank = self._snapshot.item_bank(question_type) if self._snapshot else None
+            if bank is None:
+                bank = ItemBank.from_items(
+                    initialize_item_parameters(self._vocab, question_type=question_type)
+                )
+            if question_type != 1:
+                base = self._base_pool(1)
+                if np.array_equal(base.item_ids, bank.item_ids):
+                    bank = base.with_parameters(bank.a, bank.b, bank.c, question_type=bank.question_type)
+            self._items_by_type[question_type] = bank
+            return bank
+
+    def _build_pool(self, question_type: int, parameter_set: ParameterSet | None) -> ItemBank:
+        """Pool for one parameter version, with its lookup tables built.
+
+        The information table and score curve are built here, before the
+        version can be activated, so selection uses the ranked shortlists
+        and reports the cached curve from the first request. Question type
+        0 (mixed mode) is the joint (item, question type) selection pool
+        over the type-1 pool.
+        """
+        pool_type = 1 if question_type == 0 else question_type
+        bank = self._base_pool(pool_type)
+        if parameter_set is not None:
+            bank = parameter_set.bank_for(bank, pool_type)
+        if question_type == 0:
+            available = question_type_availability(self._vocab, bank.words)
+            offsets = ItemOverlay.for_mixed_mode(pool_type).type_offsets
+            return build_joint_pool(bank, available, offsets).freeze()
+        # Shared by every session (and thread) using this version
+        bank.freeze()
+        get_information_table(bank)
+        get_score_curve(bank)
+        return bank
+
+    def get_item_pool(self, question_type: int = 1, parameter_version: str | None = None) -> ItemBank:
+        """Get or lazily initialize the item pool for a question type.
+
+        Uses the current parameter version unless ``parameter_version`` names
+        another one (sessions restored from the store).
+        """
+        return self._parameters.pool(question_type, parameter_version)
+
+    @property
+    def parameter_version(self) -> str:
+        """Parameter version new sessions are started with."""
+        return self._parameters.current.version
+
+    def load_parameter_set(self, parameter_set: ParameterSet) -> str:
+        """Swap in calibrated parameters for new sessions without a restart.
+
+        Pools and lookup tables for every question type in use are built
+        before the swap; in-flight sessions keep their version. Returns the
+        new version.
+        """
+        return self._parameters.load(parameter_set).version
+
+    def refresh_parameters(self) -> bool:
+        """Load the newest parameter set on disk if it is newer than the current one."""
+        return self._parameters.refresh()
+
+    async def run_parameter_refresh(self, interval_seconds: float = PARAMETER_REFRESH_INTERVAL):
+        """Check for a new parameter set every ``interval_seconds`` until cancelled."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                # Off the event loop: building the new pools' tables takes a while
+                await asyncio.to_thread(self.refresh_parameters)
+            except Exception as e:
+                logger.error(f"Parameter refresh failed: {e}", exc_info=True)
+
+    def pool_memory(self) -> dict[int, dict]:
+        """Memory held by each initialized pool of the current version and its information table."""
+        stats = {}
+        for question_type, bank in sorted(self._parameters.current.pools.items()):
+            table = get_information_table(bank, build=False)
+            stats[question_type] = {
+                "items": len(bank),
+                "bank_bytes": bank.nbytes,
+                "info_table_bytes": table.nbytes if table is not None else 0,
+            }
+        return stats
 
     def create_session(
         self,
@@ -89,17 +386,22 @@ class SessionManager:
         exam_experience: str = "none",
         question_type: int = 1,
     ) -> ActiveSession:
-        """Create a new CAT session."""
-        # Mixed mode (0) uses Type 1 pool for item selection;
-        # actual question type is chosen dynamically per item.
-        pool_type = 1 if question_type == 0 else question_type
-        item_pool = self.get_item_pool(pool_type)
+        """Create a new CAT session.
+
+        Mixed mode (0) selects (word, question type) pairs from the joint
+        pool and serves them through an overlay on the type-1 pool.
+        """
+        parameters = self._parameters.current
+        item_pool = parameters.pool(1 if question_type == 0 else question_type)
 
         cat_session = CATSession.create(
             item_pool=item_pool,
             grade=grade,
             self_assess=self_assess,
             exam_experience=exam_experience,
+            exposure_controller=self._exposure,
+            overlay=self._item_overlay(question_type),
+            selection_pool=parameters.pool(0) if question_type == 0 else None,
         )
 
         active = ActiveSession(
@@ -107,97 +409,154 @@ class SessionManager:
             user_id=user_id,
             cat_session=cat_session,
             question_type=question_type,
+            parameter_version=parameters.version,
         )
-        self._active[session_id] = active
+        self._store.put(active)
+        self._track(active)
         return active
 
     def get_session(self, session_id: str) -> ActiveSession | None:
         """Retrieve an active session."""
-        return self._active.get(session_id)
+        return self._store.get(session_id)
+
+    def save_session(self, active: ActiveSession):
+        """Write back a session after recording a response or serving an item."""
+        active.last_active = time.time()
+        self._store.put(active)
+        self._track(active)
 
     def remove_session(self, session_id: str):
-        """Remove a completed session from memory."""
-        self._active.pop(session_id, None)
+        """Remove a completed session from the store."""
+        self._store.delete(session_id)
+        self._expiry.discard(session_id)
+        ACTIVE_SESSIONS.set(len(self._expiry))
+
+    def _track(self, active: ActiveSession):
+        self._expiry.touch(active.session_id, active.last_active)
+        ACTIVE_SESSIONS.set(len(self._expiry))
+
+    def expire_idle_sessions(
+        self,
+        now: float | None = None,
+        on_evict: Callable[[ActiveSession], None] | None = None,
+    ) -> int:
+        """Evict sessions idle past the timeout; returns how many were evicted.
+
+        ``on_evict`` is called with each session before it is deleted. With a
+        shared store, a session another worker has touched since is left to
+        that worker.
+        """
+        evicted = 0
+        for session_id, last_active in self._expiry.pop_expired(now):
+            active = self._store.get(session_id)
+            if active is None or active.last_active > last_active:
+                continue
+            if on_evict is not None:
+                try:
+                    on_evict(active)
+                except Exception as e:
+                    logger.error(f"Failed to flush evicted session {session_id}: {e}", exc_info=True)
+            self._store.delete(session_id)
+            evicted += 1
+        if evicted:
+            SESSIONS_EXPIRED.inc(evicted)
+            logger.info(f"Evicted {evicted} idle sessions")
+        ACTIVE_SESSIONS.set(len(self._expiry))
+        return evicted
+
+    async def run_session_expiry(
+        self,
+        interval_seconds: float = SESSION_EXPIRY_INTERVAL,
+        on_evict: Callable[[ActiveSession], None] | None = None,
+    ):
+        """Evict idle sessions every ``interval_seconds`` until cancelled."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                # Off the event loop: eviction may hit Redis and the database
+                await asyncio.to_thread(self.expire_idle_sessions, on_evict=on_evict)
+            except Exception as e:
+                logger.error(f"Session expiry sweep failed: {e}", exc_info=True)
+
+    @staticmethod
+    def _item_overlay(question_type: int) -> ItemOverlay | None:
+        """Mixed mode serves type-1 pool items with a type-adjusted difficulty."""
+        return ItemOverlay.for_mixed_mode(pool_type=1) if question_type == 0 else None
+
+    def _restore_session(self, data: bytes) -> ActiveSession:
+        """Rebuild a stored session against this process's item pools."""
+        return ActiveSession.from_bytes(data, self._restore_cat_session)
+
+    def _restore_cat_session(
+        self, state: SessionState, question_type: int, parameter_version: str | None = None,
+    ) -> CATSession:
+        pool = self.get_item_pool(1 if question_type == 0 else question_type, parameter_version)
+        return CATSession.from_state(
+            state, pool, self._item_overlay(question_type), exposure_controller=self._exposure,
+            selection_pool=self.get_item_pool(0, parameter_version) if question_type == 0 else None,
+        )
 
     def generate_item_content(self, item: ItemParameters, question_type: int) -> dict | None:
-        """Generate full item content (stem, options, distractors) for an IRT item."""
-        vocab_word = self._vocab_by_word.get(item.word.lower())
+        """Full item content (stem, options, distractors) for an IRT item.
+
+        Served from the pre-built variant cache; only the option order is
+        drawn per request.
+        """
+        variant = self._content_cache.get(item.item_id, question_type, item.word)
+        if variant is None:
+            return None
+
+        # Shuffle options
+        options = [variant["correct_answer"]] + variant["distractors"]
+        random.shuffle(options)
+
+        return {
+            "item_id": item.item_id,
+            "word": item.word,
+            "question_type": variant["question_type"],
+            "stem": variant["stem"],
+            "correct_answer": variant["correct_answer"],
+            "distractors": list(variant["distractors"]),
+            "options": options,
+            "pos": item.pos,
+            "cefr": item.cefr,
+            "explanation": variant["explanation"],
+            "generation_score": variant["generation_score"],
+            "generation_model": variant["generation_model"],
+        }
+
+    def _build_item_variant(self, word: str, question_type: int) -> dict | None:
+        """Build one content variant (unshuffled) for the item cache."""
+        vocab_word = self._vocab.get(word)
         if vocab_word is None:
             return None
 
-        result = self._distractor_engine.generate_item(vocab_word, question_type=question_type)
+        engine = self._distractor_engine
+        result = engine.generate_item(vocab_word, question_type=question_type, shuffle_options=False)
         if result is None:
             # Fallback to type 1 if requested type fails
-            result = self._distractor_engine.generate_item(vocab_word, question_type=1)
+            result = engine.generate_item(vocab_word, question_type=1, shuffle_options=False)
 
         if result is None:
             return None
 
-        # Shuffle options
-        options = [result["correct_answer"]] + result["distractors"]
-        random.shuffle(options)
-
         actual_type = result.get("question_type", question_type)
-        explanation = self._generate_explanation(
-            vocab_word, result["correct_answer"], actual_type
-        )
-
         return {
-            "item_id": item.item_id,
-            "word": item.word,
             "question_type": actual_type,
             "stem": result["stem"],
             "correct_answer": result["correct_answer"],
             "distractors": result["distractors"],
-            "options": options,
-            "pos": item.pos,
-            "cefr": item.cefr,
-            "explanation": explanation,
+            "explanation": self._generate_explanation(vocab_word, result["correct_answer"], actual_type),
             "generation_score": result.get("generation_score"),
             "generation_model": result.get("generation_model"),
         }
 
-    def choose_question_type(
-        self, item: ItemParameters, items_completed: int, type_counts: dict[int, int]
-    ) -> int:
-        """Choose a question type for mixed mode based on progression and data availability."""
-        vocab_word = self._vocab_by_word.get(item.word.lower())
-        if vocab_word is None:
-            return 1
-
-        # Get preferred types based on test progression
-        from ..cat.item_selector import ContentTracker
-        preferred = ContentTracker().preferred_question_types(items_completed)
-        candidates = preferred if preferred else [1, 2, 3, 4, 5, 6]
-
-        # Filter by data availability
-        eligible = []
-        for qt in candidates:
-            if qt in (1, 2):
-                eligible.append(qt)  # Always available
-            elif qt == 3 and vocab_word.synonym:
-                eligible.append(qt)
-            elif qt == 4 and vocab_word.antonym:
-                eligible.append(qt)
-            elif qt == 5 and (vocab_word.sentence_1 or vocab_word.sentence_2):
-                eligible.append(qt)
-            elif qt == 6 and vocab_word.collocation:
-                eligible.append(qt)
-
-        if not eligible:
-            return 1
-
-        # Pick the least-used type for balanced distribution
-        min_count = min(type_counts.get(qt, 0) for qt in eligible)
-        least_used = [qt for qt in eligible if type_counts.get(qt, 0) == min_count]
-        return random.choice(least_used)
+    def content_cache_stats(self) -> dict:
+        return self._content_cache.stats()
 
-    @staticmethod
-    def adjust_item_difficulty(item: ItemParameters, chosen_type: int):
-        """Apply question-type difficulty modifier to an item's b parameter."""
-        modifier = QUESTION_TYPE_B_MODIFIER.get(chosen_type, 0.0)
-        item.difficulty_b += modifier
-        item.question_type = chosen_type
+    def close(self):
+        """Stop background work (item content pre-building)."""
+        self._content_cache.stop()
 
     @staticmethod
     def _generate_explanation(vocab_word, correct_answer: str, question_type: int) -> str:
@@ -221,22 +580,19 @@ class SessionManager:
 
     @property
     def active_session_count(self) -> int:
-        return len(self._active)
+        return len(self._store)
 
     @property
     def vocab_count(self) -> int:
         return len(self._vocab) if self._vocab else 0
 
     def cleanup_stale_sessions(self, max_age_seconds: int = 3600):
-        """Remove sessions older than max_age_seconds."""
-        now = time.time()
-        stale = [
-            sid for sid, s in self._active.items()
-            if now - s.created_at > max_age_seconds
-        ]
-        for sid in stale:
-            self._active.pop(sid, None)
-        return len(stale)
+        """Remove sessions idle for more than max_age_seconds (full scan)."""
+        removed = self._store.expire(max_age_seconds)
+        for session_id in removed:
+            self._expiry.discard(session_id)
+        ACTIVE_SESSIONS.set(len(self._expiry))
+        return len(removed)
 
 
 # Singleton instance
@@ -0,0 +1,196 @@
+"""Storage backends for active CAT sessions.
+
+``InMemorySessionStore`` keeps live session objects in a per-process dict
+(single worker). ``RedisSessionStore`` keeps a compact serialized state in
+Redis so every worker or instance can serve any session:
+
+- Only IDs and per-response values are stored (``ActiveSession.to_bytes``,
+  a few hundred bytes); item pools are never serialized. ``restore``
+  rebuilds the session against the worker's shared item bank.
+- Keys expire ``ttl_seconds`` after the last write, so abandoned sessions
+  clean themselves up. The TTL outlives the idle timeout by a sweep
+  interval plus a margin: the expiry sweep flushes an abandoned session
+  (``on_evict``) first, and the TTL only catches what no worker sweeps.
+- Writes are last-write-wins. A session is driven by one test-taker, whose
+  requests arrive one at a time.
+
+The Redis backend works with any client exposing the redis-py ``get``,
+``set(ex=)``, ``delete`` and ``scan_iter`` calls.
+"""
+import struct
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+
+from ..cat.session import CATSession
+from ..cat.session_state import SessionState
+from ..config import REDIS_URL, SESSION_STORE_TTL_SECONDS
+from ..models.irt_2pl import ItemParameters
+
+# created_at, last_active, question_type, pending item_id (-1 = none),
+# pending question_type, len(session_id), len(user_id), len(parameter_version);
+# followed by the three strings and the SessionState bytes
+_ACTIVE_HEADER = struct.Struct("<ddBiBHHB")
+
+
+@dataclass
+class ActiveSession:
+    """An active CAT session with all required context."""
+    session_id: str
+    user_id: str
+    cat_session: CATSession
+    question_type: int
+    # Item parameter version the session was started with (see parameter_registry)
+    parameter_version: str = "initial"
+    created_at: float = field(default_factory=time.time)
+    last_active: float = field(default_factory=time.time)
+    # Item served to the test-taker and awaiting a response
+    pending_item: ItemParameters | None = None
+
+    def to_bytes(self) -> bytes:
+        session_id = self.session_id.encode("utf-8")
+        user_id = self.user_id.encode("utf-8")
+        version = self.parameter_version.encode("utf-8")
+        pending = self.pending_item
+        header = _ACTIVE_HEADER.pack(
+            self.created_at, self.last_active, self.question_type,
+            -1 if pending is None else pending.item_id,
+            0 if pending is None else pending.question_type,
+            len(session_id), len(user_id), len(version),
+        )
+        return header + session_id + user_id + version + self.cat_session.state.to_bytes()
+
+    @classmethod
+    def from_bytes(
+        cls, data: bytes, restore_cat: Callable[[SessionState, int, str], CATSession],
+    ) -> "ActiveSession":
+        """Decode ``to_bytes`` output; ``restore_cat(state, question_type,
+        parameter_version)`` rebuilds the CATSession against the local item pools."""
+        (created_at, last_active, question_type, pending_id, pending_type,
+         sid_len, uid_len, version_len) = _ACTIVE_HEADER.unpack_from(data)
+        offset = _ACTIVE_HEADER.size
+        session_id = bytes(data[offset:offset + sid_len]).decode("utf-8")
+        offset += sid_len
+        user_id = bytes(data[offset:offset + uid_len]).decode("utf-8")
+        offset += uid_len
+        parameter_version = bytes(data[offset:offset + version_len]).decode("utf-8")
+        offset += version_len
+        state = SessionState.from_bytes(memoryview(data)[offset:])
+        cat_session = restore_cat(state, question_type, parameter_version)
+        return cls(
+            session_id=session_id,
+            user_id=user_id,
+            cat_session=cat_session,
+            question_type=question_type,
+            parameter_version=parameter_version,
+            created_at=created_at,
+            last_active=last_active,
+            pending_item=None if pending_id < 0 else cat_session.resolve(pending_id, pending_type),
+        )
+
+
+# restore(data) -> ActiveSession decoded and rebuilt against the local item pools
+SessionRestorer = Callable[[bytes], ActiveSession]
+
+
+class SessionStore(ABC):
+    """Where active sessions live between requests."""
+
+    @abstractmethod
+    def get(self, session_id: str) -> ActiveSession | None:
+        ...
+
+    @abstractmethod
+    def put(self, active: ActiveSession) -> None:
+        """Save a new or modified session."""
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        ...
+
+    @abstractmethod
+    def session_ids(self) -> Iterator[str]:
+        ...
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.session_ids())
+
+    def expire(self, max_idle_seconds: float, now: float | None = None) -> list[str]:
+        """Remove sessions idle for more than ``max_idle_seconds`` (full scan).
+
+        Returns the removed session IDs.
+        """
+        now = time.time() if now is None else now
+        removed = []
+        for session_id in list(self.session_ids()):
+            active = self.get(session_id)
+            if active is not None and now - active.last_active > max_idle_seconds:
+                self.delete(session_id)
+                removed.append(session_id)
+        return removed
+
+
+class InMemorySessionStore(SessionStore):
+    """Sessions held as live objects in this process."""
+
+    def __init__(self):
+        self._sessions: dict[str, ActiveSession] = {}
+
+    def get(self, session_id: str) -> ActiveSession | None:
+        return self._sessions.get(session_id)
+
+    def put(self, active: ActiveSession) -> None:
+        self._sessions[active.session_id] = active
+
+    def delete(self, session_id: str) -> None:
+        self._sessions.pop(session_id, None)
+
+    def session_ids(self) -> Iterator[str]:
+        return iter(list(self._sessions))
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+class RedisSessionStore(SessionStore):
+    """Sessions serialized into Redis, shared by all workers."""
+
+    def __init__(
+        self,
+        client,
+        restore: SessionRestorer,
+        prefix: str = "irt:session:",
+        ttl_seconds: int = SESSION_STORE_TTL_SECONDS,
+    ):
+        self.client = client
+        self._restore = restore
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+
+    @classmethod
+    def from_url(cls, restore: SessionRestorer, url: str = REDIS_URL, **kwargs) -> "RedisSessionStore":
+        import redis  # Optional dependency, only needed for this backend
+        return cls(redis.Redis.from_url(url), restore, **kwargs)
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.prefix}{session_id}"
+
+    def get(self, session_id: str) -> ActiveSession | None:
+        raw = self.client.get(self._key(session_id))
+        if raw is None:
+            return None
+        return self._restore(raw)
+
+    def put(self, active: ActiveSession) -> None:
+        self.client.set(self._key(active.session_id), active.to_bytes(), ex=self.ttl_seconds)
+
+    def delete(self, session_id: str) -> None:
+        self.client.delete(self._key(session_id))
+
+    def session_ids(self) -> Iterator[str]:
+        start = len(self.prefix)
+        for key in self.client.scan_iter(match=f"{self.prefix}*"):
+            if isinstance(key, bytes):
+                key = key.decode("utf-8")
+            yield key[start:]
@@ -0,0 +1,198 @@
+"""Sympson-Hetter exposure control shared by all workers through Redis.
+
+Each worker draws eligibility against a local copy of the exposure
+parameters ``k``. Selection/administration counts and finished tests are
+buffered locally and added to Redis (HINCRBY / INCRBY, atomic across
+workers) on every ``sync``, which also pulls the last published ``k``.
+``recalibrate`` runs in one worker per interval (a SET NX lock): it reads
+the global counts, applies the vectorized update and publishes ``k`` as a
+single float64 array, along with the counts it measured up to, so the
+next update (in whichever worker) uses only the rates since.
+"""
+import threading
+
+import numpy as np
+
+from ..cat.item_selector import ExposureController
+from ..config import CAT_MAX_EXPOSURE_RATE, EXPOSURE_RECALIBRATE_INTERVAL, REDIS_URL
+
+
+class RedisExposureController(ExposureController):
+    """Exposure control whose counts and k live in Redis."""
+
+    def __init__(
+        self,
+        client,
+        item_count: int,
+        target_max_rate: float = CAT_MAX_EXPOSURE_RATE,
+        prefix: str = "irt:exposure:",
+        lock_seconds: float = EXPOSURE_RECALIBRATE_INTERVAL,
+    ):
+        super().__init__(item_count, target_max_rate)
+        self.client = client
+        self.prefix = prefix
+        self.lock_seconds = lock_seconds
+        self._pending_select = np.zeros(item_count, dtype=np.int64)
+        self._pending_admin = np.zeros(item_count, dtype=np.int64)
+        self._pending_tests = 0
+        self._pending_started = 0
+        # Requests record counts while the periodic sync swaps them out
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_url(cls, item_count: int, url: str = REDIS_URL, **kwargs) -> "RedisExposureController":
+        import redis  # Optional dependency, only needed for this backend
+        return cls(redis.Redis.from_url(url), item_count, **kwargs)
+
+    def _key(self, name: str) -> str:
+        return f"{self.prefix}{name}"
+
+    def _ensure_capacity(self, item_id: int):
+        super()._ensure_capacity(item_id)
+        extra = len(self.k) - len(self._pending_admin)
+        if extra > 0:
+            self._pending_select = np.concatenate([self._pending_select, np.zeros(extra, dtype=np.int64)])
+            self._pending_admin = np.concatenate([self._pending_admin, np.zeros(extra, dtype=np.int64)])
+
+    def record_selection(self, item_id: int):
+        with self._lock:
+            super().record_selection(item_id)
+            self._pending_select[item_id] += 1
+
+    def record_administration(self, item_id: int):
+        with self._lock:
+            super().record_administration(item_id)
+            self._pending_admin[item_id] += 1
+
+    def record_batch(self, item_ids: np.ndarray):
+        item_ids = np.asarray(item_ids)
+        if len(item_ids) == 0:
+            return
+        with self._lock:
+            super().record_batch(item_ids)
+            np.add.at(self._pending_select, item_ids, 1)
+            np.add.at(self._pending_admin, item_ids, 1)
+
+    def start_test(self, n_tests: int = 1):
+        with self._lock:
+            super().start_test(n_tests)
+            self._pending_started += n_tests
+
+    def end_test(self, n_tests: int = 1):
+        with self._lock:
+            super().end_test(n_tests)
+            self._pending_tests += n_tests
+
+    def seed(
+        self, item_ids: np.ndarray, admin_counts: np.ndarray, total_tests: int,
+        k: np.ndarray | None = None, started_tests: int | None = None,
+    ):
+        """Seed from persisted counters; the first worker also seeds Redis."""
+        super().seed(item_ids, admin_counts, total_tests, k, started_tests)
+        if not self.client.set(self._key("seeded"), b"1", nx=True):
+            self.sync()
+            return
+        pipe = self.client.pipeline(transaction=False)
+        pipe.delete(self._key("select"), self._key("admin"))
+        for name, counts in (("select", self.select_counts), ("admin", self.admin_counts)):
+            ids = np.flatnonzero(counts)
+            if len(ids):
+                pipe.hset(self._key(name), mapping={int(i): int(counts[i]) for i in ids})
+        pipe.set(self._key("tests"), self.total_tests)
+        pipe.set(self._key("started"), self.started_tests)
+        pipe.set(self._key("k"), self.k.tobytes())
+        self._publish_base(pipe)
+        pipe.execute()
+
+    def sync(self):
+        """Push buffered counts to Redis and pull the published k."""
+        with self._lock:
+            select, admin = self._pending_select, self._pending_admin
+            tests, started = self._pending_tests, self._pending_started
+            self._pending_select = np.zeros_like(select)
+            self._pending_admin = np.zeros_like(admin)
+            self._pending_tests = self._pending_started = 0
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for name, pending in (("select", select), ("admin", admin)):
+                for item_id in np.flatnonzero(pending):
+                    pipe.hincrby(self._key(name), int(item_id), int(pending[item_id]))
+            if tests:
+                pipe.incrby(self._key("tests"), tests)
+            if started:
+                pipe.incrby(self._key("started"), started)
+            pipe.get(self._key("k"))
+            published = pipe.execute()[-1]
+        except Exception:
+            # Keep the counts for the next sync
+            with self._lock:
+                self._ensure_capacity(len(select) - 1)
+                self._pending_select[:len(select)] += select
+                self._pending_admin[:len(admin)] += admin
+                self._pending_tests += tests
+                self._pending_started += started
+            raise
+        if published is not None:
+            self._load_k(published)
+
+    def recalibrate(self) -> bool:
+        """Recalibrate from the global counts and publish k.
+
+        Returns False if another worker holds this interval's lock or there
+        are too few tests.
+        """
+        lock_ttl = max(1, int(self.lock_seconds))
+        if not self.client.set(self._key("recalibrate_lock"), b"1", nx=True, ex=lock_ttl):
+            return False
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hgetall(self._key("select"))
+        pipe.hgetall(self._key("admin"))
+        pipe.get(self._key("tests"))
+        pipe.get(self._key("started"))
+        pipe.get(self._key("k"))
+        pipe.get(self._key("base_admin"))
+        pipe.get(self._key("base_started"))
+        select, admin, tests, started, published, base_admin, base_started = pipe.execute()
+        with self._lock:
+            if published is not None:
+                self._load_k(published)
+            self.select_counts = self._counts_from_hash(select)
+            self.admin_counts = self._counts_from_hash(admin)
+            self.total_tests = int(tests or 0)
+            self.started_tests = int(started or 0)
+            self._load_base(base_admin, base_started)
+            if not self._update_k():
+                return False
+            pipe = self.client.pipeline(transaction=False)
+            pipe.set(self._key("k"), self.k.tobytes())
+            self._publish_base(pipe)
+        pipe.execute()
+        return True
+
+    def _publish_base(self, pipe):
+        pipe.set(self._key("base_admin"), self._base_admin.tobytes())
+        pipe.set(self._key("base_started"), self._base_started)
+
+    def _load_base(self, raw: bytes | None, started: bytes | None):
+        """The counts the published k was measured up to (zero if never published)."""
+        self._base_admin[:] = 0
+        if raw is not None:
+            base = np.frombuffer(raw, dtype=np.int64)
+            if len(base):
+                self._ensure_capacity(len(base) - 1)
+            self._base_admin[:len(base)] = base
+        self._base_started = int(started or 0)
+
+    def _load_k(self, raw: bytes):
+        k = np.frombuffer(raw, dtype=np.float64)
+        if len(k):
+            self._ensure_capacity(len(k) - 1)
+        self.k[:len(k)] = k
+
+    def _counts_from_hash(self, mapping: dict) -> np.ndarray:
+        ids = np.array([int(i) for i in mapping], dtype=np.int64)
+        if len(ids):
+            self._ensure_capacity(int(ids.max()))
+        counts = np.zeros(len(self.k), dtype=np.int64)
+        counts[ids] = [int(v) for v in mapping.values()]
+        return counts
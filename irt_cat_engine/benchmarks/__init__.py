@@ -0,0 +1 @@
+"""Micro-benchmarks for the CAT engine hot paths (run as scripts, not collected by pytest)."""
@@ -0,0 +1,84 @@
+"""Benchmark: whole-bank calibration, per-item minimize_scalar vs vectorized batch.
+
+The per-item path (calibrate_bank) is timed on a sample of items and
+extrapolated to the bank; the batch path (calibrate_bank_batch) fits every
+item. Both see responses simulated from perturbed true parameters.
+
+Usage:
+    python -m irt_cat_engine.benchmarks.bench_calibrator
+    python -m irt_cat_engine.benchmarks.bench_calibrator --items 9183 --responses-per-item 200 --3pl
+"""
+import argparse
+import time
+
+import numpy as np
+
+from irt_cat_engine.item_bank.bank import ItemBank
+from irt_cat_engine.item_bank.batch_calibrator import ResponseCSR, calibrate_bank_batch
+from irt_cat_engine.item_bank.calibrator import calibrate_bank
+from irt_cat_engine.models.irt_2pl import ItemParameters
+
+
+def _make_bank(n: int, seed: int = 0) -> ItemBank:
+    rng = np.random.RandomState(seed)
+    return ItemBank.from_items([
+        ItemParameters(
+            item_id=i, word=f"w{i}",
+            difficulty_b=float(rng.normal(0, 1.2)),
+            discrimination_a=float(rng.uniform(0.4, 2.5)),
+            guessing_c=0.2,
+            question_type=int(rng.randint(1, 7)),
+        )
+        for i in range(n)
+    ])
+
+
+def _simulate(bank: ItemBank, per_item: int, seed: int = 1) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    item_ids = np.repeat(bank.item_ids, per_item)
+    rows = np.repeat(np.arange(len(bank)), per_item)
+    thetas = rng.normal(0, 1, len(item_ids))
+    a, b = bank.a[rows] * 1.1, bank.b[rows] + 0.2
+    p = bank.c[rows] + (1 - bank.c[rows]) / (1 + np.exp(-a * (thetas - b)))
+    return item_ids, thetas, (rng.random(len(item_ids)) < p).astype(np.int8)
+
+
+def run_benchmark(n_items: int = 9183, per_item: int = 100, use_3pl: bool = False, sample: int = 100) -> dict:
+    item_ids, thetas, correct = _simulate(_make_bank(n_items), per_item)
+
+    sample = min(sample, n_items)
+    in_sample = item_ids < sample
+    responses_by_item: dict[int, list[tuple[float, int]]] = {}
+    for item_id, theta, u in zip(item_ids[in_sample], thetas[in_sample], correct[in_sample]):
+        responses_by_item.setdefault(int(item_id), []).append((float(theta), int(u)))
+    start = time.perf_counter()
+    calibrate_bank(_make_bank(n_items), responses_by_item, use_3pl=use_3pl)
+    per_item_s = (time.perf_counter() - start) / sample * n_items
+
+    bank = _make_bank(n_items)
+    start = time.perf_counter()
+    responses = ResponseCSR.from_arrays(bank, item_ids, thetas, correct)
+    grouped_s = time.perf_counter() - start
+    calibrate_bank_batch(bank, responses, use_3pl=use_3pl)
+    batch_s = time.perf_counter() - start
+
+    return {
+        "items": n_items,
+        "responses": len(item_ids),
+        "per_item_s": per_item_s,
+        "group_s": grouped_s,
+        "batch_s": batch_s,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=9183)
+    parser.add_argument("--responses-per-item", type=int, default=100)
+    parser.add_argument("--3pl", dest="use_3pl", action="store_true")
+    args = parser.parse_args()
+    r = run_benchmark(args.items, args.responses_per_item, args.use_3pl)
+    print(f"{r['items']:,} items, {r['responses']:,} responses")
+    print(f"  calibrate_bank (per item, extrapolated): {r['per_item_s']:>8.1f} s")
+    print(f"  calibrate_bank_batch (incl. grouping):   {r['batch_s']:>8.2f} s  (grouping {r['group_s']:.2f} s)")
+    print(f"  speedup:                                 {r['per_item_s'] / r['batch_s']:>8.0f}x")
@@ -0,0 +1,61 @@
+"""Benchmark: CEFR/curriculum mapping, per-level scipy calls vs one vectorized call.
+
+The per-session loop is timed on a sample and reported per session; the
+vectorized mapper scores all N sessions at once.
+
+Usage:
+    python -m irt_cat_engine.benchmarks.bench_cefr_mapping
+    python -m irt_cat_engine.benchmarks.bench_cefr_mapping --sessions 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+from scipy import stats
+
+from irt_cat_engine.config import THETA_CEFR_BOUNDARIES
+from irt_cat_engine.reporting.score_mapper import theta_to_cefr_batch, theta_to_curriculum_batch
+
+
+def _scipy_cefr(theta: float, se: float) -> tuple[str, dict[str, float]]:
+    """The original per-level implementation."""
+    probabilities = {}
+    for level, (low, high) in THETA_CEFR_BOUNDARIES.items():
+        p = stats.norm.cdf(high, theta, se) - stats.norm.cdf(low, theta, se)
+        probabilities[level] = round(float(p), 4)
+    return max(probabilities, key=probabilities.get), probabilities
+
+
+def run_benchmark(n_sessions: int = 1_000_000, loop_sample: int = 2000) -> dict:
+    rng = np.random.default_rng(0)
+    thetas = rng.normal(0, 1.2, n_sessions)
+    ses = rng.uniform(0.2, 0.5, n_sessions)
+
+    start = time.perf_counter()
+    for theta, se in zip(thetas[:loop_sample], ses[:loop_sample]):
+        _scipy_cefr(theta, se)
+    loop_us = (time.perf_counter() - start) / loop_sample * 1e6
+
+    start = time.perf_counter()
+    theta_to_cefr_batch(thetas, ses)
+    theta_to_curriculum_batch(thetas)
+    batch_s = time.perf_counter() - start
+
+    return {
+        "sessions": n_sessions,
+        "loop_us_per_session": loop_us,
+        "batch_s": batch_s,
+        "batch_us_per_session": batch_s / n_sessions * 1e6,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=1_000_000)
+    args = parser.parse_args()
+    r = run_benchmark(args.sessions)
+    print(f"{r['sessions']:,} sessions")
+    print(f"  scipy per level:  {r['loop_us_per_session']:>8.2f} us/session "
+          f"(~{r['loop_us_per_session'] * r['sessions'] / 1e6:,.0f} s total)")
+    print(f"  vectorized:       {r['batch_us_per_session']:>8.3f} us/session ({r['batch_s']:.2f} s total)")
+    print(f"  speedup:          {r['loop_us_per_session'] / r['batch_us_per_session']:>8.0f}x")
@@ -0,0 +1,74 @@
+"""Benchmark: vectorized EAPEstimator vs the scalar per-quadrature-point loop.
+
+Usage:
+    python -m irt_cat_engine.benchmarks.bench_eap
+"""
+import time
+
+import numpy as np
+from scipy import stats
+
+from irt_cat_engine.config import EAP_QUADRATURE_POINTS, EAP_QUAD_RANGE
+from irt_cat_engine.models.ability_estimator import estimate_theta_eap
+from irt_cat_engine.models.irt_2pl import ItemParameters, probability
+
+
+def _scalar_eap(items: list[ItemParameters], responses: list[int]) -> tuple[float, float]:
+    """The original implementation: 41 x n scalar probability() calls per call."""
+    quad_points = np.linspace(EAP_QUAD_RANGE[0], EAP_QUAD_RANGE[1], EAP_QUADRATURE_POINTS)
+    prior = stats.norm.pdf(quad_points, loc=0.0, scale=1.0)
+    likelihood = np.ones_like(quad_points)
+    for item, response in zip(items, responses):
+        p = np.array([
+            probability(theta, item.discrimination_a, item.difficulty_b, item.guessing_c)
+            for theta in quad_points
+        ])
+        p = np.clip(p, 1e-10, 1.0 - 1e-10)
+        likelihood *= p if response == 1 else (1.0 - p)
+    posterior = likelihood * prior
+    posterior /= np.trapezoid(posterior, quad_points)
+    theta_hat = float(np.trapezoid(quad_points * posterior, quad_points))
+    variance = float(np.trapezoid((quad_points - theta_hat) ** 2 * posterior, quad_points))
+    return theta_hat, float(np.sqrt(max(variance, 1e-10)))
+
+
+def _time_per_call(fn, *args, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn(*args)
+    return (time.perf_counter() - start) / repeats
+
+
+def run_benchmark(lengths: tuple[int, ...] = (10, 30, 50), seed: int = 0) -> list[dict]:
+    rng = np.random.RandomState(seed)
+    rows = []
+    for n in lengths:
+        items = [
+            ItemParameters(
+                item_id=i, word=f"w{i}",
+                difficulty_b=float(rng.normal(0, 1.2)),
+                discrimination_a=float(rng.uniform(0.4, 2.5)),
+            )
+            for i in range(n)
+        ]
+        responses = [int(r) for r in rng.randint(0, 2, n)]
+
+        scalar = _time_per_call(_scalar_eap, items, responses, repeats=5)
+        vectorized = _time_per_call(estimate_theta_eap, items, responses, repeats=500)
+        theta_s, se_s = _scalar_eap(items, responses)
+        theta_v, se_v = estimate_theta_eap(items, responses)
+        rows.append({
+            "items": n,
+            "scalar_ms": scalar * 1000,
+            "vectorized_ms": vectorized * 1000,
+            "speedup": scalar / vectorized,
+            "max_abs_diff": max(abs(theta_s - theta_v), abs(se_s - se_v)),
+        })
+    return rows
+
+
+if __name__ == "__main__":
+    print(f"{'items':>6} {'scalar ms':>10} {'vector ms':>10} {'speedup':>9} {'max |diff|':>11}")
+    for row in run_benchmark():
+        print(f"{row['items']:>6} {row['scalar_ms']:>10.3f} {row['vectorized_ms']:>10.4f} "
+              f"{row['speedup']:>8.0f}x {row['max_abs_diff']:>11.1e}")
@@ -0,0 +1,63 @@
+"""Benchmark: generate_item latency per question type.
+
+Compares filtering candidates on every call (the full same-POS /
+adjacent-CEFR scan) with sampling from the precomputed candidate pools
+stored in the snapshot. Prints mean and p95 latency per type.
+
+Usage:
+    python -m irt_cat_engine.benchmarks.bench_generate_item
+    python -m irt_cat_engine.benchmarks.bench_generate_item --items 2000
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from irt_cat_engine.data.graph_connector import VocabGraph
+from irt_cat_engine.data.snapshot import open_snapshot
+from irt_cat_engine.item_bank.distractor_engine import DistractorEngine
+
+
+def _latencies(engine: DistractorEngine, store, rows: list[int], question_type: int) -> np.ndarray:
+    random.seed(0)
+    out = np.empty(len(rows))
+    for i, row in enumerate(rows):
+        start = time.perf_counter()
+        engine.generate_item(store[row], question_type=question_type)
+        out[i] = time.perf_counter() - start
+    return out * 1000
+
+
+def run_benchmark(items: int = 500) -> list[dict]:
+    snapshot = open_snapshot()
+    store = snapshot.vocab_store()
+    graph = VocabGraph()
+    graph.load_snapshot(snapshot)
+    graph = graph if graph.is_loaded else None
+
+    scan = DistractorEngine(store, graph)
+    pooled = DistractorEngine(store, graph, pools=snapshot.distractor_pools())
+    rows = random.Random(0).sample(range(len(store)), min(items, len(store)))
+
+    results = []
+    for question_type in range(1, 7):
+        before = _latencies(scan, store, rows, question_type)
+        after = _latencies(pooled, store, rows, question_type)
+        results.append({
+            "question_type": question_type,
+            "scan_mean_ms": before.mean(), "scan_p95_ms": np.percentile(before, 95),
+            "pool_mean_ms": after.mean(), "pool_p95_ms": np.percentile(after, 95),
+            "speedup": before.mean() / after.mean(),
+        })
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=500)
+    args = parser.parse_args()
+    print(f"{'type':>4} {'scan mean':>10} {'scan p95':>9} {'pool mean':>10} {'pool p95':>9} {'speedup':>8}")
+    for r in run_benchmark(args.items):
+        print(f"{r['question_type']:>4} {r['scan_mean_ms']:>8.3f}ms {r['scan_p95_ms']:>7.3f}ms "
+              f"{r['pool_mean_ms']:>8.3f}ms {r['pool_p95_ms']:>7.3f}ms {r['speedup']:>7.1f}x")
@@ -0,0 +1,72 @@
+"""Benchmark: whole-pool computations on list[ItemParameters] vs ItemBank.
+
+Usage:
+    python -m irt_cat_engine.benchmarks.bench_item_bank
+"""
+import time
+
+import numpy as np
+
+from irt_cat_engine.cat.item_selector import ContentTracker, select_next_item
+from irt_cat_engine.item_bank.bank import ItemBank
+from irt_cat_engine.models.irt_2pl import ItemParameters, probability
+from irt_cat_engine.reporting.exposure_analysis import analyze_exposure
+from irt_cat_engine.reporting.score_mapper import theta_to_vocab_size
+
+
+def _make_pool(n: int, seed: int = 0) -> list[ItemParameters]:
+    rng = np.random.RandomState(seed)
+    return [
+        ItemParameters(
+            item_id=i, word=f"w{i}",
+            difficulty_b=float(rng.normal(0, 1.2)),
+            discrimination_a=float(rng.uniform(0.4, 2.5)),
+            question_type=int(rng.randint(1, 7)),
+            cefr=["A1", "A2", "B1", "B2", "C1"][i % 5],
+            topic=f"topic_{i % 20}",
+            is_loanword=bool(i % 13 == 0),
+        )
+        for i in range(n)
+    ]
+
+
+def _list_vocab_size(theta: float, items: list[ItemParameters]) -> int:
+    """The original per-item implementation."""
+    return int(round(sum(
+        probability(theta, item.discrimination_a, item.difficulty_b, item.guessing_c)
+        for item in items
+    )))
+
+
+def _time_per_call(fn, *args, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn(*args)
+    return (time.perf_counter() - start) / repeats
+
+
+def run_benchmark(pool_size: int = 9183) -> list[dict]:
+    items = _make_pool(pool_size)
+    bank = ItemBank.from_items(items)
+    counts = {i: i % 50 for i in range(0, pool_size, 2)}
+    tracker = ContentTracker()
+
+    cases = [
+        ("theta_to_vocab_size", (_list_vocab_size, 0.3, items), (theta_to_vocab_size, 0.3, bank)),
+        ("analyze_exposure", (analyze_exposure, items, counts, 500), (analyze_exposure, bank, counts, 500)),
+        ("select_next_item", (select_next_item, 0.3, items, set(), tracker),
+         (select_next_item, 0.3, bank, set(), tracker)),
+    ]
+    rows = []
+    for name, (list_fn, *list_args), (bank_fn, *bank_args) in cases:
+        list_t = _time_per_call(list_fn, *list_args, repeats=5)
+        bank_t = _time_per_call(bank_fn, *bank_args, repeats=50)
+        rows.append({"case": name, "list_ms": list_t * 1000, "bank_ms": bank_t * 1000,
+                     "speedup": list_t / bank_t})
+    return rows
+
+
+if __name__ == "__main__":
+    print(f"{'case':>20} {'list ms':>9} {'bank ms':>9} {'speedup':>8}")
+    for row in run_benchmark():
+        print(f"{row['case']:>20} {row['list_ms']:>9.2f} {row['bank_ms']:>9.3f} {row['speedup']:>7.0f}x")
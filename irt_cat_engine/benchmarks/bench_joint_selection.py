@@ -0,0 +1,70 @@
+"""Benchmark: select_next_item on a single-type pool vs the mixed-mode joint pool.
+
+The joint pool has one row per feasible (word, question type) pair, with
+type coverage close to the real vocabulary (100/100/86/54/100/99%).
+
+Usage:
+    python -m irt_cat_engine.benchmarks.bench_joint_selection
+"""
+import time
+
+import numpy as np
+
+from irt_cat_engine.cat.item_overlay import ItemOverlay
+from irt_cat_engine.cat.item_selector import ContentTracker, ExposureController, select_next_item
+from irt_cat_engine.item_bank.bank import ItemBank
+from irt_cat_engine.item_bank.information_table import get_information_table
+from irt_cat_engine.item_bank.joint_pool import build_joint_pool
+from irt_cat_engine.models.irt_2pl import ItemParameters
+
+TYPE_COVERAGE = (1.0, 1.0, 0.86, 0.54, 1.0, 0.99)
+
+
+def _time_selection(bank: ItemBank, administered_ids: set[int], tracker: ContentTracker,
+                    controller: ExposureController, seed: int, repeats: int) -> float:
+    gen = np.random.default_rng(seed)
+    start = time.perf_counter()
+    for i in range(repeats):
+        select_next_item(float(i % 7 - 3) * 0.5, bank, administered_ids, tracker, controller, rng=gen)
+    return (time.perf_counter() - start) / repeats
+
+
+def run_benchmark(pool_size: int = 9183, administered: int = 20, seed: int = 0, repeats: int = 2000) -> dict:
+    rng = np.random.RandomState(seed)
+    bank = ItemBank.from_items([
+        ItemParameters(
+            item_id=i, word=f"w{i}",
+            difficulty_b=float(rng.normal(0, 1.2)),
+            discrimination_a=float(rng.uniform(0.4, 2.5)),
+            question_type=1,
+            topic=f"topic_{i % 20}",
+            is_loanword=bool(i % 13 == 0),
+        )
+        for i in range(pool_size)
+    ])
+    get_information_table(bank)
+
+    available = np.zeros((pool_size, 7), dtype=bool)
+    available[:, 1:] = rng.rand(pool_size, 6) < np.array(TYPE_COVERAGE)
+    available[:, 1] = True
+    start = time.perf_counter()
+    joint = build_joint_pool(bank, available, ItemOverlay.for_mixed_mode().type_offsets)
+    build = time.perf_counter() - start
+
+    administered_ids = set(rng.choice(pool_size, administered, replace=False).tolist())
+    tracker = ContentTracker()
+    for item_id in administered_ids:
+        tracker.record(bank.get(item_id))
+    controller = ExposureController(pool_size)
+    controller.k[:] = rng.uniform(0.3, 1.0, pool_size)
+
+    single = _time_selection(bank, administered_ids, tracker, controller, seed, repeats)
+    paired = _time_selection(joint, administered_ids, tracker, controller, seed, repeats)
+    return {"pool": pool_size, "pairs": len(joint), "build_s": build,
+            "single_ms": single * 1000, "joint_ms": paired * 1000}
+
+
+if __name__ == "__main__":
+    row = run_benchmark()
+    print(f"words={row['pool']}  pairs={row['pairs']}  build={row['build_s']:.2f} s  "
+          f"single-type={row['single_ms']:.3f} ms  joint={row['joint_ms']:.3f} ms")
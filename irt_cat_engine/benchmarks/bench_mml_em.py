@@ -0,0 +1,64 @@
+"""Benchmark: streamed MML/EM E-step throughput and peak memory.
+
+Simulates sessions against a synthetic bank and runs EM cycles with the
+responses generated chunk by chunk (as the DB job streams them), so peak
+memory should depend on the chunk size and bank, not the session count.
+
+Usage:
+    python -m irt_cat_engine.benchmarks.bench_mml_em
+    python -m irt_cat_engine.benchmarks.bench_mml_em --items 9183 --sessions 200000 --chunk 2000
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from irt_cat_engine.item_bank.mml_calibrator import ResponseChunk, run_mml_em
+
+
+def _reader(n_items: int, n_sessions: int, per_session: int, chunk: int, a: np.ndarray, b: np.ndarray):
+    def read():
+        rng = np.random.default_rng(0)  # Same responses every cycle
+        for start in range(0, n_sessions, chunk):
+            size = min(chunk, n_sessions - start)
+            theta = rng.normal(0, 1, size)
+            rows = rng.integers(0, n_items, (size, per_session)).ravel()
+            sessions = np.repeat(np.arange(size), per_session)
+            p = 1 / (1 + np.exp(-a[rows] * (theta[sessions] - b[rows])))
+            yield ResponseChunk.from_sorted(sessions, rows, rng.random(len(rows)) < p, np.zeros(len(rows), dtype=bool))
+    return read
+
+
+def run_benchmark(n_items: int = 9183, n_sessions: int = 50_000, per_session: int = 25,
+                  chunk: int = 2000, cycles: int = 3) -> dict:
+    rng = np.random.default_rng(1)
+    a, b = rng.uniform(0.6, 2.0, n_items), rng.normal(0, 1.2, n_items)
+    read = _reader(n_items, n_sessions, per_session, chunk, a, b)
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = run_mml_em(read, a * 0.9, b + 0.2, np.zeros(n_items), max_iter=cycles, tol=0.0)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    responses = n_sessions * per_session
+    return {
+        "responses": responses,
+        "cycles": result.iterations,
+        "s_per_cycle": elapsed / result.iterations,
+        "responses_per_s": responses * result.iterations / elapsed,
+        "peak_mb": peak / 2**20,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=9183)
+    parser.add_argument("--sessions", type=int, default=50_000)
+    parser.add_argument("--chunk", type=int, default=2000)
+    parser.add_argument("--cycles", type=int, default=3)
+    args = parser.parse_args()
+    for sessions in (args.sessions // 4, args.sessions):
+        r = run_benchmark(args.items, sessions, chunk=args.chunk, cycles=args.cycles)
+        print(f"{r['responses']:>11,} responses: {r['s_per_cycle']:6.2f} s/cycle, "
+              f"{r['responses_per_s']:>10,.0f} responses/s, peak {r['peak_mb']:.0f} MB")
@@ -0,0 +1,51 @@
+"""Benchmark: sharded simulation throughput vs worker count.
+
+Runs the same seeded study with 1, 2, 4, ... workers up to the core count,
+checks that every run produces the same report, and prints wall time,
+simulees per second and speedup over a single worker.
+
+Usage:
+    python -m irt_cat_engine.benchmarks.bench_parallel_simulation
+    python -m irt_cat_engine.benchmarks.bench_parallel_simulation --simulees 200000 --max-workers 16
+"""
+import argparse
+import os
+
+from irt_cat_engine.cat.parallel_simulation import SimulationSpec, sweep
+from irt_cat_engine.cat.simulation import synthetic_bank
+
+
+def _worker_counts(max_workers: int) -> list[int]:
+    counts, w = [], 1
+    while w < max_workers:
+        counts.append(w)
+        w *= 2
+    return counts + [max_workers]
+
+
+def run_benchmark(simulees: int = 40000, pool_size: int = 9183, max_workers: int | None = None,
+                  shard_size: int = 2048) -> list[dict]:
+    bank = synthetic_bank(pool_size, seed=0)
+    spec = SimulationSpec(max_exposure_rate=0.25)
+    rows, reference = [], None
+    for workers in _worker_counts(max_workers or os.cpu_count() or 1):
+        report = sweep(bank, [spec], simulees, seed=0, workers=workers, shard_size=shard_size)[0]
+        wall = report.pop("wall_seconds")
+        for key in ("cpu_seconds", "workers"):
+            report.pop(key)
+        if reference is None:
+            reference, base = report, wall
+        rows.append({"workers": workers, "wall_s": wall, "simulees_per_s": simulees / wall,
+                     "speedup": base / wall, "identical": report == reference})
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--simulees", type=int, default=40000)
+    parser.add_argument("--max-workers", type=int, default=0, help="default: all cores")
+    args = parser.parse_args()
+    print(f"{'workers':>7} {'wall s':>8} {'sim/s':>9} {'speedup':>8} {'identical':>9}")
+    for row in run_benchmark(args.simulees, max_workers=args.max_workers or None):
+        print(f"{row['workers']:>7} {row['wall_s']:>8.2f} {row['simulees_per_s']:>9.0f} "
+              f"{row['speedup']:>7.2f}x {row['identical']!s:>9}")
@@ -0,0 +1,57 @@
+"""Benchmark: per-response cost of CATSession.record_response over a long test.
+
+Compares the incremental log-likelihood update against re-running EAP over
+all administered items after every answer.
+
+Usage:
+    python -m irt_cat_engine.benchmarks.bench_record_response
+"""
+import time
+
+import numpy as np
+
+from irt_cat_engine.cat.session import CATSession
+from irt_cat_engine.cat.stopping_rules import StoppingRules
+from irt_cat_engine.models.ability_estimator import estimate_theta_eap
+from irt_cat_engine.models.irt_2pl import ItemParameters
+
+
+def run_benchmark(n_items: int = 40, repeats: int = 200, seed: int = 0) -> list[dict]:
+    rng = np.random.RandomState(seed)
+    items = [
+        ItemParameters(
+            item_id=i, word=f"w{i}",
+            difficulty_b=float(rng.normal(0, 1.2)),
+            discrimination_a=float(rng.uniform(0.4, 2.5)),
+        )
+        for i in range(n_items)
+    ]
+    responses = rng.randint(0, 2, n_items).astype(bool)
+
+    incremental = np.zeros(n_items)
+    full = np.zeros(n_items)
+    for _ in range(repeats):
+        session = CATSession(
+            item_pool=items,
+            stopping_rules=StoppingRules(min_items=n_items, max_items=n_items + 1),
+        )
+        for k in range(n_items):
+            start = time.perf_counter()
+            session.record_response(items[k], bool(responses[k]))
+            incremental[k] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            estimate_theta_eap(session.administered_items, session.responses, session.dont_know_flags)
+            full[k] += time.perf_counter() - start
+
+    return [
+        {"item": k + 1, "incremental_us": incremental[k] / repeats * 1e6, "full_us": full[k] / repeats * 1e6}
+        for k in range(n_items)
+    ]
+
+
+if __name__ == "__main__":
+    print(f"{'item':>5} {'record_response us':>19} {'full EAP us':>12}")
+    for row in run_benchmark():
+        if row["item"] in (1, 5, 10, 20, 30, 40):
+            print(f"{row['item']:>5} {row['incremental_us']:>19.1f} {row['full_us']:>12.1f}")
@@ -0,0 +1,84 @@
+"""Benchmark: Response rows per second, per-row commit vs write-behind batches.
+
+Writes N responses into a fresh SQLite file (WAL, synchronous=NORMAL, like
+the app) once with one add+commit per row, as ``/respond`` used to, and
+once through ResponseWriter (which also folds each batch into the
+item_exposure counters).
+
+Usage:
+    python -m irt_cat_engine.benchmarks.bench_response_writer
+    python -m irt_cat_engine.benchmarks.bench_response_writer --rows 50000 --batch-size 500
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from irt_cat_engine.api.response_writer import ResponseWriter
+from irt_cat_engine.data.database import Base
+from irt_cat_engine.data.db_models import Response
+
+
+def _session_factory(path: Path) -> sessionmaker:
+    engine = create_engine(f"sqlite:///{path}")
+
+    @event.listens_for(engine, "connect")
+    def _pragma(dbapi_conn, _):
+        dbapi_conn.execute("PRAGMA journal_mode=WAL")
+        dbapi_conn.execute("PRAGMA synchronous=NORMAL")
+
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+def _rows(n: int) -> list[dict]:
+    return [
+        dict(session_id=f"s{i // 25}", item_id=i % 9183, word="word", question_type=1,
+             is_correct=i % 3 != 0, is_dont_know=False, response_time_ms=3000, sequence=i % 25 + 1,
+             theta_before=0.0, theta_after=0.1, se_before=0.5, se_after=0.45,
+             difficulty_b=0.0, discrimination_a=1.0)
+        for i in range(n)
+    ]
+
+
+def run_benchmark(n_rows: int = 20_000, batch_size: int = 200) -> dict:
+    rows = _rows(n_rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        factory = _session_factory(Path(tmp) / "per_row.db")
+        start = time.perf_counter()
+        with factory() as db:
+            for row in rows:
+                db.add(Response(**row))
+                db.commit()
+        per_row_s = time.perf_counter() - start
+
+        writer = ResponseWriter(_session_factory(Path(tmp) / "batched.db"), batch_size=batch_size)
+        start = time.perf_counter()
+        for row in rows:
+            writer.put(row)
+        writer.flush()
+        batched_s = time.perf_counter() - start
+        writer.close()
+
+    return {
+        "rows": n_rows,
+        "batch_size": batch_size,
+        "per_row_per_s": n_rows / per_row_s,
+        "batched_per_s": n_rows / batched_s,
+        "batches": writer.batches_written,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+    r = run_benchmark(args.rows, args.batch_size)
+    print(f"{r['rows']:,} responses")
+    print(f"  add + commit per row: {r['per_row_per_s']:>10,.0f} rows/s")
+    print(f"  ResponseWriter:       {r['batched_per_s']:>10,.0f} rows/s  ({r['batches']} batches)")
+    print(f"  speedup:              {r['batched_per_s'] / r['per_row_per_s']:>10.1f}x")
@@ -0,0 +1,85 @@
+"""Benchmark: mask-based select_next_item vs the original per-item loop.
+
+Usage:
+    python -m irt_cat_engine.benchmarks.bench_select
+"""
+import random
+import time
+
+import numpy as np
+
+from irt_cat_engine.cat.item_selector import ContentTracker, ExposureController, select_next_item
+from irt_cat_engine.item_bank.bank import ItemBank
+from irt_cat_engine.models.irt_2pl import ItemParameters, fisher_information
+
+
+def _legacy_select(theta, item_pool, administered_ids, content_tracker, k, top_n=5):
+    """The original implementation (dict-based Sympson-Hetter, full sort)."""
+    available = [item for item in item_pool if item.item_id not in administered_ids]
+    preferred_types = content_tracker.preferred_question_types(content_tracker.total)
+    candidates = [
+        item for item in available
+        if content_tracker.is_topic_ok(item.topic)
+        and content_tracker.is_loanword_ok(item.is_loanword)
+        and (preferred_types is None or item.question_type in preferred_types)
+    ]
+    if len(candidates) < top_n:
+        candidates = [item for item in available if content_tracker.is_topic_ok(item.topic)]
+    if len(candidates) < top_n:
+        candidates = available
+    eligible = [item for item in candidates if random.random() < k.get(item.item_id, 1.0)]
+    if eligible:
+        candidates = eligible
+    info_items = [
+        (fisher_information(theta, item.discrimination_a, item.difficulty_b, item.guessing_c), item)
+        for item in candidates
+    ]
+    info_items.sort(key=lambda x: x[0], reverse=True)
+    return random.choice([item for _, item in info_items[:top_n]])
+
+
+def run_benchmark(pool_size: int = 9183, administered: int = 20, seed: int = 0) -> dict:
+    rng = np.random.RandomState(seed)
+    pool = [
+        ItemParameters(
+            item_id=i, word=f"w{i}",
+            difficulty_b=float(rng.normal(0, 1.2)),
+            discrimination_a=float(rng.uniform(0.4, 2.5)),
+            guessing_c=float(rng.choice([0.0, 0.25])),
+            question_type=int(rng.randint(1, 7)),
+            topic=f"topic_{i % 20}",
+            is_loanword=bool(i % 13 == 0),
+        )
+        for i in range(pool_size)
+    ]
+    bank = ItemBank.from_items(pool)
+    administered_ids = set(rng.choice(pool_size, administered, replace=False).tolist())
+    tracker = ContentTracker()
+    for item_id in administered_ids:
+        tracker.record(pool[item_id])
+
+    k_dict = {i: float(rng.uniform(0.3, 1.0)) for i in range(pool_size)}
+    controller = ExposureController(pool_size)
+    controller.k[:] = list(k_dict.values())
+    gen = np.random.default_rng(seed)
+
+    repeats = 20
+    start = time.perf_counter()
+    for _ in range(repeats):
+        _legacy_select(0.3, pool, administered_ids, tracker, k_dict)
+    legacy = (time.perf_counter() - start) / repeats
+
+    repeats = 2000
+    start = time.perf_counter()
+    for _ in range(repeats):
+        select_next_item(0.3, bank, administered_ids, tracker, controller, rng=gen)
+    masked = (time.perf_counter() - start) / repeats
+
+    return {"pool": pool_size, "legacy_ms": legacy * 1000, "masked_ms": masked * 1000,
+            "speedup": legacy / masked}
+
+
+if __name__ == "__main__":
+    row = run_benchmark()
+    print(f"pool={row['pool']}  legacy={row['legacy_ms']:.2f} ms  "
+          f"masked={row['masked_ms']:.3f} ms  speedup={row['speedup']:.0f}x")
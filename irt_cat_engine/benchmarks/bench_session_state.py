@@ -0,0 +1,112 @@
+"""Benchmark: memory and (de)serialization cost of active session state.
+
+Holds N concurrent mid-test sessions as compact SessionState objects and
+reports resident bytes per session, encoded size, and to_bytes/from_bytes
+time. For comparison, the previous list-of-objects layout (ItemParameters
+per administered item, ResponseRecord per response, history lists and a
+ContentTracker) is measured on a sample and scaled to N.
+
+Usage:
+    python -m irt_cat_engine.benchmarks.bench_session_state
+    python -m irt_cat_engine.benchmarks.bench_session_state --sessions 100000 --items 25
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from irt_cat_engine.cat.item_selector import ContentTracker
+from irt_cat_engine.cat.session import ResponseRecord
+from irt_cat_engine.cat.session_state import SessionState
+from irt_cat_engine.models.irt_2pl import ItemParameters
+
+_LEGACY_SAMPLE = 5000
+
+
+def _traced(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, used
+
+
+def _compact_sessions(n_sessions: int, n_items: int, rng: np.random.Generator) -> list[SessionState]:
+    ids = rng.integers(0, 9183, (n_sessions, n_items))
+    correct = rng.random((n_sessions, n_items)) < 0.6
+    thetas = rng.normal(size=(n_sessions, n_items))
+    sessions = []
+    for s in range(n_sessions):
+        state = SessionState(initial_theta=0.0)
+        for k in range(n_items):
+            state.append(int(ids[s, k]), 1, int(correct[s, k]), False, float(thetas[s, k]), 0.5)
+        sessions.append(state)
+    return sessions
+
+
+def _legacy_sessions(n_sessions: int, n_items: int, rng: np.random.Generator) -> list[dict]:
+    sessions = []
+    for _ in range(n_sessions):
+        items = [
+            ItemParameters(item_id=int(i), word=f"w{i}", difficulty_b=float(rng.normal()),
+                           discrimination_a=1.0, pos="noun", cefr="B1", topic="daily_life")
+            for i in rng.integers(0, 9183, n_items)
+        ]
+        tracker = ContentTracker()
+        thetas = [0.0] + rng.normal(size=n_items).tolist()
+        records = []
+        for k, item in enumerate(items):
+            tracker.record(item)
+            records.append(ResponseRecord(item, 1, thetas[k], thetas[k + 1], 0.5, 0.5, k + 1))
+        sessions.append({
+            "administered_items": items,
+            "responses": [1] * n_items,
+            "dont_know_flags": [False] * n_items,
+            "theta_history": thetas,
+            "response_records": records,
+            "content_tracker": tracker,
+        })
+    return sessions
+
+
+def run_benchmark(n_sessions: int = 100_000, n_items: int = 25) -> dict:
+    rng = np.random.default_rng(0)
+    sessions, compact_bytes = _traced(lambda: _compact_sessions(n_sessions, n_items, rng))
+
+    sample = min(n_sessions, _LEGACY_SAMPLE)
+    _, legacy_bytes = _traced(lambda: _legacy_sessions(sample, n_items, rng))
+
+    start = time.perf_counter()
+    encoded = [state.to_bytes() for state in sessions]
+    encode_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for data in encoded:
+        SessionState.from_bytes(data)
+    decode_s = time.perf_counter() - start
+
+    return {
+        "sessions": n_sessions,
+        "items": n_items,
+        "compact_mb": compact_bytes / 1e6,
+        "legacy_mb": legacy_bytes / sample * n_sessions / 1e6,
+        "encoded_bytes": float(np.mean([len(d) for d in encoded])),
+        "encode_us": encode_s / n_sessions * 1e6,
+        "decode_us": decode_s / n_sessions * 1e6,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--items", type=int, default=25)
+    args = parser.parse_args()
+    r = run_benchmark(args.sessions, args.items)
+    print(f"{r['sessions']:,} sessions x {r['items']} responses")
+    print(f"  list-of-objects state: {r['legacy_mb']:>9.1f} MB  (scaled from {_LEGACY_SAMPLE:,} sessions)")
+    print(f"  SessionState:          {r['compact_mb']:>9.1f} MB")
+    print(f"  encoded size:          {r['encoded_bytes']:>9.0f} bytes/session")
+    print(f"  to_bytes:              {r['encode_us']:>9.2f} us/session")
+    print(f"  from_bytes:            {r['decode_us']:>9.2f} us/session")
@@ -0,0 +1,84 @@
+"""Benchmark: resident memory of the vocabulary as objects vs a VocabStore.
+
+Measures, with tracemalloc, the Python heap held by
+
+- the ``list[VocabWord]`` returned by ``load_vocabulary``;
+- a ``VocabStore`` built from that list (columns held in process memory);
+- a ``VocabStore`` opened from a compiled snapshot (columns memory-mapped);
+
+each plus a warmed ``DistractorEngine`` on top, and the time to generate
+one Type 1 item with each.
+
+Usage:
+    python -m irt_cat_engine.benchmarks.bench_vocab_memory
+"""
+import gc
+import random
+import tempfile
+import time
+import tracemalloc
+
+from irt_cat_engine.data.load_vocabulary import load_vocabulary
+from irt_cat_engine.data.snapshot import open_snapshot
+from irt_cat_engine.data.vocab_store import VocabStore
+from irt_cat_engine.item_bank.distractor_engine import DistractorEngine
+
+
+def _traced(build):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        value = build()
+        gc.collect()
+        return value, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def _item_ms(engine: DistractorEngine, vocab, n: int = 200) -> float:
+    rng = random.Random(0)
+    rows = [rng.randrange(len(vocab)) for _ in range(n)]
+    start = time.perf_counter()
+    for row in rows:
+        engine.generate_item(vocab[row], question_type=1)
+    return (time.perf_counter() - start) / n * 1000
+
+
+def _with_engine(vocab_factory):
+    vocab = vocab_factory()
+    engine = DistractorEngine(vocab)
+    engine.generate_item(vocab[0], question_type=1)  # build lazy indices
+    return vocab, engine
+
+
+def run_benchmark() -> list[dict]:
+    words = load_vocabulary()
+    rows = []
+
+    _, objects_bytes = _traced(load_vocabulary)
+    (_, engine), engine_bytes = _traced(lambda: _with_engine(load_vocabulary))
+    rows.append({"layout": "list[VocabWord]", "vocab_mb": objects_bytes / 1e6,
+                 "with_engine_mb": engine_bytes / 1e6, "item_ms": _item_ms(engine, words)})
+
+    store, store_bytes = _traced(lambda: VocabStore.from_words(words))
+    (store, engine), engine_bytes = _traced(lambda: _with_engine(lambda: VocabStore.from_words(words)))
+    rows.append({"layout": "VocabStore (heap)", "vocab_mb": store_bytes / 1e6,
+                 "with_engine_mb": engine_bytes / 1e6, "item_ms": _item_ms(engine, store)})
+
+    with tempfile.TemporaryDirectory() as directory:
+        snap = open_snapshot(directory=directory)
+        _, mapped_bytes = _traced(lambda: type(snap)(snap.path).vocab_store())
+        (store, engine), engine_bytes = _traced(lambda: _with_engine(lambda: type(snap)(snap.path).vocab_store()))
+        rows.append({"layout": "VocabStore (mmap)", "vocab_mb": mapped_bytes / 1e6,
+                     "with_engine_mb": engine_bytes / 1e6, "item_ms": _item_ms(engine, store)})
+        rows[-1]["mapped_mb"] = store.nbytes / 1e6
+    return rows
+
+
+if __name__ == "__main__":
+    print(f"{'layout':<20} {'vocab MB':>9} {'+engine MB':>11} {'item ms':>8}")
+    for row in run_benchmark():
+        print(f"{row['layout']:<20} {row['vocab_mb']:>9.2f} {row['with_engine_mb']:>11.2f} "
+              f"{row['item_ms']:>8.2f}")
+        if "mapped_mb" in row:
+            print(f"{'':<20} ({row['mapped_mb']:.2f} MB of columns mapped from the snapshot, shared between workers)")
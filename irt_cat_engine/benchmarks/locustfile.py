@@ -0,0 +1,66 @@
+"""Locust scenario: test-takers running full adaptive tests.
+
+Each simulated user starts a test, answers items (with think time) until
+the test completes, reads the results, then starts over. Most traffic is
+``/respond``, the endpoint that commits a Response row per request.
+
+Usage (server on localhost:8000):
+    pip install locust
+    locust -f irt_cat_engine/benchmarks/locustfile.py --host http://localhost:8000 \\
+        --headless -u 200 -r 20 -t 3m --csv load_async
+
+See LOAD_TESTING.md for how to compare runs.
+"""
+import random
+
+from locust import HttpUser, between, task
+
+
+class TestTaker(HttpUser):
+    wait_time = between(0.5, 2.0)  # Think time between answers
+
+    def on_start(self):
+        self.session_id = None
+        self.item_id = None
+        self.ability = random.uniform(0.3, 0.9)  # Chance of answering correctly
+        self._start()
+
+    def _start(self):
+        with self.client.post(
+            "/api/v1/test/start",
+            json={"nickname": "load_test", "grade": "중2", "self_assess": "intermediate"},
+            name="/api/v1/test/start",
+            catch_response=True,
+        ) as r:
+            if r.status_code != 200:
+                r.failure(f"start failed: {r.status_code}")
+                return
+            data = r.json()
+            self.session_id = data["session_id"]
+            self.item_id = data["first_item"]["item_id"]
+
+    @task
+    def answer(self):
+        if self.session_id is None:
+            self._start()
+            return
+        with self.client.post(
+            f"/api/v1/test/{self.session_id}/respond",
+            json={
+                "item_id": self.item_id,
+                "is_correct": random.random() < self.ability,
+                "response_time_ms": random.randint(1500, 8000),
+            },
+            name="/api/v1/test/[id]/respond",
+            catch_response=True,
+        ) as r:
+            if r.status_code != 200:
+                r.failure(f"respond failed: {r.status_code}")
+                self.session_id = None
+                return
+            data = r.json()
+        if data["is_complete"]:
+            self.client.get(f"/api/v1/test/{self.session_id}/results", name="/api/v1/test/[id]/results")
+            self.session_id = None
+        else:
+            self.item_id = data["next_item"]["item_id"]
@@ -0,0 +1,100 @@
+"""Per-session parameter overrides over a shared item pool.
+
+A mixed-mode session (question_type 0) selects items from the type-1 pool
+and serves each one as some question type, which shifts its difficulty by
+QUESTION_TYPE_B_MODIFIER. Instead of copying the pool or editing item
+objects, the session keeps a sparse overlay: item_id -> (served question
+type, b offset), in arrays sorted by item_id. Effective parameters for any
+set of pool rows are the pool's columns plus the overlay, gathered in one
+vectorized lookup, so the pool itself is never written and can be shared
+by every session.
+"""
+import numpy as np
+
+from ..config import QUESTION_TYPE_B_MODIFIER
+from ..item_bank.bank import ItemBank
+from ..models.irt_2pl import ItemParameters
+
+_TYPE_TABLE_SIZE = 8
+
+
+class ItemOverlay:
+    """Sparse (question_type, b offset) overrides by item ID.
+
+    ``type_offsets[t]`` is the b offset of serving an item as type ``t``
+    relative to the pool's own type.
+    """
+
+    __slots__ = ("type_offsets", "item_ids", "question_types", "b_offsets")
+
+    def __init__(self, type_offsets: np.ndarray):
+        self.type_offsets = np.asarray(type_offsets, dtype=np.float64)
+        self.item_ids = np.zeros(0, dtype=np.int32)
+        self.question_types = np.zeros(0, dtype=np.uint8)
+        self.b_offsets = np.zeros(0, dtype=np.float64)
+
+    @classmethod
+    def for_mixed_mode(cls, pool_type: int = 1) -> "ItemOverlay":
+        """Offsets of QUESTION_TYPE_B_MODIFIER relative to ``pool_type``."""
+        offsets = np.zeros(_TYPE_TABLE_SIZE)
+        for question_type, modifier in QUESTION_TYPE_B_MODIFIER.items():
+            offsets[question_type] = modifier - QUESTION_TYPE_B_MODIFIER.get(pool_type, 0.0)
+        return cls(offsets)
+
+    def __len__(self) -> int:
+        return len(self.item_ids)
+
+    def set(self, item_ids, question_types) -> None:
+        """Record that each item is served as the matching question type."""
+        item_ids = np.atleast_1d(np.asarray(item_ids, dtype=np.int32))
+        question_types = np.broadcast_to(np.asarray(question_types, dtype=np.uint8), item_ids.shape)
+        if not len(item_ids):
+            return
+        # Last entry wins for repeated IDs, and new entries replace old ones
+        ids = np.concatenate([item_ids[::-1], self.item_ids])
+        types = np.concatenate([question_types[::-1], self.question_types])
+        ids, first = np.unique(ids, return_index=True)
+        self.item_ids = ids
+        self.question_types = types[first]
+        self.b_offsets = self.type_offsets[self.question_types]
+
+    def lookup(self, item_ids) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(found, question_type, b_offset) for each ID; offset 0 where not overridden."""
+        item_ids = np.asarray(item_ids, dtype=np.int64)
+        if not len(self.item_ids):
+            n = len(item_ids)
+            return np.zeros(n, dtype=bool), np.zeros(n, dtype=np.uint8), np.zeros(n)
+        pos = np.minimum(np.searchsorted(self.item_ids, item_ids), len(self.item_ids) - 1)
+        found = self.item_ids[pos] == item_ids
+        return (
+            found,
+            np.where(found, self.question_types[pos], 0).astype(np.uint8),
+            np.where(found, self.b_offsets[pos], 0.0),
+        )
+
+    def parameters(
+        self, bank: ItemBank, rows: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Effective (a, b, c, question_type) of pool ``rows``; the pool is not modified."""
+        rows = np.asarray(rows, dtype=np.intp)
+        found, types, offsets = self.lookup(bank.item_ids[rows])
+        return (
+            bank.a[rows],
+            bank.b[rows] + offsets,
+            bank.c[rows],
+            np.where(found, types, bank.question_type[rows]),
+        )
+
+    def item(self, bank: ItemBank, item_id: int, question_type: int | None = None) -> ItemParameters | None:
+        """The item served as ``question_type`` (default: its overridden type, else the pool's)."""
+        item = bank.get(item_id)
+        if item is None:
+            return None
+        if question_type is None:
+            found, types, _ = self.lookup([item_id])
+            if not found[0]:
+                return item
+            question_type = int(types[0])
+        item.difficulty_b += float(self.type_offsets[question_type])
+        item.question_type = question_type
+        return item
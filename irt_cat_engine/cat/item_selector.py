@@ -4,7 +4,9 @@ import random
 import numpy as np
 
 from ..config import CONTENT_BALANCE, CAT_MAX_EXPOSURE_RATE, LOANWORD_MAX_PER_TEST
-from ..models.irt_2pl import ItemParameters, fisher_information
+from ..item_bank.bank import ItemBank, as_item_bank
+from ..item_bank.information_table import InformationTable, get_information_table
+from ..models.irt_2pl import ItemParameters, fisher_information_matrix
 
 
 class ContentTracker:
@@ -31,6 +33,11 @@ class ContentTracker:
         max_same = CONTENT_BALANCE["max_same_topic"]
         return self.topic_counts.get(topic, 0) < max_same
 
+    def capped_topics(self) -> list[str]:
+        """Topics that have reached the per-test cap."""
+        max_same = CONTENT_BALANCE["max_same_topic"]
+        return [topic for topic, count in self.topic_counts.items() if count >= max_same]
+
     def is_loanword_ok(self, is_loanword: bool) -> bool:
         if not is_loanword:
             return True
@@ -46,115 +53,431 @@ class ContentTracker:
 
 
 class ExposureController:
-    """Sympson-Hetter exposure control."""
+    """Sympson-Hetter exposure control.
+
+    Exposure parameters and counters are arrays indexed by item_id, so the
+    eligibility draw for a whole candidate set is one vectorized comparison.
+    Rates are administrations per started test; abandoned tests count in
+    both, as their items were administered too.
+    """
 
     def __init__(self, item_count: int, target_max_rate: float = CAT_MAX_EXPOSURE_RATE):
-        self.k = {i: 1.0 for i in range(item_count)}  # exposure parameters
-        self.admin_counts = {i: 0 for i in range(item_count)}
-        self.select_counts = {i: 0 for i in range(item_count)}
-        self.total_tests = 0
+        self.k = np.ones(item_count)  # exposure parameters
+        self.admin_counts = np.zeros(item_count, dtype=np.int64)
+        self.select_counts = np.zeros(item_count, dtype=np.int64)
+        self.total_tests = 0  # completed
+        self.started_tests = 0
         self.target = target_max_rate
+        # Counts at the last update of k; the next update uses the rates since
+        self._base_admin = np.zeros(item_count, dtype=np.int64)
+        self._base_started = 0
+
+    def _ensure_capacity(self, item_id: int):
+        """Grow the arrays so that ``item_id`` is a valid index."""
+        n = len(self.k)
+        if item_id < n:
+            return
+        extra = item_id + 1 - n
+        self.k = np.concatenate([self.k, np.ones(extra)])
+        self.admin_counts = np.concatenate([self.admin_counts, np.zeros(extra, dtype=np.int64)])
+        self.select_counts = np.concatenate([self.select_counts, np.zeros(extra, dtype=np.int64)])
+        self._base_admin = np.concatenate([self._base_admin, np.zeros(extra, dtype=np.int64)])
+
+    def k_for(self, item_ids: np.ndarray) -> np.ndarray:
+        """Exposure parameters for an array of item IDs (1.0 for unknown IDs)."""
+        item_ids = np.asarray(item_ids)
+        if item_ids.size == 0 or item_ids.max() < len(self.k):
+            return self.k[item_ids]
+        known = item_ids < len(self.k)
+        return np.where(known, self.k[np.where(known, item_ids, 0)], 1.0)
 
-    def is_eligible(self, item_id: int) -> bool:
+    def is_eligible(self, item_id: int, rng: np.random.Generator | None = None) -> bool:
         """Probabilistic eligibility check."""
-        return random.random() < self.k.get(item_id, 1.0)
+        draw = rng.random() if rng is not None else random.random()
+        return draw < (self.k[item_id] if item_id < len(self.k) else 1.0)
+
+    def eligible_mask(self, item_ids: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Vectorized eligibility draw: one uniform per item, kept where u < k."""
+        return rng.random(len(item_ids)) < self.k_for(item_ids)
 
     def record_selection(self, item_id: int):
-        self.select_counts[item_id] = self.select_counts.get(item_id, 0) + 1
+        self._ensure_capacity(item_id)
+        self.select_counts[item_id] += 1
 
     def record_administration(self, item_id: int):
-        self.admin_counts[item_id] = self.admin_counts.get(item_id, 0) + 1
+        self._ensure_capacity(item_id)
+        self.admin_counts[item_id] += 1
 
-    def end_test(self):
-        self.total_tests += 1
-
-    def recalibrate(self):
-        """Recalibrate exposure parameters based on actual rates."""
-        if self.total_tests < 10:
+    def record_batch(self, item_ids: np.ndarray):
+        """Record selection and administration of many items at once."""
+        item_ids = np.asarray(item_ids)
+        if len(item_ids) == 0:
             return
-        for item_id in self.k:
-            if self.select_counts.get(item_id, 0) > 0:
-                actual_rate = self.admin_counts.get(item_id, 0) / self.total_tests
-                if actual_rate > self.target:
-                    self.k[item_id] *= self.target / actual_rate
-                else:
-                    self.k[item_id] = min(1.0, self.k[item_id] * 1.05)
+        self._ensure_capacity(int(item_ids.max()))
+        np.add.at(self.select_counts, item_ids, 1)
+        np.add.at(self.admin_counts, item_ids, 1)
+
+    def start_test(self, n_tests: int = 1):
+        self.started_tests += n_tests
+
+    def end_test(self, n_tests: int = 1):
+        self.total_tests += n_tests
+
+    def seed(
+        self, item_ids: np.ndarray, admin_counts: np.ndarray, total_tests: int,
+        k: np.ndarray | None = None, started_tests: int | None = None,
+    ):
+        """Load persisted administration counts (and k, if checkpointed).
+
+        Without persisted k the parameters are recalibrated from the counts,
+        as if all of them had been administered with k = 1. Either way the
+        next recalibration measures rates from here on.
+        """
+        item_ids = np.asarray(item_ids, dtype=np.int64)
+        admin_counts = np.asarray(admin_counts, dtype=np.int64)
+        if len(item_ids):
+            self._ensure_capacity(int(item_ids.max()))
+        self.admin_counts[:] = 0
+        self.admin_counts[item_ids] = admin_counts
+        self.select_counts = np.maximum(self.select_counts, self.admin_counts)
+        self.total_tests = total_tests
+        self.started_tests = max(total_tests, started_tests or 0)
+        if k is None:
+            self.k[:] = 1.0
+            self._base_admin[:] = 0
+            self._base_started = 0
+            if not self._update_k():
+                self._mark_base()
+        else:
+            self.k[item_ids] = k
+            self._mark_base()
+
+    def sync(self):
+        """Exchange counts and parameters with other workers (none in-process)."""
+
+    def recalibrate(self) -> bool:
+        """Recalibrate exposure parameters based on actual rates.
+
+        Returns False when there are too few tests to recalibrate from.
+        """
+        return self._update_k()
+
+    def _update_k(self) -> bool:
+        """Vectorized Sympson-Hetter update of k from the counts since the last update.
+
+        The rates are measured over that interval, so they reflect the
+        current k: an item still over target has its k lowered by the
+        ratio, the others creep back up towards 1. Without at least 10 new
+        tests k is left alone and the interval keeps accumulating.
+        """
+        tests = self.started_tests - self._base_started
+        if tests < 10:
+            return False
+        rate = (self.admin_counts - self._base_admin) / tests
+        over = rate > self.target
+        self.k[over] *= self.target / rate[over]
+        self.k[~over] = np.minimum(1.0, self.k[~over] * 1.05)
+        self._mark_base()
+        return True
+
+    def _mark_base(self):
+        self._base_admin = self.admin_counts.copy()
+        self._base_started = self.started_tests
+
+
+_default_rng = np.random.default_rng()
+
+# Question types are small ints; per-session "allowed type" rows are looked up
+# through tables of this width.
+_TYPE_TABLE_SIZE = 128
+
+# Sessions per block in the full-pool pass, to bound (sessions x pool) temporaries.
+_FULL_PASS_BLOCK = 256
+
+
+class SelectionState:
+    """Array form of the selection constraints for N sessions.
+
+    Holds what ContentTracker and the administered-ID set hold for a single
+    session, as rows of (N x pool) / (N x topics) arrays. The batch
+    simulator keeps one of these for all simulees; select_next_item builds a
+    one-row state from a ContentTracker.
+    """
+
+    def __init__(self, bank: ItemBank, n_sessions: int):
+        self.bank = bank
+        self.administered = np.zeros((n_sessions, len(bank)), dtype=bool)
+        self.topic_counts = np.zeros((n_sessions, len(bank.topic_labels)), dtype=np.int16)
+        self.loanword_counts = np.zeros(n_sessions, dtype=np.int16)
+        self.items_completed = np.zeros(n_sessions, dtype=np.int16)
+
+    @classmethod
+    def from_tracker(
+        cls, bank: ItemBank, administered_ids: set[int], content_tracker: ContentTracker,
+    ) -> "SelectionState":
+        state = cls(bank, 1)
+        state.administered[0, bank.rows_for_ids(administered_ids)] = True
+        for topic, count in content_tracker.topic_counts.items():
+            code = bank.topic_index.get(topic)
+            if code is not None:
+                state.topic_counts[0, code] = count
+        state.loanword_counts[0] = content_tracker.loanword_count
+        state.items_completed[0] = content_tracker.total
+        return state
+
+    def record(self, sessions: np.ndarray, rows: np.ndarray):
+        """Record that each of ``sessions`` was administered the matching bank row."""
+        bank = self.bank
+        self.administered[sessions, rows] = True
+        self.topic_counts[sessions, bank.topic_code[rows]] += 1
+        self.loanword_counts[sessions] += bank.is_loanword[rows]
+        self.items_completed[sessions] += 1
+
+    def constraint_tables(self, sessions: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Per-session (topic_blocked, loanword_blocked, type_allowed) lookup tables."""
+        topic_blocked = self.topic_counts[sessions] >= CONTENT_BALANCE["max_same_topic"]
+        loanword_blocked = self.loanword_counts[sessions] >= LOANWORD_MAX_PER_TEST
+        completed = self.items_completed[sessions]
+        type_allowed = np.ones((len(sessions), _TYPE_TABLE_SIZE), dtype=bool)
+        tracker = ContentTracker()
+        for n in np.unique(completed):
+            preferred = tracker.preferred_question_types(int(n))
+            if preferred is not None:
+                allowed = np.zeros(_TYPE_TABLE_SIZE, dtype=bool)
+                allowed[preferred] = True
+                type_allowed[completed == n] = allowed
+        return topic_blocked, loanword_blocked, type_allowed
+
+
+def _constraint_masks(
+    bank: ItemBank,
+    tables: tuple[np.ndarray, np.ndarray, np.ndarray],
+    rows: np.ndarray | slice = slice(None),
+) -> tuple[np.ndarray, np.ndarray]:
+    """(topic_ok, strict_ok) masks of shape (sessions, len(rows)).
+
+    ``rows`` is either a slice of the pool or an (sessions x K) array of
+    per-session rows. ``strict_ok`` adds the loanword cap and preferred
+    question types on top of the topic cap.
+    """
+    topic_blocked, loanword_blocked, type_allowed = tables
+    if isinstance(rows, slice):
+        topic_ok = ~topic_blocked[:, bank.topic_code[rows]]
+        strict = topic_ok & type_allowed[:, bank.question_type[rows]]
+    else:
+        idx = np.arange(len(topic_blocked))[:, None]
+        topic_ok = ~topic_blocked[idx, bank.topic_code[rows]]
+        strict = topic_ok & type_allowed[idx, bank.question_type[rows]]
+    strict &= ~(loanword_blocked[:, None] & bank.is_loanword[rows])
+    return topic_ok, strict
+
+
+def candidate_mask(
+    bank: ItemBank,
+    available: np.ndarray,
+    content_tracker: ContentTracker,
+    top_n: int = 5,
+) -> np.ndarray:
+    """Content-constrained candidate mask with the relaxation fallbacks.
+
+    Applies topic cap, loanword cap and preferred question types. If fewer
+    than ``top_n`` items survive, drops everything but the topic cap; if
+    still too few, falls back to all available items.
+    """
+    state = SelectionState.from_tracker(bank, set(), content_tracker)
+    state.administered[0] = ~available
+    return _relaxed_candidates(bank, state, np.zeros(1, dtype=np.intp), top_n)[0]
+
+
+def _relaxed_candidates(
+    bank: ItemBank, state: SelectionState, sessions: np.ndarray, top_n: int,
+) -> np.ndarray:
+    """(sessions x pool) candidate masks after per-session relaxation."""
+    available = ~state.administered[sessions]
+    topic_ok, strict = _constraint_masks(bank, state.constraint_tables(sessions))
+    topic_ok &= available
+    strict &= available
+    use_strict = np.count_nonzero(strict, axis=1) >= top_n
+    use_topic = ~use_strict & (np.count_nonzero(topic_ok, axis=1) >= top_n)
+    return np.where(
+        use_strict[:, None], strict, np.where(use_topic[:, None], topic_ok, available),
+    )
+
+
+def _pick_top_n(
+    info: np.ndarray, valid: np.ndarray, top_n: int, rng: np.random.Generator,
+) -> np.ndarray:
+    """Column index drawn uniformly from each row's top-N valid entries (-1 if none)."""
+    info = np.where(valid, info, -np.inf)
+    n_valid = np.minimum(np.count_nonzero(valid, axis=1), top_n)
+    k = min(top_n, info.shape[1])
+    if k < info.shape[1]:
+        top = np.argpartition(-info, k - 1, axis=1)[:, :k]
+    else:
+        top = np.broadcast_to(np.arange(k), info.shape).copy()
+    # Valid entries first within the top slice; order among them doesn't matter
+    top = np.take_along_axis(top, np.argsort(~np.take_along_axis(valid, top, axis=1), axis=1,
+                                             kind="stable"), axis=1)
+    choice = (rng.random(len(info)) * np.maximum(n_valid, 1)).astype(np.intp)
+    picked = top[np.arange(len(info)), choice]
+    return np.where(n_valid > 0, picked, -1)
+
+
+def _select_from_shortlist(
+    theta: np.ndarray,
+    bank: ItemBank,
+    table: InformationTable,
+    state: SelectionState,
+    sessions: np.ndarray,
+    exposure_controller: ExposureController | None,
+    top_n: int,
+    rng: np.random.Generator,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray | None]:
+    """Pick rows from the table's ranked shortlists (-1 where the shortlist is too thin).
+
+    A session falls back to the full pool when fewer than ``top_n``
+    shortlisted items pass the strict constraints and the exposure draw.
+    Whenever the shortlist alone has ``top_n`` strict candidates the full
+    pool does too, so no relaxation fallback is skipped.
+
+    Returns ``(picked, rows, draws)``: the shortlisted rows and their
+    exposure draws (None without exposure control), which the full-pool
+    pass reuses so each item gets a single draw per selection.
+    """
+    bins = np.clip(np.rint((theta - table.theta_min) / table.step), 0, len(table.grid) - 1)
+    rows = table.top_rows[bins.astype(np.intp)]
+    keep = _constraint_masks(bank, state.constraint_tables(sessions), rows)[1]
+    keep &= ~state.administered[sessions[:, None], rows]
+    draws = None
+    if exposure_controller is not None:
+        draws = rng.random(rows.shape)
+        keep &= draws < exposure_controller.k_for(bank.item_ids[rows])
+    enough = np.count_nonzero(keep, axis=1) >= top_n
+
+    picked = np.full(len(sessions), -1, dtype=np.intp)
+    if enough.any():
+        short, keep = rows[enough], keep[enough]
+        info = fisher_information_matrix(theta[enough, None], bank.a[short], bank.b[short], bank.c[short])
+        cols = _pick_top_n(info, keep, top_n, rng)
+        picked[enough] = short[np.arange(len(short)), cols]
+    return picked, rows, draws
+
+
+def _select_from_pool(
+    theta: np.ndarray,
+    bank: ItemBank,
+    state: SelectionState,
+    sessions: np.ndarray,
+    exposure_controller: ExposureController | None,
+    top_n: int,
+    rng: np.random.Generator,
+    drawn: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None,
+) -> np.ndarray:
+    """Full-pool pass: relaxed constraints, exposure draw, top-N over all items.
+
+    ``drawn`` is ``(block positions, rows, draws)`` of exposure draws already
+    made by the shortlist pass; those rows keep their draw.
+    """
+    candidates = _relaxed_candidates(bank, state, sessions, top_n)
+    if exposure_controller is not None:
+        draws = rng.random(candidates.shape)
+        if drawn is not None:
+            positions, rows, earlier = drawn
+            draws[positions[:, None], rows] = earlier
+        eligible = candidates & (draws < exposure_controller.k_for(bank.item_ids))
+        candidates = np.where(eligible.any(axis=1)[:, None], eligible, candidates)
+    info = fisher_information_matrix(theta[:, None], bank.a, bank.b, bank.c)
+    return _pick_top_n(info, candidates, top_n, rng)
+
+
+def select_rows(
+    theta: np.ndarray,
+    bank: ItemBank,
+    state: SelectionState,
+    sessions: np.ndarray | None = None,
+    exposure_controller: ExposureController | None = None,
+    top_n: int = 5,
+    rng: np.random.Generator | None = None,
+) -> np.ndarray:
+    """Select the next bank row for each of ``sessions`` in ``state``.
+
+    This is the selection engine shared by live sessions (N=1) and the
+    batch simulator. Selections are recorded in the exposure controller
+    but not in ``state``; callers record rows once the item is administered.
+
+    Args:
+        theta: Current ability estimate per session, shape (N,)
+        bank: Item pool
+        state: Constraint state; row ``sessions[i]`` belongs to ``theta[i]``
+        sessions: Rows of ``state`` to select for (default: all)
+        exposure_controller: Optional Sympson-Hetter control
+        top_n: Select randomly from top-N highest information items
+        rng: Random generator for the exposure draw and top-N pick
+
+    Returns:
+        Selected bank row per session, -1 where no item is available
+    """
+    rng = rng if rng is not None else _default_rng
+    theta = np.asarray(theta, dtype=np.float64)
+    sessions = np.arange(len(theta)) if sessions is None else np.asarray(sessions, dtype=np.intp)
+    picked = np.full(len(sessions), -1, dtype=np.intp)
+
+    # Fast path: ranked shortlist from the precomputed information table
+    pending = np.arange(len(sessions))
+    table = get_information_table(bank, build=False)
+    # Session -> position in the shortlist pass, whose exposure draws are reused
+    short_pos = np.full(len(sessions), -1, dtype=np.intp)
+    short_rows = short_draws = None
+    if table is not None:
+        pending = pending[(theta >= table.theta_min) & (theta <= table.theta_max)]
+        if len(pending):
+            picked[pending], short_rows, short_draws = _select_from_shortlist(
+                theta[pending], bank, table, state, sessions[pending], exposure_controller, top_n, rng,
+            )
+            short_pos[pending] = np.arange(len(pending))
+        pending = np.flatnonzero(picked < 0)
+
+    # Full-pool pass for the rest, in blocks
+    for start in range(0, len(pending), _FULL_PASS_BLOCK):
+        block = pending[start:start + _FULL_PASS_BLOCK]
+        drawn = None
+        if short_draws is not None:
+            positions = np.flatnonzero(short_pos[block] >= 0)
+            src = short_pos[block[positions]]
+            drawn = positions, short_rows[src], short_draws[src]
+        picked[block] = _select_from_pool(
+            theta[block], bank, state, sessions[block], exposure_controller, top_n, rng, drawn,
+        )
+
+    if exposure_controller is not None:
+        exposure_controller.record_batch(bank.item_ids[picked[picked >= 0]])
+    return picked
 
 
 def select_next_item(
     theta: float,
-    item_pool: list[ItemParameters],
+    item_pool: ItemBank | list[ItemParameters],
     administered_ids: set[int],
     content_tracker: ContentTracker,
     exposure_controller: ExposureController | None = None,
     top_n: int = 5,
+    rng: np.random.Generator | None = None,
 ) -> ItemParameters | None:
     """Select the next item using maximum Fisher information with constraints.
 
     Args:
         theta: Current ability estimate
-        item_pool: Full item pool
+        item_pool: Full item pool (ItemBank or list of ItemParameters)
         administered_ids: Set of already-administered item IDs
         content_tracker: Tracks content balance
         exposure_controller: Optional exposure control
         top_n: Select randomly from top-N highest information items
+        rng: Random generator for the exposure draw and top-N pick
 
     Returns:
         Selected item or None if no eligible items
     """
-    # 1. Filter out administered items
-    available = [item for item in item_pool if item.item_id not in administered_ids]
-    if not available:
-        return None
-
-    # 2. Apply content constraints
-    preferred_types = content_tracker.preferred_question_types(content_tracker.total)
-    candidates = []
-    for item in available:
-        # Topic constraint
-        if not content_tracker.is_topic_ok(item.topic):
-            continue
-        # Loanword constraint
-        if not content_tracker.is_loanword_ok(item.is_loanword):
-            continue
-        # Question type preference
-        if preferred_types is not None and item.question_type not in preferred_types:
-            continue
-        candidates.append(item)
-
-    # Fallback: if too few candidates after filtering, relax constraints
-    if len(candidates) < top_n:
-        candidates = [
-            item for item in available
-            if content_tracker.is_topic_ok(item.topic)
-        ]
-    if len(candidates) < top_n:
-        candidates = available
-
-    # 3. Apply exposure control
-    if exposure_controller is not None:
-        eligible = [item for item in candidates if exposure_controller.is_eligible(item.item_id)]
-        if eligible:
-            candidates = eligible
-
-    # 4. Calculate Fisher Information
-    info_items = []
-    for item in candidates:
-        info = fisher_information(theta, item.discrimination_a, item.difficulty_b, item.guessing_c)
-        info_items.append((info, item))
-
-    # 5. Select from top-N
-    info_items.sort(key=lambda x: x[0], reverse=True)
-    top_items = [item for _, item in info_items[:top_n]]
-
-    if not top_items:
-        return None
-
-    selected = random.choice(top_items)
-
-    # Record
-    if exposure_controller is not None:
-        exposure_controller.record_selection(selected.item_id)
-        exposure_controller.record_administration(selected.item_id)
-
-    return selected
+    bank = as_item_bank(item_pool)
+    state = SelectionState.from_tracker(bank, administered_ids, content_tracker)
+    row = select_rows(np.array([theta]), bank, state, None, exposure_controller, top_n, rng)[0]
+    return bank[int(row)] if row >= 0 else None
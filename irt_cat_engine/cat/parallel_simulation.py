@@ -0,0 +1,296 @@
+"""Sharded multi-process CAT simulation.
+
+Large Monte Carlo studies (e.g. sweeping the SE threshold, exposure target
+or EAP quadrature size over a million simulees) are split into fixed-size
+shards and run on a process pool:
+
+- The bank's NumPy columns and its information table are copied once into
+  ``multiprocessing.shared_memory`` blocks; workers attach read-only views
+  in the pool initializer, so no task pickles item parameters.
+- Shard ``i`` always draws from ``SeedSequence(seed).spawn(n_shards)[i]``,
+  and shard statistics are merged in shard order, so reports are
+  bit-identical for any worker count.
+
+Usage:
+    python -m irt_cat_engine.cat.parallel_simulation --simulees 1000000 --workers 8
+    python -m irt_cat_engine.cat.parallel_simulation --simulees 200000 \\
+        --se-threshold 0.25 0.30 0.35 --exposure-rate 0.2 --quadrature-points 21 41
+"""
+import argparse
+import itertools
+import json
+import multiprocessing as mp
+import os
+import time
+from dataclasses import asdict, dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from ..config import (
+    CAT_MAX_EXPOSURE_RATE,
+    CAT_MAX_ITEMS,
+    CAT_MIN_ITEMS,
+    CAT_SE_THRESHOLD,
+    EAP_QUADRATURE_POINTS,
+)
+from ..item_bank.bank import ItemBank
+from ..item_bank.information_table import (
+    InformationTable,
+    attach_information_table,
+    get_information_table,
+)
+from ..models.ability_estimator import EAPEstimator
+from .item_selector import ExposureController
+from .simulation import SimulationStats, _load_pool, simulate, synthetic_bank
+from .stopping_rules import StoppingRules
+
+DEFAULT_SHARD_SIZE = 4096
+
+# Simulees between Sympson-Hetter recalibrations inside a shard
+_RECALIBRATE_EVERY = 512
+
+_BANK_COLUMNS = (
+    "item_ids", "a", "b", "c", "question_type",
+    "pos_code", "topic_code", "cefr_code", "is_loanword",
+)
+
+
+@dataclass(frozen=True)
+class SimulationSpec:
+    """One point of a simulation design grid.
+
+    ``max_exposure_rate=None`` runs without exposure control.
+    """
+    se_threshold: float = CAT_SE_THRESHOLD
+    max_exposure_rate: float | None = None
+    quadrature_points: int = EAP_QUADRATURE_POINTS
+    min_items: int = CAT_MIN_ITEMS
+    max_items: int = CAT_MAX_ITEMS
+    top_n: int = 5
+    theta_min: float = -2.5
+    theta_max: float = 2.5
+
+
+class SharedBank:
+    """An ItemBank (and its information table) copied into shared memory.
+
+    The owning process creates the blocks and must call ``close()`` when
+    done; ``attach()`` rebuilds a read-only ItemBank from a handle in any
+    other process without copying the arrays.
+    """
+
+    def __init__(self, bank: ItemBank, with_table: bool = True):
+        arrays = {name: getattr(bank, name) for name in _BANK_COLUMNS}
+        table = get_information_table(bank) if with_table else None
+        if table is not None:
+            arrays["info_table"] = table.table
+            arrays["info_top_rows"] = table.top_rows
+
+        self._blocks: list[shared_memory.SharedMemory] = []
+        layout = {}
+        for name, arr in arrays.items():
+            block = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+            np.ndarray(arr.shape, dtype=arr.dtype, buffer=block.buf)[...] = arr
+            self._blocks.append(block)
+            layout[name] = (block.name, arr.shape, arr.dtype.str)
+
+        self.handle = {
+            "layout": layout,
+            "words": bank.words,
+            "labels": (bank.pos_labels, bank.topic_labels, bank.cefr_labels),
+            "table_args": (table.step, (table.theta_min, table.theta_max), table.top_k) if table else None,
+        }
+
+    @property
+    def nbytes(self) -> int:
+        return sum(block.size for block in self._blocks)
+
+    def close(self) -> None:
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self) -> "SharedBank":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @staticmethod
+    def attach(handle: dict) -> tuple[ItemBank, list[shared_memory.SharedMemory]]:
+        """Rebuild the bank from a handle; returns it and the attached blocks."""
+        blocks, views = [], {}
+        for name, (shm_name, shape, dtype) in handle["layout"].items():
+            # Pool workers share the parent's resource tracker, so attaching
+            # does not hand ownership over; the creator still unlinks.
+            block = shared_memory.SharedMemory(name=shm_name)
+            view = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+            view.flags.writeable = False
+            blocks.append(block)
+            views[name] = view
+
+        pos_labels, topic_labels, cefr_labels = handle["labels"]
+        bank = ItemBank(
+            words=handle["words"],
+            pos_labels=pos_labels,
+            topic_labels=topic_labels,
+            cefr_labels=cefr_labels,
+            **{name: views[name] for name in _BANK_COLUMNS},
+        )
+        if handle["table_args"] is not None:
+            step, theta_range, top_k = handle["table_args"]
+            attach_information_table(bank, InformationTable(
+                bank, step, theta_range, top_k,
+                arrays=(views["info_table"], views["info_top_rows"]),
+            ))
+        return bank, blocks
+
+
+def run_shard(bank: ItemBank, spec: SimulationSpec, seed_seq: np.random.SeedSequence,
+              n_simulees: int) -> SimulationStats:
+    """Simulate one shard; all randomness comes from ``seed_seq``."""
+    rng = np.random.default_rng(seed_seq)
+    theta_true = rng.uniform(spec.theta_min, spec.theta_max, n_simulees)
+    rules = StoppingRules(min_items=spec.min_items, max_items=spec.max_items,
+                          se_threshold=spec.se_threshold)
+    estimator = EAPEstimator(n_points=spec.quadrature_points)
+    controller = None
+    if spec.max_exposure_rate is not None:
+        controller = ExposureController(int(bank.item_ids.max()) + 1, spec.max_exposure_rate)
+
+    stats = SimulationStats(len(bank))
+    for lo in range(0, n_simulees, _RECALIBRATE_EVERY):
+        result = simulate(
+            bank, theta_true[lo:lo + _RECALIBRATE_EVERY], stopping_rules=rules,
+            exposure_controller=controller, estimator=estimator, top_n=spec.top_n, rng=rng,
+        )
+        stats.merge(result.stats())
+        if controller is not None:
+            controller.recalibrate()
+    return stats
+
+
+# ── Worker process state ──────────────────────────────────────
+
+_worker_bank: ItemBank | None = None
+_worker_blocks: list[shared_memory.SharedMemory] = []
+
+
+def _init_worker(handle: dict) -> None:
+    global _worker_bank, _worker_blocks
+    _worker_bank, _worker_blocks = SharedBank.attach(handle)
+
+
+def _run_task(task: tuple[SimulationSpec, np.random.SeedSequence, int]) -> SimulationStats:
+    spec, seed_seq, n_simulees = task
+    return run_shard(_worker_bank, spec, seed_seq, n_simulees)
+
+
+def _shard_tasks(spec: SimulationSpec, n_simulees: int, seed: int, shard_size: int):
+    n_shards = -(-n_simulees // shard_size)
+    for i, seed_seq in enumerate(np.random.SeedSequence(seed).spawn(n_shards)):
+        yield spec, seed_seq, min(shard_size, n_simulees - i * shard_size)
+
+
+def sweep(
+    bank: ItemBank,
+    specs: list[SimulationSpec],
+    n_simulees: int,
+    seed: int = 0,
+    workers: int | None = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    use_info_table: bool = True,
+) -> list[dict]:
+    """Run every spec on ``n_simulees`` simulees and return one report per spec.
+
+    Every spec reuses the same shard seeds, so specs are compared on the same
+    simulees (common random numbers). ``workers=1`` runs in-process.
+    """
+    workers = workers or os.cpu_count() or 1
+    tasks = [task for spec in specs for task in _shard_tasks(spec, n_simulees, seed, shard_size)]
+    shards_per_spec = -(-n_simulees // shard_size)
+
+    start = time.perf_counter()
+    if workers == 1:
+        if use_info_table:
+            get_information_table(bank)
+        results = (run_shard(bank, *task) for task in tasks)
+        merged = _merge_in_order(bank, specs, results, shards_per_spec)
+    else:
+        with SharedBank(bank, with_table=use_info_table) as shared:
+            ctx = mp.get_context("fork" if "fork" in mp.get_all_start_methods() else "spawn")
+            with ctx.Pool(workers, initializer=_init_worker, initargs=(shared.handle,)) as pool:
+                merged = _merge_in_order(bank, specs, pool.imap(_run_task, tasks), shards_per_spec)
+    wall = time.perf_counter() - start
+
+    reports = []
+    for spec, stats in zip(specs, merged):
+        report = stats.summary(spec.max_exposure_rate or CAT_MAX_EXPOSURE_RATE)
+        report["spec"] = asdict(spec)
+        report["cpu_seconds"] = report.pop("elapsed_seconds")
+        report["wall_seconds"] = round(wall, 2)
+        report["workers"] = workers
+        reports.append(report)
+    return reports
+
+
+def _merge_in_order(bank, specs, results, shards_per_spec) -> list[SimulationStats]:
+    """Fold shard results (arriving in task order) into one accumulator per spec."""
+    merged = [SimulationStats(len(bank)) for _ in specs]
+    for i, stats in enumerate(results):
+        merged[i // shards_per_spec].merge(stats)
+    return merged
+
+
+def run_sharded(
+    bank: ItemBank,
+    spec: SimulationSpec,
+    n_simulees: int,
+    seed: int = 0,
+    workers: int | None = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+) -> dict:
+    """Report for a single spec (see ``sweep``)."""
+    return sweep(bank, [spec], n_simulees, seed, workers, shard_size)[0]
+
+
+def main(argv: list[str] | None = None) -> list[dict]:
+    parser = argparse.ArgumentParser(description="Sharded multi-process CAT simulation sweep.")
+    parser.add_argument("--simulees", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=0, help="default: all cores")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE)
+    parser.add_argument("--synthetic-pool", type=int, default=0,
+                        help="use a random pool of this size instead of the vocabulary DB")
+    parser.add_argument("--question-type", type=int, default=1)
+    parser.add_argument("--se-threshold", type=float, nargs="+", default=[CAT_SE_THRESHOLD])
+    parser.add_argument("--exposure-rate", type=float, nargs="+", default=[None],
+                        help="Sympson-Hetter targets (omit to disable exposure control)")
+    parser.add_argument("--quadrature-points", type=int, nargs="+", default=[EAP_QUADRATURE_POINTS])
+    parser.add_argument("--json", action="store_true", help="print the reports as JSON")
+    args = parser.parse_args(argv)
+
+    bank = synthetic_bank(args.synthetic_pool, args.seed) if args.synthetic_pool else _load_pool(args.question_type)
+    specs = [
+        SimulationSpec(se_threshold=se, max_exposure_rate=rate, quadrature_points=q)
+        for se, rate, q in itertools.product(args.se_threshold, args.exposure_rate, args.quadrature_points)
+    ]
+    reports = sweep(bank, specs, args.simulees, args.seed, args.workers or None, args.shard_size)
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        print(f"{len(specs)} spec(s) x {args.simulees} simulees on {reports[0]['workers']} worker(s) "
+              f"in {reports[0]['wall_seconds']}s (pool={len(bank)})")
+        for r in reports:
+            s = r["spec"]
+            print(f"  se={s['se_threshold']:<5} exposure={s['max_exposure_rate']!s:<5} "
+                  f"quad={s['quadrature_points']:<3} rmse={r['rmse']:<7} bias={r['bias']:<8} "
+                  f"len={r['test_length']['mean']:<6} max_rate={r['exposure']['max_rate']}")
+    return reports
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,14 @@
 """CAT session orchestrator — ties together all components."""
 from dataclasses import dataclass, field
 
+import numpy as np
+
+from ..item_bank.bank import ItemBank, as_item_bank
 from ..models.irt_2pl import ItemParameters
-from ..models.ability_estimator import estimate_theta_eap, estimate_initial_theta
+from ..models.ability_estimator import EAPEstimator, get_eap_estimator, estimate_initial_theta
+from .item_overlay import ItemOverlay
 from .item_selector import select_next_item, ContentTracker, ExposureController
+from .session_state import INITIAL_SE, SessionState
 from .stopping_rules import StoppingRules
 from ..reporting.score_mapper import generate_diagnostic_report
 
@@ -22,37 +27,49 @@ class ResponseRecord:
 
 @dataclass
 class CATSession:
-    """A complete CAT test session."""
-    item_pool: list[ItemParameters]
+    """A complete CAT test session.
+
+    ``item_pool`` may be passed as a list of ItemParameters; it is converted
+    to an ItemBank once at construction.
+
+    Per-response data lives in a compact ``SessionState`` (item IDs,
+    responses, estimates); ``administered_items``, ``responses``,
+    ``theta_history`` and ``response_records`` are derived from it.
+    Mixed-mode sessions carry an ``overlay`` of the question type each item
+    was served as; the pool's parameters are used as-is otherwise. They
+    select from a ``selection_pool`` of (item, question type) pairs, so
+    each selected item comes with its type and is served as that type.
+    """
+    item_pool: ItemBank
     initial_theta: float = 0.0
     stopping_rules: StoppingRules = field(default_factory=StoppingRules)
     exposure_controller: ExposureController | None = None
+    estimator: EAPEstimator = field(default_factory=get_eap_estimator, repr=False)
+    rng: np.random.Generator = field(default_factory=np.random.default_rng, repr=False)
+    overlay: ItemOverlay | None = field(default=None, repr=False)
+    selection_pool: ItemBank | None = field(default=None, repr=False)
 
-    # Session state
-    current_theta: float = 0.0
-    current_se: float = 1.5
-    administered_items: list[ItemParameters] = field(default_factory=list)
-    responses: list[int] = field(default_factory=list)
-    dont_know_flags: list[bool] = field(default_factory=list)
-    theta_history: list[float] = field(default_factory=list)
-    response_records: list[ResponseRecord] = field(default_factory=list)
     content_tracker: ContentTracker = field(default_factory=ContentTracker)
-    is_complete: bool = False
-    termination_reason: str = ""
+    state: SessionState = field(init=False, repr=False)
+    # Running log-likelihood on the EAP quadrature grid (one entry per point)
+    quad_log_likelihood: np.ndarray = field(init=False, repr=False)
 
     def __post_init__(self):
-        self.current_theta = self.initial_theta
-        self.theta_history = [self.initial_theta]
+        self.item_pool = as_item_bank(self.item_pool)
+        self.state = SessionState(self.initial_theta, capacity=self.stopping_rules.max_items)
+        self.quad_log_likelihood = np.zeros(self.estimator.n_points)
 
     @classmethod
     def create(
         cls,
-        item_pool: list[ItemParameters],
+        item_pool: ItemBank | list[ItemParameters],
         grade: str = "중2",
         self_assess: str = "intermediate",
         exam_experience: str = "none",
         knows_calibrator: bool | None = None,
         exposure_controller: ExposureController | None = None,
+        overlay: ItemOverlay | None = None,
+        selection_pool: ItemBank | None = None,
     ) -> "CATSession":
         """Create a new CAT session from user profile."""
         initial_theta = estimate_initial_theta(
@@ -61,25 +78,148 @@ class CATSession:
             exam_experience=exam_experience,
             knows_calibrator=knows_calibrator,
         )
+        if exposure_controller is not None:
+            exposure_controller.start_test()
         return cls(
             item_pool=item_pool,
             initial_theta=initial_theta,
             exposure_controller=exposure_controller,
+            overlay=overlay,
+            selection_pool=selection_pool,
         )
 
+    @classmethod
+    def from_state(
+        cls,
+        state: SessionState,
+        item_pool: ItemBank | list[ItemParameters],
+        overlay: ItemOverlay | None = None,
+        exposure_controller: ExposureController | None = None,
+        selection_pool: ItemBank | None = None,
+    ) -> "CATSession":
+        """Rebuild a session from its stored state against a shared item pool.
+
+        The overlay is refilled from the served question types, and the
+        running log-likelihood is recomputed for all administered items in
+        one vectorized pass; the content-tracker counts are replayed.
+        """
+        session = cls(
+            item_pool=item_pool,
+            initial_theta=state.initial_theta,
+            exposure_controller=exposure_controller,
+            overlay=overlay,
+            selection_pool=selection_pool,
+        )
+        session.state = state
+        bank = session.item_pool
+        rows = bank.lookup_rows(state.item_ids)
+        if np.any(rows < 0):
+            raise KeyError(f"Item {int(state.item_ids[np.argmin(rows)])} not in pool")
+        if overlay is not None:
+            overlay.set(state.item_ids, state.question_types)
+            a, b, c, _ = overlay.parameters(bank, rows)
+        else:
+            a, b, c = bank.a[rows], bank.b[rows], bank.c[rows]
+        if len(rows):
+            session.quad_log_likelihood = session.estimator.log_likelihood(
+                a, b, np.where(state.dont_know, 0.0, c), state.responses,
+            )
+        for item in session.administered_items:
+            session.content_tracker.record(item)
+        return session
+
+    def resolve(self, item_id: int, question_type: int) -> ItemParameters:
+        """The item ``item_id`` as served with ``question_type``."""
+        if self.overlay is not None:
+            item = self.overlay.item(self.item_pool, item_id, question_type)
+        else:
+            item = self.item_pool.get(item_id)
+        if item is None:
+            raise KeyError(f"Item {item_id} not in pool")
+        return item
+
+    def serve_as(self, item: ItemParameters, question_type: int) -> ItemParameters:
+        """Record that ``item`` is served as ``question_type``; returns the served item.
+
+        Only the session's overlay changes: neither ``item`` nor the pool
+        is modified.
+        """
+        if self.overlay is None:
+            raise ValueError("Only sessions with an item overlay (mixed mode) can change question types")
+        self.overlay.set(item.item_id, question_type)
+        return self.resolve(item.item_id, question_type)
+
+    # ── Views over the session state ────────────────────────────
+
+    @property
+    def current_theta(self) -> float:
+        return self.state.theta
+
+    @property
+    def current_se(self) -> float:
+        return self.state.se
+
+    @property
+    def is_complete(self) -> bool:
+        return self.state.is_complete
+
+    @property
+    def termination_reason(self) -> str:
+        return self.state.termination_reason
+
+    @property
+    def administered_items(self) -> list[ItemParameters]:
+        state = self.state
+        return [
+            self.resolve(item_id, question_type)
+            for item_id, question_type in zip(state.item_ids.tolist(), state.question_types.tolist())
+        ]
+
+    @property
+    def responses(self) -> list[int]:
+        return self.state.responses.tolist()
+
+    @property
+    def dont_know_flags(self) -> list[bool]:
+        return self.state.dont_know.tolist()
+
+    @property
+    def theta_history(self) -> list[float]:
+        return [self.state.initial_theta, *self.state.thetas.tolist()]
+
+    @property
+    def response_records(self) -> list[ResponseRecord]:
+        thetas = self.theta_history
+        ses = [INITIAL_SE, *self.state.ses.tolist()]
+        return [
+            ResponseRecord(
+                item=item,
+                response=response,
+                theta_before=thetas[i],
+                theta_after=thetas[i + 1],
+                se_before=ses[i],
+                se_after=ses[i + 1],
+                sequence=i + 1,
+            )
+            for i, (item, response) in enumerate(zip(self.administered_items, self.responses))
+        ]
+
     def get_next_item(self) -> ItemParameters | None:
         """Get the next item to administer."""
         if self.is_complete:
             return None
 
-        administered_ids = {item.item_id for item in self.administered_items}
-        return select_next_item(
+        item = select_next_item(
             theta=self.current_theta,
-            item_pool=self.item_pool,
-            administered_ids=administered_ids,
+            item_pool=self.selection_pool if self.selection_pool is not None else self.item_pool,
+            administered_ids=set(self.state.item_ids.tolist()),
             content_tracker=self.content_tracker,
             exposure_controller=self.exposure_controller,
+            rng=self.rng,
         )
+        if item is not None and self.selection_pool is not None:
+            item = self.serve_as(item, item.question_type)
+        return item
 
     def record_response(self, item: ItemParameters, is_correct: bool, is_dont_know: bool = False):
         """Record a response and update ability estimate.
@@ -92,43 +232,30 @@ class CATSession:
                 providing a cleaner signal than a random guess.
         """
         response = 1 if is_correct else 0
-        theta_before = self.current_theta
-        se_before = self.current_se
-
-        # Update administered items and responses
-        self.administered_items.append(item)
-        self.responses.append(response)
-        self.dont_know_flags.append(is_dont_know)
+        if self.overlay is not None:
+            # Estimate from the parameters as served, not the caller's copy
+            found, served_types, _ = self.overlay.lookup([item.item_id])
+            item = self.resolve(item.item_id, int(served_types[0]) if found[0] else item.question_type)
         self.content_tracker.record(item)
 
-        # Re-estimate theta
-        self.current_theta, self.current_se = estimate_theta_eap(
-            items=self.administered_items,
-            responses=self.responses,
-            dont_know_flags=self.dont_know_flags,
+        # Fold the new response into the running log-likelihood (O(quad) work)
+        # and read theta/SE off the posterior. "Don't know" overrides c to 0.
+        c = 0.0 if is_dont_know else item.guessing_c
+        self.quad_log_likelihood += self.estimator.response_log_likelihood(
+            item.discrimination_a, item.difficulty_b, c, response,
         )
-        self.theta_history.append(self.current_theta)
-
-        # Record
-        self.response_records.append(ResponseRecord(
-            item=item,
-            response=response,
-            theta_before=theta_before,
-            theta_after=self.current_theta,
-            se_before=se_before,
-            se_after=self.current_se,
-            sequence=len(self.responses),
-        ))
+        theta, se = self.estimator.summarize(self.quad_log_likelihood)
+        self.state.append(item.item_id, item.question_type, response, is_dont_know, theta, se)
 
         # Check stopping criteria
         should_stop, reason = self.stopping_rules.should_stop(
-            items_completed=len(self.responses),
-            current_se=self.current_se,
+            items_completed=len(self.state),
+            current_se=se,
             theta_history=self.theta_history,
         )
         if should_stop:
-            self.is_complete = True
-            self.termination_reason = reason
+            self.state.is_complete = True
+            self.state.termination_reason = reason
             if self.exposure_controller:
                 self.exposure_controller.end_test()
 
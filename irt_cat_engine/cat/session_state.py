@@ -0,0 +1,128 @@
+"""Compact per-response state of a CAT session.
+
+One packed row per administered item in a structured array preallocated to
+``CAT_MAX_ITEMS`` rows:
+
+- ``item_id``: int32, resolved against the shared item bank
+- ``question_type``: uint8, the type the item was served as
+- ``flags``: uint8, bit 0 = correct, bit 1 = "don't know"
+- ``theta``: float64, the estimate after the response (drives the
+  convergence stopping rule, so it is kept exact)
+- ``se``: float32, the SE after the response (reporting only; the current
+  SE is kept exact in ``se``)
+
+``to_bytes`` writes a fixed header plus the used rows: about 30 + 18n
+bytes, a few hundred bytes for a typical test.
+"""
+import struct
+
+import numpy as np
+
+from ..config import CAT_MAX_ITEMS
+
+ROW_DTYPE = np.dtype([
+    ("item_id", "<i4"),
+    ("question_type", "u1"),
+    ("flags", "u1"),
+    ("theta", "<f8"),
+    ("se", "<f4"),
+])
+
+_CORRECT = 1
+_DONT_KNOW = 2
+_COMPLETE = 1
+
+INITIAL_SE = 1.5
+
+FORMAT_VERSION = 1
+# version, flags, n, initial_theta, theta, se, len(termination_reason)
+_HEADER = struct.Struct("<BBHdddB")
+
+
+class SessionState:
+    """Responses, estimates and termination status of one session."""
+
+    __slots__ = ("rows", "n", "initial_theta", "theta", "se", "is_complete", "termination_reason")
+
+    def __init__(self, initial_theta: float = 0.0, se: float = INITIAL_SE, capacity: int = CAT_MAX_ITEMS):
+        self.rows = np.zeros(max(capacity, 1), dtype=ROW_DTYPE)
+        self.n = 0
+        self.initial_theta = initial_theta
+        self.theta = initial_theta
+        self.se = se
+        self.is_complete = False
+        self.termination_reason = ""
+
+    def __len__(self) -> int:
+        return self.n
+
+    def append(
+        self, item_id: int, question_type: int, response: int, dont_know: bool, theta: float, se: float,
+    ) -> None:
+        """Record one response and the estimate after it."""
+        if self.n == len(self.rows):
+            # Only sessions with a custom max_items above capacity get here
+            self.rows = np.resize(self.rows, 2 * len(self.rows))
+        self.rows[self.n] = (
+            item_id, question_type, (_CORRECT if response else 0) | (_DONT_KNOW if dont_know else 0), theta, se,
+        )
+        self.n += 1
+        self.theta = theta
+        self.se = se
+
+    # ── Column views over the used rows ─────────────────────────
+
+    @property
+    def item_ids(self) -> np.ndarray:
+        return self.rows["item_id"][:self.n]
+
+    @property
+    def question_types(self) -> np.ndarray:
+        return self.rows["question_type"][:self.n]
+
+    @property
+    def responses(self) -> np.ndarray:
+        return (self.rows["flags"][:self.n] & _CORRECT).astype(np.int8)
+
+    @property
+    def dont_know(self) -> np.ndarray:
+        return (self.rows["flags"][:self.n] & _DONT_KNOW) != 0
+
+    @property
+    def thetas(self) -> np.ndarray:
+        """Theta after each response."""
+        return self.rows["theta"][:self.n]
+
+    @property
+    def ses(self) -> np.ndarray:
+        """SE after each response."""
+        return self.rows["se"][:self.n]
+
+    @property
+    def nbytes(self) -> int:
+        return self.rows.nbytes
+
+    # ── Codec ───────────────────────────────────────────────────
+
+    def to_bytes(self) -> bytes:
+        reason = self.termination_reason.encode("utf-8")
+        header = _HEADER.pack(
+            FORMAT_VERSION, _COMPLETE if self.is_complete else 0, self.n,
+            self.initial_theta, self.theta, self.se, len(reason),
+        )
+        return header + reason + self.rows[:self.n].tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes, capacity: int = CAT_MAX_ITEMS) -> "SessionState":
+        version, flags, n, initial_theta, theta, se, reason_len = _HEADER.unpack_from(data)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported session state version: {version}")
+        offset = _HEADER.size
+        state = cls(initial_theta, se, capacity=max(capacity, n))
+        state.theta = theta
+        state.is_complete = bool(flags & _COMPLETE)
+        state.termination_reason = bytes(data[offset:offset + reason_len]).decode("utf-8")
+        offset += reason_len
+        state.rows[:n] = np.frombuffer(data, dtype=ROW_DTYPE, count=n, offset=offset)
+        state.n = n
+        return state
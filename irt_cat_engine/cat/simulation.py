@@ -0,0 +1,359 @@
+"""Batch CAT simulation on the production code paths.
+
+Runs N simulees in lockstep: every step selects one item for each active
+simulee with ``select_rows`` (the engine behind ``select_next_item``),
+folds the simulated responses into per-simulee quadrature log-likelihoods
+with the shared ``EAPEstimator``, and applies ``StoppingRules``. Content
+constraints, the information-table shortlist and Sympson-Hetter exposure
+control are the same code a live session uses.
+
+Usage:
+    python -m irt_cat_engine.cat.simulation --simulees 100000
+    python -m irt_cat_engine.cat.simulation --simulees 20000 --synthetic-pool 9183 --exposure
+"""
+import argparse
+import json
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from ..config import CAT_MAX_EXPOSURE_RATE
+from ..item_bank.bank import ItemBank
+from ..item_bank.information_table import get_information_table
+from ..models.ability_estimator import EAPEstimator, get_eap_estimator
+from ..models.irt_2pl import ItemParameters, probability_matrix
+from ..reporting.exposure_analysis import _compute_gini
+from .item_selector import ExposureController, SelectionState, select_rows
+from .stopping_rules import StoppingRules
+
+# Initial SE before any response, as in CATSession
+_INITIAL_SE = 1.5
+
+_ABILITY_BANDS = [
+    (-2.5, -1.5, "low"), (-1.5, -0.5, "below_average"), (-0.5, 0.5, "average"),
+    (0.5, 1.5, "above_average"), (1.5, 2.5, "high"),
+]
+
+
+class SimulationStats:
+    """Mergeable summary statistics for one or more simulation runs.
+
+    Holds only sums and counts, so per-shard statistics can be merged
+    incrementally; merging the same shards in the same order gives
+    bit-identical reports.
+    """
+
+    def __init__(self, pool_size: int):
+        self.n = 0
+        self.sum_err = 0.0
+        self.sum_sq_err = 0.0
+        self.sum_abs_err = 0.0
+        self.sum_true = 0.0
+        self.sum_hat = 0.0
+        self.sum_true_sq = 0.0
+        self.sum_hat_sq = 0.0
+        self.sum_cross = 0.0
+        self.sum_se = 0.0
+        self.length_counts = np.zeros(1, dtype=np.int64)
+        self.reason_counts: dict[str, int] = {}
+        self.exposure_counts = np.zeros(pool_size, dtype=np.int64)
+        n_bands = len(_ABILITY_BANDS)
+        self.band_n = np.zeros(n_bands, dtype=np.int64)
+        self.band_sum_err = np.zeros(n_bands)
+        self.band_sum_sq_err = np.zeros(n_bands)
+        self.band_sum_items = np.zeros(n_bands)
+        self.elapsed_seconds = 0.0
+
+    @classmethod
+    def from_result(cls, result: "SimulationResult") -> "SimulationStats":
+        stats = cls(len(result.exposure_counts))
+        t, h = result.theta_true, result.theta_hat
+        err = h - t
+        stats.n = len(t)
+        stats.sum_err = float(err.sum())
+        stats.sum_sq_err = float((err ** 2).sum())
+        stats.sum_abs_err = float(np.abs(err).sum())
+        stats.sum_true = float(t.sum())
+        stats.sum_hat = float(h.sum())
+        stats.sum_true_sq = float((t ** 2).sum())
+        stats.sum_hat_sq = float((h ** 2).sum())
+        stats.sum_cross = float((t * h).sum())
+        stats.sum_se = float(result.se.sum())
+        stats.length_counts = np.bincount(result.n_items.astype(np.intp))
+        reasons, counts = np.unique(result.termination_reasons.astype(str), return_counts=True)
+        stats.reason_counts = {str(r): int(c) for r, c in zip(reasons, counts)}
+        stats.exposure_counts = result.exposure_counts.astype(np.int64)
+        for i, (lo, hi, _) in enumerate(_ABILITY_BANDS):
+            mask = (t >= lo) & (t < hi)
+            stats.band_n[i] = int(mask.sum())
+            stats.band_sum_err[i] = float(err[mask].sum())
+            stats.band_sum_sq_err[i] = float((err[mask] ** 2).sum())
+            stats.band_sum_items[i] = float(result.n_items[mask].sum())
+        stats.elapsed_seconds = result.elapsed_seconds
+        return stats
+
+    def merge(self, other: "SimulationStats") -> "SimulationStats":
+        """Add ``other`` into this accumulator (in place) and return self."""
+        for name in ("n", "sum_err", "sum_sq_err", "sum_abs_err", "sum_true", "sum_hat",
+                     "sum_true_sq", "sum_hat_sq", "sum_cross", "sum_se", "elapsed_seconds"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        size = max(len(self.length_counts), len(other.length_counts))
+        self.length_counts = (np.pad(self.length_counts, (0, size - len(self.length_counts)))
+                              + np.pad(other.length_counts, (0, size - len(other.length_counts))))
+        for reason, count in other.reason_counts.items():
+            self.reason_counts[reason] = self.reason_counts.get(reason, 0) + count
+        self.exposure_counts += other.exposure_counts
+        self.band_n += other.band_n
+        self.band_sum_err += other.band_sum_err
+        self.band_sum_sq_err += other.band_sum_sq_err
+        self.band_sum_items += other.band_sum_items
+        return self
+
+    def _length_percentile(self, q: float) -> int:
+        cumulative = np.cumsum(self.length_counts)
+        return int(np.searchsorted(cumulative, q * cumulative[-1]))
+
+    def summary(self, exposure_target: float = CAT_MAX_EXPOSURE_RATE) -> dict:
+        """Structured report: accuracy, test length, termination and exposure."""
+        n = max(self.n, 1)
+        var_true = self.sum_true_sq / n - (self.sum_true / n) ** 2
+        var_hat = self.sum_hat_sq / n - (self.sum_hat / n) ** 2
+        cov = self.sum_cross / n - (self.sum_true / n) * (self.sum_hat / n)
+        correlation = cov / np.sqrt(var_true * var_hat) if self.n > 1 and var_true * var_hat > 0 else None
+        lengths = np.flatnonzero(self.length_counts)
+        rates = self.exposure_counts / n
+
+        by_ability = {}
+        for i, (_, _, label) in enumerate(_ABILITY_BANDS):
+            band_n = int(self.band_n[i])
+            if band_n:
+                by_ability[label] = {
+                    "n": band_n,
+                    "rmse": round(float(np.sqrt(self.band_sum_sq_err[i] / band_n)), 4),
+                    "bias": round(float(self.band_sum_err[i] / band_n), 4),
+                    "mean_items": round(float(self.band_sum_items[i] / band_n), 2),
+                }
+
+        return {
+            "simulees": self.n,
+            "elapsed_seconds": round(self.elapsed_seconds, 2),
+            "rmse": round(float(np.sqrt(self.sum_sq_err / n)), 4),
+            "bias": round(self.sum_err / n, 4),
+            "mean_abs_bias": round(self.sum_abs_err / n, 4),
+            "correlation": round(float(correlation), 4) if correlation is not None else None,
+            "mean_se": round(self.sum_se / n, 4),
+            "test_length": {
+                "mean": round(float(self.length_counts @ np.arange(len(self.length_counts))) / n, 2),
+                "min": int(lengths.min()) if len(lengths) else 0,
+                "p50": self._length_percentile(0.5),
+                "p90": self._length_percentile(0.9),
+                "max": int(lengths.max()) if len(lengths) else 0,
+            },
+            "termination_reasons": dict(sorted(self.reason_counts.items())),
+            "exposure": {
+                "pool_size": len(rates),
+                "items_used": int(np.count_nonzero(self.exposure_counts)),
+                "max_rate": round(float(rates.max()), 4) if len(rates) else 0.0,
+                "items_over_target": int(np.count_nonzero(rates > exposure_target)),
+                "gini": round(_compute_gini(rates), 4),
+            },
+            "by_ability": by_ability,
+        }
+
+
+@dataclass
+class SimulationResult:
+    """Per-simulee outcomes of a batch simulation."""
+    theta_true: np.ndarray
+    theta_hat: np.ndarray
+    se: np.ndarray
+    n_items: np.ndarray
+    termination_reasons: np.ndarray
+    exposure_counts: np.ndarray  # administrations per bank row
+    elapsed_seconds: float = 0.0
+
+    def stats(self) -> SimulationStats:
+        return SimulationStats.from_result(self)
+
+    def summary(self, exposure_target: float = CAT_MAX_EXPOSURE_RATE) -> dict:
+        """Structured report: accuracy, test length, termination and exposure."""
+        return self.stats().summary(exposure_target)
+
+
+def _simulate_chunk(
+    bank: ItemBank,
+    theta_true: np.ndarray,
+    initial_theta: np.ndarray,
+    stopping_rules: StoppingRules,
+    exposure_controller: ExposureController | None,
+    estimator: EAPEstimator,
+    top_n: int,
+    rng: np.random.Generator,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    n = len(theta_true)
+    if exposure_controller is not None:
+        exposure_controller.start_test(n)
+    state = SelectionState(bank, n)
+    log_lik = np.zeros((n, estimator.n_points))
+    theta = initial_theta.astype(np.float64).copy()
+    se = np.full(n, _INITIAL_SE)
+    history = np.empty((n, stopping_rules.max_items + 1))
+    history[:, 0] = theta
+    n_items = np.zeros(n, dtype=np.int16)
+    reasons = np.full(n, "", dtype=object)
+
+    active = np.arange(n)
+    for step in range(stopping_rules.max_items):
+        rows = select_rows(theta[active], bank, state, active, exposure_controller, top_n, rng)
+
+        exhausted = rows < 0
+        if exhausted.any():
+            reasons[active[exhausted]] = "pool_exhausted"
+            n_items[active[exhausted]] = step
+            if exposure_controller is not None:
+                exposure_controller.end_test(int(exhausted.sum()))
+            active, rows = active[~exhausted], rows[~exhausted]
+            if len(active) == 0:
+                break
+
+        state.record(active, rows)
+        a, b, c = bank.a[rows], bank.b[rows], bank.c[rows]
+        p_correct = probability_matrix(theta_true[active], a, b, c)
+        responses = (rng.random(len(active)) < p_correct).astype(np.int8)
+
+        log_lik[active] += estimator.response_log_likelihood_batch(a, b, c, responses)
+        theta[active], se[active] = estimator.summarize_batch(log_lik[active])
+        history[active, step + 1] = theta[active]
+
+        stop, why = stopping_rules.should_stop_batch(step + 1, se[active], history[active, :step + 2])
+        if stop.any():
+            done = active[stop]
+            reasons[done] = why[stop]
+            n_items[done] = step + 1
+            if exposure_controller is not None:
+                exposure_controller.end_test(len(done))
+            active = active[~stop]
+        if len(active) == 0:
+            break
+
+    return theta, se, n_items, reasons, state.administered.sum(axis=0)
+
+
+def simulate(
+    bank: ItemBank,
+    theta_true: np.ndarray,
+    initial_theta: float | np.ndarray = 0.0,
+    stopping_rules: StoppingRules | None = None,
+    exposure_controller: ExposureController | None = None,
+    estimator: EAPEstimator | None = None,
+    top_n: int = 5,
+    rng: np.random.Generator | None = None,
+    chunk_size: int = 2048,
+) -> SimulationResult:
+    """Simulate one CAT per entry of ``theta_true``.
+
+    Simulees run in chunks of ``chunk_size`` to bound the (chunk x pool)
+    administered mask; each chunk runs to completion in lockstep.
+    """
+    stopping_rules = stopping_rules or StoppingRules()
+    estimator = estimator or get_eap_estimator()
+    rng = rng if rng is not None else np.random.default_rng()
+    theta_true = np.asarray(theta_true, dtype=np.float64)
+    initial = np.broadcast_to(np.asarray(initial_theta, dtype=np.float64), theta_true.shape)
+
+    n = len(theta_true)
+    theta_hat = np.empty(n)
+    se = np.empty(n)
+    n_items = np.empty(n, dtype=np.int16)
+    reasons = np.empty(n, dtype=object)
+    exposure_counts = np.zeros(len(bank), dtype=np.int64)
+
+    start = time.perf_counter()
+    for lo in range(0, n, chunk_size):
+        hi = min(lo + chunk_size, n)
+        theta_hat[lo:hi], se[lo:hi], n_items[lo:hi], reasons[lo:hi], counts = _simulate_chunk(
+            bank, theta_true[lo:hi], initial[lo:hi], stopping_rules,
+            exposure_controller, estimator, top_n, rng,
+        )
+        exposure_counts += counts
+
+    return SimulationResult(
+        theta_true=theta_true,
+        theta_hat=theta_hat,
+        se=se,
+        n_items=n_items,
+        termination_reasons=reasons,
+        exposure_counts=exposure_counts,
+        elapsed_seconds=time.perf_counter() - start,
+    )
+
+
+def synthetic_bank(n_items: int, seed: int = 0) -> ItemBank:
+    """A random 2PL pool shaped like the initialized vocabulary pool."""
+    rng = np.random.RandomState(seed)
+    cefrs = ["A1", "A2", "B1", "B2", "C1"]
+    return ItemBank.from_items(
+        ItemParameters(
+            item_id=i,
+            word=f"item_{i}",
+            difficulty_b=float(np.clip(rng.normal(0.0, 1.2), -3.0, 3.0)),
+            discrimination_a=float(rng.uniform(0.6, 2.0)),
+            question_type=1,
+            cefr=cefrs[i % len(cefrs)],
+            topic=f"topic_{i % 25}",
+            is_loanword=bool(rng.rand() < 0.05),
+        )
+        for i in range(n_items)
+    )
+
+
+def _load_pool(question_type: int) -> ItemBank:
+    from ..data.load_vocabulary import load_vocabulary
+    from ..item_bank.parameter_initializer import initialize_item_parameters
+    return ItemBank.from_items(initialize_item_parameters(load_vocabulary(), question_type=question_type))
+
+
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description="Batch CAT simulation on the production selector.")
+    parser.add_argument("--simulees", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--synthetic-pool", type=int, default=0,
+                        help="use a random pool of this size instead of the vocabulary DB")
+    parser.add_argument("--question-type", type=int, default=1)
+    parser.add_argument("--theta-min", type=float, default=-2.5)
+    parser.add_argument("--theta-max", type=float, default=2.5)
+    parser.add_argument("--exposure", action="store_true", help="enable Sympson-Hetter control")
+    parser.add_argument("--no-info-table", action="store_true", help="always scan the full pool")
+    parser.add_argument("--chunk-size", type=int, default=2048)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    bank = synthetic_bank(args.synthetic_pool, args.seed) if args.synthetic_pool else _load_pool(args.question_type)
+    if not args.no_info_table:
+        get_information_table(bank)
+
+    rng = np.random.default_rng(args.seed)
+    theta_true = rng.uniform(args.theta_min, args.theta_max, args.simulees)
+    controller = ExposureController(int(bank.item_ids.max()) + 1) if args.exposure else None
+    result = simulate(bank, theta_true, exposure_controller=controller, rng=rng,
+                      chunk_size=args.chunk_size)
+    report = result.summary()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{report['simulees']} simulees in {report['elapsed_seconds']}s "
+              f"(pool={len(bank)}, exposure={'on' if args.exposure else 'off'})")
+        for key in ("rmse", "bias", "mean_abs_bias", "correlation", "mean_se"):
+            print(f"  {key:<14} {report[key]}")
+        print(f"  test_length    {report['test_length']}")
+        print(f"  termination    {report['termination_reasons']}")
+        print(f"  exposure       {report['exposure']}")
+        for label, band in report["by_ability"].items():
+            print(f"  {label:<14} {band}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
 """CAT stopping criteria."""
+import numpy as np
+
 from ..config import (
     CAT_MIN_ITEMS, CAT_MAX_ITEMS, CAT_SE_THRESHOLD,
     CAT_CONVERGENCE_WINDOW, CAT_CONVERGENCE_EPSILON,
@@ -53,3 +55,36 @@ class StoppingRules:
                 return True, "convergence"
 
         return False, ""
+
+    def should_stop_batch(
+        self,
+        items_completed: int,
+        current_se: np.ndarray,
+        theta_history: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Vectorized ``should_stop`` for sessions that have all completed the same number of items.
+
+        Args:
+            items_completed: Items completed by every session in the batch
+            current_se: SE per session, shape (N,)
+            theta_history: Theta estimates per session, shape (N, n_estimates),
+                most recent last
+
+        Returns:
+            (stop mask, reason per session; "" where not stopping)
+        """
+        n = len(current_se)
+        reasons = np.full(n, "", dtype=object)
+        if items_completed >= self.max_items:
+            reasons[:] = "max_items"
+            return np.ones(n, dtype=bool), reasons
+        if items_completed < self.min_items:
+            return np.zeros(n, dtype=bool), reasons
+
+        se_stop = current_se < self.se_threshold
+        reasons[se_stop] = "se_threshold"
+        if theta_history.shape[1] >= self.convergence_window:
+            recent = theta_history[:, -self.convergence_window:]
+            converged = np.all(np.abs(np.diff(recent, axis=1)) < self.convergence_epsilon, axis=1)
+            reasons[converged & ~se_stop] = "convergence"
+        return reasons != "", reasons
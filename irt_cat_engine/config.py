@@ -1,4 +1,5 @@
 """Configuration constants for the IRT CAT Engine."""
+import os
 from pathlib import Path
 
 # Paths
@@ -6,6 +7,11 @@ PROJECT_ROOT = Path(__file__).parent.parent
 VOCAB_DB_PATH = PROJECT_ROOT / "9000word_full_db.csv"
 GRAPH_DB_PATH = PROJECT_ROOT / "vocabulary_graph.json"
 
+# Compiled vocabulary/item-bank snapshots (see data/snapshot.py)
+SNAPSHOT_DIR = Path(os.getenv("IRT_SNAPSHOT_DIR", Path(__file__).parent / "db" / "snapshots"))
+SNAPSHOT_ENABLED = os.getenv("IRT_SNAPSHOT", "on").lower() not in ("off", "0", "false")
+SNAPSHOT_KEEP = int(os.getenv("IRT_SNAPSHOT_KEEP", "2"))  # Newest snapshots kept after compiling a new one
+
 # IRT Model Parameters
 IRT_MODEL = "2PL"  # "2PL" or "3PL"
 THETA_RANGE = (-3.0, 3.0)
@@ -65,6 +71,59 @@ CAT_CONVERGENCE_EPSILON = 0.05
 CAT_TIME_LIMIT_MINUTES = 30
 CAT_MAX_EXPOSURE_RATE = 0.25
 
+# Precomputed item information table (item x theta-grid)
+INFO_TABLE_STEP = 0.01         # Theta bin width
+INFO_TABLE_TOP_K = 64          # Ranked shortlist length per bin
+# Mixed mode's joint (item, question type) pool has ~5 rows per word: coarser
+# bins keep its table near one pool's size, longer shortlists cover the types
+JOINT_INFO_TABLE_STEP = 0.05
+JOINT_INFO_TABLE_TOP_K = 256
+
+# Precomputed theta -> (vocab size, core coverage) curve for reports
+SCORE_CURVE_STEP = 0.01        # Theta grid spacing for the vocab size curve
+
+# Pre-built item content cache (see api/item_content_cache.py)
+ITEM_CACHE_MAX_KEYS = 20000    # (item_id, question_type) entries before LRU eviction
+ITEM_CACHE_VARIANTS = 4        # Distractor sets kept per entry
+
+# Active session storage (see api/session_store.py)
+SESSION_STORE_BACKEND = os.getenv("IRT_SESSION_STORE", "memory").lower()  # "memory" or "redis"
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TIMEOUT", "3600"))  # Idle timeout (expiry task)
+SESSION_EXPIRY_INTERVAL = 30.0  # Seconds between idle-session sweeps
+# Redis keys outlive the idle timeout by a sweep interval plus a margin, so the
+# sweep flushes an abandoned session before Redis drops its key
+SESSION_STORE_TTL_MARGIN = 300
+SESSION_STORE_TTL_SECONDS = int(SESSION_TTL_SECONDS + SESSION_EXPIRY_INTERVAL + SESSION_STORE_TTL_MARGIN)
+# Record item counts of abandoned sessions on the TestSession row when evicting them
+SESSION_FLUSH_PARTIAL = os.getenv("IRT_SESSION_FLUSH_PARTIAL", "on").lower() not in ("off", "0", "false")
+
+# Write-behind response logging (see api/response_writer.py)
+RESPONSE_WRITE_BATCH_SIZE = int(os.getenv("IRT_RESPONSE_BATCH_SIZE", "200"))    # Rows per INSERT transaction
+RESPONSE_WRITE_LINGER_MS = int(os.getenv("IRT_RESPONSE_LINGER_MS", "50"))       # Max wait to fill a batch
+RESPONSE_WRITE_QUEUE_SIZE = int(os.getenv("IRT_RESPONSE_QUEUE_SIZE", "10000"))  # Queued rows before requests wait
+RESPONSE_FLUSH_TIMEOUT = float(os.getenv("IRT_RESPONSE_FLUSH_TIMEOUT", "10"))   # Seconds a completing test waits for its rows
+
+# Incremental item exposure counters (see data/exposure_counts.py)
+EXPOSURE_CATCHUP_CHUNK = 50000  # Response ids folded per catch-up transaction
+
+# Bulk re-scoring of stored sessions (see data/rescore.py)
+RESCORE_CHUNK = 10000  # Sessions scored per vectorized call and transaction
+
+# Offline MML/EM recalibration (see data/mml_recalibration.py)
+PARAMETER_SET_DIR = Path(os.getenv("IRT_PARAMETER_SET_DIR", Path(__file__).parent / "db" / "parameter_sets"))
+MML_CHUNK_SESSIONS = 2000  # Sessions per streamed E-step chunk
+MML_MAX_ITER = 50          # EM cycles
+MML_TOL = 1e-3             # Stop when no a/b moves more than this in a cycle
+
+# Hot-swapped parameter versions (see item_bank/parameter_registry.py)
+PARAMETER_REFRESH_INTERVAL = float(os.getenv("IRT_PARAMETER_REFRESH_INTERVAL", "300"))  # Seconds between checks
+PARAMETER_VERSIONS_KEPT = 3  # Versions kept for restoring in-flight sessions
+
+# Live Sympson-Hetter exposure control (see api/shared_exposure.py)
+EXPOSURE_BACKEND = os.getenv("IRT_EXPOSURE_BACKEND", SESSION_STORE_BACKEND).lower()  # "memory" or "redis"
+EXPOSURE_RECALIBRATE_INTERVAL = 60.0  # Seconds between sync + recalibrate + checkpoint rounds
+
 # EAP Settings
 EAP_QUADRATURE_POINTS = 41
 EAP_QUAD_RANGE = (-4.0, 4.0)
@@ -2,12 +2,17 @@
 
 Uses SQLite for development, easily swappable to PostgreSQL for production.
 Database URL is configured via DATABASE_URL environment variable.
+
+Two engines share the URL: a sync one (admin routes, scripts, migrations)
+and an async one (aiosqlite / asyncpg) for the hot test-taking routes, so
+their database writes don't hold a threadpool thread.
 """
 import os
 import logging
 from pathlib import Path
 
 from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
 logger = logging.getLogger("irt_cat_engine.database")
@@ -61,8 +66,29 @@ elif DATABASE_URL.startswith("sqlite"):
 engine = create_engine(DATABASE_URL, **engine_kwargs)
 
 
+def get_async_database_url(db_url: str) -> str:
+    """The same database addressed through its asyncio driver."""
+    if db_url.startswith("sqlite:///"):
+        return db_url.replace("sqlite:///", "sqlite+aiosqlite:///", 1)
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if db_url.startswith(prefix):
+            return "postgresql+asyncpg://" + db_url[len(prefix):]
+    return db_url
+
+
+ASYNC_DATABASE_URL = get_async_database_url(DATABASE_URL)
+async_engine_kwargs = {"echo": False}
+if ASYNC_DATABASE_URL.startswith("postgresql"):
+    async_engine_kwargs.update({"pool_pre_ping": True, "pool_size": 10, "max_overflow": 20})
+elif ASYNC_DATABASE_URL.startswith("sqlite"):
+    async_engine_kwargs.update({"connect_args": {"timeout": 30}})
+
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **async_engine_kwargs)
+
+
 # Enable WAL mode for SQLite to improve concurrent access
 @event.listens_for(engine, "connect")
+@event.listens_for(async_engine.sync_engine, "connect")
 def set_sqlite_pragma(dbapi_conn, connection_record):
     """Configure SQLite for better performance and concurrency."""
     if DATABASE_URL.startswith("sqlite"):
@@ -80,6 +106,7 @@ def set_sqlite_pragma(dbapi_conn, connection_record):
 
 
 SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
 
 
 def init_db():
@@ -96,3 +123,9 @@ def get_db() -> Session:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncSession:
+    """Get an async database session (for FastAPI dependency injection)."""
+    async with AsyncSessionLocal() as db:
+        yield db
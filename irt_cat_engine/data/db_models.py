@@ -37,6 +37,7 @@ class TestSession(Base):
 
     # Initial state
     initial_theta = Column(Float, nullable=False, default=0.0)
+    parameter_version = Column(String(40), nullable=True)  # Item parameter version used
 
     # Final results (filled on completion)
     final_theta = Column(Float, nullable=True)
@@ -62,7 +63,7 @@ class Response(Base):
     __tablename__ = "responses"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    session_id = Column(String(32), ForeignKey("test_sessions.id"), nullable=False)
+    session_id = Column(String(32), ForeignKey("test_sessions.id"), nullable=False, index=True)
     item_id = Column(Integer, nullable=False)
     word = Column(String(100), nullable=False)
     question_type = Column(Integer, nullable=False, default=1)
@@ -93,6 +94,17 @@ class ItemExposure(Base):
     admin_count = Column(Integer, nullable=False, default=0)
     correct_count = Column(Integer, nullable=False, default=0)
     last_administered = Column(DateTime, nullable=True)
+    exposure_k = Column(Float, nullable=True)  # Sympson-Hetter k, checkpointed by the exposure controller
+
+
+class AggregationWatermark(Base):
+    """Last response id folded into an incremental aggregate (e.g. item_exposure)."""
+    __tablename__ = "aggregation_watermarks"
+
+    name = Column(String(50), primary_key=True)
+    last_response_id = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc),
+                        onupdate=lambda: datetime.now(timezone.utc))
 
 
 class GoalLearningSession(Base):
@@ -0,0 +1,144 @@
+"""Incremental item exposure counters.
+
+``item_exposure`` holds per-item administration and correct counts. Rather
+than a GROUP BY over every response, ``apply_new_responses`` folds in only
+the responses past the ``item_exposure`` watermark, as upserted per-item
+deltas, and advances the watermark in the same transaction.
+``catch_up_exposure`` runs the fold periodically (with exposure
+recalibration), at startup and from the admin recalibrate route, a chunk
+per transaction.
+
+The fold holds the watermark row exclusively. Response writers only take a
+shared lock on it (``share_watermark``), so they insert concurrently with
+each other; the fold waits for in-flight inserts to commit, which keeps
+every id up to ``max(id)`` committed when it reads them.
+"""
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from ..config import EXPOSURE_CATCHUP_CHUNK
+from .db_models import AggregationWatermark, ItemExposure, Response
+
+logger = logging.getLogger("irt_cat_engine.exposure_counts")
+
+WATERMARK = "item_exposure"
+
+_UPSERT_INSERTS = {"sqlite": sqlite_insert, "postgresql": pg_insert}
+
+
+def _watermark_query(shared: bool):
+    return (
+        select(AggregationWatermark)
+        .where(AggregationWatermark.name == WATERMARK)
+        .with_for_update(read=shared)
+    )
+
+
+def share_watermark(db: Session) -> None:
+    """Hold a shared lock on the watermark until the transaction ends.
+
+    Response writers take it before inserting, so a fold (which needs the
+    exclusive lock) never reads past ids that have not been committed yet.
+    Writers don't block each other.
+    """
+    db.execute(_watermark_query(shared=True))
+
+
+def lock_watermark(db: Session) -> AggregationWatermark:
+    """The item_exposure watermark, locked exclusively until the transaction ends.
+
+    A missing watermark means the counters were never built incrementally;
+    they are reset and rebuilt from the first response.
+    """
+    watermark = db.scalars(_watermark_query(shared=False)).first()
+    if watermark is None:
+        logger.info("No item_exposure watermark; rebuilding exposure counters from all responses")
+        db.execute(update(ItemExposure).values(admin_count=0, correct_count=0))
+        watermark = AggregationWatermark(name=WATERMARK, last_response_id=0)
+        db.add(watermark)
+        db.flush()
+    return watermark
+
+
+def apply_new_responses(db: Session, watermark: AggregationWatermark, limit: int | None = None) -> int:
+    """Fold responses past the watermark into item_exposure.
+
+    ``limit`` caps how many response ids are covered. Returns the number
+    of responses folded; the caller commits.
+    """
+    start = watermark.last_response_id
+    end = db.scalar(select(func.max(Response.id)))
+    if end is None or end <= start:
+        return 0
+    if limit is not None:
+        end = min(end, start + limit)
+
+    deltas = db.execute(
+        select(
+            Response.item_id,
+            func.max(Response.word).label("word"),
+            func.count(Response.id).label("admin_count"),
+            func.sum(case((Response.is_correct == True, 1), else_=0)).label("correct_count"),
+        )
+        .where(Response.id > start, Response.id <= end)
+        .group_by(Response.item_id)
+    ).all()
+    _upsert_deltas(db, deltas)
+    watermark.last_response_id = end
+    return sum(d.admin_count for d in deltas)
+
+
+def _upsert_deltas(db: Session, deltas) -> None:
+    if not deltas:
+        return
+    now = datetime.now(timezone.utc)
+    rows = [
+        {"item_id": d.item_id, "word": d.word, "admin_count": d.admin_count,
+         "correct_count": d.correct_count or 0, "last_administered": now}
+        for d in deltas
+    ]
+    make_insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if make_insert is not None:
+        stmt = make_insert(ItemExposure)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ItemExposure.item_id],
+            set_={
+                "admin_count": ItemExposure.admin_count + stmt.excluded.admin_count,
+                "correct_count": ItemExposure.correct_count + stmt.excluded.correct_count,
+                "last_administered": stmt.excluded.last_administered,
+            },
+        )
+        db.execute(stmt, rows)
+        return
+
+    # Dialects without ON CONFLICT: read-modify-write per item
+    for row in rows:
+        exposure = db.get(ItemExposure, row["item_id"])
+        if exposure is None:
+            db.add(ItemExposure(**row))
+        else:
+            exposure.admin_count += row["admin_count"]
+            exposure.correct_count += row["correct_count"]
+            exposure.last_administered = now
+
+
+def catch_up_exposure(db: Session, chunk_size: int = EXPOSURE_CATCHUP_CHUNK) -> int:
+    """Fold every response past the watermark; returns how many were folded.
+
+    Each chunk of ``chunk_size`` response ids is its own transaction, so a
+    long backlog never holds the lock for long.
+    """
+    folded = 0
+    while True:
+        watermark = lock_watermark(db)
+        start = watermark.last_response_id
+        folded += apply_new_responses(db, watermark, limit=chunk_size)
+        advanced = watermark.last_response_id != start
+        db.commit()
+        if not advanced:
+            return folded
@@ -67,6 +67,22 @@ class VocabGraph:
 
         self._loaded = True
 
+    def load_snapshot(self, snapshot) -> bool:
+        """Load adjacency from a compiled snapshot instead of the JSON file.
+
+        Returns False if the snapshot was compiled without a graph.
+        """
+        if self._loaded:
+            return True
+        data = snapshot.graph_adjacency()
+        if data is None:
+            return False
+        self._word_props, relations = data
+        for name, adjacency in relations.items():
+            getattr(self, f"_{name}").update(adjacency)
+        self._loaded = True
+        return True
+
     def get_synonyms(self, word: str) -> set[str]:
         return self._synonyms.get(word.lower(), set())
 
@@ -0,0 +1,171 @@
+"""Offline MML/EM recalibration over the responses table.
+
+Streams the responses of ``chunk_sessions`` sessions at a time (keyset
+paging on responses.session_id) into the E-step of
+``item_bank.mml_calibrator`` once per EM cycle, then writes the result as a
+new ParameterSet under PARAMETER_SET_DIR. Every (question_type, item_id)
+with responses is calibrated against that type's bank; a running server
+picks the set up through its parameter registry.
+
+Usage:
+    python -m irt_cat_engine.data.mml_recalibration
+    python -m irt_cat_engine.data.mml_recalibration --chunk-sessions 5000 --max-iter 30
+"""
+import argparse
+import logging
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..config import MML_CHUNK_SESSIONS, MML_MAX_ITER, MML_TOL, PARAMETER_SET_DIR, SNAPSHOT_ENABLED
+from ..item_bank.bank import ItemBank
+from ..item_bank.mml_calibrator import ResponseChunk, run_mml_em
+from ..item_bank.parameter_initializer import initialize_item_parameters
+from ..item_bank.parameter_set import ParameterSet, latest_parameter_set
+from .db_models import Response
+from .load_vocabulary import load_vocabulary
+from .snapshot import open_snapshot
+from .vocab_store import VocabStore
+
+logger = logging.getLogger("irt_cat_engine.mml_recalibration")
+
+
+class _Layout:
+    """Flat parameter rows over several banks, one block per question type."""
+
+    def __init__(self, banks: dict[int, ItemBank]):
+        self.banks = dict(sorted(banks.items()))
+        self.offsets = {}
+        offset = 0
+        for qt, bank in self.banks.items():
+            self.offsets[qt] = offset
+            offset += len(bank)
+
+    def rows(self, question_types: np.ndarray, item_ids: np.ndarray) -> np.ndarray:
+        """Flat row of each response's item, -1 if its type or item is not calibrated."""
+        rows = np.full(len(item_ids), -1, dtype=np.int64)
+        for qt, bank in self.banks.items():
+            mask = question_types == qt
+            if mask.any():
+                local = bank.lookup_rows(item_ids[mask])
+                rows[mask] = np.where(local >= 0, local + self.offsets[qt], -1)
+        return rows
+
+    def concat(self, name: str) -> np.ndarray:
+        return np.concatenate([getattr(bank, name) for bank in self.banks.values()]) if self.banks else np.zeros(0)
+
+    def split(self, values: np.ndarray) -> dict[int, np.ndarray]:
+        return {qt: values[self.offsets[qt]:self.offsets[qt] + len(bank)] for qt, bank in self.banks.items()}
+
+
+def iter_response_chunks(
+    db: Session, layout: _Layout, chunk_sessions: int = MML_CHUNK_SESSIONS,
+) -> Iterator[ResponseChunk]:
+    """Yield the responses of every session, ``chunk_sessions`` sessions at a time."""
+    last_id = None
+    while True:
+        page = select(Response.session_id).group_by(Response.session_id).order_by(Response.session_id)
+        if last_id is not None:
+            page = page.where(Response.session_id > last_id)
+        session_ids = db.scalars(page.limit(chunk_sessions)).all()
+        if not session_ids:
+            return
+        rows = db.execute(
+            select(Response.session_id, Response.question_type, Response.item_id,
+                   Response.is_correct, Response.is_dont_know)
+            .where(Response.session_id >= session_ids[0], Response.session_id <= session_ids[-1])
+            .order_by(Response.session_id, Response.id)
+        ).all()
+        last_id = session_ids[-1]
+        if not rows:
+            continue
+        sessions, types, items, correct, dont_know = zip(*rows)
+        yield ResponseChunk.from_sorted(
+            np.array(sessions, dtype=object),
+            layout.rows(np.array(types, dtype=np.int64), np.array(items, dtype=np.int64)),
+            np.array(correct, dtype=bool),
+            np.array(dont_know, dtype=bool),
+        )
+
+
+def recalibrate_mml(
+    db: Session,
+    banks: dict[int, ItemBank],
+    chunk_sessions: int = MML_CHUNK_SESSIONS,
+    **em_kwargs,
+) -> ParameterSet:
+    """Run MML/EM from the banks' current parameters; the banks are not modified.
+
+    Returns a new ParameterSet covering every item of every bank (items
+    without responses keep their current parameters).
+    """
+    layout = _Layout(banks)
+    c = layout.concat("c")
+    start = time.perf_counter()
+    result = run_mml_em(
+        lambda: iter_response_chunks(db, layout, chunk_sessions),
+        layout.concat("a"), layout.concat("b"), c, **em_kwargs,
+    )
+    a, b = layout.split(result.a), layout.split(result.b)
+    observed = layout.split(result.observed)
+    return ParameterSet.create(
+        {qt: (bank.item_ids, a[qt], b[qt], bank.c) for qt, bank in layout.banks.items()},
+        {
+            "method": "mml-em",
+            "iterations": result.iterations,
+            "converged": result.converged,
+            "log_likelihood": result.log_likelihood[-1] if result.log_likelihood else None,
+            "sessions": result.sessions,
+            "responses": {str(qt): int(n.sum()) for qt, n in observed.items()},
+            "items_calibrated": {str(qt): int(np.count_nonzero(n)) for qt, n in observed.items()},
+            "elapsed_s": round(time.perf_counter() - start, 1),
+        },
+    )
+
+
+def _load_banks(question_types: list[int]) -> dict[int, ItemBank]:
+    """Item banks as the server builds them (snapshot, else from the CSV)."""
+    snapshot = open_snapshot() if SNAPSHOT_ENABLED else None
+    banks = {qt: snapshot.item_bank(qt) for qt in question_types} if snapshot is not None else {}
+    missing = [qt for qt in question_types if banks.get(qt) is None]
+    if missing:
+        vocab = VocabStore.from_words(load_vocabulary())
+        for qt in missing:
+            banks[qt] = ItemBank.from_items(initialize_item_parameters(vocab, question_type=qt))
+    return banks
+
+
+def main(argv: list[str] | None = None) -> Path:
+    parser = argparse.ArgumentParser(description="Recalibrate item parameters by MML/EM over stored responses.")
+    parser.add_argument("--types", type=int, nargs="+", default=[1, 2, 3, 4, 5, 6])
+    parser.add_argument("--chunk-sessions", type=int, default=MML_CHUNK_SESSIONS)
+    parser.add_argument("--max-iter", type=int, default=MML_MAX_ITER)
+    parser.add_argument("--tol", type=float, default=MML_TOL)
+    parser.add_argument("--dir", type=Path, default=PARAMETER_SET_DIR)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    from .database import SessionLocal
+
+    banks = _load_banks(args.types)
+    # Continue from the newest set, so successive runs refine rather than restart
+    previous = latest_parameter_set(args.dir)
+    if previous is not None:
+        banks = {qt: previous.bank_for(bank, qt) for qt, bank in banks.items()}
+    with SessionLocal() as db:
+        parameter_set = recalibrate_mml(
+            db, banks, args.chunk_sessions, max_iter=args.max_iter, tol=args.tol,
+        )
+    path = parameter_set.save(args.dir)
+    meta = parameter_set.metadata
+    print(f"{path}: {meta['iterations']} EM cycles over {meta['sessions']} sessions "
+          f"(converged={meta['converged']}, {meta['elapsed_s']} s)")
+    return path
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Bulk re-scoring of completed test sessions.
+
+Stored sessions keep the CEFR and curriculum levels they were reported
+with. After the theta boundaries change, ``rescore_sessions`` recomputes
+cefr_level, cefr_probabilities and curriculum_level from each session's
+final theta and SE: one vectorized mapping call and one bulk UPDATE per
+chunk of sessions, paged by id.
+
+Usage:
+    python -m irt_cat_engine.data.rescore
+    python -m irt_cat_engine.data.rescore --chunk-size 50000
+"""
+import argparse
+import logging
+import time
+
+import numpy as np
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.orm import Session
+
+from ..config import RESCORE_CHUNK
+from ..reporting.score_mapper import (
+    CEFR_LEVELS,
+    CURRICULUM_LEVELS,
+    theta_to_cefr_batch,
+    theta_to_curriculum_batch,
+)
+from .db_models import TestSession
+
+logger = logging.getLogger("irt_cat_engine.rescore")
+
+
+def rescore_sessions(db: Session, chunk_size: int = RESCORE_CHUNK) -> int:
+    """Recompute CEFR/curriculum levels of every scored session.
+
+    Commits once per chunk. Returns the number of sessions rescored.
+    """
+    table = TestSession.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("_id"))
+        .values(
+            cefr_level=bindparam("_cefr"),
+            cefr_probabilities=bindparam("_probs"),
+            curriculum_level=bindparam("_curriculum"),
+        )
+    )
+    query = (
+        select(table.c.id, table.c.final_theta, table.c.final_se)
+        .where(table.c.final_theta.isnot(None), table.c.final_se > 0)
+        .order_by(table.c.id)
+        .limit(chunk_size)
+    )
+    cefr_labels = np.array(CEFR_LEVELS, dtype=object)
+    curriculum_labels = np.array(CURRICULUM_LEVELS, dtype=object)
+    total = 0
+    last_id = None
+    while True:
+        page = query if last_id is None else query.where(table.c.id > last_id)
+        rows = db.execute(page).all()
+        if not rows:
+            break
+        ids, thetas, ses = zip(*rows)
+        primary, probs = theta_to_cefr_batch(thetas, ses)
+        probs = np.round(probs, 4).tolist()
+        cefr = cefr_labels[primary]
+        curriculum = curriculum_labels[theta_to_curriculum_batch(thetas)]
+        db.execute(stmt, [
+            {"_id": ids[i], "_cefr": cefr[i], "_probs": dict(zip(CEFR_LEVELS, probs[i])),
+             "_curriculum": curriculum[i]}
+            for i in range(len(ids))
+        ])
+        db.commit()
+        total += len(ids)
+        last_id = ids[-1]
+        logger.info(f"Rescored {total} sessions")
+    return total
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Recompute CEFR/curriculum levels of stored sessions.")
+    parser.add_argument("--chunk-size", type=int, default=RESCORE_CHUNK)
+    args = parser.parse_args(argv)
+
+    from .database import SessionLocal
+
+    start = time.perf_counter()
+    with SessionLocal() as db:
+        total = rescore_sessions(db, args.chunk_size)
+    elapsed = time.perf_counter() - start
+    print(f"Rescored {total} sessions in {elapsed:.1f} s")
+    return total
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+"""Compiled, memory-mapped snapshot of the vocabulary and item banks.
+
+Without a snapshot, every start parses the vocabulary CSV, runs the field
+cleaners, computes initial IRT parameters and loads the graph JSON. A
+snapshot stores those results as ``.npy`` columns in one directory per
+content key:
+
+    <SNAPSHOT_DIR>/<key>/
+        manifest.json                sizes, labels, stored question types
+        vocab.*.npy                  VocabStore columns (text blobs, codes, relation CSR)
+        bank.*.npy                   categorical item columns (all types)
+        params.qt<N>.npy             (3, n_items) a/b/c for question type N
+        info.qt<N>.*.npy             information table for question type N
+        pools.*.npy                  distractor candidate groups + per-word exclusions (CSR)
+        graph.*.npy, graph.props.json  graph adjacency (CSR over a word list)
+
+The key hashes the source files, the format version and the code that
+derives the stored values, so a changed input produces a new snapshot
+rather than a stale read; compiling one prunes all but the newest
+``SNAPSHOT_KEEP`` snapshots. Arrays are opened with ``mmap_mode="c"``
+(copy-on-write): later starts only map pages, and nothing written in
+memory can reach the files.
+
+Usage:
+    python -m irt_cat_engine.data.snapshot          # compile for the current sources
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from .. import config as cfg
+from ..config import GRAPH_DB_PATH, SNAPSHOT_DIR, SNAPSHOT_KEEP, VOCAB_DB_PATH
+from ..item_bank import bank as bank_module, distractor_engine, parameter_initializer
+from ..item_bank.bank import ItemBank
+from ..item_bank.distractor_engine import DistractorEngine, DistractorPools
+from ..item_bank.information_table import InformationTable, attach_information_table
+from . import graph_connector, load_vocabulary as vocab_module, topic_mapper, vocab_store
+from .graph_connector import VocabGraph
+from .load_vocabulary import VocabWord, load_vocabulary
+from .vocab_store import StringColumn, VocabStore, as_vocab_store
+
+logger = logging.getLogger("irt_cat_engine.snapshot")
+
+SNAPSHOT_FORMAT_VERSION = 3
+
+QUESTION_TYPES = (1, 2, 3, 4, 5, 6)
+
+# Question types whose information table is stored (the pool warmed at startup)
+INFO_TABLE_TYPES = (1,)
+
+_GRAPH_RELATIONS = ("synonyms", "antonyms", "hypernyms", "hyponyms")
+
+# Modules whose code determines the stored values
+_DERIVATION_MODULES = (cfg, vocab_module, vocab_store, bank_module, parameter_initializer,
+                       distractor_engine, topic_mapper, graph_connector)
+
+
+def snapshot_key(vocab_path: Path | None = None, graph_path: Path | None = None) -> str:
+    """Content hash of the snapshot inputs."""
+    h = hashlib.sha256(f"format={SNAPSHOT_FORMAT_VERSION};irt_model={cfg.IRT_MODEL}".encode())
+    sources = [Path(vocab_path or VOCAB_DB_PATH), Path(graph_path or GRAPH_DB_PATH)]
+    sources += [Path(module.__file__) for module in _DERIVATION_MODULES]
+    for path in sources:
+        h.update(path.name.encode())
+        h.update(path.read_bytes() if path.exists() else b"<missing>")
+    return h.hexdigest()[:32]
+
+
+class _Writer:
+    def __init__(self, path: Path):
+        self.path = path
+
+    def array(self, name: str, arr: np.ndarray) -> None:
+        np.save(self.path / f"{name}.npy", np.ascontiguousarray(arr), allow_pickle=False)
+
+    def strings(self, name: str, values: list[str]) -> None:
+        column = StringColumn.from_values(values)
+        self.array(f"{name}.blob", column.blob)
+        self.array(f"{name}.offsets", column.offsets)
+
+
+# ── Writing ───────────────────────────────────────────────────
+
+def _write_vocab(w: _Writer, store: VocabStore) -> dict:
+    for name, arr in store.arrays().items():
+        w.array(f"vocab.{name}", arr)
+    return {name: list(labels) for name, labels in store.labels.items()}
+
+
+def _write_banks(w: _Writer, vocab, info_table_types) -> dict:
+    manifest = {"question_types": [], "info_tables": {}}
+    for question_type in QUESTION_TYPES:
+        bank = ItemBank.from_items(
+            parameter_initializer.initialize_item_parameters(vocab, question_type=question_type)
+        )
+        if not manifest["question_types"]:
+            for name in ("item_ids", "pos_code", "topic_code", "cefr_code", "is_loanword"):
+                w.array(f"bank.{name}", getattr(bank, name))
+            manifest["labels"] = {"pos": bank.pos_labels, "topic": bank.topic_labels,
+                                  "cefr": bank.cefr_labels}
+        w.array(f"params.qt{question_type}", np.stack([bank.a, bank.b, bank.c]))
+        manifest["question_types"].append(question_type)
+        if question_type in info_table_types:
+            table = InformationTable(bank)
+            w.array(f"info.qt{question_type}.table", table.table)
+            w.array(f"info.qt{question_type}.top_rows", table.top_rows)
+            manifest["info_tables"][str(question_type)] = {
+                "step": table.step, "theta_range": [table.theta_min, table.theta_max],
+                "top_k": table.top_k,
+            }
+    return manifest
+
+
+def _write_graph(w: _Writer, graph: VocabGraph) -> None:
+    relations = {name: getattr(graph, f"_{name}") for name in _GRAPH_RELATIONS}
+    nodes = sorted(set().union(*(adj.keys() for adj in relations.values()),
+                               *(t for adj in relations.values() for t in adj.values())))
+    index = {word: i for i, word in enumerate(nodes)}
+    w.strings("graph.nodes", nodes)
+    for name, adj in relations.items():
+        targets = [sorted(adj.get(word, ())) for word in nodes]
+        row_ptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+        np.cumsum([len(t) for t in targets], out=row_ptr[1:])
+        w.array(f"graph.{name}.row_ptr", row_ptr)
+        w.array(f"graph.{name}.cols", np.array([index[t] for ts in targets for t in ts], dtype=np.int32))
+    (w.path / "graph.props.json").write_text(json.dumps(graph._word_props, ensure_ascii=False),
+                                             encoding="utf-8")
+
+
+def write_snapshot(
+    key: str,
+    vocab: VocabStore | list[VocabWord],
+    graph: VocabGraph | None = None,
+    directory: Path | None = None,
+    info_table_types: tuple[int, ...] = INFO_TABLE_TYPES,
+    keep: int = SNAPSHOT_KEEP,
+) -> Path:
+    """Compile a snapshot under ``directory/key`` (no-op if it already exists).
+
+    The snapshot is written to a temporary sibling and renamed into place,
+    so concurrent starts never observe a half-written directory. Older
+    snapshots beyond the newest ``keep`` are then removed.
+    """
+    directory = Path(directory or SNAPSHOT_DIR)
+    final = directory / key
+    if (final / "manifest.json").exists():
+        return final
+    directory.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(prefix=f".{key}-", dir=directory))
+    try:
+        w = _Writer(tmp)
+        store = as_vocab_store(vocab)
+        vocab_labels = _write_vocab(w, store)
+        manifest = _write_banks(w, vocab, info_table_types)
+        manifest["vocab_labels"] = vocab_labels
+        pools = DistractorEngine(store).build_pools()
+        for name, arr in pools.arrays().items():
+            w.array(f"pools.{name}", arr)
+        has_graph = graph is not None and graph.is_loaded
+        if has_graph:
+            _write_graph(w, graph)
+        manifest.update({
+            "format": SNAPSHOT_FORMAT_VERSION,
+            "key": key,
+            "created_at": time.time(),
+            "n_words": len(vocab),
+            "graph": has_graph,
+        })
+        (tmp / "manifest.json").write_text(json.dumps(manifest, ensure_ascii=False, indent=1),
+                                           encoding="utf-8")
+        try:
+            os.rename(tmp, final)
+        except OSError:
+            if not (final / "manifest.json").exists():
+                raise
+            # Another process published the same key first
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    prune_snapshots(directory, keep, current=key)
+    return final
+
+
+def prune_snapshots(
+    directory: Path | None = None, keep: int = SNAPSHOT_KEEP, current: str | None = None,
+) -> list[str]:
+    """Remove all but the newest ``keep`` snapshots (``current`` is always kept).
+
+    The previous snapshot stays by default, so workers still running on the
+    old sources can reopen it until they reload. In-progress writes
+    (dot-prefixed temporary directories) are left alone. Returns the
+    removed keys.
+    """
+    directory = Path(directory or SNAPSHOT_DIR)
+    if not directory.is_dir():
+        return []
+
+    def created_at(path: Path) -> float:
+        try:
+            return json.loads((path / "manifest.json").read_text(encoding="utf-8"))["created_at"]
+        except (OSError, ValueError, KeyError):
+            return path.stat().st_mtime
+
+    others = [p for p in directory.iterdir()
+              if p.is_dir() and not p.name.startswith(".") and p.name != current]
+    others.sort(key=created_at, reverse=True)
+    stale = others[max(keep - (current is not None), 0):]
+    for path in stale:
+        shutil.rmtree(path, ignore_errors=True)
+        logger.info(f"Removed old snapshot {path.name}")
+    return [path.name for path in stale]
+
+
+# ── Reading ───────────────────────────────────────────────────
+
+class Snapshot:
+    """A compiled snapshot directory opened for reading."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.manifest = json.loads((self.path / "manifest.json").read_text(encoding="utf-8"))
+        if self.manifest.get("format") != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format: {self.manifest.get('format')}")
+        self._store: VocabStore | None = None
+        self._words: list[str] | None = None
+
+    @property
+    def key(self) -> str:
+        return self.manifest["key"]
+
+    @property
+    def has_graph(self) -> bool:
+        return self.manifest["graph"]
+
+    def _array(self, name: str) -> np.ndarray:
+        path = self.path / f"{name}.npy"
+        try:
+            return np.load(path, mmap_mode="c", allow_pickle=False)
+        except ValueError:
+            # Zero-length arrays cannot be memory-mapped
+            return np.load(path, allow_pickle=False)
+
+    def _strings(self, name: str) -> list[str]:
+        return StringColumn(self._array(f"{name}.blob"), self._array(f"{name}.offsets")).to_list()
+
+    def vocab_store(self) -> VocabStore:
+        """The cleaned vocabulary as a VocabStore over the mapped columns."""
+        if self._store is None:
+            prefix = "vocab."
+            arrays = {p.stem[len(prefix):]: self._array(p.stem) for p in self.path.glob(f"{prefix}*.npy")}
+            self._store = VocabStore(arrays, self.manifest["vocab_labels"])
+        return self._store
+
+    def words(self) -> list[str]:
+        """Display form of every word, in item-ID order."""
+        if self._words is None:
+            self._words = self.vocab_store().text_column("word_display")
+        return self._words
+
+    def vocabulary(self) -> list[VocabWord]:
+        """Materialize the cleaned VocabWord list."""
+        return self.vocab_store().to_words()
+
+    def distractor_pools(self) -> DistractorPools:
+        """Distractor candidate pools for the words of ``vocab_store()``."""
+        prefix = "pools."
+        return DistractorPools({p.stem[len(prefix):]: self._array(p.stem)
+                                for p in self.path.glob(f"{prefix}*.npy")})
+
+    def item_bank(self, question_type: int) -> ItemBank | None:
+        """The initialized item pool for a question type, or None if not stored."""
+        if question_type not in self.manifest["question_types"]:
+            return None
+        a, b, c = self._array(f"params.qt{question_type}")
+        labels = self.manifest["labels"]
+        bank = ItemBank(
+            item_ids=self._array("bank.item_ids"),
+            words=self.words(),
+            a=a, b=b, c=c,
+            question_type=np.full(len(a), question_type, dtype=np.int8),
+            pos_code=self._array("bank.pos_code"),
+            topic_code=self._array("bank.topic_code"),
+            cefr_code=self._array("bank.cefr_code"),
+            is_loanword=self._array("bank.is_loanword"),
+            pos_labels=tuple(labels["pos"]),
+            topic_labels=tuple(labels["topic"]),
+            cefr_labels=tuple(labels["cefr"]),
+        )
+        info = self.manifest["info_tables"].get(str(question_type))
+        if info is not None:
+            attach_information_table(bank, InformationTable(
+                bank, info["step"], tuple(info["theta_range"]), info["top_k"],
+                arrays=(self._array(f"info.qt{question_type}.table"),
+                        self._array(f"info.qt{question_type}.top_rows")),
+            ))
+        return bank
+
+    def graph_adjacency(self) -> tuple[dict[str, dict], dict[str, dict[str, set[str]]]] | None:
+        """``(word_props, {relation: {word: neighbors}})``, or None without a graph."""
+        if not self.has_graph:
+            return None
+        nodes = self._strings("graph.nodes")
+        relations = {}
+        for name in _GRAPH_RELATIONS:
+            bounds = self._array(f"graph.{name}.row_ptr").tolist()
+            cols = self._array(f"graph.{name}.cols").tolist()
+            relations[name] = {
+                nodes[i]: {nodes[j] for j in cols[lo:hi]}
+                for i, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:])) if hi > lo
+            }
+        props = json.loads((self.path / "graph.props.json").read_text(encoding="utf-8"))
+        return props, relations
+
+
+def open_snapshot(
+    vocab_path: Path | None = None,
+    graph_path: Path | None = None,
+    directory: Path | None = None,
+    build: bool = True,
+) -> Snapshot | None:
+    """Open the snapshot for the current sources, compiling it first if needed.
+
+    With ``build=False`` a missing snapshot returns None.
+    """
+    key = snapshot_key(vocab_path, graph_path)
+    path = Path(directory or SNAPSHOT_DIR) / key
+    if not (path / "manifest.json").exists():
+        if not build:
+            return None
+        start = time.perf_counter()
+        vocab = load_vocabulary(vocab_path)
+        graph = VocabGraph()
+        graph.load(Path(graph_path or GRAPH_DB_PATH))
+        path = write_snapshot(key, vocab, graph, directory)
+        logger.info(f"Compiled snapshot {key} in {time.perf_counter() - start:.2f}s")
+    return Snapshot(path)
+
+
+def main(argv: list[str] | None = None) -> Path:
+    parser = argparse.ArgumentParser(description="Compile the vocabulary/item-bank snapshot.")
+    parser.add_argument("--vocab", type=Path, default=None)
+    parser.add_argument("--graph", type=Path, default=None)
+    parser.add_argument("--dir", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    snapshot = open_snapshot(args.vocab, args.graph, args.dir)
+    built = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reopened = Snapshot(snapshot.path)
+    vocab = reopened.vocab_store()
+    reopened.item_bank(1)
+    opened = time.perf_counter() - start
+    print(f"{snapshot.path} ({len(vocab)} words, graph={'yes' if snapshot.has_graph else 'no'})")
+    print(f"  open_snapshot: {built * 1000:.0f} ms, reopen + vocab store + pool: {opened * 1000:.0f} ms")
+    return snapshot.path
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""Columnar vocabulary store.
+
+``VocabStore`` holds the cleaned vocabulary as NumPy columns instead of one
+``VocabWord`` object per word:
+
+- free text (word, meanings, sentences) as NUL-separated UTF-8 blobs with
+  byte offsets, decoded only when a field is read;
+- repeated categorical fields (pos, cefr, curriculum, topic, register, ...)
+  as int16 codes plus a label table;
+- relation lists (synonym, antonym, ...) as CSR offset arrays into one
+  interned term table, so relation checks compare integer term IDs.
+
+Callers index or iterate the store to get ``VocabWordView`` objects, which
+expose the same read-only attributes as ``VocabWord``. The arrays can be
+built from ``VocabWord`` lists or adopted from a memory-mapped snapshot.
+"""
+import dataclasses
+from collections.abc import Iterable, Iterator
+
+import numpy as np
+
+from ..item_bank.bank import _encode
+from .load_vocabulary import VocabWord
+
+_TEXT_FIELDS = (
+    "word_display", "meaning_ko", "definition_en",
+    "sentence_1", "sentence_2", "sentence_3", "error_pattern", "stem",
+)
+_CATEGORICAL_FIELDS = (
+    "pos", "cefr", "freq_grade", "kr_curriculum", "grade_range", "lexile",
+    "topic", "domain", "register", "oxford3000", "ngsl",
+)
+_RELATION_FIELDS = ("synonym", "antonym", "hypernym", "hyponym", "word_family", "collocation")
+_NUMERIC_FIELDS = ("freq_rank", "gse", "educational_value", "is_loanword")
+
+_FIELD_ORDER = tuple(f.name for f in dataclasses.fields(VocabWord))
+if set(_FIELD_ORDER) != set(_TEXT_FIELDS + _CATEGORICAL_FIELDS + _RELATION_FIELDS + _NUMERIC_FIELDS):
+    raise TypeError("VocabStore column layout is out of sync with VocabWord fields")
+
+
+class StringColumn:
+    """Strings stored as one NUL-separated UTF-8 blob plus byte offsets.
+
+    Value ``i`` is ``blob[offsets[i]:offsets[i + 1] - 1]``; the separators
+    let a whole column decode with a single ``split``.
+    """
+
+    __slots__ = ("blob", "offsets", "_buf")
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray):
+        self.blob = blob
+        self.offsets = offsets
+        self._buf = memoryview(blob).cast("B") if len(blob) else b""
+
+    @classmethod
+    def from_values(cls, values: Iterable[str]) -> "StringColumn":
+        encoded = [v.encode() for v in values]
+        if any(b"\0" in e for e in encoded):
+            raise ValueError("string columns cannot contain NUL characters")
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(e) + 1 for e in encoded], out=offsets[1:])
+        blob = np.frombuffer(b"\0".join(encoded) + b"\0" if encoded else b"", dtype=np.uint8)
+        return cls(blob, offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return str(self._buf[self.offsets[i]:self.offsets[i + 1] - 1], "utf-8")
+
+    def to_list(self) -> list[str]:
+        if len(self) == 0:
+            return []
+        return str(self._buf, "utf-8").split("\0")[:-1]
+
+    @property
+    def nbytes(self) -> int:
+        return self.blob.nbytes + self.offsets.nbytes
+
+
+class VocabStore:
+    """The vocabulary as NumPy columns; rows are positions in ``load_vocabulary`` order."""
+
+    def __init__(self, arrays: dict[str, np.ndarray], labels: dict[str, tuple[str, ...]]):
+        self._text = {
+            name: StringColumn(arrays[f"text.{name}.blob"], arrays[f"text.{name}.offsets"])
+            for name in _TEXT_FIELDS
+        }
+        self.codes = {name: arrays[f"cat.{name}"] for name in _CATEGORICAL_FIELDS}
+        self.labels = {name: tuple(labels[name]) for name in _CATEGORICAL_FIELDS}
+        self.terms = StringColumn(arrays["terms.blob"], arrays["terms.offsets"])
+        self.term_lower = arrays["terms.lower"]
+        self._relations = {
+            name: (arrays[f"rel.{name}.ptr"], arrays[f"rel.{name}.ids"]) for name in _RELATION_FIELDS
+        }
+        self.word_lower = arrays["word_lower"]
+        self.freq_rank = arrays["freq_rank"]
+        self.gse = arrays["gse"]
+        self.educational_value = arrays["educational_value"]
+        self.is_loanword = arrays["is_loanword"]
+
+        self._row_by_word: dict[str, int] | None = None
+        self._term_ids: dict[str, int] | None = None
+        self._rows_by_term: np.ndarray | None = None
+        self._canonical_rows: np.ndarray | None = None
+
+    @classmethod
+    def from_words(cls, words: Iterable[VocabWord]) -> "VocabStore":
+        """Build a store from VocabWord objects (copies their values)."""
+        words = list(words)
+        arrays: dict[str, np.ndarray] = {}
+        labels: dict[str, tuple[str, ...]] = {}
+
+        for name in _TEXT_FIELDS:
+            column = StringColumn.from_values(getattr(w, name) for w in words)
+            arrays[f"text.{name}.blob"], arrays[f"text.{name}.offsets"] = column.blob, column.offsets
+        for name in _CATEGORICAL_FIELDS:
+            arrays[f"cat.{name}"], labels[name] = _encode(getattr(w, name) for w in words)
+
+        term_ids: dict[str, int] = {}
+        terms: list[str] = []
+
+        def term_id(s: str) -> int:
+            tid = term_ids.get(s)
+            if tid is None:
+                tid = term_ids[s] = len(terms)
+                terms.append(s)
+            return tid
+
+        for name in _RELATION_FIELDS:
+            lists = [getattr(w, name) for w in words]
+            ptr = np.zeros(len(words) + 1, dtype=np.int32)
+            np.cumsum([len(values) for values in lists], out=ptr[1:])
+            arrays[f"rel.{name}.ptr"] = ptr
+            arrays[f"rel.{name}.ids"] = np.array([term_id(t) for values in lists for t in values],
+                                                 dtype=np.int32)
+        arrays["word_lower"] = np.array([term_id(w.word_display.lower()) for w in words], dtype=np.int32)
+        lower = []
+        while len(lower) < len(terms):  # lowercase forms may add terms
+            lower.append(term_id(terms[len(lower)].lower()))
+        column = StringColumn.from_values(terms)
+        arrays["terms.blob"], arrays["terms.offsets"] = column.blob, column.offsets
+        arrays["terms.lower"] = np.array(lower, dtype=np.int32)
+
+        arrays["freq_rank"] = np.array([w.freq_rank for w in words], dtype=np.int32)
+        arrays["gse"] = np.array([np.nan if w.gse is None else w.gse for w in words], dtype=np.float64)
+        arrays["educational_value"] = np.array([w.educational_value or 0 for w in words], dtype=np.int8)
+        arrays["is_loanword"] = np.array([w.is_loanword for w in words], dtype=bool)
+        return cls(arrays, labels)
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        """All columns by name (the inverse of the constructor's ``arrays``)."""
+        out = {}
+        for name, column in self._text.items():
+            out[f"text.{name}.blob"], out[f"text.{name}.offsets"] = column.blob, column.offsets
+        for name, codes in self.codes.items():
+            out[f"cat.{name}"] = codes
+        out["terms.blob"], out["terms.offsets"] = self.terms.blob, self.terms.offsets
+        out["terms.lower"] = self.term_lower
+        for name, (ptr, ids) in self._relations.items():
+            out[f"rel.{name}.ptr"], out[f"rel.{name}.ids"] = ptr, ids
+        for name in ("word_lower", *_NUMERIC_FIELDS):
+            out[name] = getattr(self, name)
+        return out
+
+    # ── Row access ──────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return len(self.word_lower)
+
+    def __getitem__(self, row: int) -> "VocabWordView":
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        return VocabWordView(self, row)
+
+    def __iter__(self) -> Iterator["VocabWordView"]:
+        for row in range(len(self)):
+            yield VocabWordView(self, row)
+
+    def row_of(self, word: str) -> int | None:
+        """Row of a word (case-insensitive; the last duplicate wins)."""
+        if self._row_by_word is None:
+            self._row_by_word = {w.lower(): row for row, w in enumerate(self._text["word_display"].to_list())}
+        return self._row_by_word.get(word.lower())
+
+    def get(self, word: str) -> "VocabWordView | None":
+        row = self.row_of(word)
+        return None if row is None else VocabWordView(self, row)
+
+    def term_id(self, term: str) -> int | None:
+        """ID of an interned term, or None if no word or relation uses it."""
+        if self._term_ids is None:
+            self._term_ids = {t: i for i, t in enumerate(self.terms.to_list())}
+        return self._term_ids.get(term)
+
+    @property
+    def rows_by_term(self) -> np.ndarray:
+        """For each term ID, the row ``row_of`` returns for that term (-1 if none)."""
+        if self._rows_by_term is None:
+            rev = self.word_lower[::-1]
+            _, first = np.unique(rev, return_index=True)
+            rows = np.full(len(self.terms), -1, dtype=np.int32)
+            rows[rev[first]] = len(self) - 1 - first
+            self._rows_by_term = rows
+        return self._rows_by_term
+
+    @property
+    def canonical_rows(self) -> np.ndarray:
+        """For each row, the row ``row_of`` returns for its word."""
+        if self._canonical_rows is None:
+            self._canonical_rows = self.rows_by_term[self.word_lower]
+        return self._canonical_rows
+
+    # ── Column access ───────────────────────────────────────────
+
+    def text(self, name: str, row: int) -> str:
+        return self._text[name][row]
+
+    def text_column(self, name: str) -> list[str]:
+        """Every value of a text field, decoded in one pass."""
+        return self._text[name].to_list()
+
+    def has_text(self, name: str) -> np.ndarray:
+        """Per-row mask of non-empty values of a text field (no decoding)."""
+        return np.diff(self._text[name].offsets) > 1
+
+    def has_relation(self, name: str) -> np.ndarray:
+        """Per-row mask of non-empty relation lists."""
+        return np.diff(self._relations[name][0]) > 0
+
+    def label(self, name: str, row: int) -> str:
+        return self.labels[name][self.codes[name][row]]
+
+    def code_of(self, name: str, label: str) -> int:
+        """Code of a categorical label, or -1 if no word has it."""
+        try:
+            return self.labels[name].index(label)
+        except ValueError:
+            return -1
+
+    def relation_ids(self, name: str, row: int) -> np.ndarray:
+        ptr, ids = self._relations[name]
+        return ids[ptr[row]:ptr[row + 1]]
+
+    def relation(self, name: str, row: int) -> list[str]:
+        return [self.terms[t] for t in self.relation_ids(name, row).tolist()]
+
+    def relation_csr(self, name: str) -> tuple[np.ndarray, np.ndarray]:
+        return self._relations[name]
+
+    def to_words(self) -> list[VocabWord]:
+        """Materialize VocabWord objects (for callers that need mutable copies)."""
+        return [view.to_word() for view in self]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(arr.nbytes for arr in self.arrays().values())
+
+
+def as_vocab_store(vocab: "VocabStore | Iterable[VocabWord]") -> VocabStore:
+    """Return ``vocab`` as a VocabStore, converting a VocabWord list if needed."""
+    if isinstance(vocab, VocabStore):
+        return vocab
+    return VocabStore.from_words(vocab)
+
+
+class VocabWordView:
+    """Read-only view of one VocabStore row with the attributes of VocabWord."""
+
+    __slots__ = ("store", "row")
+
+    def __init__(self, store: VocabStore, row: int):
+        self.store = store
+        self.row = row
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, VocabWordView):
+            return self.store is other.store and self.row == other.row
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((id(self.store), self.row))
+
+    def __repr__(self) -> str:
+        return f"VocabWordView(row={self.row}, word_display={self.word_display!r})"
+
+    @property
+    def freq_rank(self) -> int:
+        return int(self.store.freq_rank[self.row])
+
+    @property
+    def gse(self) -> float | None:
+        value = float(self.store.gse[self.row])
+        return None if value != value else value
+
+    @property
+    def educational_value(self) -> int | None:
+        return int(self.store.educational_value[self.row]) or None
+
+    @property
+    def is_loanword(self) -> bool:
+        return bool(self.store.is_loanword[self.row])
+
+    def to_word(self) -> VocabWord:
+        return VocabWord(**{name: getattr(self, name) for name in _FIELD_ORDER})
+
+
+def _text_property(name: str) -> property:
+    return property(lambda self: self.store._text[name][self.row])
+
+
+def _label_property(name: str) -> property:
+    return property(lambda self: self.store.labels[name][self.store.codes[name][self.row]])
+
+
+def _relation_property(name: str) -> property:
+    return property(lambda self: self.store.relation(name, self.row))
+
+
+for _name in _TEXT_FIELDS:
+    setattr(VocabWordView, _name, _text_property(_name))
+for _name in _CATEGORICAL_FIELDS:
+    setattr(VocabWordView, _name, _label_property(_name))
+for _name in _RELATION_FIELDS:
+    setattr(VocabWordView, _name, _relation_property(_name))
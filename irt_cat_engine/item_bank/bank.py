@@ -0,0 +1,230 @@
+"""Array-backed item bank.
+
+Item parameters and categorical metadata live in contiguous NumPy columns so
+that selection, scoring and exposure analysis can work on whole-pool arrays.
+``ItemParameters`` objects are only materialized on demand, as lightweight
+row views for API serialization and session bookkeeping.
+"""
+from collections.abc import Iterable, Iterator
+
+import numpy as np
+
+from ..models.irt_2pl import ItemParameters
+
+
+def _encode(values: Iterable[str]) -> tuple[np.ndarray, tuple[str, ...]]:
+    """Intern a column of strings as int16 codes plus a label table."""
+    index: dict[str, int] = {}
+    codes = [index.setdefault(v, len(index)) for v in values]
+    return np.asarray(codes, dtype=np.int16), tuple(index)
+
+
+class ItemBank:
+    """An item pool stored as NumPy columns.
+
+    Rows are positions in the arrays; ``item_ids`` maps rows to item IDs.
+    Indexing or iterating yields fresh ``ItemParameters`` views, so callers
+    can never mutate the shared pool through a row object. An item ID may
+    own several rows (one per question type in a joint pool, see
+    ``joint_pool.py``); ``rows_for_ids`` returns all of them.
+    """
+
+    def __init__(
+        self,
+        item_ids: np.ndarray,
+        words: list[str],
+        a: np.ndarray,
+        b: np.ndarray,
+        c: np.ndarray,
+        question_type: np.ndarray,
+        pos_code: np.ndarray,
+        topic_code: np.ndarray,
+        cefr_code: np.ndarray,
+        is_loanword: np.ndarray,
+        pos_labels: tuple[str, ...],
+        topic_labels: tuple[str, ...],
+        cefr_labels: tuple[str, ...],
+    ):
+        self.item_ids = np.asarray(item_ids, dtype=np.int32)
+        self.words = words
+        self.a = np.asarray(a, dtype=np.float64)
+        self.b = np.asarray(b, dtype=np.float64)
+        self.c = np.asarray(c, dtype=np.float64)
+        self.question_type = np.asarray(question_type, dtype=np.int8)
+        self.pos_code = np.asarray(pos_code, dtype=np.int16)
+        self.topic_code = np.asarray(topic_code, dtype=np.int16)
+        self.cefr_code = np.asarray(cefr_code, dtype=np.int16)
+        self.is_loanword = np.asarray(is_loanword, dtype=bool)
+        self.pos_labels = pos_labels
+        self.topic_labels = topic_labels
+        self.cefr_labels = cefr_labels
+
+        # Derived from a/b/c, which never change after construction
+        self._information_table = None
+        self._score_curve = None
+        # CEFR codes never change after construction, so masks are reusable
+        self._cefr_masks: dict[tuple[str, ...], np.ndarray] = {}
+
+        self.topic_index = {label: i for i, label in enumerate(topic_labels)}
+        self.cefr_index = {label: i for i, label in enumerate(cefr_labels)}
+
+        n = len(self.item_ids)
+        self._dense_ids = bool(n == 0 or np.array_equal(self.item_ids, np.arange(n)))
+        self._row_by_id: dict[int, int] | None = None
+        self._row_by_word: dict[str, int] | None = None
+        self._id_order: tuple[np.ndarray, np.ndarray] | None = None
+
+    @classmethod
+    def from_items(cls, items: Iterable[ItemParameters]) -> "ItemBank":
+        """Build a bank from ItemParameters objects (copies their values)."""
+        items = list(items)
+        pos_code, pos_labels = _encode(item.pos for item in items)
+        topic_code, topic_labels = _encode(item.topic for item in items)
+        cefr_code, cefr_labels = _encode(item.cefr for item in items)
+        return cls(
+            item_ids=np.array([item.item_id for item in items], dtype=np.int32),
+            words=[item.word for item in items],
+            a=np.array([item.discrimination_a for item in items], dtype=np.float64),
+            b=np.array([item.difficulty_b for item in items], dtype=np.float64),
+            c=np.array([item.guessing_c for item in items], dtype=np.float64),
+            question_type=np.array([item.question_type for item in items], dtype=np.int8),
+            pos_code=pos_code,
+            topic_code=topic_code,
+            cefr_code=cefr_code,
+            is_loanword=np.array([item.is_loanword for item in items], dtype=bool),
+            pos_labels=pos_labels,
+            topic_labels=topic_labels,
+            cefr_labels=cefr_labels,
+        )
+
+    # ── Row access ──────────────────────────────────────────────
+
+    def with_parameters(
+        self, a: np.ndarray, b: np.ndarray, c: np.ndarray, question_type: np.ndarray | None = None,
+    ) -> "ItemBank":
+        """A bank over the same items with other IRT parameters (and question types).
+
+        Every other column is shared with this bank, not copied.
+        """
+        return ItemBank(
+            item_ids=self.item_ids, words=self.words, a=a, b=b, c=c,
+            question_type=self.question_type if question_type is None else question_type,
+            pos_code=self.pos_code,
+            topic_code=self.topic_code, cefr_code=self.cefr_code, is_loanword=self.is_loanword,
+            pos_labels=self.pos_labels, topic_labels=self.topic_labels, cefr_labels=self.cefr_labels,
+        )
+
+    def __len__(self) -> int:
+        return len(self.item_ids)
+
+    def __getitem__(self, row: int) -> ItemParameters:
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        return ItemParameters(
+            item_id=int(self.item_ids[row]),
+            word=self.words[row],
+            difficulty_b=float(self.b[row]),
+            discrimination_a=float(self.a[row]),
+            guessing_c=float(self.c[row]),
+            question_type=int(self.question_type[row]),
+            pos=self.pos_labels[self.pos_code[row]],
+            cefr=self.cefr_labels[self.cefr_code[row]],
+            topic=self.topic_labels[self.topic_code[row]],
+            is_loanword=bool(self.is_loanword[row]),
+        )
+
+    def __iter__(self) -> Iterator[ItemParameters]:
+        for row in range(len(self)):
+            yield self[row]
+
+    def row_of(self, item_id: int) -> int | None:
+        """Row index for an item ID, or None if the item is not in the bank."""
+        if self._dense_ids:
+            return item_id if 0 <= item_id < len(self) else None
+        if self._row_by_id is None:
+            self._row_by_id = {int(i): row for row, i in enumerate(self.item_ids)}
+        return self._row_by_id.get(item_id)
+
+    def _sorted_ids(self) -> tuple[np.ndarray, np.ndarray]:
+        """(order, item_ids[order]): rows sorted by item ID (cached; IDs never change)."""
+        if self._id_order is None:
+            order = np.argsort(self.item_ids, kind="stable")
+            self._id_order = order, self.item_ids[order]
+        return self._id_order
+
+    def rows_for_ids(self, item_ids: Iterable[int]) -> np.ndarray:
+        """Every row of each item ID in a collection (unknown IDs are dropped)."""
+        if self._dense_ids:
+            rows = [self.row_of(int(i)) for i in item_ids]
+            return np.array([r for r in rows if r is not None], dtype=np.intp)
+        ids = np.fromiter(item_ids, dtype=np.int64)
+        order, sorted_ids = self._sorted_ids()
+        lo = np.searchsorted(sorted_ids, ids, side="left")
+        counts = np.searchsorted(sorted_ids, ids, side="right") - lo
+        ends = np.cumsum(counts)
+        positions = np.arange(ends[-1] if len(ends) else 0) - np.repeat(ends - counts - lo, counts)
+        return order[positions].astype(np.intp)
+
+    def lookup_rows(self, item_ids: np.ndarray) -> np.ndarray:
+        """Vectorized ``row_of``: a row of each ID, -1 where it is not in the bank."""
+        item_ids = np.asarray(item_ids, dtype=np.int64)
+        if len(self) == 0:
+            return np.full(len(item_ids), -1, dtype=np.int64)
+        if self._dense_ids:
+            return np.where((item_ids >= 0) & (item_ids < len(self)), item_ids, -1)
+        order, sorted_ids = self._sorted_ids()
+        pos = np.minimum(np.searchsorted(sorted_ids, item_ids), len(sorted_ids) - 1)
+        return np.where(sorted_ids[pos] == item_ids, order[pos], -1)
+
+    def get(self, item_id: int) -> ItemParameters | None:
+        """ItemParameters view for an item ID."""
+        row = self.row_of(item_id)
+        return None if row is None else self[row]
+
+    def get_by_word(self, word: str) -> ItemParameters | None:
+        """ItemParameters view for a word (case-insensitive)."""
+        if self._row_by_word is None:
+            self._row_by_word = {w.lower(): row for row, w in enumerate(self.words)}
+        row = self._row_by_word.get(word.lower())
+        return None if row is None else self[row]
+
+    def cefr_mask(self, levels: Iterable[str]) -> np.ndarray:
+        """Boolean mask of rows whose CEFR level is in ``levels`` (cached, read-only)."""
+        key = tuple(levels)
+        mask = self._cefr_masks.get(key)
+        if mask is None:
+            codes = [self.cefr_index[lv] for lv in key if lv in self.cefr_index]
+            mask = np.isin(self.cefr_code, codes)
+            mask.flags.writeable = False
+            self._cefr_masks[key] = mask
+        return mask
+
+    def freeze(self) -> "ItemBank":
+        """Make every column read-only, so the bank can be shared safely; returns self.
+
+        Parameters are never changed in place: recalibration builds a new
+        bank with ``with_parameters`` (see ``parameter_set.py``).
+        """
+        for arr in self._columns():
+            arr.flags.writeable = False
+        return self
+
+    def _columns(self) -> tuple[np.ndarray, ...]:
+        return (
+            self.item_ids, self.a, self.b, self.c, self.question_type,
+            self.pos_code, self.topic_code, self.cefr_code, self.is_loanword,
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the NumPy columns."""
+        return sum(arr.nbytes for arr in self._columns())
+
+
+def as_item_bank(items: "ItemBank | Iterable[ItemParameters]") -> ItemBank:
+    """Return ``items`` as an ItemBank, converting a list of ItemParameters if needed."""
+    if isinstance(items, ItemBank):
+        return items
+    return ItemBank.from_items(items)
@@ -8,6 +8,7 @@ import numpy as np
 from scipy.optimize import minimize_scalar, minimize
 
 from ..models.irt_2pl import probability
+from .bank import ItemBank
 from ..config import GUESSING_C_4CHOICE, GUESSING_C_BINARY
 
 
@@ -202,3 +203,32 @@ def calibrate_item(
         "p_correct": round(sum(r for _, r in responses) / n, 3),
         "model": "3PL" if use_3pl and n >= 500 else "2PL",
     }
+
+
+def calibrate_bank(
+    bank: ItemBank,
+    responses_by_item: dict[int, list[tuple[float, int]]],
+    use_3pl: bool = False,
+    **kwargs,
+) -> tuple[ItemBank, dict[int, dict]]:
+    """Run calibrate_item for each item with responses.
+
+    ``bank`` is not modified. The results come back as a new bank (see
+    ``ItemBank.with_parameters``); publish it to running servers as a
+    ``ParameterSet`` (``ParameterSet.from_banks``).
+
+    Returns:
+        (calibrated bank, item_id -> calibration metadata)
+    """
+    a, b, c = bank.a.copy(), bank.b.copy(), bank.c.copy()
+    metadata = {}
+    for item_id, responses in responses_by_item.items():
+        row = bank.row_of(item_id)
+        if row is None or not responses:
+            continue
+        b[row], a[row], c[row], metadata[item_id] = calibrate_item(
+            float(bank.b[row]), float(bank.a[row]), responses,
+            current_c=float(bank.c[row]), use_3pl=use_3pl,
+            question_type=int(bank.question_type[row]), **kwargs,
+        )
+    return bank.with_parameters(a, b, c), metadata
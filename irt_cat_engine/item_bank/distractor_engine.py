@@ -1,57 +1,244 @@
-"""Distractor generation engine for vocabulary test items."""
+"""Distractor generation engine for vocabulary test items.
+
+Candidate filtering (same POS, adjacent CEFR, synonym / word-family /
+shared-meaning exclusions) is done once per (word, strategy) and kept in
+``DistractorPools`` as the word's (POS, CEFR) candidate group plus the rows
+it excludes; generating an item then samples uniformly from every valid
+candidate, drawing only as many as it needs. Pools are built with the
+item-bank snapshot and computed on the fly for words outside the store.
+"""
 import random
+
+import numpy as np
+
 from ..data.load_vocabulary import VocabWord
 from ..data.graph_connector import VocabGraph
+from ..data.vocab_store import VocabStore, VocabWordView, as_vocab_store
+
+# Tokens ignored when comparing Korean meanings
+_COMMON_PARTICLES = {"을", "를", "이", "가", "의", "에", "로", "~", "하다", "되다"}
+
+
+# Strategies with a precomputed pool (Types 1/2, 3 and 4 fallback)
+POOL_STRATEGIES = ("meaning", "synonym", "antonym")
+
+
+def _meaning_tokens(meaning: str) -> set[str]:
+    return set(meaning.replace(",", " ").split()) - _COMMON_PARTICLES
+
+
+class DistractorPools:
+    """Every valid distractor candidate per (word, strategy), stored compactly.
+
+    A word's candidates are the rows of its (POS, CEFR) group - same POS,
+    adjacent CEFR levels, in candidate order - minus a short per-word list
+    of excluded rows, so the full candidate set is kept without storing it
+    per word. ``get`` also returns the topic codes of the word's primary
+    topic, which the meaning strategy prefers.
+    """
+
+    def __init__(self, arrays: dict[str, np.ndarray]):
+        self.group_of = arrays["group_of"]
+        self._group_ptr = arrays["group.ptr"]
+        self._group_rows = arrays["group.rows"]
+        self._ptr = {s: arrays[f"{s}.ptr"] for s in POOL_STRATEGIES}
+        self._excluded = {s: arrays[f"{s}.excluded"] for s in POOL_STRATEGIES}
+        self._topic_ptr = arrays["topic.ptr"]
+        self._topic_codes = arrays["topic.codes"]
+
+    @classmethod
+    def build(cls, engine: "DistractorEngine") -> "DistractorPools":
+        store = engine.store
+        n = len(store)
+        keys = store.codes["pos"].astype(np.int64) << 16 | store.codes["cefr"].astype(np.int64)
+        _, first, group_of = np.unique(keys, return_index=True, return_inverse=True)
+        groups = [engine._candidate_rows(store[int(r)]) for r in first]
+        arrays = {
+            "group_of": group_of.astype(np.int32),
+            "group.ptr": np.concatenate([[0], np.cumsum([len(g) for g in groups])]).astype(np.int32),
+            "group.rows": np.concatenate(groups).astype(np.int32) if groups else np.zeros(0, dtype=np.int32),
+        }
+        excluded = {s: [] for s in POOL_STRATEGIES}
+        topics = []
+        for row in range(n):
+            target = store[row]
+            rows = groups[group_of[row]]
+            for strategy in POOL_STRATEGIES:
+                excluded[strategy].append(rows[~engine._candidate_mask(strategy, target, rows)])
+            topics.append(engine._primary_topic_codes(target))
+        for name, chunks in [(f"{s}.excluded", excluded[s]) for s in POOL_STRATEGIES] + [("topic.codes", topics)]:
+            prefix = name.rsplit(".", 1)[0]
+            arrays[f"{prefix}.ptr"] = np.concatenate([[0], np.cumsum([len(c) for c in chunks])]).astype(np.int32)
+            arrays[name] = np.concatenate(chunks).astype(np.int32) if chunks else np.zeros(0, dtype=np.int32)
+        return cls(arrays)
+
+    def get(self, strategy: str, row: int) -> tuple[np.ndarray, np.ndarray]:
+        """(candidate rows in candidate order, primary topic codes) of one word."""
+        group = self.group_of[row]
+        rows = self._group_rows[self._group_ptr[group]:self._group_ptr[group + 1]]
+        ptr = self._ptr[strategy]
+        excluded = self._excluded[strategy][ptr[row]:ptr[row + 1]]
+        if len(excluded):
+            rows = rows[~np.isin(rows, excluded)]
+        return rows, self._topic_codes[self._topic_ptr[row]:self._topic_ptr[row + 1]]
+
+    def __len__(self) -> int:
+        return len(self.group_of)
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        out = {
+            "group_of": self.group_of, "group.ptr": self._group_ptr, "group.rows": self._group_rows,
+            "topic.ptr": self._topic_ptr, "topic.codes": self._topic_codes,
+        }
+        for strategy in POOL_STRATEGIES:
+            out[f"{strategy}.ptr"] = self._ptr[strategy]
+            out[f"{strategy}.excluded"] = self._excluded[strategy]
+        return out
+
+    @property
+    def nbytes(self) -> int:
+        return sum(arr.nbytes for arr in self.arrays().values())
+
+
+def _random_order(rows: np.ndarray):
+    """Yield ``rows`` in uniformly random order, drawing only as many as are consumed."""
+    rows = np.array(rows)
+    for i in range(len(rows)):
+        j = random.randrange(i, len(rows))
+        rows[i], rows[j] = rows[j], rows[i]
+        yield int(rows[i])
 
 
 class DistractorEngine:
-    """Generate distractors for vocabulary test items using metadata + graph."""
+    """Generate distractors for vocabulary test items using metadata + graph.
+
+    Candidate filtering runs on the integer columns of a VocabStore
+    (category codes, interned relation term IDs), so the engine keeps no
+    per-word Python indices of its own. ``pools`` must have been built for
+    the same store.
+    """
 
-    def __init__(self, vocab: list[VocabWord], graph: VocabGraph | None = None):
-        self.vocab = vocab
+    def __init__(
+        self,
+        vocab: VocabStore | list[VocabWord],
+        graph: VocabGraph | None = None,
+        pools: DistractorPools | None = None,
+    ):
+        self.store = as_vocab_store(vocab)
+        self.vocab = self.store
         self._graph = graph
-        # Build indices for fast lookup
-        self._by_pos: dict[str, list[VocabWord]] = {}
-        self._by_cefr: dict[str, list[VocabWord]] = {}
-        self._by_topic: dict[str, list[VocabWord]] = {}
-        self._by_word: dict[str, VocabWord] = {}
-        self._synonym_sets: dict[str, set[str]] = {}
-        self._antonym_sets: dict[str, set[str]] = {}
-
-        for w in vocab:
-            self._by_pos.setdefault(w.pos, []).append(w)
-            self._by_cefr.setdefault(w.cefr, []).append(w)
-            primary_topic = w.topic.split(",")[0].strip().split("|")[0].strip() if w.topic else ""
-            if primary_topic:
-                self._by_topic.setdefault(primary_topic, []).append(w)
-            self._by_word[w.word_display.lower()] = w
-            self._synonym_sets[w.word_display.lower()] = {
-                s.lower() for s in w.synonym
-            }
-            self._antonym_sets[w.word_display.lower()] = {
-                a.lower() for a in w.antonym
-            }
+        if pools is not None and len(pools) != len(self.store):
+            raise ValueError("Distractor pools were built for a different vocabulary")
+        self._pools = pools
+
+        # Synonym CSR flattened to (owner row, lowercase term ID) pairs
+        ptr, ids = self.store.relation_csr("synonym")
+        self._syn_owner = np.repeat(np.arange(len(self.store), dtype=np.int32), np.diff(ptr))
+        self._syn_lower = self.store.term_lower[ids]
+
+        # Korean meaning tokens as CSR, built on first use
+        self._token_ids: dict[str, int] | None = None
+        self._token_owner: np.ndarray | None = None
+        self._token_flat: np.ndarray | None = None
+
+    # ── Row-level helpers ───────────────────────────────────────
+
+    def _target_row(self, target) -> int | None:
+        if isinstance(target, VocabWordView) and target.store is self.store:
+            return target.row
+        return None
+
+    def _target_lower_id(self, target) -> int:
+        """Lowercase term ID of the target word (-1 if no word or relation uses it)."""
+        row = self._target_row(target)
+        if row is not None:
+            return int(self.store.word_lower[row])
+        tid = self.store.term_id(target.word_display.lower())
+        return -1 if tid is None else tid
+
+    def _target_ids(self, target, field: str) -> np.ndarray:
+        """Lowercase term IDs of one of the target's relation lists."""
+        row = self._target_row(target)
+        if row is not None:
+            return self.store.term_lower[self.store.relation_ids(field, row)]
+        ids = (self.store.term_id(s.lower()) for s in getattr(target, field))
+        return np.array([i for i in ids if i is not None], dtype=np.int32)
+
+    def _synonyms_of_term(self, lower_id: int) -> np.ndarray:
+        """Lowercase synonym IDs of the word ``lower_id`` resolves to."""
+        row = self.store.rows_by_term[lower_id] if lower_id >= 0 else -1
+        if row < 0:
+            return np.empty(0, dtype=np.int32)
+        return self.store.term_lower[self.store.relation_ids("synonym", row)]
+
+    def _rows_are_synonyms(self, row1: int, row2: int) -> bool:
+        l1 = int(self.store.word_lower[row1])
+        l2 = int(self.store.word_lower[row2])
+        return l2 in self._synonyms_of_term(l1) or l1 in self._synonyms_of_term(l2)
+
+    def _not_synonym_mask(self, rows: np.ndarray, lower_id: int) -> np.ndarray:
+        """Rows that are not synonyms of the word ``lower_id`` (either direction)."""
+        keep = np.ones(len(rows), dtype=bool)
+        if lower_id < 0:
+            return keep
+        keep &= ~np.isin(self.store.word_lower[rows], self._synonyms_of_term(lower_id))
+        owners = self._syn_owner[self._syn_lower == lower_id]
+        keep &= ~np.isin(self.store.canonical_rows[rows], owners)
+        return keep
+
+    def _meaning_overlap(self, meaning: str) -> np.ndarray:
+        """Per row, the number of meaning tokens shared with ``meaning``."""
+        if self._token_ids is None:
+            token_ids: dict[str, int] = {}
+            owner, flat = [], []
+            for row, m in enumerate(self.store.text_column("meaning_ko")):
+                for token in (_meaning_tokens(m) if m else ()):
+                    owner.append(row)
+                    flat.append(token_ids.setdefault(token, len(token_ids)))
+            self._token_owner = np.array(owner, dtype=np.int32)
+            self._token_flat = np.array(flat, dtype=np.int32)
+            self._token_ids = token_ids  # published last: other threads may be reading
+        target_tokens = [self._token_ids[t] for t in _meaning_tokens(meaning) if t in self._token_ids]
+        hits = np.isin(self._token_flat, target_tokens)
+        return np.bincount(self._token_owner[hits], minlength=len(self.store))
+
+    def _candidate_rows(self, target) -> np.ndarray:
+        """Same-POS rows in adjacent CEFR order (target level first), vocab order within each."""
+        pos_mask = self.store.codes["pos"] == self.store.code_of("pos", target.pos)
+        cefr = self.store.codes["cefr"]
+        return np.concatenate([
+            np.flatnonzero(pos_mask & (cefr == self.store.code_of("cefr", level)))
+            for level in self._get_adjacent_cefr(target.cefr)
+        ])
+
+    def _select(self, pool, n: int, selected: list[int] | None = None) -> list[int]:
+        """Greedily take rows from ``pool`` (any iterable) that are not synonyms of one another."""
+        selected = [] if selected is None else selected
+        for c in pool:
+            if len(selected) >= n:
+                break
+            if not any(self._rows_are_synonyms(c, existing) for existing in selected):
+                selected.append(c)
+        return selected
+
+    def _words(self, rows: list[int]) -> list[str]:
+        return [self.store.text("word_display", r) for r in rows]
+
+    # ── Word-level checks ───────────────────────────────────────
 
     def _is_synonym_of(self, word1: str, word2: str) -> bool:
         """Check if two words are synonyms."""
-        w1 = word1.lower()
-        w2 = word2.lower()
-        return (
-            w2 in self._synonym_sets.get(w1, set()) or
-            w1 in self._synonym_sets.get(w2, set())
-        )
+        w1 = self.store.term_id(word1.lower())
+        w2 = self.store.term_id(word2.lower())
+        if w1 is None or w2 is None:
+            return False
+        return w2 in self._synonyms_of_term(w1) or w1 in self._synonyms_of_term(w2)
 
     def _shares_meaning(self, word1: VocabWord, word2: VocabWord) -> bool:
         """Check if two words share overlapping Korean meanings."""
         if not word1.meaning_ko or not word2.meaning_ko:
             return False
-        m1_parts = set(word1.meaning_ko.replace(",", " ").split())
-        m2_parts = set(word2.meaning_ko.replace(",", " ").split())
-        # Remove very common particles
-        common_particles = {"을", "를", "이", "가", "의", "에", "로", "~", "하다", "되다"}
-        m1_parts -= common_particles
-        m2_parts -= common_particles
-        overlap = m1_parts & m2_parts
+        overlap = _meaning_tokens(word1.meaning_ko) & _meaning_tokens(word2.meaning_ko)
         return len(overlap) >= 2
 
     def _get_adjacent_cefr(self, cefr: str) -> list[str]:
@@ -68,6 +255,80 @@ class DistractorEngine:
             result.append(levels[idx + 1])
         return result
 
+    # ── Candidate pools ─────────────────────────────────────────
+
+    def _candidate_mask(self, strategy: str, target, rows: np.ndarray) -> np.ndarray:
+        """Which of the target's candidate ``rows`` pass the strategy's exclusion rules."""
+        target_lower = self._target_lower_id(target)
+        word_lower = self.store.word_lower[rows]
+
+        if strategy == "meaning":
+            keep = word_lower != target_lower
+            keep &= self._not_synonym_mask(rows, target_lower)
+            keep &= ~np.isin(word_lower, self._target_ids(target, "word_family"))
+            if target.meaning_ko:
+                keep &= self._meaning_overlap(target.meaning_ko)[rows] < 2
+            return keep
+
+        if strategy == "synonym":
+            keep = word_lower != target_lower
+            keep &= ~np.isin(word_lower, self._target_ids(target, "synonym"))
+            keep &= self._not_synonym_mask(rows, target_lower)
+            return keep
+
+        if strategy == "antonym":
+            excluded = np.concatenate([
+                self._target_ids(target, "antonym"),
+                self._target_ids(target, "synonym"),
+                [target_lower],
+            ])
+            keep = ~np.isin(word_lower, excluded)
+            # One row per word (the first in candidate order)
+            _, first = np.unique(word_lower, return_index=True)
+            unique = np.zeros(len(rows), dtype=bool)
+            unique[first] = True
+            return keep & unique
+
+        raise ValueError(f"Unknown distractor strategy: {strategy}")
+
+    def _primary_topic_codes(self, target) -> np.ndarray:
+        """Topic codes whose label contains the target's primary topic."""
+        primary_topic = target.topic.split(",")[0].strip().split("|")[0].strip() if target.topic else ""
+        return np.array([i for i, label in enumerate(self.store.labels["topic"])
+                         if primary_topic and primary_topic in label], dtype=np.int32)
+
+    def _topic_first(self, rows: np.ndarray, topic_codes: np.ndarray) -> tuple[np.ndarray, int]:
+        same = np.isin(self.store.codes["topic"][rows], topic_codes)
+        return np.concatenate([rows[same], rows[~same]]), int(same.sum())
+
+    def compute_pool(self, strategy: str, target) -> tuple[np.ndarray, int]:
+        """Every valid candidate row for one (word, strategy), in candidate order.
+
+        Returns ``(rows, n_preferred)``: for the meaning strategy the first
+        ``n_preferred`` rows share the target's primary topic.
+        """
+        rows = self._candidate_rows(target)
+        rows = rows[self._candidate_mask(strategy, target, rows)]
+        if strategy == "meaning":
+            return self._topic_first(rows, self._primary_topic_codes(target))
+        return rows, 0
+
+    def build_pools(self) -> "DistractorPools":
+        """Compute every word's pools and use them for subsequent items."""
+        self._pools = DistractorPools.build(self)
+        return self._pools
+
+    def _pool(self, strategy: str, target) -> tuple[np.ndarray, int]:
+        row = self._target_row(target)
+        if self._pools is None or row is None:
+            return self.compute_pool(strategy, target)
+        rows, topic_codes = self._pools.get(strategy, row)
+        if strategy == "meaning":
+            return self._topic_first(rows, topic_codes)
+        return rows, 0
+
+    # ── Strategies ──────────────────────────────────────────────
+
     def generate_meaning_distractors(
         self,
         target: VocabWord,
@@ -79,115 +340,37 @@ class DistractorEngine:
         For Type 1 (Korean meaning) or Type 2 (English definition) questions.
         Returns list of distractor meanings (Korean or English).
         """
-        adjacent_cefrs = self._get_adjacent_cefr(target.cefr)
-        target_word_lower = target.word_display.lower()
-
-        # Candidate pool: same POS, adjacent CEFR
-        candidates = []
-        for cefr in adjacent_cefrs:
-            for w in self._by_cefr.get(cefr, []):
-                if w.pos != target.pos:
-                    continue
-                if w.word_display.lower() == target_word_lower:
-                    continue
-                if self._is_synonym_of(target.word_display, w.word_display):
-                    continue
-                # Check word family overlap
-                target_family = {f.lower() for f in target.word_family}
-                if w.word_display.lower() in target_family:
-                    continue
-                if self._shares_meaning(target, w):
-                    continue
-                candidates.append(w)
-
-        # Prefer same-topic candidates
-        primary_topic = target.topic.split(",")[0].strip().split("|")[0].strip() if target.topic else ""
-        same_topic = [c for c in candidates if primary_topic and primary_topic in c.topic]
-        other_topic = [c for c in candidates if c not in same_topic]
+        pool, n_same_topic = self._pool("meaning", target)
 
         # Select: prefer same topic, fill with others
-        selected: list[VocabWord] = []
-        pool = same_topic.copy()
-        random.shuffle(pool)
-
-        for c in pool:
-            if len(selected) >= n:
-                break
-            # Ensure distractors aren't synonyms of each other
-            is_ok = True
-            for existing in selected:
-                if self._is_synonym_of(c.word_display, existing.word_display):
-                    is_ok = False
-                    break
-            if is_ok:
-                selected.append(c)
-
-        # Fill remaining from other topics
+        selected = self._select(_random_order(pool[:n_same_topic]), n)
         if len(selected) < n:
-            random.shuffle(other_topic)
-            for c in other_topic:
-                if len(selected) >= n:
-                    break
-                is_ok = True
-                for existing in selected:
-                    if self._is_synonym_of(c.word_display, existing.word_display):
-                        is_ok = False
-                        break
-                if is_ok:
-                    selected.append(c)
-
-        if field == "meaning_ko":
-            return [w.meaning_ko for w in selected[:n]]
-        else:
-            return [w.definition_en for w in selected[:n]]
+            selected = self._select(_random_order(pool[n_same_topic:]), n, selected)
+
+        field = "meaning_ko" if field == "meaning_ko" else "definition_en"
+        return [self.store.text(field, r) for r in selected[:n]]
 
     def generate_synonym_distractors(self, target: VocabWord, n: int = 3) -> list[str]:
         """Strategy B: For synonym questions. Distractors are non-synonyms.
 
         Returns list of distractor words (not synonyms of target).
         """
-        adjacent_cefrs = self._get_adjacent_cefr(target.cefr)
-        target_synonym_set = {s.lower() for s in target.synonym}
-
-        candidates = []
-        for cefr in adjacent_cefrs:
-            for w in self._by_cefr.get(cefr, []):
-                if w.pos != target.pos:
-                    continue
-                w_lower = w.word_display.lower()
-                if w_lower == target.word_display.lower():
-                    continue
-                if w_lower in target_synonym_set:
-                    continue
-                if self._is_synonym_of(target.word_display, w.word_display):
-                    continue
-                candidates.append(w)
-
-        random.shuffle(candidates)
-        selected = []
-        for c in candidates:
-            if len(selected) >= n:
-                break
-            is_ok = True
-            for existing in selected:
-                if self._is_synonym_of(c.word_display, existing.word_display):
-                    is_ok = False
-                    break
-            if is_ok:
-                selected.append(c)
-
-        return [w.word_display for w in selected[:n]]
+        candidates = self._pool("synonym", target)[0]
+        return self._words(self._select(_random_order(candidates), n)[:n])
 
     def generate_antonym_distractors(self, target: VocabWord, n: int = 3) -> list[str]:
         """For antonym questions. Distractors are non-antonyms of target.
 
         Uses graph data when available for better semantic plausibility.
         """
-        target_antonym_set = {a.lower() for a in target.antonym}
-        target_synonym_set = {s.lower() for s in target.synonym}
-        exclude = target_antonym_set | target_synonym_set | {target.word_display.lower()}
+        exclude = (
+            {a.lower() for a in target.antonym}
+            | {s.lower() for s in target.synonym}
+            | {target.word_display.lower()}
+        )
+        pos_code = self.store.code_of("pos", target.pos)
 
-        candidates: list[VocabWord] = []
+        candidates: list[int] = []
 
         # Strategy D: graph-based siblings (share hypernym, not antonyms/synonyms)
         if self._graph and self._graph.is_loaded:
@@ -195,37 +378,18 @@ class DistractorEngine:
                 target.word_display, exclude=exclude, max_count=20
             )
             for gc in graph_candidates:
-                w = self._by_word.get(gc)
-                if w and w.pos == target.pos and gc not in exclude:
-                    candidates.append(w)
+                row = self.store.row_of(gc)
+                if row is not None and self.store.codes["pos"][row] == pos_code and gc not in exclude:
+                    candidates.append(row)
 
-        # Fallback: same POS + adjacent CEFR
+        # Fallback: same POS + adjacent CEFR, skipping words the graph already gave
+        rows = np.array(candidates, dtype=np.int64)
         if len(candidates) < n * 2:
-            adjacent_cefrs = self._get_adjacent_cefr(target.cefr)
-            for cefr in adjacent_cefrs:
-                for w in self._by_cefr.get(cefr, []):
-                    if w.pos != target.pos:
-                        continue
-                    wl = w.word_display.lower()
-                    if wl in exclude:
-                        continue
-                    if wl not in {c.word_display.lower() for c in candidates}:
-                        candidates.append(w)
-
-        random.shuffle(candidates)
-        selected = []
-        for c in candidates:
-            if len(selected) >= n:
-                break
-            is_ok = True
-            for existing in selected:
-                if self._is_synonym_of(c.word_display, existing.word_display):
-                    is_ok = False
-                    break
-            if is_ok:
-                selected.append(c)
+            pool = self._pool("antonym", target)[0]
+            pool = pool[~np.isin(self.store.word_lower[pool], self.store.word_lower[candidates])]
+            rows = np.concatenate([rows, pool])
 
-        return [w.word_display for w in selected[:n]]
+        return self._words(self._select(_random_order(rows), n)[:n])
 
     def generate_graph_distractors(self, target: VocabWord, n: int = 3) -> list[str]:
         """Strategy D: Graph-based distractors using hypernym siblings.
@@ -235,46 +399,38 @@ class DistractorEngine:
         if not self._graph or not self._graph.is_loaded:
             return self.generate_synonym_distractors(target, n)
 
-        exclude = (
-            {target.word_display.lower()}
-            | self._synonym_sets.get(target.word_display.lower(), set())
-            | self._antonym_sets.get(target.word_display.lower(), set())
-        )
+        target_lower = target.word_display.lower()
+        exclude = {target_lower}
+        row = self.store.row_of(target_lower)
+        if row is not None:
+            exclude |= {s.lower() for s in self.store.relation("synonym", row)}
+            exclude |= {a.lower() for a in self.store.relation("antonym", row)}
 
         graph_candidates = self._graph.get_graph_distractors(
             target.word_display, exclude=exclude, max_count=20
         )
 
         # Filter to same POS and in our vocab
+        pos_code = self.store.code_of("pos", target.pos)
         valid = []
         for gc in graph_candidates:
-            w = self._by_word.get(gc)
-            if w and w.pos == target.pos:
-                valid.append(w)
+            row = self.store.row_of(gc)
+            if row is not None and self.store.codes["pos"][row] == pos_code:
+                valid.append(row)
 
         random.shuffle(valid)
-        selected = []
-        for v in valid:
-            if len(selected) >= n:
-                break
-            is_ok = all(
-                not self._is_synonym_of(v.word_display, s.word_display)
-                for s in selected
-            )
-            if is_ok:
-                selected.append(v)
+        selected = self._words(self._select(valid, n))
 
         # Fallback if not enough
         if len(selected) < n:
             fallback = self.generate_synonym_distractors(target, n - len(selected))
-            existing_words = {s.word_display.lower() for s in selected}
+            existing_words = {s.lower() for s in selected}
             for fb in fallback:
                 if fb.lower() not in existing_words:
-                    selected.append(self._by_word.get(fb.lower(), VocabWord(
-                        word_display=fb, freq_rank=0, pos="", cefr="", meaning_ko="", definition_en=""
-                    )))
+                    row = self.store.row_of(fb)
+                    selected.append(fb if row is None else self.store.text("word_display", row))
 
-        return [w.word_display if isinstance(w, VocabWord) else w for w in selected[:n]]
+        return selected[:n]
 
     def generate_sentence_distractors(self, target: VocabWord, n: int = 3) -> list[str]:
         """For sentence completion (Type 5). Use graph distractors when available."""
@@ -304,9 +460,9 @@ class DistractorEngine:
         # Redirect loanwords away from meaning-matching questions
         if target.is_loanword and question_type in (1, 2):
             if target.synonym:
-                return self.generate_item(target, question_type=3)
+                return self.generate_item(target, question_type=3, shuffle_options=shuffle_options)
             if target.sentence_1 or target.sentence_2:
-                return self.generate_item(target, question_type=5)
+                return self.generate_item(target, question_type=5, shuffle_options=shuffle_options)
             return None
 
         if question_type == 1:
@@ -0,0 +1,115 @@
+"""Precomputed Fisher information over a theta grid.
+
+Item parameters never change within a bank (recalibration builds a new
+one), so the information of every item at every theta bin is computed once
+per bank. Each bin also
+keeps a ranked top-K shortlist of rows, which lets item selection start
+from the most informative items instead of scanning the whole pool.
+"""
+import numpy as np
+
+from ..config import INFO_TABLE_STEP, INFO_TABLE_TOP_K, THETA_RANGE
+from ..models.irt_2pl import fisher_information_matrix
+from .bank import ItemBank
+
+_BUILD_CHUNK_BINS = 64
+
+
+class InformationTable:
+    """Item information on a fixed theta grid for one ItemBank.
+
+    Attributes:
+        grid: Theta value of each bin, shape (n_bins,)
+        table: float32 information, shape (n_bins, n_items)
+        top_rows: int32 bank rows ranked by information, shape (n_bins, top_k)
+    """
+
+    def __init__(
+        self,
+        bank: ItemBank,
+        step: float = INFO_TABLE_STEP,
+        theta_range: tuple[float, float] = THETA_RANGE,
+        top_k: int = INFO_TABLE_TOP_K,
+        arrays: tuple[np.ndarray, np.ndarray] | None = None,
+    ):
+        """Build the table, or adopt prebuilt ``(table, top_rows)`` arrays.
+
+        Adopted arrays (e.g. views onto shared memory) are taken to match the
+        bank's parameters and are not recomputed.
+        """
+        self.bank = bank
+        self.step = step
+        self.theta_min, self.theta_max = theta_range
+        n_bins = int(round((self.theta_max - self.theta_min) / step)) + 1
+        self.grid = self.theta_min + step * np.arange(n_bins)
+        self.top_k = min(top_k, len(bank))
+        if arrays is not None:
+            self.table, self.top_rows = arrays
+            return
+        self.table = np.empty((n_bins, len(bank)), dtype=np.float32)
+        self.top_rows = np.empty((n_bins, self.top_k), dtype=np.int32)
+        self._build()
+
+    @property
+    def nbytes(self) -> int:
+        return self.grid.nbytes + self.table.nbytes + self.top_rows.nbytes
+
+    def _build(self) -> None:
+        """Compute the table and shortlists from the bank's parameters."""
+        bank = self.bank
+        k = self.top_k
+        for start in range(0, len(self.grid), _BUILD_CHUNK_BINS):
+            stop = min(start + _BUILD_CHUNK_BINS, len(self.grid))
+            info = fisher_information_matrix(self.grid[start:stop, None], bank.a, bank.b, bank.c)
+            self.table[start:stop] = info
+            if k == 0:
+                continue
+            if k < info.shape[1]:
+                part = np.argpartition(-info, k - 1, axis=1)[:, :k]
+            else:
+                part = np.tile(np.arange(info.shape[1]), (stop - start, 1))
+            order = np.argsort(-np.take_along_axis(info, part, axis=1), axis=1, kind="stable")
+            self.top_rows[start:stop] = np.take_along_axis(part, order, axis=1)
+
+    def covers(self, theta: float) -> bool:
+        return self.theta_min <= theta <= self.theta_max
+
+    def bin_index(self, theta: float) -> int:
+        """Nearest bin for ``theta`` (clamped to the grid)."""
+        idx = int(round((theta - self.theta_min) / self.step))
+        return min(max(idx, 0), len(self.grid) - 1)
+
+    def information(self, theta: float, rows: np.ndarray | None = None) -> np.ndarray:
+        """Information at ``theta``, linearly interpolated between bins."""
+        pos = (min(max(theta, self.theta_min), self.theta_max) - self.theta_min) / self.step
+        lo = min(int(pos), len(self.grid) - 1)
+        hi = min(lo + 1, len(self.grid) - 1)
+        w = pos - lo
+        cols = slice(None) if rows is None else rows
+        low = self.table[lo, cols].astype(np.float64)
+        if w == 0.0 or hi == lo:
+            return low
+        return (1.0 - w) * low + w * self.table[hi, cols]
+
+    def ranked_rows(self, theta: float) -> np.ndarray:
+        """Top-K bank rows at the bin nearest ``theta``, most informative first."""
+        return self.top_rows[self.bin_index(theta)]
+
+
+def attach_information_table(bank: ItemBank, table: InformationTable) -> None:
+    """Install a prebuilt table as the bank's cached information table."""
+    bank._information_table = table
+
+
+def get_information_table(bank: ItemBank, build: bool = True) -> InformationTable | None:
+    """Return the bank's information table, building it on first use.
+
+    With ``build=False`` a bank that never had a table returns None, so callers
+    can use the table opportunistically without paying the build cost.
+    """
+    table = bank._information_table
+    if table is None:
+        if not build:
+            return None
+        table = bank._information_table = InformationTable(bank)
+    return table
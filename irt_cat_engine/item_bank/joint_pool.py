@@ -0,0 +1,83 @@
+"""Joint (item, question type) pool for mixed-mode sessions.
+
+A mixed-mode session can serve any word as any question type its data
+supports. The joint pool has one row per feasible (item, question type)
+pair: item_ids repeat across a word's rows and the question_type column
+tells them apart. Parameters are those of the base (type-1) pool plus the
+type's b offset, the same values the session's ItemOverlay serves and
+scores, so selection ranks every pair by the information it will actually
+give. Because the pool is an ordinary ItemBank, selection is the usual
+single vectorized pass: administered words drop out with all their rows,
+exposure control stays per word, and the preferred question types of the
+content constraints apply per row.
+"""
+import numpy as np
+
+from ..config import JOINT_INFO_TABLE_STEP, JOINT_INFO_TABLE_TOP_K, THETA_RANGE
+from ..data.vocab_store import VocabStore
+from .bank import ItemBank
+from .information_table import InformationTable, attach_information_table
+
+QUESTION_TYPES = (1, 2, 3, 4, 5, 6)
+
+
+def question_type_availability(vocab: VocabStore, words: list[str]) -> np.ndarray:
+    """(len(words), 7) mask: whether each word has the data for each question type (column = type).
+
+    Types 1 and 2 need nothing beyond the word; 3 needs a synonym, 4 an
+    antonym, 5 an example sentence and 6 a collocation. Words missing from
+    ``vocab`` can only be served as type 1.
+    """
+    by_row = np.zeros((len(vocab) + 1, 7), dtype=bool)  # Last row: unknown words
+    by_row[:, 1] = True
+    by_row[:-1, 2] = True
+    by_row[:-1, 3] = vocab.has_relation("synonym")
+    by_row[:-1, 4] = vocab.has_relation("antonym")
+    by_row[:-1, 5] = vocab.has_text("sentence_1") | vocab.has_text("sentence_2")
+    by_row[:-1, 6] = vocab.has_relation("collocation")
+    rows = [vocab.row_of(word) for word in words]
+    return by_row[np.array([-1 if row is None else row for row in rows], dtype=np.intp)]
+
+
+def build_joint_pool(
+    bank: ItemBank,
+    available: np.ndarray,
+    type_offsets: np.ndarray,
+    question_types: tuple[int, ...] = QUESTION_TYPES,
+) -> ItemBank:
+    """One row per feasible (item, question type) pair of ``bank``, grouped by item.
+
+    Args:
+        bank: Base pool
+        available: (len(bank), 7) availability mask per row and question
+            type, as from ``question_type_availability(vocab, bank.words)``
+        type_offsets: b offset of each question type relative to ``bank``
+        question_types: Types to include
+
+    The pool comes with an information table whose shortlists are long
+    enough to hold several rows of each top word.
+    """
+    types = np.asarray(question_types, dtype=np.int8)
+    rows, cols = np.nonzero(available[:, types])  # Row-major: an item's types are adjacent
+    types = types[cols]
+
+    words = bank.words
+    pool = ItemBank(
+        item_ids=bank.item_ids[rows],
+        words=[words[r] for r in rows.tolist()],
+        a=bank.a[rows],
+        b=bank.b[rows] + np.asarray(type_offsets)[types],
+        c=bank.c[rows],
+        question_type=types,
+        pos_code=bank.pos_code[rows],
+        topic_code=bank.topic_code[rows],
+        cefr_code=bank.cefr_code[rows],
+        is_loanword=bank.is_loanword[rows],
+        pos_labels=bank.pos_labels,
+        topic_labels=bank.topic_labels,
+        cefr_labels=bank.cefr_labels,
+    )
+    attach_information_table(
+        pool, InformationTable(pool, JOINT_INFO_TABLE_STEP, THETA_RANGE, JOINT_INFO_TABLE_TOP_K),
+    )
+    return pool
@@ -0,0 +1,228 @@
+"""Marginal maximum likelihood calibration by EM (Bock-Aitkin).
+
+Unlike ``calibrator.calibrate_item``, which conditions on the theta point
+estimate recorded with each response, MML integrates every test-taker's
+ability over the quadrature grid of the EAP estimator (the N(0, 1) prior
+fixes the scale). Each EM cycle:
+
+- E-step: sessions are streamed in chunks. Each chunk's posterior over the
+  grid is folded into expected counts per item per node. These are fixed
+  (n_items x n_quad) arrays, so memory does not grow with the number of
+  responses.
+- M-step: every item's (a, b) is fitted at once by Fisher scoring on those
+  counts, with the same normal priors, bounds and response gates as
+  ``calibrate_item``, centred on the starting parameters. c is held fixed.
+
+Parameters are addressed by a flat row index; callers map
+(question_type, item_id) to rows (see ``data/mml_recalibration.py``).
+"""
+import logging
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+import numpy as np
+from scipy.special import expit
+
+from ..config import MML_MAX_ITER, MML_TOL
+from ..models.ability_estimator import EAPEstimator, get_eap_estimator
+from .batch_calibrator import A_BOUNDS, B_BOUNDS, MIN_RESPONSES_A
+
+logger = logging.getLogger("irt_cat_engine.mml_calibrator")
+
+_MAX_STEP = 1.0
+_M_STEP_ITER = 20
+_M_STEP_TOL = 1e-5
+
+
+@dataclass
+class ResponseChunk:
+    """Responses of a group of sessions, ordered by session.
+
+    Attributes:
+        session_starts: Offset of each session's first response, shape (n_sessions,)
+        rows: Parameter row of each response, shape (n_responses,)
+        correct: Whether each response was correct
+        dont_know: "Don't know" responses, scored without guessing as in EAP
+    """
+    session_starts: np.ndarray
+    rows: np.ndarray
+    correct: np.ndarray
+    dont_know: np.ndarray
+
+    @classmethod
+    def from_sorted(cls, session_codes, rows, correct, dont_know) -> "ResponseChunk":
+        """Build from per-response arrays already ordered by session.
+
+        Responses with a negative row (items not being calibrated) are
+        dropped, along with sessions left empty.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        keep = rows >= 0
+        codes = np.asarray(session_codes)[keep]
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.zeros(0, np.int64)
+        return cls(
+            session_starts=starts,
+            rows=rows[keep],
+            correct=np.asarray(correct, dtype=bool)[keep],
+            dont_know=np.asarray(dont_know, dtype=bool)[keep],
+        )
+
+
+class ExpectedCounts:
+    """E-step accumulator: expected counts per item per quadrature node.
+
+    ``n`` counts scored attempts, ``r`` correct ones and ``n_dk`` "don't
+    know" responses (incorrect, with no guessing).
+    """
+
+    def __init__(self, n_items: int, estimator: EAPEstimator):
+        self.estimator = estimator
+        n_quad = estimator.n_points
+        self.n = np.zeros((n_items, n_quad))
+        self.r = np.zeros((n_items, n_quad))
+        self.n_dk = np.zeros((n_items, n_quad))
+        self.observed = np.zeros(n_items, dtype=np.int64)
+        self.log_likelihood = 0.0
+        self.sessions = 0
+
+    def add(self, chunk: ResponseChunk, a: np.ndarray, b: np.ndarray, c: np.ndarray) -> None:
+        """Fold one chunk's posterior-weighted responses into the counts."""
+        if not len(chunk.rows):
+            return
+        n_items, n_quad = self.n.shape
+        rows = chunk.rows
+        quad = self.estimator.quad_points
+
+        ci = np.where(chunk.dont_know, 0.0, c[rows])[:, None]
+        p = ci + (1.0 - ci) * expit(a[rows, None] * (quad - b[rows, None]))
+        p = np.clip(p, 1e-10, 1.0 - 1e-10)
+        log_lik = np.where(chunk.correct[:, None], np.log(p), np.log(1.0 - p))
+
+        log_post = np.add.reduceat(log_lik, chunk.session_starts, axis=0) + self.estimator.log_prior_weights
+        peak = log_post.max(axis=1, keepdims=True)
+        posterior = np.exp(log_post - peak)
+        total = posterior.sum(axis=1, keepdims=True)
+        posterior /= total
+        self.log_likelihood += float(np.sum(peak + np.log(total)))
+        self.sessions += len(chunk.session_starts)
+
+        lengths = np.diff(np.r_[chunk.session_starts, len(rows)])
+        weights = posterior[np.repeat(np.arange(len(lengths)), lengths)]
+        cells = (rows[:, None] * n_quad + np.arange(n_quad)).ravel()
+        size = n_items * n_quad
+        scored = ~chunk.dont_know
+        for target, mask in ((self.n, scored), (self.r, scored & chunk.correct), (self.n_dk, chunk.dont_know)):
+            w = (weights * mask[:, None]).ravel()
+            target += np.bincount(cells, w, minlength=size).reshape(n_items, n_quad)
+        self.observed += np.bincount(rows, minlength=n_items)
+
+
+def m_step(
+    counts: ExpectedCounts,
+    a: np.ndarray,
+    b: np.ndarray,
+    c: np.ndarray,
+    prior_a: np.ndarray,
+    prior_b: np.ndarray,
+    fit_a: np.ndarray,
+    a_prior_sd: float = 0.3,
+    b_prior_sd: float = 0.5,
+) -> tuple[np.ndarray, np.ndarray]:
+    """MAP (a, b) of every observed item given the expected counts.
+
+    ``fit_a`` marks items with enough responses to move a; the rest only
+    fit b. Returns new arrays.
+    """
+    a, b = a.copy(), b.copy()
+    quad = counts.estimator.quad_points
+    pending = np.flatnonzero(counts.observed)
+    for _ in range(_M_STEP_ITER):
+        if not len(pending):
+            break
+        ai, bi, ci = a[pending, None], b[pending, None], c[pending, None]
+        n, r, n_dk = counts.n[pending], counts.r[pending], counts.n_dk[pending]
+        s = expit(ai * (quad - bi))
+        p = np.clip(ci + (1.0 - ci) * s, 1e-10, 1.0 - 1e-10)
+        dp_dz = (1.0 - ci) * s * (1.0 - s)
+        pq = p * (1.0 - p)
+        # Score and expected information of the node logits z = a(q - b)
+        score_z = (r - n * p) / pq * dp_dz - n_dk * s
+        info_z = n * dp_dz ** 2 / pq + n_dk * s * (1.0 - s)
+        dz_da, dz_db = quad - bi, -ai
+
+        g_a = (score_z * dz_da).sum(axis=1) - (a[pending] - prior_a[pending]) / a_prior_sd ** 2
+        g_b = (score_z * dz_db).sum(axis=1) - (b[pending] - prior_b[pending]) / b_prior_sd ** 2
+        i_aa = (info_z * dz_da ** 2).sum(axis=1) + 1.0 / a_prior_sd ** 2
+        i_bb = (info_z * dz_db ** 2).sum(axis=1) + 1.0 / b_prior_sd ** 2
+        i_ab = (info_z * dz_da * dz_db).sum(axis=1)
+
+        joint = fit_a[pending]
+        det = i_aa * i_bb - i_ab ** 2
+        step_a = np.where(joint, (i_bb * g_a - i_ab * g_b) / det, 0.0)
+        step_b = np.where(joint, (i_aa * g_b - i_ab * g_a) / det, g_b / i_bb)
+        step_a = np.clip(step_a, -_MAX_STEP, _MAX_STEP)
+        step_b = np.clip(step_b, -_MAX_STEP, _MAX_STEP)
+
+        new_a = np.clip(a[pending] + step_a, *A_BOUNDS)
+        new_b = np.clip(b[pending] + step_b, *B_BOUNDS)
+        moved = np.maximum(np.abs(new_a - a[pending]), np.abs(new_b - b[pending]))
+        a[pending], b[pending] = new_a, new_b
+        pending = pending[moved > _M_STEP_TOL]
+    return a, b
+
+
+@dataclass
+class MMLResult:
+    a: np.ndarray
+    b: np.ndarray
+    observed: np.ndarray          # Responses per row
+    iterations: int
+    converged: bool
+    log_likelihood: list[float]   # Marginal log-likelihood at the start of each cycle
+    sessions: int
+
+
+def run_mml_em(
+    read_chunks: Callable[[], Iterable[ResponseChunk]],
+    a: np.ndarray,
+    b: np.ndarray,
+    c: np.ndarray,
+    min_responses: int = 30,
+    a_prior_sd: float = 0.3,
+    b_prior_sd: float = 0.5,
+    max_iter: int = MML_MAX_ITER,
+    tol: float = MML_TOL,
+    estimator: EAPEstimator | None = None,
+) -> MMLResult:
+    """Run EM cycles from the starting (a, b) until no parameter moves more than ``tol``.
+
+    ``read_chunks`` is called once per cycle and must stream every session.
+    """
+    estimator = estimator or get_eap_estimator()
+    prior_a = np.asarray(a, dtype=np.float64)
+    prior_b = np.asarray(b, dtype=np.float64)
+    c = np.asarray(c, dtype=np.float64)
+    a, b = prior_a.copy(), prior_b.copy()
+    history = []
+    converged = False
+    iterations = 0
+    counts = None
+    for iterations in range(1, max_iter + 1):
+        counts = ExpectedCounts(len(a), estimator)
+        for chunk in read_chunks():
+            counts.add(chunk, a, b, c)
+        history.append(counts.log_likelihood)
+        fit_a = counts.observed >= max(min_responses, MIN_RESPONSES_A)
+        new_a, new_b = m_step(counts, a, b, c, prior_a, prior_b, fit_a, a_prior_sd, b_prior_sd)
+        change = max(float(np.max(np.abs(new_a - a), initial=0.0)), float(np.max(np.abs(new_b - b), initial=0.0)))
+        a, b = new_a, new_b
+        logger.info(f"EM cycle {iterations}: log-likelihood {counts.log_likelihood:.2f}, max change {change:.5f}")
+        if change < tol:
+            converged = True
+            break
+    return MMLResult(
+        a=a, b=b,
+        observed=counts.observed if counts is not None else np.zeros(len(a), dtype=np.int64),
+        iterations=iterations, converged=converged, log_likelihood=history,
+        sessions=counts.sessions if counts is not None else 0,
+    )
@@ -1,6 +1,6 @@
 """Initialize IRT parameters (b, a) from vocabulary metadata."""
 import numpy as np
-from scipy import stats
+from scipy import special
 
 from ..config import (
     B_WEIGHT_CEFR, B_WEIGHT_FREQ, B_WEIGHT_GSE,
@@ -67,9 +67,10 @@ def compute_difficulty_b(word: VocabWord, total_words: int = 9183) -> float:
     else:
         difficulty_raw = sum(weights[k] * values[k] for k in weights) / total_weight
 
-    # Transform to IRT b-scale via probit
-    difficulty_raw = np.clip(difficulty_raw, 0.01, 0.99)
-    b = float(stats.norm.ppf(difficulty_raw))
+    # Transform to IRT b-scale via probit (ndtri is norm.ppf without the
+    # per-call argument handling of scipy.stats)
+    difficulty_raw = min(max(difficulty_raw, 0.01), 0.99)
+    b = float(special.ndtri(difficulty_raw))
 
     return b
 
@@ -0,0 +1,147 @@
+"""Versions of the item pools, swapped atomically as new parameters arrive.
+
+A ParameterVersion holds the pools built from one ParameterSet (or from
+the initial parameters). New sessions take the registry's current version;
+a session keeps the pools of the version it started with, so a swap never
+changes parameters under an in-flight test.
+
+``load`` builds the new version's pools and lookup tables first, for
+every question type the current version has built, and only then swaps
+the current reference. Requests never see a half-built version or a cold
+information table. The last few versions stay registered, so sessions
+restored from a shared store find theirs. A version this process no
+longer holds, or never loaded (another worker swapped first), is rebuilt
+from its parameter set file.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+
+from ..config import PARAMETER_SET_DIR, PARAMETER_VERSIONS_KEPT
+from .bank import ItemBank
+from .parameter_set import ParameterSet, latest_parameter_version
+
+logger = logging.getLogger("irt_cat_engine.parameter_registry")
+
+INITIAL_VERSION = "initial"
+
+# build_pool(question_type, parameter_set or None) -> pool with lookup tables built
+PoolBuilder = Callable[[int, ParameterSet | None], ItemBank]
+
+
+class ParameterVersion:
+    """The item pools of one parameter version, built lazily per question type."""
+
+    def __init__(self, parameter_set: ParameterSet | None, build_pool: PoolBuilder):
+        self.parameter_set = parameter_set
+        self.version = parameter_set.version if parameter_set is not None else INITIAL_VERSION
+        self._build_pool = build_pool
+        self._pools: dict[int, ItemBank] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def question_types(self) -> list[int]:
+        """Question types whose pools have been built."""
+        return sorted(self._pools)
+
+    @property
+    def pools(self) -> dict[int, ItemBank]:
+        return dict(self._pools)
+
+    def pool(self, question_type: int) -> ItemBank:
+        bank = self._pools.get(question_type)
+        if bank is None:
+            with self._lock:
+                bank = self._pools.get(question_type)
+                if bank is None:
+                    bank = self._pools[question_type] = self._build_pool(question_type, self.parameter_set)
+        return bank
+
+
+class ParameterRegistry:
+    """The current parameter version plus the last few, by version string."""
+
+    def __init__(
+        self,
+        build_pool: PoolBuilder,
+        directory: Path = PARAMETER_SET_DIR,
+        keep: int = PARAMETER_VERSIONS_KEPT,
+    ):
+        self._build_pool = build_pool
+        self.directory = Path(directory)
+        self.keep = max(1, keep)
+        self._current = ParameterVersion(None, build_pool)
+        self._versions: OrderedDict[str, ParameterVersion] = OrderedDict({INITIAL_VERSION: self._current})
+        self._lock = threading.Lock()
+
+    @property
+    def current(self) -> ParameterVersion:
+        return self._current
+
+    @property
+    def versions(self) -> list[str]:
+        """Registered versions, oldest first."""
+        return list(self._versions)
+
+    def get(self, version: str | None = None) -> ParameterVersion:
+        """The named version, or the current one if it is None or unavailable."""
+        current = self._current
+        if version is None or version == current.version:
+            return current
+        found = self._versions.get(version)
+        if found is not None:
+            return found
+        path = self.directory / f"{version}.npz"
+        if version == INITIAL_VERSION or path.exists():
+            parameter_set = ParameterSet.load(path) if version != INITIAL_VERSION else None
+            found = ParameterVersion(parameter_set, self._build_pool)
+            self._register(found)
+            return found
+        logger.warning(f"Parameter version {version} unavailable; using {current.version}")
+        return current
+
+    def pool(self, question_type: int, version: str | None = None) -> ItemBank:
+        return self.get(version).pool(question_type)
+
+    def prepare(self, parameter_set: ParameterSet) -> ParameterVersion:
+        """Build a version's pools for every question type in use, without activating it."""
+        prepared = ParameterVersion(parameter_set, self._build_pool)
+        for question_type in self._current.question_types:
+            prepared.pool(question_type)
+        return prepared
+
+    def activate(self, prepared: ParameterVersion) -> None:
+        """Make ``prepared`` the version new sessions get."""
+        with self._lock:
+            self._current = prepared
+            self._register_locked(prepared)
+        logger.info(f"Activated parameter version {prepared.version}")
+
+    def load(self, parameter_set: ParameterSet) -> ParameterVersion:
+        """Prepare and activate a parameter set."""
+        prepared = self.prepare(parameter_set)
+        self.activate(prepared)
+        return prepared
+
+    def refresh(self) -> bool:
+        """Load the newest set in ``directory`` if it is newer than the current version."""
+        latest = latest_parameter_version(self.directory)
+        current = self._current.version
+        if latest is None or latest == current or (current != INITIAL_VERSION and latest < current):
+            return False
+        self.load(ParameterSet.load(self.directory / f"{latest}.npz"))
+        return True
+
+    def _register(self, version: ParameterVersion) -> None:
+        with self._lock:
+            self._register_locked(version)
+
+    def _register_locked(self, version: ParameterVersion) -> None:
+        """Add ``version`` and evict the oldest others, never the current one."""
+        self._versions[version.version] = version
+        self._versions.move_to_end(version.version)
+        evictable = [v for v in self._versions if v not in (self._current.version, version.version)]
+        while len(self._versions) > self.keep and evictable:
+            del self._versions[evictable.pop(0)]
@@ -0,0 +1,117 @@
+"""Versioned sets of calibrated item parameters.
+
+A recalibration job writes its result as one ``<version>.npz`` file holding
+item_ids/a/b/c per question type plus a JSON metadata blob. The version
+is the creation time plus a hash of the arrays, so files sort by age and
+two different calibrations never share a version.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from ..config import PARAMETER_SET_DIR
+from .bank import ItemBank
+
+_FIELDS = ("item_ids", "a", "b", "c")
+
+
+@dataclass
+class ParameterSet:
+    """Calibrated parameters per question type, identified by ``version``.
+
+    Attributes:
+        version: Unique, time-ordered identifier
+        params: question_type -> (item_ids, a, b, c) arrays
+        metadata: Job details (method, iterations, log-likelihood, counts)
+    """
+    version: str
+    params: dict[int, tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]
+    metadata: dict = field(default_factory=dict)
+
+    @classmethod
+    def create(cls, params: dict[int, tuple], metadata: dict | None = None) -> "ParameterSet":
+        """Build a set from arrays and assign it a new version."""
+        params = {
+            int(qt): (
+                np.asarray(ids, dtype=np.int32), np.asarray(a, dtype=np.float64),
+                np.asarray(b, dtype=np.float64), np.asarray(c, dtype=np.float64),
+            )
+            for qt, (ids, a, b, c) in sorted(params.items())
+        }
+        digest = hashlib.sha1()
+        for qt, arrays in params.items():
+            digest.update(str(qt).encode())
+            for arr in arrays:
+                digest.update(arr.tobytes())
+        created = datetime.now(timezone.utc)
+        version = f"{created:%Y%m%dT%H%M%S}-{digest.hexdigest()[:8]}"
+        metadata = {"created_at": created.isoformat(), **(metadata or {})}
+        return cls(version=version, params=params, metadata=metadata)
+
+    @classmethod
+    def from_banks(cls, banks: dict[int, ItemBank], metadata: dict | None = None) -> "ParameterSet":
+        """Snapshot the current parameters of each bank."""
+        return cls.create(
+            {qt: (bank.item_ids, bank.a, bank.b, bank.c) for qt, bank in banks.items()}, metadata,
+        )
+
+    def bank_for(self, bank: ItemBank, question_type: int) -> ItemBank:
+        """A new bank with this set's parameters for ``question_type``.
+
+        Items the set does not cover keep ``bank``'s values; ``bank`` itself
+        is not modified and its other columns are shared.
+        """
+        a, b, c = bank.a.copy(), bank.b.copy(), bank.c.copy()
+        if question_type in self.params:
+            item_ids, new_a, new_b, new_c = self.params[question_type]
+            rows = bank.lookup_rows(item_ids)
+            known = rows >= 0
+            a[rows[known]] = new_a[known]
+            b[rows[known]] = new_b[known]
+            c[rows[known]] = new_c[known]
+        return bank.with_parameters(a, b, c)
+
+    def save(self, directory: Path = PARAMETER_SET_DIR) -> Path:
+        """Write ``<directory>/<version>.npz`` (atomically, via a rename)."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        arrays = {"metadata": np.array(json.dumps({"version": self.version, **self.metadata}))}
+        for qt, values in self.params.items():
+            for name, arr in zip(_FIELDS, values):
+                arrays[f"qt{qt}.{name}"] = arr
+        fd, tmp = tempfile.mkstemp(prefix=f".{self.version}-", suffix=".npz", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **arrays)
+            final = directory / f"{self.version}.npz"
+            os.replace(tmp, final)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return final
+
+    @classmethod
+    def load(cls, path: Path) -> "ParameterSet":
+        with np.load(path) as data:
+            metadata = json.loads(str(data["metadata"]))
+            types = sorted({int(key[2:].split(".")[0]) for key in data.files if key.startswith("qt")})
+            params = {qt: tuple(data[f"qt{qt}.{name}"] for name in _FIELDS) for qt in types}
+        return cls(version=metadata.pop("version"), params=params, metadata=metadata)
+
+
+def latest_parameter_version(directory: Path = PARAMETER_SET_DIR) -> str | None:
+    """Version of the most recently created set in ``directory``, or None."""
+    paths = sorted(Path(directory).glob("[!.]*.npz"))
+    return paths[-1].stem if paths else None
+
+
+def latest_parameter_set(directory: Path = PARAMETER_SET_DIR) -> ParameterSet | None:
+    """The most recently created set in ``directory``, or None."""
+    version = latest_parameter_version(directory)
+    return ParameterSet.load(Path(directory) / f"{version}.npz") if version is not None else None
@@ -57,6 +57,32 @@ ACTIVE_SESSIONS = Gauge(
     "Number of currently active test sessions"
 )
 
+SESSIONS_EXPIRED = Counter(
+    "sessions_expired_total",
+    "Active test sessions evicted after the idle timeout"
+)
+
+RESPONSE_QUEUE_DEPTH = Gauge(
+    "response_write_queue_depth",
+    "Responses waiting in the write-behind queue"
+)
+
+RESPONSE_QUEUE_FULL = Counter(
+    "response_write_queue_full_total",
+    "Responses that had to wait for room in the full write-behind queue"
+)
+
+RESPONSE_WRITE_BATCH = Histogram(
+    "response_write_batch_rows",
+    "Rows inserted per write-behind transaction",
+    buckets=[1, 5, 10, 25, 50, 100, 200, 500]
+)
+
+RESPONSE_WRITE_FAILURES = Counter(
+    "response_write_failures_total",
+    "Response rows dropped after repeated insert failures"
+)
+
 ITEM_GENERATION_SCORE = Histogram(
     "item_generation_score",
     "Distribution of generated item quality score (0-100)",
@@ -83,6 +109,28 @@ ITEM_GENERATION_REJECTED_TOTAL = Counter(
     ["stage", "model", "exam_type"],
 )
 
+ITEM_CONTENT_CACHE_HITS = Counter(
+    "item_content_cache_hits_total",
+    "Item content requests served from the pre-built variant cache",
+    ["question_type"],
+)
+
+ITEM_CONTENT_CACHE_MISSES = Counter(
+    "item_content_cache_misses_total",
+    "Item content requests that had to build a variant inline",
+    ["question_type"],
+)
+
+ITEM_CONTENT_CACHE_EVICTIONS = Counter(
+    "item_content_cache_evictions_total",
+    "Item content cache entries evicted (LRU) or dropped on invalidation",
+)
+
+ITEM_CONTENT_CACHE_ENTRIES = Gauge(
+    "item_content_cache_entries",
+    "Number of (item_id, question_type) entries in the item content cache",
+)
+
 
 def observe_item_generation_score(
     score: float,
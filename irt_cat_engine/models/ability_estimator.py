@@ -1,4 +1,6 @@
 """Ability (theta) estimation methods: EAP, MLE, MAP."""
+from functools import lru_cache
+
 import numpy as np
 from scipy import stats
 
@@ -9,6 +11,140 @@ from ..config import (
 from .irt_2pl import ItemParameters, probability
 
 
+class EAPEstimator:
+    """Vectorized EAP estimator with a precomputed quadrature grid.
+
+    The quadrature points, trapezoid weights and log prior are built once.
+    Each call evaluates the whole response pattern as a single
+    (items x quad) matrix in log space, so cost no longer scales with the
+    number of Python-level probability() calls.
+    """
+
+    def __init__(
+        self,
+        n_points: int = EAP_QUADRATURE_POINTS,
+        quad_range: tuple[float, float] = EAP_QUAD_RANGE,
+        prior_mean: float = THETA_PRIOR_MEAN,
+        prior_sd: float = THETA_PRIOR_SD,
+    ):
+        self.prior_mean = prior_mean
+        self.prior_sd = prior_sd
+        self.quad_points = np.linspace(quad_range[0], quad_range[1], n_points)
+
+        # Trapezoid rule weights on the uniform grid, folded into the log prior
+        step = (quad_range[1] - quad_range[0]) / (n_points - 1)
+        trap_weights = np.full(n_points, step)
+        trap_weights[0] = trap_weights[-1] = step / 2.0
+        self.log_prior_weights = (
+            np.log(trap_weights)
+            + stats.norm.logpdf(self.quad_points, loc=prior_mean, scale=prior_sd)
+        )
+
+    @property
+    def n_points(self) -> int:
+        return len(self.quad_points)
+
+    def _item_log_likelihoods(
+        self, a: np.ndarray, b: np.ndarray, c: np.ndarray, responses: np.ndarray,
+    ) -> np.ndarray:
+        """3PL log-likelihood of each response at every quadrature point, shape (n, n_quad)."""
+        a = np.asarray(a, dtype=np.float64)[:, np.newaxis]
+        b = np.asarray(b, dtype=np.float64)[:, np.newaxis]
+        c = np.asarray(c, dtype=np.float64)[:, np.newaxis]
+        exponent = np.clip(-a * (self.quad_points - b), -500, 500)
+        p = c + (1.0 - c) / (1.0 + np.exp(exponent))
+        p = np.clip(p, 1e-10, 1.0 - 1e-10)
+        return np.where(np.asarray(responses)[:, np.newaxis] == 1, np.log(p), np.log(1.0 - p))
+
+    def log_likelihood(
+        self,
+        a: np.ndarray,
+        b: np.ndarray,
+        c: np.ndarray,
+        responses: np.ndarray,
+    ) -> np.ndarray:
+        """Log-likelihood of a response pattern at every quadrature point.
+
+        Args:
+            a, b, c: Item parameter arrays of shape (n_items,)
+            responses: 0/1 array of shape (n_items,)
+
+        Returns:
+            Array of shape (n_quad,)
+        """
+        return self._item_log_likelihoods(a, b, c, responses).sum(axis=0)
+
+    def response_log_likelihood(
+        self, a: float, b: float, c: float, response: int,
+    ) -> np.ndarray:
+        """Log-likelihood of a single response at every quadrature point.
+
+        O(n_quad); used to fold responses into a running log-likelihood.
+        """
+        return self._item_log_likelihoods([a], [b], [c], [response])[0]
+
+    def response_log_likelihood_batch(
+        self, a: np.ndarray, b: np.ndarray, c: np.ndarray, responses: np.ndarray,
+    ) -> np.ndarray:
+        """One response per session: (N,) parameters -> (N, n_quad) log-likelihoods."""
+        return self._item_log_likelihoods(a, b, c, responses)
+
+    def summarize(self, log_lik: np.ndarray) -> tuple[float, float]:
+        """Posterior mean and SD from a log-likelihood over the quadrature grid."""
+        log_post = log_lik + self.log_prior_weights
+        log_post = log_post - np.max(log_post)
+        posterior = np.exp(log_post)
+        posterior /= posterior.sum()
+
+        theta_hat = float(posterior @ self.quad_points)
+        if not np.isfinite(theta_hat):
+            return self.prior_mean, self.prior_sd
+        variance = float(posterior @ (self.quad_points - theta_hat) ** 2)
+        return theta_hat, float(np.sqrt(max(variance, 1e-10)))
+
+    def summarize_batch(self, log_lik: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Row-wise ``summarize`` for an (N, n_quad) log-likelihood matrix."""
+        log_post = log_lik + self.log_prior_weights
+        log_post = log_post - np.max(log_post, axis=1, keepdims=True)
+        posterior = np.exp(log_post)
+        posterior /= posterior.sum(axis=1, keepdims=True)
+
+        theta_hat = posterior @ self.quad_points
+        variance = np.einsum("nq,nq->n", posterior, (self.quad_points - theta_hat[:, None]) ** 2)
+        se = np.sqrt(np.maximum(variance, 1e-10))
+        bad = ~np.isfinite(theta_hat)
+        theta_hat[bad] = self.prior_mean
+        se[bad] = self.prior_sd
+        return theta_hat, se
+
+    def estimate(
+        self,
+        items: list[ItemParameters],
+        responses: list[int],
+        dont_know_flags: list[bool] | None = None,
+    ) -> tuple[float, float]:
+        """Estimate (theta, SE) for a list of administered items."""
+        if not items:
+            return self.summarize(np.zeros(self.n_points))
+
+        a = np.fromiter((item.discrimination_a for item in items), np.float64, len(items))
+        b = np.fromiter((item.difficulty_b for item in items), np.float64, len(items))
+        c = np.fromiter((item.guessing_c for item in items), np.float64, len(items))
+        if dont_know_flags:
+            c[np.asarray(dont_know_flags[:len(items)], dtype=bool)] = 0.0
+
+        return self.summarize(self.log_likelihood(a, b, c, np.asarray(responses)))
+
+
+@lru_cache(maxsize=16)
+def get_eap_estimator(
+    prior_mean: float = THETA_PRIOR_MEAN,
+    prior_sd: float = THETA_PRIOR_SD,
+) -> EAPEstimator:
+    """Shared EAP estimator for a given prior (grid is built once per prior)."""
+    return EAPEstimator(prior_mean=prior_mean, prior_sd=prior_sd)
+
+
 def estimate_theta_eap(
     items: list[ItemParameters],
     responses: list[int],
@@ -30,40 +166,8 @@ def estimate_theta_eap(
     Returns:
         (theta_hat, standard_error)
     """
-    quad_points = np.linspace(EAP_QUAD_RANGE[0], EAP_QUAD_RANGE[1], EAP_QUADRATURE_POINTS)
-    prior = stats.norm.pdf(quad_points, loc=prior_mean, scale=prior_sd)
-
-    # Compute likelihood at each quadrature point
-    likelihood = np.ones_like(quad_points)
-    for i, (item, response) in enumerate(zip(items, responses)):
-        # Override guessing_c to 0 for "don't know" responses
-        c = 0.0 if (dont_know_flags and dont_know_flags[i]) else item.guessing_c
-        p = np.array([
-            probability(theta, item.discrimination_a, item.difficulty_b, c)
-            for theta in quad_points
-        ])
-        p = np.clip(p, 1e-10, 1.0 - 1e-10)
-        if response == 1:
-            likelihood *= p
-        else:
-            likelihood *= (1.0 - p)
-
-    # Posterior = likelihood * prior
-    posterior = likelihood * prior
-    total = np.trapezoid(posterior, quad_points)
-    if total < 1e-30:
-        # Fallback if posterior is essentially zero everywhere
-        return prior_mean, prior_sd
-    posterior /= total
-
-    # EAP estimate = E[theta | data]
-    theta_hat = float(np.trapezoid(quad_points * posterior, quad_points))
-
-    # Standard error = sqrt(Var[theta | data])
-    variance = float(np.trapezoid((quad_points - theta_hat) ** 2 * posterior, quad_points))
-    se = np.sqrt(max(variance, 1e-10))
-
-    return theta_hat, se
+    estimator = get_eap_estimator(prior_mean, prior_sd)
+    return estimator.estimate(items, responses, dont_know_flags)
 
 
 def estimate_theta_mle(
@@ -30,15 +30,30 @@ def probability(theta: float, a: float, b: float, c: float = 0.0) -> float:
     return float(p)
 
 
-def probability_array(theta: float, items: list[ItemParameters]) -> np.ndarray:
-    """Calculate probabilities for multiple items at once."""
-    a = np.array([item.discrimination_a for item in items])
-    b = np.array([item.difficulty_b for item in items])
-    c = np.array([item.guessing_c for item in items])
+def _param_arrays(items) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(a, b, c) arrays for an ItemBank or a list of ItemParameters."""
+    if isinstance(getattr(items, "a", None), np.ndarray):
+        return items.a, items.b, items.c
+    a = np.array([item.discrimination_a for item in items], dtype=float)
+    b = np.array([item.difficulty_b for item in items], dtype=float)
+    c = np.array([item.guessing_c for item in items], dtype=float)
+    return a, b, c
+
+
+def probability_matrix(theta, a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """P(correct) from parameter arrays; ``theta`` broadcasts against them."""
     exponent = np.clip(-a * (theta - b), -500, 500)
     return c + (1.0 - c) / (1.0 + np.exp(exponent))
 
 
+def probability_array(theta: float, items: list[ItemParameters]) -> np.ndarray:
+    """Calculate probabilities for multiple items at once.
+
+    ``items`` may be a list of ItemParameters or an ItemBank.
+    """
+    return probability_matrix(theta, *_param_arrays(items))
+
+
 def fisher_information(theta: float, a: float, b: float, c: float = 0.0) -> float:
     """Calculate Fisher Information of an item at a given theta.
 
@@ -59,11 +74,29 @@ def fisher_information(theta: float, a: float, b: float, c: float = 0.0) -> floa
 
 
 def fisher_information_array(theta: float, items: list[ItemParameters]) -> np.ndarray:
-    """Calculate Fisher Information for multiple items."""
-    return np.array([
-        fisher_information(theta, item.discrimination_a, item.difficulty_b, item.guessing_c)
-        for item in items
-    ])
+    """Calculate Fisher Information for multiple items.
+
+    Vectorized form of ``fisher_information``; ``items`` may be a list of
+    ItemParameters or an ItemBank.
+    """
+    return fisher_information_matrix(theta, *_param_arrays(items))
+
+
+def fisher_information_matrix(theta, a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """Fisher information from parameter arrays; ``theta`` broadcasts against them.
+
+    Applies the same 2PL/3PL rules as ``fisher_information`` element-wise.
+    """
+    p = probability_matrix(theta, a, b, c)
+    q = 1.0 - p
+    if not np.any(c):
+        return a * a * p * q
+    # With c == 0 the 3PL expression reduces to a²PQ, so one formula covers
+    # both; only 3PL items get the p < 1e-10 cut-off.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        info = a * a * q * (p - c) ** 2 / ((1.0 - c) ** 2 * p)
+    info[(p < 1e-10) & (c != 0.0)] = 0.0
+    return info
 
 
 def log_likelihood(theta: float, items: list[ItemParameters], responses: list[int]) -> float:
@@ -5,11 +5,12 @@ metrics, and generates recommendations for pool expansion.
 """
 import numpy as np
 
+from ..item_bank.bank import ItemBank, as_item_bank
 from ..models.irt_2pl import ItemParameters
 
 
 def analyze_exposure(
-    items: list[ItemParameters],
+    items: ItemBank | list[ItemParameters],
     exposure_counts: dict[int, int],
     total_sessions: int,
     max_exposure_target: float = 0.25,
@@ -17,7 +18,7 @@ def analyze_exposure(
     """Analyze item exposure rates across the pool.
 
     Args:
-        items: Full item pool
+        items: Full item pool (ItemBank or list of ItemParameters)
         exposure_counts: Dict mapping item_id -> number of times administered
         total_sessions: Total number of test sessions conducted
         max_exposure_target: Target maximum exposure rate (Sympson-Hetter)
@@ -32,49 +33,39 @@ def analyze_exposure(
             "message": "No sessions conducted yet",
         }
 
-    # Compute exposure rates
-    rates = []
-    never_used = []
-    over_exposed = []
-    under_used = []
-
-    for item in items:
-        count = exposure_counts.get(item.item_id, 0)
-        rate = count / total_sessions
-        rates.append(rate)
-
-        if count == 0:
-            never_used.append(item.item_id)
-        elif rate > max_exposure_target:
-            over_exposed.append({
-                "item_id": item.item_id,
-                "word": item.word,
-                "rate": round(rate, 4),
-                "count": count,
-                "difficulty_b": round(item.difficulty_b, 3),
-                "cefr": item.cefr,
-            })
-
-    rates_array = np.array(rates)
+    bank = as_item_bank(items)
+    counts = _exposure_count_array(bank, exposure_counts)
+    rates_array = counts / total_sessions
+
+    never_used = bank.item_ids[counts == 0].tolist()
+    over_exposed = [
+        {
+            "item_id": int(bank.item_ids[row]),
+            "word": bank.words[row],
+            "rate": round(float(rates_array[row]), 4),
+            "count": int(counts[row]),
+            "difficulty_b": round(float(bank.b[row]), 3),
+            "cefr": bank.cefr_labels[bank.cefr_code[row]],
+        }
+        for row in np.flatnonzero((counts > 0) & (rates_array > max_exposure_target))
+    ]
 
     # Pool utilization: what fraction of items have been used at least once
-    items_used = sum(1 for r in rates if r > 0)
-    utilization = items_used / len(items) if items else 0.0
+    items_used = int(np.count_nonzero(rates_array > 0))
+    utilization = items_used / len(bank) if len(bank) else 0.0
 
     # Effective pool size: items with non-negligible exposure
-    effective_pool = sum(1 for r in rates if r >= 0.01)
+    effective_pool = int(np.count_nonzero(rates_array >= 0.01))
 
     # Gini coefficient for exposure inequality
     gini = _compute_gini(rates_array)
 
     # Distribution by CEFR
-    cefr_exposure: dict[str, list[float]] = {}
-    for item, rate in zip(items, rates):
-        cefr_exposure.setdefault(item.cefr, []).append(rate)
-
     cefr_stats = {}
-    for cefr, cefr_rates in sorted(cefr_exposure.items()):
-        arr = np.array(cefr_rates)
+    for code, cefr in sorted(enumerate(bank.cefr_labels), key=lambda x: x[1]):
+        arr = rates_array[bank.cefr_code == code]
+        if len(arr) == 0:
+            continue
         cefr_stats[cefr] = {
             "count": len(arr),
             "mean_rate": round(float(np.mean(arr)), 4),
@@ -92,9 +83,8 @@ def analyze_exposure(
     ]
     band_stats = {}
     for label, lo, hi in difficulty_bands:
-        band_rates = [r for item, r in zip(items, rates) if lo <= item.difficulty_b < hi]
-        if band_rates:
-            arr = np.array(band_rates)
+        arr = rates_array[(bank.b >= lo) & (bank.b < hi)]
+        if len(arr):
             band_stats[label] = {
                 "count": len(arr),
                 "mean_rate": round(float(np.mean(arr)), 4),
@@ -103,12 +93,12 @@ def analyze_exposure(
 
     # Recommendations
     recommendations = _generate_recommendations(
-        utilization, gini, over_exposed, never_used, len(items), total_sessions
+        utilization, gini, over_exposed, never_used, len(bank), total_sessions
     )
 
     return {
         "total_sessions": total_sessions,
-        "pool_size": len(items),
+        "pool_size": len(bank),
         "items_used": items_used,
         "items_never_used": len(never_used),
         "utilization_pct": round(utilization * 100, 1),
@@ -126,6 +116,16 @@ def analyze_exposure(
     }
 
 
+def _exposure_count_array(bank: ItemBank, exposure_counts: dict[int, int]) -> np.ndarray:
+    """Scatter an item_id -> count dict into an array aligned with the bank rows."""
+    counts = np.zeros(len(bank), dtype=np.int64)
+    for item_id, count in exposure_counts.items():
+        row = bank.row_of(item_id)
+        if row is not None:
+            counts[row] = count
+    return counts
+
+
 def _compute_gini(values: np.ndarray) -> float:
     """Compute Gini coefficient (0 = perfect equality, 1 = perfect inequality)."""
     if len(values) == 0 or np.sum(values) == 0:
@@ -184,7 +184,7 @@ def _generate_recommendations(
 
 
 def identify_expansion_needs(
-    items: list[ItemParameters],
+    items: ItemBank | list[ItemParameters],
     exposure_counts: dict[int, int],
     total_sessions: int,
 ) -> dict:
@@ -196,38 +196,29 @@ def identify_expansion_needs(
     if total_sessions < 100:
         return {"message": "Insufficient data for expansion analysis", "min_sessions": 100}
 
-    # Find difficulty gaps: ranges where items are over-exposed
-    rates_by_b = []
-    for item in items:
-        count = exposure_counts.get(item.item_id, 0)
-        rate = count / total_sessions
-        rates_by_b.append((item.difficulty_b, rate, item.cefr, item.topic))
+    bank = as_item_bank(items)
+    rates = _exposure_count_array(bank, exposure_counts) / total_sessions
 
-    # Group by difficulty bands
-    bands = {}
-    for b, rate, cefr, topic in rates_by_b:
-        band = round(b * 2) / 2  # Round to 0.5 increments
-        bands.setdefault(band, []).append(rate)
+    # Group by difficulty bands (rounded to 0.5 increments)
+    bands, band_idx = np.unique(np.round(bank.b * 2) / 2, return_inverse=True)
+    band_sizes = np.bincount(band_idx, minlength=len(bands))
+    band_means = np.bincount(band_idx, weights=rates, minlength=len(bands)) / np.maximum(band_sizes, 1)
 
     high_demand_bands = []
-    for band, band_rates in sorted(bands.items()):
-        mean_rate = float(np.mean(band_rates))
+    for band, size, mean_rate in zip(bands, band_sizes, band_means):
         if mean_rate > 0.15:  # High demand relative to pool
             high_demand_bands.append({
                 "difficulty_range": f"{band:.1f} to {band+0.5:.1f}",
-                "item_count": len(band_rates),
-                "mean_exposure": round(mean_rate, 4),
+                "item_count": int(size),
+                "mean_exposure": round(float(mean_rate), 4),
             })
 
     # CEFR gaps
     cefr_needs = {}
-    cefr_groups: dict[str, list[float]] = {}
-    for item in items:
-        count = exposure_counts.get(item.item_id, 0)
-        rate = count / total_sessions
-        cefr_groups.setdefault(item.cefr, []).append(rate)
-
-    for cefr, cefr_rates in sorted(cefr_groups.items()):
+    for code, cefr in sorted(enumerate(bank.cefr_labels), key=lambda x: x[1]):
+        cefr_rates = rates[bank.cefr_code == code]
+        if len(cefr_rates) == 0:
+            continue
         mean_rate = float(np.mean(cefr_rates))
         if mean_rate > 0.10:
             cefr_needs[cefr] = {
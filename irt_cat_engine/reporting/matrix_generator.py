@@ -5,6 +5,7 @@ using IRT probability for words with item parameters and CEFR-based estimation
 for words without. Purely additive read-only module — does not modify IRT logic.
 """
 
+from ..item_bank.bank import ItemBank, as_item_bank
 from ..models.irt_2pl import ItemParameters, probability
 from ..data.load_vocabulary import VocabWord
 from ..config import THETA_CEFR_BOUNDARIES
@@ -89,16 +90,14 @@ def compute_vocab_matrix(
     theta: float,
     cefr_level: str,
     vocab_words: list[VocabWord],
-    item_bank: list[ItemParameters],
+    item_bank: ItemBank | list[ItemParameters],
     sample_size: int = 100,
 ) -> dict:
     """Compute vocabulary matrix data for current and goal states.
 
     Read-only post-test metric. Does not affect IRT model or item selection.
     """
-    item_lookup: dict[str, ItemParameters] = {
-        item.word.lower(): item for item in item_bank
-    }
+    item_bank = as_item_bank(item_bank)
 
     sampled = _sample_representative_words(vocab_words, sample_size)
 
@@ -119,7 +118,7 @@ def compute_vocab_matrix(
     changed_count = 0
 
     for vw in sampled:
-        item = item_lookup.get(vw.word_display.lower())
+        item = item_bank.get_by_word(vw.word_display)
 
         if item is not None:
             current_p = probability(theta, item.discrimination_a, item.difficulty_b, item.guessing_c)
@@ -1,9 +1,10 @@
 """Map theta scores to interpretable scales (CEFR, curriculum, vocab size)."""
 import numpy as np
-from scipy import stats
+from scipy.special import ndtr
 
-from ..config import THETA_CEFR_BOUNDARIES, THETA_CURRICULUM_BOUNDARIES
-from ..models.irt_2pl import ItemParameters, probability
+from ..config import SCORE_CURVE_STEP, THETA_CEFR_BOUNDARIES, THETA_CURRICULUM_BOUNDARIES, THETA_RANGE
+from ..item_bank.bank import ItemBank, as_item_bank
+from ..models.irt_2pl import ItemParameters, probability_array, probability_matrix
 from .dimension_analyzer import compute_dimension_scores
 
 # CEFR level -> approximate known vocabulary count (for display purposes)
@@ -11,77 +12,161 @@ CEFR_VOCAB_ESTIMATES: dict[str, int] = {
     "A1": 1000, "A2": 2000, "B1": 3500, "B2": 5000, "C1": 8000,
 }
 
+# CEFR levels used as a proxy for high-frequency (core) vocabulary
+CORE_CEFR_LEVELS = ("A1", "A2", "B1")
 
-def _estimate_oxford_coverage(theta: float, full_item_bank: list[ItemParameters]) -> float:
+_CURVE_CHUNK_BINS = 64
+
+CEFR_LEVELS = tuple(THETA_CEFR_BOUNDARIES)
+CURRICULUM_LEVELS = tuple(THETA_CURRICULUM_BOUNDARIES)
+
+_CEFR_LOW = np.array([low for low, _ in THETA_CEFR_BOUNDARIES.values()])
+_CEFR_HIGH = np.array([high for _, high in THETA_CEFR_BOUNDARIES.values()])
+# Curriculum bands are contiguous: a theta falls in the band whose upper edge it is below
+_CURRICULUM_EDGES = np.array([high for _, high in THETA_CURRICULUM_BOUNDARIES.values()][:-1])
+
+
+def _estimate_oxford_coverage(theta: float, full_item_bank: ItemBank | list[ItemParameters]) -> float:
     """Estimate coverage of high-frequency words (freq_rank <= 3000).
 
     Read-only post-test metric. Does not affect IRT model or item selection.
-    Uses existing probability() function to compute P(correct | theta) for each
-    high-frequency item; coverage = fraction where P >= 0.5.
+    Computes P(correct | theta) for each high-frequency item;
+    coverage = fraction where P >= 0.5.
     """
-    # Use CEFR as proxy for high-frequency: A1/A2/B1 are core vocabulary.
-    core_items = [
-        item for item in full_item_bank
-        if item.cefr in ("A1", "A2", "B1")
-    ]
+    bank = as_item_bank(full_item_bank)
+    core = bank.cefr_mask(CORE_CEFR_LEVELS)
+    n_core = int(np.count_nonzero(core))
 
-    if not core_items:
+    if n_core == 0:
         return 0.0
 
-    known_count = sum(
-        1 for item in core_items
-        if probability(theta, item.discrimination_a, item.difficulty_b, item.guessing_c) >= 0.5
-    )
-    return round(known_count / len(core_items), 3)
+    known_count = int(np.count_nonzero(probability_array(theta, bank)[core] >= 0.5))
+    return round(known_count / n_core, 3)
 
 
-def theta_to_cefr(theta: float, se: float) -> tuple[str, dict[str, float]]:
-    """Map theta to CEFR level with probability distribution.
+def theta_to_cefr_batch(thetas, ses) -> tuple[np.ndarray, np.ndarray]:
+    """Map arrays of (theta, se) to CEFR levels in one vectorized call.
+
+    P(level) is the normal mass of N(theta, se) between the level's
+    boundaries.
 
     Returns:
-        (primary_level, probabilities_dict)
+        (primary level index into CEFR_LEVELS, shape (N,),
+         probabilities, shape (N, len(CEFR_LEVELS)))
     """
-    probabilities = {}
-    primary_level = "B1"  # default
+    theta = np.asarray(thetas, dtype=np.float64)[:, None]
+    se = np.asarray(ses, dtype=np.float64)[:, None]
+    probs = ndtr((_CEFR_HIGH - theta) / se) - ndtr((_CEFR_LOW - theta) / se)
+    # Highest probability at report precision, first level on ties
+    primary = np.argmax(np.round(probs, 4), axis=1)
+    return primary, probs
 
-    for level, (low, high) in THETA_CEFR_BOUNDARIES.items():
-        p = stats.norm.cdf(high, theta, se) - stats.norm.cdf(low, theta, se)
-        probabilities[level] = round(float(p), 4)
 
-    # Primary level is the one with highest probability
-    primary_level = max(probabilities, key=probabilities.get)
+def theta_to_curriculum_batch(thetas) -> np.ndarray:
+    """Curriculum band index into CURRICULUM_LEVELS for each theta."""
+    return np.searchsorted(_CURRICULUM_EDGES, np.asarray(thetas, dtype=np.float64), side="right")
 
-    return primary_level, probabilities
+
+def theta_to_cefr(theta: float, se: float) -> tuple[str, dict[str, float]]:
+    """Map theta to CEFR level with probability distribution.
+
+    Returns:
+        (primary_level, probabilities_dict)
+    """
+    primary, probs = theta_to_cefr_batch([theta], [se])
+    probabilities = {level: round(float(p), 4) for level, p in zip(CEFR_LEVELS, probs[0])}
+    return CEFR_LEVELS[primary[0]], probabilities
 
 
 def theta_to_curriculum(theta: float) -> str:
     """Map theta to Korean curriculum level."""
-    for level, (low, high) in THETA_CURRICULUM_BOUNDARIES.items():
-        if low <= theta < high:
-            return level
-    if theta >= 1.2:
-        return "고등 이상 (Beyond High School)"
-    return "초등 수준 (Elementary)"
+    return CURRICULUM_LEVELS[theta_to_curriculum_batch([theta])[0]]
 
 
-def theta_to_vocab_size(theta: float, items: list[ItemParameters]) -> int:
+def theta_to_vocab_size(theta: float, items: ItemBank | list[ItemParameters]) -> int:
     """Estimate vocabulary size by summing P(correct) across all items.
 
     This gives the expected number of words the learner knows.
     """
-    total = sum(
-        probability(theta, item.discrimination_a, item.difficulty_b, item.guessing_c)
-        for item in items
-    )
+    total = float(np.sum(probability_array(theta, items)))
     return int(round(total))
 
 
+class ScoreCurve:
+    """Vocab size and core coverage as functions of theta for one ItemBank.
+
+    Expected vocab size is smooth in theta, so it is tabulated on a grid and
+    linearly interpolated. Coverage is a step function: each core item is
+    known once theta passes the point where P(correct) = 0.5, so the sorted
+    crossing points give the exact count with one binary search. Lookups
+    outside the grid fall back to a full-bank reduction.
+    """
+
+    def __init__(
+        self,
+        bank: ItemBank,
+        step: float = SCORE_CURVE_STEP,
+        theta_range: tuple[float, float] = THETA_RANGE,
+    ):
+        self.bank = bank
+        self.theta_min, self.theta_max = theta_range
+        n_bins = int(round((self.theta_max - self.theta_min) / step)) + 1
+        self.grid = self.theta_min + step * np.arange(n_bins)
+        self.expected_known = np.empty(n_bins)
+        self._build()
+
+    def _build(self) -> None:
+        """Compute the curve from the bank's parameters."""
+        bank = self.bank
+        for start in range(0, len(self.grid), _CURVE_CHUNK_BINS):
+            stop = min(start + _CURVE_CHUNK_BINS, len(self.grid))
+            p = probability_matrix(self.grid[start:stop, None], bank.a, bank.b, bank.c)
+            self.expected_known[start:stop] = p.sum(axis=1)
+
+        core = bank.cefr_mask(CORE_CEFR_LEVELS)
+        a, b, c = bank.a[core], bank.b[core], bank.c[core]
+        self.n_core = len(a)
+        # P >= 0.5 needs the logistic term >= t; c >= 0.5 makes the item always known
+        t = (0.5 - c) / (1.0 - c)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            crossing = b + np.log(t / (1.0 - t)) / a
+        always = (t <= 0.0) | ((a == 0.0) & (t <= 0.5))
+        never = (a == 0.0) & ~always
+        crossing = np.where(always, -np.inf, np.where(never, np.inf, crossing))
+        # Rising items (a > 0) are known above their crossing, falling ones below it
+        falling = a < 0.0
+        self.rising = np.sort(crossing[~falling])
+        self.falling = np.sort(crossing[falling])
+
+    def vocab_size(self, theta: float) -> int:
+        """Expected number of known words at ``theta``."""
+        if not self.theta_min <= theta <= self.theta_max:
+            return theta_to_vocab_size(theta, self.bank)
+        return int(round(float(np.interp(theta, self.grid, self.expected_known))))
+
+    def coverage(self, theta: float) -> float:
+        """Fraction of core items with P(correct) >= 0.5 at ``theta``."""
+        if self.n_core == 0:
+            return 0.0
+        known = int(np.searchsorted(self.rising, theta, side="right"))
+        known += len(self.falling) - int(np.searchsorted(self.falling, theta, side="left"))
+        return round(known / self.n_core, 3)
+
+
+def get_score_curve(bank: ItemBank) -> ScoreCurve:
+    """Return the bank's score curve, building it on first use."""
+    curve = bank._score_curve
+    if curve is None:
+        curve = bank._score_curve = ScoreCurve(bank)
+    return curve
+
+
 def generate_diagnostic_report(
     theta: float,
     se: float,
     items_administered: list[ItemParameters],
     responses: list[int],
-    full_item_bank: list[ItemParameters],
+    full_item_bank: ItemBank | list[ItemParameters],
 ) -> dict:
     """Generate a comprehensive diagnostic report.
 
@@ -89,7 +174,15 @@ def generate_diagnostic_report(
     """
     cefr_level, cefr_probs = theta_to_cefr(theta, se)
     curriculum_level = theta_to_curriculum(theta)
-    vocab_size = theta_to_vocab_size(theta, full_item_bank)
+    if isinstance(full_item_bank, ItemBank):
+        # Long-lived bank: build its curve once, then every report is a lookup
+        curve = get_score_curve(full_item_bank)
+        vocab_size = curve.vocab_size(theta)
+        oxford_coverage = curve.coverage(theta)
+    else:
+        full_item_bank = as_item_bank(full_item_bank)
+        vocab_size = theta_to_vocab_size(theta, full_item_bank)
+        oxford_coverage = _estimate_oxford_coverage(theta, full_item_bank)
 
     # Per-topic analysis
     topic_results: dict[str, dict] = {}
@@ -152,7 +245,6 @@ def generate_diagnostic_report(
     dimension_scores = compute_dimension_scores(items_administered, responses)
 
     # Post-test metrics (read-only, does not affect IRT)
-    oxford_coverage = _estimate_oxford_coverage(theta, full_item_bank)
     estimated_vocabulary = CEFR_VOCAB_ESTIMATES.get(cefr_level, 3500)
 
     return {
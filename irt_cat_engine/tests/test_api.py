@@ -1,10 +1,15 @@
 """Integration tests for the FastAPI API."""
+import asyncio
+
 import pytest
 from fastapi.testclient import TestClient
 
 from irt_cat_engine.api.main import app
+from irt_cat_engine.api.response_writer import response_writer
+from irt_cat_engine.api.routes_test import flush_partial_result
 from irt_cat_engine.api.session_manager import session_manager
-from irt_cat_engine.data.database import init_db, engine, Base
+from irt_cat_engine.data.database import init_db, engine, Base, SessionLocal
+from irt_cat_engine.data import db_models
 from irt_cat_engine.config import VOCAB_DB_PATH
 
 
@@ -14,6 +19,7 @@ def setup_db():
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
     yield
+    response_writer.flush()
     Base.metadata.drop_all(bind=engine)
 
 
@@ -49,6 +55,7 @@ class TestHealthEndpoints:
         r = client.get("/api/v1/admin/stats")
         assert r.status_code == 200
         assert r.json()["vocab_loaded"] is True
+        assert r.json()["item_pools"]["1"]["info_table_bytes"] > 0
 
 
 class TestTestSession:
@@ -127,6 +134,11 @@ class TestTestSession:
 
         assert items_answered >= 15, "Should have at least min_items responses"
 
+        # Responses are written behind, but flushed before the result
+        with SessionLocal() as db:
+            stored_responses = db.query(db_models.Response).filter_by(session_id=session_id).count()
+        assert stored_responses == items_answered
+
         # Verify results endpoint
         r = client.get(f"/api/v1/test/{session_id}/results")
         assert r.status_code == 200
@@ -140,6 +152,104 @@ class TestTestSession:
         assert history["total_sessions"] >= 1
         assert any(s["session_id"] == session_id for s in history["sessions"])
 
+    def test_completion_waits_for_stored_responses(self, client, monkeypatch):
+        """A test whose responses can't be stored is not completed until they are."""
+        r = client.post("/api/v1/test/start", json={"nickname": "unsaved_student", "grade": "중2"})
+        session_id = r.json()["session_id"]
+        item = r.json()["first_item"]
+
+        def unavailable():
+            raise RuntimeError("database unavailable")
+
+        healthy = response_writer._session_factory
+        monkeypatch.setattr(response_writer, "_session_factory", unavailable)
+        answered = 0
+        for _ in range(50):
+            payload = {"item_id": item["item_id"], "is_correct": answered % 3 != 0, "response_time_ms": 2000}
+            r = client.post(f"/api/v1/test/{session_id}/respond", json=payload)
+            answered += 1
+            if r.status_code != 200:
+                break
+            item = r.json()["next_item"]
+        assert r.status_code == 503
+        r = client.get(f"/api/v1/test/{session_id}/results")
+        assert r.status_code == 400
+
+        # Once the database is back, resubmitting completes the test without a duplicate row
+        monkeypatch.setattr(response_writer, "_session_factory", healthy)
+        r = client.post(f"/api/v1/test/{session_id}/respond", json=payload)
+        assert r.status_code == 200
+        assert r.json()["is_complete"]
+        with SessionLocal() as db:
+            stored = db.query(db_models.Response).filter_by(session_id=session_id).count()
+        assert stored == answered == r.json()["results"]["total_items"]
+
+    def test_completion_waits_for_rows_queued_on_other_workers(self, client, monkeypatch):
+        """A response queued on another worker (shared session store) holds back the result."""
+        r = client.post("/api/v1/test/start", json={"nickname": "two_worker_student", "grade": "중2"})
+        session_id = r.json()["session_id"]
+        item = r.json()["first_item"]
+
+        # The first response goes to "another worker" whose queue has not been written yet
+        elsewhere = []
+        offer = response_writer.offer
+        monkeypatch.setattr(response_writer, "offer", lambda row: elsewhere.append(row) or True)
+        payload = {"item_id": item["item_id"], "is_correct": True, "response_time_ms": 2000}
+        r = client.post(f"/api/v1/test/{session_id}/respond", json=payload)
+        assert r.status_code == 200
+        monkeypatch.setattr(response_writer, "offer", offer)
+
+        answered = 1
+        for _ in range(50):
+            item = r.json()["next_item"]
+            payload = {"item_id": item["item_id"], "is_correct": answered % 3 != 0, "response_time_ms": 2000}
+            r = client.post(f"/api/v1/test/{session_id}/respond", json=payload)
+            answered += 1
+            if r.status_code != 200 or r.json()["is_complete"]:
+                break
+        assert r.status_code == 503
+        assert client.get(f"/api/v1/test/{session_id}/results").status_code == 400
+
+        # The other worker writes its row; resubmitting completes the test
+        response_writer.offer(elsewhere[0])
+        assert response_writer.flush_session(session_id, timeout=10)
+        r = client.post(f"/api/v1/test/{session_id}/respond", json=payload)
+        assert r.status_code == 200 and r.json()["is_complete"]
+        assert r.json()["results"]["total_items"] == answered
+
+    def test_session_store_is_called_off_the_event_loop(self, client, monkeypatch):
+        """The async routes reach the (possibly Redis) session store from worker threads."""
+        calls = []
+
+        class LoopCheckingStore:
+            def __init__(self, store):
+                self._store = store
+
+            def __getattr__(self, name):
+                attr = getattr(self._store, name)
+                if name not in ("get", "put", "delete"):
+                    return attr
+
+                def call(*args, **kwargs):
+                    try:
+                        asyncio.get_running_loop()
+                        calls.append((name, True))
+                    except RuntimeError:
+                        calls.append((name, False))
+                    return attr(*args, **kwargs)
+                return call
+
+        monkeypatch.setattr(session_manager, "_store", LoopCheckingStore(session_manager._store))
+        r = client.post("/api/v1/test/start", json={"nickname": "loop_student", "grade": "중2"})
+        session_id = r.json()["session_id"]
+        r = client.post(f"/api/v1/test/{session_id}/respond", json={
+            "item_id": r.json()["first_item"]["item_id"], "is_correct": True, "response_time_ms": 2000,
+        })
+        assert r.status_code == 200
+        client.get(f"/api/v1/test/{session_id}/results")
+        assert {name for name, _ in calls} >= {"get", "put"}
+        assert not any(on_loop for _, on_loop in calls)
+
     def test_respond_invalid_session(self, client):
         """Responding to a non-existent session should return 404."""
         r = client.post("/api/v1/test/nonexistent123/respond", json={
@@ -159,6 +269,24 @@ class TestTestSession:
         r = client.get(f"/api/v1/test/{session_id}/results")
         assert r.status_code == 400
 
+    def test_abandoned_session_flush(self, client):
+        """Evicting an idle session records its item counts, not a result."""
+        r = client.post("/api/v1/test/start", json={"nickname": "abandoned"})
+        session_id = r.json()["session_id"]
+        item_id = r.json()["first_item"]["item_id"]
+        client.post(f"/api/v1/test/{session_id}/respond", json={"item_id": item_id, "is_correct": True})
+
+        active = session_manager.get_session(session_id)
+        flush_partial_result(active)
+        session_manager.remove_session(session_id)
+
+        with SessionLocal() as db:
+            row = db.get(db_models.TestSession, session_id)
+            assert (row.total_items, row.total_correct, row.termination_reason) == (1, 1, "abandoned")
+        r = client.get(f"/api/v1/test/{session_id}/results")
+        assert r.status_code == 400
+        assert r.json()["detail"] == "Test was not completed"
+
 
 class TestAdmin:
     def test_recalibrate(self, client):
@@ -167,6 +295,17 @@ class TestAdmin:
         assert r.status_code == 200
         assert "items_recalibrated" in r.json()
 
+    def test_recalibrate_folds_responses_into_exposure(self, client):
+        """Exposure counters match the responses table; live selection counts cover them."""
+        r = client.post("/api/v1/admin/recalibrate")
+        assert r.status_code == 200
+        with SessionLocal() as db:
+            responses = db.query(db_models.Response).count()
+            counted = sum(e.admin_count for e in db.query(db_models.ItemExposure))
+        assert responses > 0 and counted == responses
+        # Served items count at selection, including ones never answered
+        assert session_manager.exposure_controller.admin_counts.sum() >= responses
+
     def test_cleanup(self, client):
         r = client.post("/api/v1/admin/cleanup")
         assert r.status_code == 200
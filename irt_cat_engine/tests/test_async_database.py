@@ -0,0 +1,47 @@
+"""Tests for the async database engine used by the test-taking routes."""
+import asyncio
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from irt_cat_engine.data import database
+from irt_cat_engine.data.database import Base, get_async_database_url, get_async_db
+from irt_cat_engine.data.db_models import User
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("sqlite:///./db/irt.db", "sqlite+aiosqlite:///./db/irt.db"),
+    ("sqlite:////tmp/irt.db", "sqlite+aiosqlite:////tmp/irt.db"),
+    ("postgresql://u:p@db:5432/irt", "postgresql+asyncpg://u:p@db:5432/irt"),
+    ("postgresql+psycopg2://u:p@db/irt", "postgresql+asyncpg://u:p@db/irt"),
+    ("postgres://u:p@db/irt", "postgresql+asyncpg://u:p@db/irt"),
+    ("postgresql+asyncpg://u:p@db/irt", "postgresql+asyncpg://u:p@db/irt"),
+    ("mysql://u:p@db/irt", "mysql://u:p@db/irt"),
+])
+def test_async_database_url(url, expected):
+    assert get_async_database_url(url) == expected
+
+
+def test_get_async_db_yields_a_working_session(tmp_path, monkeypatch):
+    async def run():
+        engine = create_async_engine(get_async_database_url(f"sqlite:///{tmp_path / 'async.db'}"))
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            monkeypatch.setattr(database, "AsyncSessionLocal", async_sessionmaker(engine, expire_on_commit=False))
+
+            dependency = get_async_db()
+            db = await anext(dependency)
+            assert isinstance(db, AsyncSession)
+            assert await db.scalar(text("SELECT 1")) == 1
+            db.add(User(nickname="async_user", grade="중2"))
+            await db.commit()
+            await dependency.aclose()
+
+            async with database.AsyncSessionLocal() as other:
+                assert await other.scalar(select(User.nickname)) == "async_user"
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
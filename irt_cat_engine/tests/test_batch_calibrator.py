@@ -0,0 +1,80 @@
+"""Tests for the vectorized whole-bank calibrator."""
+import numpy as np
+import pytest
+
+from irt_cat_engine.item_bank.bank import ItemBank
+from irt_cat_engine.item_bank.batch_calibrator import ResponseCSR, calibrate_bank_batch
+from irt_cat_engine.item_bank.calibrator import calibrate_bank
+from irt_cat_engine.models.irt_2pl import ItemParameters
+
+# Response counts cycle through every gate: none, b only, b + a, b + a + c
+_COUNTS = [0, 5, 25, 40, 120, 600]
+
+
+def _make_bank(n: int = 36) -> ItemBank:
+    rng = np.random.RandomState(1)
+    return ItemBank.from_items([
+        ItemParameters(
+            item_id=100 + i, word=f"w{i}",
+            difficulty_b=float(rng.normal(0, 1.2)),
+            discrimination_a=float(rng.uniform(0.5, 2.0)),
+            guessing_c=float(rng.choice([0.0, 0.2])),
+            question_type=int(rng.randint(1, 7)),
+        )
+        for i in range(n)
+    ])
+
+
+def _responses(bank: ItemBank, seed: int = 0) -> dict[int, list[tuple[float, int]]]:
+    """Responses from shifted true parameters, so every estimate moves."""
+    rng = np.random.RandomState(seed)
+    responses = {}
+    for row in range(len(bank)):
+        theta = rng.normal(0, 1, _COUNTS[row % len(_COUNTS)])
+        a, b, c = bank.a[row] + 0.3, bank.b[row] + 0.4, bank.c[row]
+        p = c + (1 - c) / (1 + np.exp(-a * (theta - b)))
+        responses[int(bank.item_ids[row])] = [(float(t), int(u)) for t, u in zip(theta, rng.rand(len(theta)) < p)]
+    return responses
+
+
+class TestCalibrateBankBatch:
+
+    @pytest.mark.parametrize("use_3pl", [False, True])
+    def test_matches_per_item_calibration(self, use_3pl):
+        bank = _make_bank()
+        before = bank.b.copy()
+        responses = _responses(bank)
+        per_item, expected = calibrate_bank(bank, responses, use_3pl=use_3pl)
+        batch, meta = calibrate_bank_batch(bank, ResponseCSR.from_dict(bank, responses), use_3pl=use_3pl)
+
+        np.testing.assert_allclose(batch.b, per_item.b, atol=1e-4)
+        np.testing.assert_allclose(batch.a, per_item.a, atol=1e-4)
+        np.testing.assert_allclose(batch.c, per_item.c, atol=1e-4)
+        assert meta.keys() == expected.keys()
+        for item_id, m in meta.items():
+            for key in ("n_responses", "updated", "empirical_b", "p_correct", "model"):
+                assert m[key] == expected[item_id][key]
+        # Results come back as new banks; the input is untouched
+        np.testing.assert_array_equal(bank.b, before)
+        assert batch.words is bank.words
+
+    def test_gates(self):
+        bank = _make_bank()
+        calibrated, meta = calibrate_bank_batch(bank, ResponseCSR.from_dict(bank, _responses(bank)), use_3pl=True)
+        counts = np.array([_COUNTS[row % len(_COUNTS)] for row in range(len(bank))])
+        assert 100 not in meta  # No responses, not calibrated
+        np.testing.assert_array_equal(calibrated.a[counts < 30], bank.a[counts < 30])
+        np.testing.assert_array_equal(calibrated.c[counts < 500], bank.c[counts < 500])
+        assert np.all(calibrated.c[counts >= 500]
+                      <= np.where(bank.question_type[counts >= 500] == 6, 0.5, 0.25))
+
+    def test_from_arrays_groups_by_row_and_drops_unknown_ids(self):
+        bank = _make_bank(4)
+        csr = ResponseCSR.from_arrays(bank, [103, 101, 999, 103], [0.1, 0.2, 0.3, 0.4], [1, 0, 1, 0])
+        assert csr.indptr.tolist() == [0, 0, 1, 1, 3]
+        assert csr.theta.tolist() == [0.2, 0.1, 0.4]
+        assert csr.correct.tolist() == [0.0, 1.0, 0.0]
+
+    def test_no_responses(self):
+        bank = _make_bank(3)
+        assert calibrate_bank_batch(bank, ResponseCSR.from_arrays(bank, [], [], [])) == (bank, {})
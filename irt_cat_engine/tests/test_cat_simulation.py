@@ -3,6 +3,7 @@ import numpy as np
 import pytest
 
 from irt_cat_engine.models.irt_2pl import ItemParameters, probability
+from irt_cat_engine.models.ability_estimator import estimate_theta_eap
 from irt_cat_engine.cat.session import CATSession
 from irt_cat_engine.cat.stopping_rules import StoppingRules
 
@@ -171,3 +172,37 @@ class TestCATSimulation:
         assert rmse < 0.6, f"RMSE {rmse:.3f} exceeds 0.6"
         assert bias < 0.5, f"Mean absolute bias {bias:.3f} exceeds 0.5"
         assert correlation > 0.85, f"Correlation {correlation:.3f} below 0.85"
+
+
+class TestIncrementalEstimation:
+    """The running log-likelihood must agree with a full EAP re-estimation."""
+
+    def _run(self, item_pool, dont_know_every: int = 0):
+        rng = np.random.RandomState(5)
+        session = CATSession(
+            item_pool=item_pool,
+            initial_theta=0.0,
+            stopping_rules=StoppingRules(min_items=30, max_items=30),
+        )
+        while not session.is_complete:
+            item = session.get_next_item()
+            is_correct = _simulate_response(0.3, item, rng)
+            dont_know = bool(dont_know_every) and not is_correct and len(session.responses) % dont_know_every == 0
+            session.record_response(item, is_correct, is_dont_know=dont_know)
+
+            theta, se = estimate_theta_eap(
+                session.administered_items, session.responses, session.dont_know_flags,
+            )
+            assert abs(session.current_theta - theta) < 1e-9
+            assert abs(session.current_se - se) < 1e-9
+        return session
+
+    def test_matches_full_reestimation_2pl(self):
+        self._run(_generate_synthetic_item_pool(n=300))
+
+    def test_matches_full_reestimation_3pl_dont_know(self):
+        pool = _generate_synthetic_item_pool(n=300)
+        for item in pool:
+            item.guessing_c = 0.2
+        session = self._run(pool, dont_know_every=2)
+        assert any(session.dont_know_flags)
@@ -0,0 +1,124 @@
+"""Tests for the incremental item exposure counters."""
+import numpy as np
+import pytest
+from sqlalchemy import case, create_engine, func, insert, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+
+from irt_cat_engine.api.response_writer import ResponseWriter
+from irt_cat_engine.cat.item_selector import ExposureController
+from irt_cat_engine.data import exposure_counts
+from irt_cat_engine.data.database import Base
+from irt_cat_engine.data.db_models import AggregationWatermark, ItemExposure, Response
+from irt_cat_engine.data.exposure_counts import WATERMARK, catch_up_exposure
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'exposure.db'}")
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def _row(item_id: int, correct: bool) -> dict:
+    return dict(
+        session_id="s1", item_id=item_id, word=f"w{item_id}", question_type=1,
+        is_correct=correct, is_dont_know=False, response_time_ms=None, sequence=1,
+        theta_before=0.0, theta_after=0.0, se_before=1.0, se_after=1.0,
+        difficulty_b=0.0, discrimination_a=1.0,
+    )
+
+
+def _insert(session_factory, rows: list[dict]):
+    with session_factory() as db:
+        db.execute(insert(Response), rows)
+        db.commit()
+
+
+def _counts(session_factory) -> dict[int, tuple[int, int]]:
+    with session_factory() as db:
+        return {e.item_id: (e.admin_count, e.correct_count) for e in db.scalars(select(ItemExposure))}
+
+
+def _recount(session_factory) -> dict[int, tuple[int, int]]:
+    with session_factory() as db:
+        rows = db.execute(
+            select(Response.item_id, func.count(Response.id), func.sum(case((Response.is_correct, 1), else_=0)))
+            .group_by(Response.item_id)
+        ).all()
+    return {item_id: (n, int(c)) for item_id, n, c in rows}
+
+
+class TestCatchUp:
+
+    def test_folds_only_new_responses(self, session_factory):
+        _insert(session_factory, [_row(1, True), _row(1, False), _row(2, True)])
+        with session_factory() as db:
+            assert catch_up_exposure(db) == 3
+        assert _counts(session_factory) == {1: (2, 1), 2: (1, 1)}
+
+        _insert(session_factory, [_row(2, False), _row(3, True)])
+        with session_factory() as db:
+            assert catch_up_exposure(db) == 2
+            assert catch_up_exposure(db) == 0
+        assert _counts(session_factory) == {1: (2, 1), 2: (2, 1), 3: (1, 1)}
+
+    def test_chunks_advance_watermark_to_last_id(self, session_factory):
+        rng = np.random.default_rng(0)
+        _insert(session_factory, [_row(int(i), bool(c)) for i, c in zip(rng.integers(0, 5, 40), rng.random(40) < 0.5)])
+        with session_factory() as db:
+            assert catch_up_exposure(db, chunk_size=7) == 40
+            assert db.get(AggregationWatermark, WATERMARK).last_response_id == 40
+        assert _counts(session_factory) == _recount(session_factory)
+
+    def test_missing_watermark_rebuilds_stale_counters(self, session_factory):
+        with session_factory() as db:
+            db.add(ItemExposure(item_id=1, word="w1", admin_count=99, correct_count=50))
+            db.commit()
+        _insert(session_factory, [_row(1, True), _row(1, True)])
+        with session_factory() as db:
+            catch_up_exposure(db)
+        assert _counts(session_factory) == {1: (2, 2)}
+
+    def test_generic_dialect_fallback(self, session_factory, monkeypatch):
+        monkeypatch.setattr(exposure_counts, "_UPSERT_INSERTS", {})
+        _insert(session_factory, [_row(1, True)])
+        with session_factory() as db:
+            catch_up_exposure(db)
+        _insert(session_factory, [_row(1, False), _row(4, True)])
+        with session_factory() as db:
+            catch_up_exposure(db)
+        assert _counts(session_factory) == {1: (2, 1), 4: (1, 1)}
+
+
+class TestWriterAggregation:
+
+    def test_written_batches_are_folded_by_catch_up(self, session_factory):
+        writer = ResponseWriter(session_factory, batch_size=8, linger_ms=0)
+        rng = np.random.default_rng(1)
+        for item_id, correct in zip(rng.integers(0, 6, 50), rng.random(50) < 0.6):
+            writer.put(_row(int(item_id), bool(correct)))
+        assert writer.flush(timeout=10)
+        writer.close()
+        assert _counts(session_factory) == {}  # Writers don't fold
+        with session_factory() as db:
+            assert catch_up_exposure(db) == 50
+        assert _counts(session_factory) == _recount(session_factory)
+
+    def test_writers_share_the_lock_the_fold_takes_exclusively(self):
+        def sql(shared):
+            return str(exposure_counts._watermark_query(shared).compile(dialect=postgresql.dialect()))
+        assert sql(shared=True).endswith("FOR SHARE")
+        assert sql(shared=False).endswith("FOR UPDATE")
+
+
+class TestExposureSeed:
+
+    def test_seed_sets_counts_and_recalibrates(self):
+        controller = ExposureController(4, target_max_rate=0.2)
+        controller.seed(np.array([0, 2, 6]), np.array([15, 1, 3]), total_tests=20)
+        assert controller.admin_counts.tolist() == [15, 0, 1, 0, 0, 0, 3]
+        assert controller.total_tests == 20
+        assert controller.k[0] < 1.0  # 15/20 administered, over the 0.2 target
+        assert controller.k[2] == 1.0
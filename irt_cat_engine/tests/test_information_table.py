@@ -0,0 +1,137 @@
+"""Tests for the precomputed theta-grid information table."""
+import numpy as np
+import pytest
+
+from irt_cat_engine.cat.item_selector import ContentTracker, ExposureController, select_next_item
+from irt_cat_engine.item_bank.bank import ItemBank
+from irt_cat_engine.item_bank.calibrator import calibrate_bank
+from irt_cat_engine.item_bank.information_table import InformationTable, get_information_table
+from irt_cat_engine.models.irt_2pl import ItemParameters, fisher_information, fisher_information_array
+
+
+def _make_bank(n: int = 400, seed: int = 11) -> ItemBank:
+    rng = np.random.RandomState(seed)
+    return ItemBank.from_items([
+        ItemParameters(
+            item_id=i, word=f"w{i}",
+            difficulty_b=float(rng.normal(0, 1.2)),
+            discrimination_a=float(rng.uniform(0.5, 2.0)),
+            guessing_c=float(rng.choice([0.0, 0.2])),
+            question_type=int(rng.randint(1, 7)),
+            topic=f"t{i % 8}",
+            is_loanword=bool(i % 10 == 0),
+        )
+        for i in range(n)
+    ])
+
+
+class TestInformationTable:
+
+    def test_grid_values_match_exact_information(self):
+        bank = _make_bank()
+        table = InformationTable(bank)
+        assert table.grid[0] == pytest.approx(-3.0)
+        assert table.grid[-1] == pytest.approx(3.0)
+        for idx in (0, 150, 300, 600):
+            np.testing.assert_allclose(
+                table.table[idx], fisher_information_array(table.grid[idx], bank), rtol=1e-6,
+            )
+
+    def test_interpolation_between_bins(self):
+        bank = _make_bank()
+        table = InformationTable(bank)
+        theta = 0.123
+        np.testing.assert_allclose(table.information(theta), fisher_information_array(theta, bank),
+                                   rtol=1e-3, atol=1e-6)
+        rows = np.array([3, 7, 11])
+        np.testing.assert_allclose(table.information(theta, rows), table.information(theta)[rows])
+
+    def test_top_rows_are_ranked(self):
+        bank = _make_bank()
+        table = InformationTable(bank, top_k=20)
+        for theta in (-2.0, 0.0, 1.5):
+            idx = table.bin_index(theta)
+            ranked = table.top_rows[idx]
+            expected = np.argsort(-table.table[idx], kind="stable")[:20]
+            np.testing.assert_allclose(table.table[idx][ranked], table.table[idx][expected])
+            assert np.all(np.diff(table.table[idx][ranked]) <= 0)
+
+    def test_new_parameters_get_their_own_table(self):
+        bank = _make_bank()
+        table = get_information_table(bank)
+        a, b = bank.a.copy(), bank.b.copy()
+        a[5], b[5] = 2.4, 0.0
+        other = get_information_table(bank.with_parameters(a, b, bank.c))
+        assert get_information_table(bank) is table and other is not table
+        assert other.table[other.bin_index(0.0), 5] == pytest.approx(
+            fisher_information(0.0, 2.4, 0.0, bank.c[5]), rel=1e-6)
+
+    def test_calibrate_bank_returns_new_bank(self):
+        bank = _make_bank().freeze()
+        table = get_information_table(bank)
+        rng = np.random.RandomState(0)
+        responses = {3: [(float(t), int(rng.rand() < 0.9)) for t in rng.normal(0, 1, 60)]}
+        old_b = float(bank.b[3])
+        calibrated, meta = calibrate_bank(bank, responses)
+        assert meta[3]["updated"] is True
+        assert calibrated.b[3] == pytest.approx(old_b + meta[3]["b_change"], abs=1e-4)
+        assert bank.b[3] == old_b and get_information_table(bank) is table
+        assert get_information_table(calibrated, build=False) is None
+
+    def test_build_is_opt_in(self):
+        bank = _make_bank()
+        assert get_information_table(bank, build=False) is None
+        get_information_table(bank)
+        assert get_information_table(bank, build=False) is not None
+
+
+class TestShortlistSelection:
+
+    def test_matches_full_scan(self):
+        with_table = _make_bank()
+        get_information_table(with_table)
+        without_table = _make_bank()
+        for theta in np.linspace(-2.8, 2.8, 40):
+            tracker = ContentTracker()
+            a = select_next_item(theta, with_table, set(), tracker, top_n=1)
+            b = select_next_item(theta, without_table, set(), tracker, top_n=1)
+            assert a.item_id == b.item_id
+
+    def test_falls_back_when_shortlist_exhausted(self):
+        bank = _make_bank(n=100)
+        table = get_information_table(bank)
+        administered = set(bank.item_ids[table.ranked_rows(0.0)].tolist())
+        selected = select_next_item(0.0, bank, administered, ContentTracker())
+        assert selected is not None
+        assert selected.item_id not in administered
+
+    def test_exposure_controller_applies_on_shortlist(self):
+        bank = _make_bank()
+        get_information_table(bank)
+        ctrl = ExposureController(len(bank))
+        best = select_next_item(0.0, bank, set(), ContentTracker(), ctrl, top_n=1)
+        ctrl.k[best.item_id] = 0.0
+        for _ in range(20):
+            assert select_next_item(0.0, bank, set(), ContentTracker(), ctrl, top_n=1).item_id != best.item_id
+
+    def test_fallback_reuses_shortlist_exposure_draws(self):
+        bank = _make_bank()
+        table = get_information_table(bank)
+        ctrl = ExposureController(len(bank))
+        ctrl.k[:] = 0.5
+
+        class RecordingRng:
+            def __init__(self):
+                self.gen, self.draws = np.random.default_rng(0), []
+
+            def random(self, size=None):
+                out = self.gen.random(size)
+                self.draws.append(out)
+                return out
+
+        rng = RecordingRng()
+        # More than the shortlist holds, so the full-pool pass always runs
+        assert select_next_item(0.0, bank, set(), ContentTracker(), ctrl, top_n=table.top_k + 1, rng=rng)
+        short = next(d for d in rng.draws if d.shape == (1, table.top_k))
+        full = next(d for d in rng.draws if d.shape == (1, len(bank)))
+        np.testing.assert_array_equal(full[0, table.ranked_rows(0.0)], short[0])
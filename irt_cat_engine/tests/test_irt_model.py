@@ -8,7 +8,9 @@ from irt_cat_engine.models.irt_2pl import (
 )
 from irt_cat_engine.models.ability_estimator import (
     estimate_theta_eap, estimate_theta_mle, estimate_initial_theta,
+    EAPEstimator, get_eap_estimator,
 )
+from irt_cat_engine.config import EAP_QUADRATURE_POINTS, EAP_QUAD_RANGE
 
 
 class TestProbability:
@@ -142,3 +144,75 @@ class TestArrayFunctions:
         ]
         infos = fisher_information_array(0.0, items)
         assert infos[1] > infos[0]  # higher a → more info
+
+
+def _reference_eap(items, responses, dont_know_flags=None):
+    """Scalar EAP (one probability() call per item per quadrature point)."""
+    from scipy import stats
+    quad_points = np.linspace(EAP_QUAD_RANGE[0], EAP_QUAD_RANGE[1], EAP_QUADRATURE_POINTS)
+    prior = stats.norm.pdf(quad_points, loc=0.0, scale=1.0)
+    likelihood = np.ones_like(quad_points)
+    for i, (item, response) in enumerate(zip(items, responses)):
+        c = 0.0 if (dont_know_flags and dont_know_flags[i]) else item.guessing_c
+        p = np.array([
+            probability(theta, item.discrimination_a, item.difficulty_b, c)
+            for theta in quad_points
+        ])
+        p = np.clip(p, 1e-10, 1.0 - 1e-10)
+        likelihood *= p if response == 1 else (1.0 - p)
+    posterior = likelihood * prior
+    posterior /= np.trapezoid(posterior, quad_points)
+    theta_hat = float(np.trapezoid(quad_points * posterior, quad_points))
+    variance = float(np.trapezoid((quad_points - theta_hat) ** 2 * posterior, quad_points))
+    return theta_hat, float(np.sqrt(max(variance, 1e-10)))
+
+
+class TestEAPEstimator:
+    def _random_pattern(self, n: int, seed: int, c: float = 0.0):
+        rng = np.random.RandomState(seed)
+        items = [
+            ItemParameters(
+                item_id=i, word=f"w{i}",
+                difficulty_b=float(rng.normal(0, 1.2)),
+                discrimination_a=float(rng.uniform(0.4, 2.5)),
+                guessing_c=c,
+            )
+            for i in range(n)
+        ]
+        responses = [int(r) for r in rng.randint(0, 2, n)]
+        return items, responses
+
+    @pytest.mark.parametrize("n_items", [1, 10, 30, 50])
+    def test_matches_scalar_reference_2pl(self, n_items):
+        items, responses = self._random_pattern(n_items, seed=n_items)
+        theta, se = estimate_theta_eap(items, responses)
+        ref_theta, ref_se = _reference_eap(items, responses)
+        assert abs(theta - ref_theta) < 1e-9
+        assert abs(se - ref_se) < 1e-9
+
+    def test_matches_scalar_reference_3pl_dont_know(self):
+        items, responses = self._random_pattern(30, seed=7, c=0.2)
+        flags = [r == 0 and i % 2 == 0 for i, r in enumerate(responses)]
+        theta, se = estimate_theta_eap(items, responses, dont_know_flags=flags)
+        ref_theta, ref_se = _reference_eap(items, responses, dont_know_flags=flags)
+        assert abs(theta - ref_theta) < 1e-9
+        assert abs(se - ref_se) < 1e-9
+
+    def test_no_items_returns_prior(self):
+        theta, se = EAPEstimator().estimate([], [])
+        assert abs(theta) < 1e-9
+        assert abs(se - 1.0) < 0.01
+
+    def test_shared_estimator_is_cached(self):
+        assert get_eap_estimator() is get_eap_estimator()
+        assert get_eap_estimator(0.5, 1.0) is not get_eap_estimator()
+
+    def test_single_responses_sum_to_pattern_likelihood(self):
+        est = EAPEstimator()
+        rng = np.random.RandomState(4)
+        a, b = rng.uniform(0.5, 2.0, 12), rng.normal(0, 1, 12)
+        c, r = rng.choice([0.0, 0.2], 12), rng.randint(0, 2, 12)
+        folded = sum(est.response_log_likelihood(a[i], b[i], c[i], r[i]) for i in range(12))
+        np.testing.assert_allclose(folded, est.log_likelihood(a, b, c, r))
+        np.testing.assert_array_equal(est.response_log_likelihood(a[0], b[0], c[0], r[0]),
+                                      est.log_likelihood(a[:1], b[:1], c[:1], r[:1]))
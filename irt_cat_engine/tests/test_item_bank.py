@@ -0,0 +1,110 @@
+"""Tests for the array-backed ItemBank and its vectorized consumers."""
+import numpy as np
+import pytest
+
+from irt_cat_engine.item_bank.bank import ItemBank, as_item_bank
+from irt_cat_engine.models.irt_2pl import (
+    ItemParameters, fisher_information, fisher_information_array, probability, probability_array,
+)
+from irt_cat_engine.reporting.exposure_analysis import analyze_exposure, identify_expansion_needs
+from irt_cat_engine.reporting.score_mapper import _estimate_oxford_coverage, theta_to_vocab_size
+
+
+def _make_items(n: int = 200, seed: int = 7) -> list[ItemParameters]:
+    rng = np.random.RandomState(seed)
+    cefrs = ["A1", "A2", "B1", "B2", "C1"]
+    topics = ["daily", "school", "nature", "business"]
+    return [
+        ItemParameters(
+            item_id=i,
+            word=f"word_{i}",
+            difficulty_b=float(rng.normal(0, 1.2)),
+            discrimination_a=float(rng.uniform(0.5, 2.0)),
+            guessing_c=float(rng.choice([0.0, 0.2])),
+            question_type=int(rng.randint(1, 7)),
+            pos=["noun", "verb", "adj"][i % 3],
+            cefr=cefrs[i % 5],
+            topic=topics[i % 4],
+            is_loanword=bool(i % 11 == 0),
+        )
+        for i in range(n)
+    ]
+
+
+class TestItemBank:
+
+    def test_round_trip(self):
+        items = _make_items(50)
+        bank = ItemBank.from_items(items)
+        assert len(bank) == 50
+        assert list(bank) == items
+        assert bank[-1] == items[-1]
+
+    def test_lookup_by_id_and_word(self):
+        items = [ItemParameters(item_id=10 + i, word=f"W{i}", difficulty_b=0.0, discrimination_a=1.0)
+                 for i in range(5)]
+        bank = ItemBank.from_items(items)
+        assert bank.get(12) == items[2]
+        assert bank.get(3) is None
+        assert bank.row_of(14) == 4
+        assert bank.rows_for_ids([14, 99, 10]).tolist() == [4, 0]
+        assert bank.get_by_word("w3") == items[3]
+        assert bank.get_by_word("missing") is None
+
+    def test_row_views_do_not_mutate_bank(self):
+        bank = ItemBank.from_items(_make_items(10))
+        view = bank[3]
+        view.difficulty_b += 5.0
+        assert bank[3].difficulty_b == pytest.approx(view.difficulty_b - 5.0)
+
+    def test_as_item_bank_passthrough(self):
+        bank = ItemBank.from_items(_make_items(10))
+        assert as_item_bank(bank) is bank
+
+    def test_out_of_range(self):
+        bank = ItemBank.from_items(_make_items(3))
+        with pytest.raises(IndexError):
+            bank[3]
+
+    def test_nbytes(self):
+        bank = ItemBank.from_items(_make_items(100))
+        assert 0 < bank.nbytes < 100 * 64
+
+
+class TestVectorizedConsumers:
+    """Bank-backed functions must match the per-item scalar definitions."""
+
+    @pytest.fixture
+    def items(self):
+        return _make_items()
+
+    def test_probability_array(self, items):
+        bank = ItemBank.from_items(items)
+        expected = [probability(0.4, i.discrimination_a, i.difficulty_b, i.guessing_c) for i in items]
+        np.testing.assert_allclose(probability_array(0.4, bank), expected, rtol=1e-12)
+
+    @pytest.mark.parametrize("theta", [-3.0, 0.0, 1.7])
+    def test_fisher_information_array(self, items, theta):
+        bank = ItemBank.from_items(items)
+        expected = [fisher_information(theta, i.discrimination_a, i.difficulty_b, i.guessing_c)
+                    for i in items]
+        np.testing.assert_allclose(fisher_information_array(theta, bank), expected, rtol=1e-10)
+        np.testing.assert_allclose(fisher_information_array(theta, items), expected, rtol=1e-10)
+
+    def test_vocab_size_and_coverage(self, items):
+        bank = ItemBank.from_items(items)
+        for theta in (-1.0, 0.0, 1.5):
+            expected_size = int(round(sum(
+                probability(theta, i.discrimination_a, i.difficulty_b, i.guessing_c) for i in items
+            )))
+            assert theta_to_vocab_size(theta, bank) == expected_size
+            assert _estimate_oxford_coverage(theta, bank) == _estimate_oxford_coverage(theta, items)
+
+    def test_exposure_analysis_accepts_bank(self, items):
+        counts = {i: (i * 7) % 40 for i in range(0, 200, 3)}
+        from_list = analyze_exposure(items, counts, total_sessions=100)
+        from_bank = analyze_exposure(ItemBank.from_items(items), counts, total_sessions=100)
+        assert from_list == from_bank
+        assert from_bank["items_used"] == sum(1 for c in counts.values() if c > 0)
+        assert identify_expansion_needs(items, counts, 100) == \
+            identify_expansion_needs(ItemBank.from_items(items), counts, 100)
@@ -0,0 +1,131 @@
+"""Tests for the pre-built item content cache."""
+import pytest
+from prometheus_client import REGISTRY
+
+from irt_cat_engine.api.item_content_cache import ItemContentCache
+from irt_cat_engine.api.session_manager import session_manager
+from irt_cat_engine.config import VOCAB_DB_PATH
+
+
+class FakeBuilder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, word: str, question_type: int) -> dict | None:
+        self.calls.append((word, question_type))
+        if word == "missing":
+            return None
+        return {"word": word, "question_type": question_type, "variant": len(self.calls)}
+
+
+@pytest.fixture
+def builder():
+    return FakeBuilder()
+
+
+def _metric(name: str, question_type: int) -> float:
+    return REGISTRY.get_sample_value(name, {"question_type": str(question_type)}) or 0.0
+
+
+class TestItemContentCache:
+
+    def test_miss_builds_inline_then_background_fills_variants(self, builder):
+        cache = ItemContentCache(builder, variants=3, background=False)
+        first = cache.get(1, 1, "apple")
+        assert first["word"] == "apple"
+        assert len(builder.calls) == 1
+        assert cache.fill_pending() == 1
+        assert len(builder.calls) == 3
+        seen = {cache.get(1, 1, "apple")["variant"] for _ in range(50)}
+        assert seen == {1, 2, 3}
+        assert len(builder.calls) == 3
+        assert cache.stats()["variants"] == 3
+
+    def test_hit_and_miss_counters(self, builder):
+        hits, misses = _metric("item_content_cache_hits_total", 4), _metric("item_content_cache_misses_total", 4)
+        cache = ItemContentCache(builder, background=False)
+        cache.get(7, 4, "apple")
+        cache.get(7, 4, "apple")
+        cache.get(7, 4, "apple")
+        assert (cache.hits, cache.misses) == (2, 1)
+        assert _metric("item_content_cache_hits_total", 4) - hits == 2
+        assert _metric("item_content_cache_misses_total", 4) - misses == 1
+        assert cache.stats()["hit_rate"] == pytest.approx(2 / 3, abs=1e-4)
+
+    def test_lru_eviction(self, builder):
+        cache = ItemContentCache(builder, max_keys=2, variants=1, background=False)
+        cache.get(1, 1, "a")
+        cache.get(2, 1, "b")
+        cache.get(1, 1, "a")  # 1 is now most recent
+        cache.get(3, 1, "c")
+        assert len(cache) == 2
+        assert cache.evictions == 1
+        builder.calls.clear()
+        cache.get(1, 1, "a")
+        assert builder.calls == []
+        cache.get(2, 1, "b")
+        assert builder.calls == [("b", 1)]
+
+    def test_question_types_are_separate_keys(self, builder):
+        cache = ItemContentCache(builder, variants=1, background=False)
+        assert cache.get(1, 1, "apple")["question_type"] == 1
+        assert cache.get(1, 3, "apple")["question_type"] == 3
+        assert len(cache) == 2
+
+    def test_unbuildable_items_are_not_cached(self, builder):
+        cache = ItemContentCache(builder, background=False)
+        assert cache.get(1, 1, "missing") is None
+        assert len(cache) == 0
+
+    def test_invalidate_on_new_version(self, builder):
+        cache = ItemContentCache(builder, variants=1, version="v1", background=False)
+        cache.get(1, 1, "apple")
+        assert not cache.invalidate("v1")
+        assert len(cache) == 1
+        assert cache.invalidate("v2")
+        assert len(cache) == 0 and cache.version == "v2"
+
+    def test_pending_work_from_old_version_is_dropped(self, builder):
+        cache = ItemContentCache(builder, variants=3, version="v1", background=False)
+        cache.get(1, 1, "apple")
+        cache.invalidate("v2")
+        cache.fill_pending()
+        assert len(builder.calls) == 1
+
+    def test_warm_prebuilds_without_requests(self, builder):
+        cache = ItemContentCache(builder, variants=2, background=False)
+        cache.warm([(1, 1, "apple"), (2, 1, "missing")])
+        cache.fill_pending()
+        assert len(cache) == 1
+        builder.calls.clear()
+        assert cache.get(1, 1, "apple") is not None
+        assert builder.calls == [] and cache.hits == 1
+
+    def test_background_thread(self, builder):
+        cache = ItemContentCache(builder, variants=4)
+        cache.get(1, 1, "apple")
+        cache.stop()
+        assert cache.stats()["variants"] == 4
+
+
+@pytest.fixture(scope="module")
+def manager():
+    if not VOCAB_DB_PATH.exists():
+        pytest.skip(f"Vocabulary DB not found: {VOCAB_DB_PATH}")
+    session_manager.load_data()
+    return session_manager
+
+
+class TestSessionManagerContent:
+
+    def test_content_is_served_from_cache(self, manager):
+        pool = manager.get_item_pool(1)
+        item = pool.get(int(pool.item_ids[len(pool) // 2]))
+        first = manager.generate_item_content(item, question_type=1)
+        hits = manager.content_cache_stats()["hits"]
+        second = manager.generate_item_content(item, question_type=1)
+        assert manager.content_cache_stats()["hits"] == hits + 1
+        for content in (first, second):
+            assert sorted(content["options"]) == sorted([content["correct_answer"], *content["distractors"]])
+            assert content["item_id"] == item.item_id
+            assert content["explanation"]
@@ -0,0 +1,101 @@
+"""Tests for per-session item overlays in mixed mode."""
+import numpy as np
+import pytest
+
+from irt_cat_engine.api.session_manager import SessionManager
+from irt_cat_engine.cat.item_overlay import ItemOverlay
+from irt_cat_engine.cat.session import CATSession
+from irt_cat_engine.cat.session_state import SessionState
+from irt_cat_engine.config import QUESTION_TYPE_B_MODIFIER
+from irt_cat_engine.tests.test_session_store import _make_bank, _make_vocab
+
+
+class TestItemOverlay:
+
+    def test_lookup_and_parameters(self):
+        bank = _make_bank(n=20)
+        overlay = ItemOverlay.for_mixed_mode()
+        overlay.set([1005, 1002], [4, 3])
+        overlay.set(1005, 5)  # Replaces the earlier entry
+        assert len(overlay) == 2
+
+        found, types, offsets = overlay.lookup([1002, 1003, 1005])
+        assert found.tolist() == [True, False, True]
+        assert types.tolist() == [3, 0, 5]
+        assert offsets.tolist() == [QUESTION_TYPE_B_MODIFIER[3], 0.0, QUESTION_TYPE_B_MODIFIER[5]]
+
+        rows = np.array([2, 3, 5])
+        a, b, c, question_type = overlay.parameters(bank, rows)
+        np.testing.assert_array_equal(a, bank.a[rows])
+        np.testing.assert_allclose(b, bank.b[rows] + offsets)
+        assert question_type.tolist() == [3, 1, 5]
+
+    def test_item_views_leave_the_pool_alone(self):
+        bank = _make_bank(n=20).freeze()
+        before = bank.b.copy()
+        overlay = ItemOverlay.for_mixed_mode()
+        overlay.set(1004, 2)
+        item = overlay.item(bank, 1004)
+        assert item.question_type == 2
+        assert item.difficulty_b == pytest.approx(before[4] + QUESTION_TYPE_B_MODIFIER[2])
+        assert overlay.item(bank, 1004, 6).question_type == 6
+        assert overlay.item(bank, 1007).difficulty_b == before[7]
+        assert overlay.item(bank, 5) is None
+        np.testing.assert_array_equal(bank.b, before)
+        with pytest.raises(ValueError):
+            bank.b[4] = 0.0
+
+
+class TestMixedModeSessions:
+
+    @pytest.fixture
+    def manager(self):
+        manager = SessionManager(store_backend="memory", exposure_backend="memory")
+        manager._items_by_type = {1: _make_bank()}
+        manager._vocab = _make_vocab()
+        return manager
+
+    def test_sessions_serve_the_same_item_independently(self, manager):
+        one = manager.create_session("s1", "u1", question_type=0)
+        two = manager.create_session("s2", "u2", question_type=0)
+        item = manager.get_item_pool(1).get(one.cat_session.get_next_item().item_id)
+        pool_b = item.difficulty_b
+
+        served_one = one.cat_session.serve_as(item, 5)
+        served_two = two.cat_session.serve_as(item, 2)
+        assert item.question_type == 1
+        assert served_one.difficulty_b == pytest.approx(pool_b + QUESTION_TYPE_B_MODIFIER[5])
+        assert served_two.difficulty_b == pytest.approx(pool_b + QUESTION_TYPE_B_MODIFIER[2])
+        assert manager.get_item_pool(1).get(item.item_id).difficulty_b == pool_b
+
+        # Estimation reads the served parameters even from an unadjusted copy
+        one.cat_session.record_response(item, True)
+        assert one.cat_session.administered_items == [served_one]
+
+    def test_single_type_sessions_cannot_change_type(self, manager):
+        active = manager.create_session("s1", "u1", question_type=1)
+        with pytest.raises(ValueError):
+            active.cat_session.serve_as(active.cat_session.get_next_item(), 3)
+
+    def test_restore_replays_served_parameters(self, manager):
+        active = manager.create_session("s1", "u1", question_type=0)
+        cat = active.cat_session
+        rng = np.random.RandomState(3)
+        for i in range(12):
+            item = cat.serve_as(cat.get_next_item(), [1, 2, 3, 4, 5, 6][i % 6])
+            cat.record_response(item, bool(rng.rand() < 0.6), is_dont_know=bool(i == 4))
+
+        restored = manager._restore_cat_session(SessionState.from_bytes(cat.state.to_bytes()), 0)
+        assert len(restored.overlay) == 12
+        assert restored.administered_items == cat.administered_items
+        np.testing.assert_allclose(restored.quad_log_likelihood, cat.quad_log_likelihood)
+        assert restored.content_tracker.type_counts == cat.content_tracker.type_counts
+        assert restored.get_next_item() is not None
+
+    def test_restore_without_overlay_matches_incremental(self):
+        bank = _make_bank()
+        session = CATSession(item_pool=bank)
+        for i in range(8):
+            session.record_response(session.get_next_item(), i % 3 != 0)
+        restored = CATSession.from_state(SessionState.from_bytes(session.state.to_bytes()), bank)
+        np.testing.assert_allclose(restored.quad_log_likelihood, session.quad_log_likelihood)
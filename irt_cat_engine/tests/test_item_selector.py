@@ -0,0 +1,173 @@
+"""Tests for the mask-based item selector and array-backed exposure control."""
+import numpy as np
+import pytest
+
+from irt_cat_engine.cat.item_selector import (
+    ContentTracker, ExposureController, candidate_mask, select_next_item,
+)
+from irt_cat_engine.config import CONTENT_BALANCE, LOANWORD_MAX_PER_TEST
+from irt_cat_engine.item_bank.bank import ItemBank
+from irt_cat_engine.models.irt_2pl import ItemParameters, fisher_information
+
+
+def _make_pool(n: int = 300, seed: int = 3) -> list[ItemParameters]:
+    rng = np.random.RandomState(seed)
+    return [
+        ItemParameters(
+            item_id=i, word=f"w{i}",
+            difficulty_b=float(rng.normal(0, 1.2)),
+            discrimination_a=float(rng.uniform(0.5, 2.0)),
+            guessing_c=float(rng.choice([0.0, 0.25])),
+            question_type=int(rng.randint(1, 7)),
+            topic=f"t{i % 6}",
+            is_loanword=bool(i % 9 == 0),
+        )
+        for i in range(n)
+    ]
+
+
+def _reference_best(theta, pool, administered, tracker):
+    """The original per-item filter + full sort, with top_n=1."""
+    available = [it for it in pool if it.item_id not in administered]
+    preferred = tracker.preferred_question_types(tracker.total)
+    candidates = [
+        it for it in available
+        if tracker.is_topic_ok(it.topic) and tracker.is_loanword_ok(it.is_loanword)
+        and (preferred is None or it.question_type in preferred)
+    ]
+    if len(candidates) < 1:
+        candidates = [it for it in available if tracker.is_topic_ok(it.topic)]
+    if len(candidates) < 1:
+        candidates = available
+    return max(candidates, key=lambda it: fisher_information(
+        theta, it.discrimination_a, it.difficulty_b, it.guessing_c))
+
+
+class TestSelectNextItem:
+
+    @pytest.mark.parametrize("theta", [-2.0, 0.0, 1.3])
+    def test_matches_reference_max_information(self, theta):
+        pool = _make_pool()
+        bank = ItemBank.from_items(pool)
+        tracker = ContentTracker()
+        administered: set[int] = set()
+        for _ in range(25):
+            expected = _reference_best(theta, pool, administered, tracker)
+            selected = select_next_item(theta, bank, administered, tracker, top_n=1)
+            assert selected.item_id == expected.item_id
+            administered.add(selected.item_id)
+            tracker.record(selected)
+
+    def test_top_n_spread(self):
+        bank = ItemBank.from_items(_make_pool())
+        rng = np.random.default_rng(0)
+        picks = {
+            select_next_item(0.0, bank, set(), ContentTracker(), top_n=5, rng=rng).item_id
+            for _ in range(200)
+        }
+        assert len(picks) == 5
+
+    def test_seeded_rng_is_reproducible(self):
+        bank = ItemBank.from_items(_make_pool())
+        a = [select_next_item(0.0, bank, set(), ContentTracker(), rng=np.random.default_rng(9)).item_id
+             for _ in range(3)]
+        b = [select_next_item(0.0, bank, set(), ContentTracker(), rng=np.random.default_rng(9)).item_id
+             for _ in range(3)]
+        assert a == b
+
+    def test_pool_exhausted(self):
+        pool = _make_pool(4)
+        assert select_next_item(0.0, pool, {0, 1, 2, 3}, ContentTracker()) is None
+
+    def test_relaxes_to_available_when_constraints_empty(self):
+        pool = [ItemParameters(item_id=i, word=f"w{i}", difficulty_b=0.0, discrimination_a=1.0,
+                               topic="same", question_type=6)
+                for i in range(3)]
+        tracker = ContentTracker()
+        tracker.topic_counts["same"] = CONTENT_BALANCE["max_same_topic"]
+        assert select_next_item(0.0, pool, set(), tracker) is not None
+
+
+class TestCandidateMask:
+
+    def test_strict_constraints(self):
+        bank = ItemBank.from_items(_make_pool())
+        tracker = ContentTracker()
+        tracker.topic_counts["t0"] = CONTENT_BALANCE["max_same_topic"]
+        tracker.loanword_count = LOANWORD_MAX_PER_TEST
+        mask = candidate_mask(bank, np.ones(len(bank), dtype=bool), tracker)
+        rows = np.flatnonzero(mask)
+        assert len(rows) > 0
+        assert not np.any(bank.topic_code[rows] == bank.topic_index["t0"])
+        assert not np.any(bank.is_loanword[rows])
+        assert set(bank.question_type[rows].tolist()) <= {1, 2}
+
+
+class TestExposureController:
+
+    def test_eligible_mask_respects_k(self):
+        ctrl = ExposureController(10)
+        ctrl.k[:5] = 0.0
+        mask = ctrl.eligible_mask(np.arange(10), np.random.default_rng(1))
+        assert not mask[:5].any()
+        assert mask[5:].all()
+
+    def test_unknown_ids_are_eligible(self):
+        ctrl = ExposureController(3)
+        assert ctrl.k_for(np.array([1, 50])).tolist() == [1.0, 1.0]
+        ctrl.record_administration(50)
+        assert ctrl.admin_counts[50] == 1
+
+    def test_recalibrate(self):
+        ctrl = ExposureController(3, target_max_rate=0.25)
+        ctrl.start_test(100)
+        ctrl.select_counts[:] = [50, 10, 0]
+        ctrl.admin_counts[:] = [50, 10, 0]
+        ctrl.k[1] = 0.5
+        assert ctrl.recalibrate()
+        assert ctrl.k[0] == pytest.approx(0.25 / 0.5)
+        assert ctrl.k[1] == pytest.approx(0.525)
+        assert ctrl.k[2] == 1.0
+
+    def test_recalibrate_without_new_tests_keeps_k(self):
+        ctrl = ExposureController(3, target_max_rate=0.25)
+        ctrl.start_test(100)
+        ctrl.admin_counts[:] = [50, 10, 0]
+        assert ctrl.recalibrate()
+        k = ctrl.k.copy()
+        for _ in range(20):
+            assert not ctrl.recalibrate()
+        np.testing.assert_array_equal(ctrl.k, k)
+
+    def test_recalibrate_settles_near_target(self):
+        # Item 0 would be selected in 80% of tests without exposure control
+        ctrl = ExposureController(2, target_max_rate=0.25)
+        for _ in range(50):
+            ctrl.start_test(1000)
+            ctrl.admin_counts[0] += round(1000 * 0.8 * ctrl.k[0])
+            ctrl.recalibrate()
+        assert 0.25 / 0.8 / 1.1 < ctrl.k[0] < 0.25 / 0.8 * 1.1
+
+    def test_abandoned_tests_count_in_the_rate(self):
+        ctrl = ExposureController(2, target_max_rate=0.5)
+        for _ in range(20):
+            ctrl.start_test()
+            ctrl.record_batch(np.array([0]))
+        ctrl.end_test(10)  # Half were abandoned
+        ctrl.recalibrate()
+        assert ctrl.k[0] == pytest.approx(0.5)
+
+    def test_seed_without_k_recalibrates_from_history(self):
+        ctrl = ExposureController(3, target_max_rate=0.25)
+        ctrl.seed(np.array([0, 1]), np.array([60, 10]), total_tests=80, started_tests=120)
+        assert ctrl.k[0] == pytest.approx(0.25 / 0.5)
+        assert not ctrl.recalibrate()
+
+    def test_exposure_controller_limits_selection(self):
+        bank = ItemBank.from_items(_make_pool())
+        ctrl = ExposureController(len(bank))
+        first = select_next_item(0.0, bank, set(), ContentTracker(), ctrl, top_n=1)
+        ctrl.k[first.item_id] = 0.0
+        second = select_next_item(0.0, bank, set(), ContentTracker(), ctrl, top_n=1)
+        assert second.item_id != first.item_id
+        assert ctrl.select_counts[first.item_id] == 1
@@ -0,0 +1,97 @@
+"""Tests for the joint (item, question type) pool of mixed mode."""
+import numpy as np
+import pytest
+
+from irt_cat_engine.api.session_manager import SessionManager
+from irt_cat_engine.cat.item_overlay import ItemOverlay
+from irt_cat_engine.config import QUESTION_TYPE_B_MODIFIER
+from irt_cat_engine.item_bank.information_table import get_information_table
+from irt_cat_engine.item_bank.joint_pool import build_joint_pool, question_type_availability
+from irt_cat_engine.tests.test_parameter_registry import _shifted
+from irt_cat_engine.tests.test_session_store import _make_bank, _make_vocab
+
+
+class TestJointPool:
+
+    def test_availability_follows_word_data(self):
+        vocab = _make_vocab(n=12)
+        available = question_type_availability(vocab, ["w0", "w1", "w3", "w4", "missing"])
+        assert available.shape == (5, 7)
+        assert not available[:, 0].any()
+        assert available[:, 1].all()
+        assert available[:, 2].tolist() == [True, True, True, True, False]
+        assert available[:, 3].tolist() == [True, False, False, True, False]   # synonym
+        assert available[:, 4].tolist() == [True, False, True, False, False]   # antonym
+        assert available[:, 5].tolist() == [False, True, True, False, False]   # sentence
+        assert available[:, 6].tolist() == [False, True, True, True, False]    # collocation
+
+    def test_rows_are_feasible_pairs_with_type_offsets(self):
+        bank = _make_bank(n=30)
+        available = question_type_availability(_make_vocab(n=30), bank.words)
+        offsets = ItemOverlay.for_mixed_mode().type_offsets
+        pool = build_joint_pool(bank, available, offsets)
+
+        assert len(pool) == int(available.sum())
+        assert get_information_table(pool, build=False) is not None
+        for row in range(len(pool)):
+            item_id, question_type = int(pool.item_ids[row]), int(pool.question_type[row])
+            base = bank.row_of(item_id)
+            assert available[base, question_type]
+            assert pool.b[row] == pytest.approx(bank.b[base] + QUESTION_TYPE_B_MODIFIER[question_type]
+                                                - QUESTION_TYPE_B_MODIFIER[1])
+            assert pool.a[row] == bank.a[base]
+
+        # Every row of a word is found by its id
+        rows = pool.rows_for_ids([1000, 1004, 5])
+        assert sorted(pool.question_type[rows].tolist()) == sorted(np.flatnonzero(available[0]).tolist()
+                                                                   + np.flatnonzero(available[4]).tolist())
+        assert set(pool.item_ids[rows].tolist()) == {1000, 1004}
+
+    def test_types_subset(self):
+        bank = _make_bank(n=30)
+        available = question_type_availability(_make_vocab(n=30), bank.words)
+        pool = build_joint_pool(bank, available, ItemOverlay.for_mixed_mode().type_offsets, (1, 3))
+        assert set(pool.question_type.tolist()) == {1, 3}
+        assert len(pool) == 30 + int(available[:, 3].sum())
+
+
+class TestMixedModeSelection:
+
+    @pytest.fixture
+    def manager(self):
+        manager = SessionManager(store_backend="memory", exposure_backend="memory")
+        manager._items_by_type = {1: _make_bank()}
+        manager._vocab = _make_vocab()
+        return manager
+
+    def test_selects_word_and_type_together(self, manager):
+        active = manager.create_session("s1", "u1", question_type=0)
+        cat = active.cat_session
+        available = question_type_availability(manager._vocab, manager.get_item_pool(1).words)
+        pool = manager.get_item_pool(1)
+        rng = np.random.RandomState(1)
+        served = []
+        while (item := cat.get_next_item()) is not None:
+            served.append(item)
+            # The item comes served as its selected type, parameters from the type-1 pool
+            base = pool.get(item.item_id)
+            assert available[pool.row_of(item.item_id), item.question_type]
+            assert item.difficulty_b == pytest.approx(
+                base.difficulty_b + QUESTION_TYPE_B_MODIFIER[item.question_type] - QUESTION_TYPE_B_MODIFIER[1])
+            cat.record_response(item, bool(rng.rand() < 0.6))
+
+        ids = [item.item_id for item in served]
+        assert len(served) > 15
+        assert len(set(ids)) == len(ids)
+        # Warm-up and early-test types follow the progression constraints
+        assert {item.question_type for item in served[:5]} <= {1, 2}
+        assert {item.question_type for item in served[5:15]} <= {1, 2, 3, 5}
+        assert cat.administered_items == served
+        found, types, _ = cat.overlay.lookup(ids)
+        assert found.all() and types.tolist() == [item.question_type for item in served]
+
+    def test_joint_pool_follows_parameter_versions(self, manager):
+        joint = manager.get_item_pool(0)
+        manager.load_parameter_set(_shifted(manager.get_item_pool(1), 1.0))
+        # Built before the swap, because the current version had built it
+        np.testing.assert_allclose(manager.get_item_pool(0).b, joint.b + 1.0)
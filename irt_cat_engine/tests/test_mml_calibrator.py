@@ -0,0 +1,152 @@
+"""Tests for MML/EM recalibration and versioned parameter sets."""
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from irt_cat_engine.data.database import Base
+from irt_cat_engine.data.db_models import Response, TestSession as StoredSession, User
+from irt_cat_engine.data.mml_recalibration import recalibrate_mml
+from irt_cat_engine.item_bank.bank import ItemBank
+from irt_cat_engine.item_bank.mml_calibrator import ResponseChunk, run_mml_em
+from irt_cat_engine.item_bank.parameter_set import ParameterSet, latest_parameter_set
+from irt_cat_engine.models.irt_2pl import ItemParameters
+
+
+def _simulate(n_items: int = 60, n_sessions: int = 1500, per_session: int = 20, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    a = rng.uniform(0.7, 2.0, n_items)
+    b = rng.normal(0, 1, n_items)
+    theta = rng.normal(0, 1, n_sessions)
+    rows = np.concatenate([rng.choice(n_items, per_session, replace=False) for _ in range(n_sessions)])
+    sessions = np.repeat(np.arange(n_sessions), per_session)
+    correct = rng.random(len(rows)) < 1 / (1 + np.exp(-a[rows] * (theta[sessions] - b[rows])))
+    return a, b, sessions, rows, correct
+
+
+def _chunks(sessions, rows, correct, size):
+    def read():
+        for start in range(0, sessions.max() + 1, size):
+            m = (sessions >= start) & (sessions < start + size)
+            yield ResponseChunk.from_sorted(sessions[m], rows[m], correct[m], np.zeros(m.sum(), dtype=bool))
+    return read
+
+
+class TestRunMMLEM:
+
+    def test_recovers_parameters_from_perturbed_start(self):
+        a, b, sessions, rows, correct = _simulate()
+        rng = np.random.default_rng(1)
+        a0, b0 = a * rng.uniform(0.7, 1.3, len(a)), b + rng.normal(0, 0.5, len(b))
+        result = run_mml_em(_chunks(sessions, rows, correct, 200), a0, b0, np.zeros(len(a)))
+        assert result.converged
+        assert np.abs(result.b - b).mean() < 0.5 * np.abs(b0 - b).mean()
+        assert np.abs(result.a - a).mean() < np.abs(a0 - a).mean()
+        assert result.log_likelihood[-1] > result.log_likelihood[0]
+        assert result.sessions == 1500
+
+    def test_chunking_does_not_change_the_result(self):
+        a, b, sessions, rows, correct = _simulate(n_sessions=300)
+        c = np.zeros(len(a))
+        small = run_mml_em(_chunks(sessions, rows, correct, 7), a, b, c, max_iter=3)
+        large = run_mml_em(_chunks(sessions, rows, correct, 1000), a, b, c, max_iter=3)
+        np.testing.assert_allclose(small.a, large.a, atol=1e-10)
+        np.testing.assert_allclose(small.b, large.b, atol=1e-10)
+
+    def test_gates_and_unobserved_items(self):
+        a, b, sessions, rows, correct = _simulate(n_sessions=200)
+        keep = rows != 5
+        rows, sessions, correct = rows[keep], sessions[keep], correct[keep]
+        sparse = rows == 7  # Leave item 7 under the min_responses gate for a
+        keep = ~sparse | (np.cumsum(sparse) <= 10)
+        result = run_mml_em(_chunks(sessions[keep], rows[keep], correct[keep], 50), a, b, np.zeros(len(a)))
+        assert result.observed[5] == 0 and result.observed[7] == 10
+        assert (result.a[5], result.b[5]) == (a[5], b[5])
+        assert result.a[7] == a[7] and result.b[7] != b[7]
+
+
+def _bank(n: int = 12, qt: int = 1) -> ItemBank:
+    rng = np.random.RandomState(qt)
+    return ItemBank.from_items([
+        ItemParameters(item_id=500 + i, word=f"w{i}", difficulty_b=float(rng.normal(0, 1)),
+                       discrimination_a=float(rng.uniform(0.8, 1.5)), guessing_c=0.2 if qt == 2 else 0.0,
+                       question_type=qt)
+        for i in range(n)
+    ])
+
+
+class TestRecalibrationJob:
+
+    @pytest.fixture
+    def db(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'mml.db'}")
+        Base.metadata.create_all(engine)
+        with sessionmaker(bind=engine)() as session:
+            yield session
+        engine.dispose()
+
+    def _store_responses(self, db, n_sessions: int = 80):
+        rng = np.random.default_rng(2)
+        db.add(User(id="u1"))
+        db.add_all([StoredSession(id=f"s{i:04d}", user_id="u1") for i in range(n_sessions)])
+        rows = []
+        for i in range(n_sessions):
+            theta = rng.normal()
+            for seq, item in enumerate(rng.choice(10, 8, replace=False)):  # Items 510/511 never seen
+                qt = 1 if seq % 2 else 2
+                rows.append(dict(
+                    session_id=f"s{i:04d}", item_id=500 + int(item), word="w", question_type=qt,
+                    is_correct=bool(rng.random() < 1 / (1 + np.exp(-(theta - 0.5)))),
+                    is_dont_know=bool(rng.random() < 0.05), sequence=seq + 1,
+                    theta_before=0.0, theta_after=0.0, se_before=1.0, se_after=1.0,
+                    difficulty_b=0.0, discrimination_a=1.0,
+                ))
+        rows.append(dict(rows[0], item_id=9999))  # Not in any bank
+        db.execute(insert(Response), rows)
+        db.commit()
+        return len(rows) - 1
+
+    def test_streams_sessions_into_a_parameter_set(self, db, tmp_path):
+        n_responses = self._store_responses(db)
+        banks = {1: _bank(qt=1), 2: _bank(qt=2)}
+        before = {qt: (bank.a.copy(), bank.b.copy()) for qt, bank in banks.items()}
+        parameter_set = recalibrate_mml(db, banks, chunk_sessions=9)
+
+        meta = parameter_set.metadata
+        assert meta["sessions"] == 80
+        assert sum(meta["responses"].values()) == n_responses
+        assert meta["items_calibrated"] == {"1": 10, "2": 10}
+        for qt, bank in banks.items():
+            np.testing.assert_array_equal(bank.b, before[qt][1])  # Banks are not modified
+            item_ids, a, b, c = parameter_set.params[qt]
+            assert np.all(b[:10] != before[qt][1][:10])
+            np.testing.assert_array_equal(b[10:], before[qt][1][10:])
+            np.testing.assert_array_equal(c, bank.c)
+
+        path = parameter_set.save(tmp_path / "sets")
+        loaded = latest_parameter_set(tmp_path / "sets")
+        assert path.name == f"{parameter_set.version}.npz"
+        assert loaded.version == parameter_set.version
+        assert loaded.metadata == meta
+        np.testing.assert_array_equal(loaded.params[2][2], parameter_set.params[2][2])
+
+
+class TestBankFor:
+
+    def test_overrides_known_items_without_touching_the_bank(self):
+        bank = _bank(qt=1)
+        original_b = bank.b.copy()
+        parameter_set = ParameterSet.create({
+            1: (np.r_[bank.item_ids[:3], 999], [1.1, 1.2, 1.3, 1.4], [0.1, 0.2, 0.3, 0.4], [0.0] * 4),
+        })
+        updated = parameter_set.bank_for(bank, 1)
+        assert updated.b[:3].tolist() == [0.1, 0.2, 0.3]
+        assert updated.a[:3].tolist() == [1.1, 1.2, 1.3]
+        np.testing.assert_array_equal(updated.b[3:], original_b[3:])
+        np.testing.assert_array_equal(bank.b, original_b)
+        assert updated.item_ids is bank.item_ids and updated.cefr_code is bank.cefr_code
+
+        # No parameters for the type: same values, still a separate bank
+        other = parameter_set.bank_for(bank, 3)
+        assert other is not bank
+        np.testing.assert_array_equal(other.b, original_b)
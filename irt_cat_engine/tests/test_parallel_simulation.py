@@ -0,0 +1,73 @@
+"""Tests for the sharded multi-process simulation driver."""
+import numpy as np
+import pytest
+
+from irt_cat_engine.cat.parallel_simulation import SharedBank, SimulationSpec, run_shard, sweep
+from irt_cat_engine.cat.simulation import SimulationResult, SimulationStats, simulate, synthetic_bank
+from irt_cat_engine.item_bank.information_table import get_information_table
+
+
+@pytest.fixture(scope="module")
+def bank():
+    return synthetic_bank(800, seed=3)
+
+
+def _without_timing(report: dict) -> dict:
+    return {k: v for k, v in report.items() if k not in ("cpu_seconds", "wall_seconds", "workers")}
+
+
+class TestSharding:
+
+    def test_reports_identical_across_worker_counts(self, bank):
+        specs = [SimulationSpec(), SimulationSpec(se_threshold=0.35, max_exposure_rate=0.2,
+                                                  quadrature_points=21)]
+        serial = sweep(bank, specs, 900, seed=5, workers=1, shard_size=250)
+        pooled = sweep(bank, specs, 900, seed=5, workers=2, shard_size=250)
+        assert [_without_timing(r) for r in serial] == [_without_timing(r) for r in pooled]
+        assert serial[0]["simulees"] == 900
+
+    def test_specs_share_simulees(self, bank):
+        loose, strict = sweep(bank, [SimulationSpec(se_threshold=0.4), SimulationSpec(se_threshold=0.25)],
+                              300, seed=1, workers=1, shard_size=100)
+        assert loose["test_length"]["mean"] <= strict["test_length"]["mean"]
+
+    def test_shared_bank_roundtrip(self, bank):
+        table = get_information_table(bank)
+        with SharedBank(bank) as shared:
+            attached, blocks = SharedBank.attach(shared.handle)
+            try:
+                np.testing.assert_array_equal(attached.b, bank.b)
+                assert attached.words == bank.words
+                assert attached.topic_labels == bank.topic_labels
+                assert not attached.a.flags.writeable
+                attached_table = get_information_table(attached, build=False)
+                np.testing.assert_array_equal(attached_table.top_rows, table.top_rows)
+                seq = np.random.SeedSequence(9)
+                a = run_shard(attached, SimulationSpec(), seq, 50).summary()
+                b = run_shard(bank, SimulationSpec(), seq, 50).summary()
+                a.pop("elapsed_seconds"), b.pop("elapsed_seconds")
+                assert a == b
+            finally:
+                del attached, attached_table
+                for block in blocks:
+                    block.close()
+
+
+class TestStatsMerge:
+
+    def test_merged_stats_match_single_run(self, bank):
+        rng = np.random.default_rng(2)
+        result = simulate(bank, rng.uniform(-2, 2, 120), rng=rng)
+        merged = SimulationStats(len(bank))
+        for sl in (slice(0, 50), slice(50, 120)):
+            part = SimulationResult(
+                result.theta_true[sl], result.theta_hat[sl], result.se[sl], result.n_items[sl],
+                result.termination_reasons[sl], np.zeros(len(bank), dtype=np.int64),
+            )
+            merged.merge(part.stats())
+        merged.exposure_counts += result.exposure_counts
+        full, combined = result.summary(), merged.summary()
+        for key in ("simulees", "test_length", "termination_reasons", "exposure", "by_ability"):
+            assert combined[key] == full[key]
+        for key in ("rmse", "bias", "correlation", "mean_se"):
+            assert combined[key] == pytest.approx(full[key], abs=1e-4)
@@ -0,0 +1,155 @@
+"""Tests for hot-swapped item parameter versions."""
+import numpy as np
+import pytest
+
+from concurrent.futures import ThreadPoolExecutor
+
+from irt_cat_engine.api.session_manager import SessionManager
+from irt_cat_engine.item_bank.calibrator import calibrate_bank
+from irt_cat_engine.item_bank.information_table import get_information_table
+from irt_cat_engine.item_bank.parameter_registry import INITIAL_VERSION, ParameterRegistry
+from irt_cat_engine.item_bank.parameter_set import ParameterSet
+from irt_cat_engine.tests.test_session_store import _make_bank, _make_vocab, _redis_client, _run
+
+
+def _shifted(bank, shift: float, **metadata) -> ParameterSet:
+    return ParameterSet.create({1: (bank.item_ids, bank.a, bank.b + shift, bank.c)}, metadata)
+
+
+class TestParameterRegistry:
+
+    @pytest.fixture
+    def base(self):
+        return _make_bank(n=50)
+
+    @pytest.fixture
+    def registry(self, base, tmp_path):
+        def build(question_type, parameter_set):
+            return parameter_set.bank_for(base, question_type) if parameter_set is not None else base
+        return ParameterRegistry(build, tmp_path, keep=2)
+
+    def test_load_swaps_prebuilt_pools(self, registry, base):
+        assert registry.pool(1) is base
+        assert registry.current.version == INITIAL_VERSION
+        version = registry.load(_shifted(base, 1.0))
+        # Pools for types in use were built before the swap
+        assert version.question_types == [1]
+        assert registry.current is version
+        np.testing.assert_allclose(registry.pool(1).b, base.b + 1.0)
+        assert registry.pool(1, INITIAL_VERSION) is base
+
+    def test_keeps_last_versions_and_reloads_from_file(self, registry, base, tmp_path):
+        registry.pool(1)
+        sets = [_shifted(base, shift, run=i) for i, shift in enumerate((0.5, 1.0, 1.5))]
+        for parameter_set in sets:
+            parameter_set.save(tmp_path)
+            registry.load(parameter_set)
+        assert registry.versions == [sets[1].version, sets[2].version]
+        assert registry.current.version == sets[2].version
+
+        # An evicted version comes back from its file, without becoming current
+        np.testing.assert_allclose(registry.pool(1, sets[0].version).b, base.b + 0.5)
+        assert registry.current.version == sets[2].version
+        assert sets[2].version in registry.versions
+        # The initial parameters are always available
+        assert registry.pool(1, INITIAL_VERSION) is base
+
+    def test_unknown_version_falls_back_to_current(self, registry, base):
+        assert registry.pool(1, "20000101T000000-deadbeef") is base
+
+    def test_refresh_loads_newer_sets_only(self, registry, base, tmp_path):
+        assert not registry.refresh()
+        older, newer = _shifted(base, 0.5), _shifted(base, 1.0)
+        older.version, newer.version = "20260101T000000-00000000", "20260201T000000-00000000"
+        newer.save(tmp_path)
+        assert registry.refresh()
+        assert registry.current.version == newer.version
+        assert not registry.refresh()
+        older.save(tmp_path)
+        assert not registry.refresh()
+        assert registry.current.version == newer.version
+
+
+class TestSessionManagerVersions:
+
+    @pytest.fixture
+    def bank(self):
+        return _make_bank()
+
+    def _manager(self, bank, tmp_path, backend="memory", client=None) -> SessionManager:
+        manager = SessionManager(
+            store_backend=backend, redis_client=client, exposure_backend="memory", parameter_dir=tmp_path,
+        )
+        manager._items_by_type = {1: bank}
+        return manager
+
+    def test_in_flight_sessions_keep_their_version(self, bank, tmp_path):
+        manager = self._manager(bank, tmp_path)
+        before = manager.create_session("s1", "u1")
+        _run(before.cat_session, 3)
+        assert before.parameter_version == INITIAL_VERSION
+
+        version = manager.load_parameter_set(_shifted(bank, 1.0))
+        assert manager.parameter_version == version
+        new_pool = manager.get_item_pool(1)
+        assert get_information_table(new_pool, build=False) is not None
+
+        after = manager.create_session("s2", "u2")
+        assert after.parameter_version == version
+        assert after.cat_session.item_pool is new_pool
+        assert before.cat_session.item_pool is bank
+        _run(before.cat_session, 2)
+        assert all(item.difficulty_b == bank.get(item.item_id).difficulty_b
+                   for item in before.cat_session.administered_items)
+
+    def test_restored_sessions_keep_their_version(self, bank, tmp_path):
+        client = _redis_client()
+        worker_a = self._manager(bank, tmp_path, "redis", client)
+        worker_b = self._manager(bank, tmp_path, "redis", client)
+        parameter_set = _shifted(bank, 1.0)
+        parameter_set.save(tmp_path)
+        version = worker_a.load_parameter_set(parameter_set)
+
+        active = worker_a.create_session("s1", "u1")
+        _run(active.cat_session, 3)
+        worker_a.save_session(active)
+
+        # Worker B has not swapped yet: it loads the session's version from its file
+        on_b = worker_b.get_session("s1")
+        assert worker_b.parameter_version == INITIAL_VERSION
+        assert on_b.parameter_version == version
+        np.testing.assert_allclose(on_b.cat_session.item_pool.b, bank.b + 1.0)
+        assert on_b.cat_session.current_theta == active.cat_session.current_theta
+
+    def test_refresh_loads_newest_set(self, bank, tmp_path):
+        manager = self._manager(bank, tmp_path)
+        manager.get_item_pool(1)
+        parameter_set = _shifted(bank, -0.5)
+        parameter_set.save(tmp_path)
+        assert manager.refresh_parameters()
+        assert manager.parameter_version == parameter_set.version
+        np.testing.assert_allclose(manager.get_item_pool(1).b, bank.b - 0.5)
+        assert manager.pool_memory()[1]["items"] == len(bank)
+
+    def test_calibration_is_published_as_a_new_version(self, bank, tmp_path):
+        manager = self._manager(bank, tmp_path)
+        live = manager.get_item_pool(1)
+        assert not live.b.flags.writeable
+        rng = np.random.RandomState(0)
+        item_id = int(live.item_ids[3])
+        responses = {item_id: [(float(t), int(rng.rand() < 0.9)) for t in rng.normal(0, 1, 60)]}
+        calibrated, meta = calibrate_bank(live, responses)
+        assert meta[item_id]["updated"]
+
+        manager.load_parameter_set(ParameterSet.from_banks({1: calibrated}))
+        np.testing.assert_array_equal(manager.get_item_pool(1).b, calibrated.b)
+        assert live.b[3] != calibrated.b[3]
+
+    def test_base_pools_are_built_once_across_threads(self, bank, tmp_path):
+        manager = self._manager(bank, tmp_path)
+        manager._vocab = _make_vocab()
+        types = [2, 3, 4, 5, 6] * 4
+        with ThreadPoolExecutor(8) as pool:
+            built = list(pool.map(manager._base_pool, types))
+        for question_type, result in zip(types, built):
+            assert result is manager._items_by_type[question_type]
@@ -0,0 +1,67 @@
+"""Tests for vectorized CEFR/curriculum mapping and bulk re-scoring."""
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from irt_cat_engine.data.database import Base
+from irt_cat_engine.data.db_models import TestSession as StoredSession, User
+from irt_cat_engine.data.rescore import rescore_sessions
+from irt_cat_engine.reporting.score_mapper import (
+    CEFR_LEVELS,
+    CURRICULUM_LEVELS,
+    theta_to_cefr,
+    theta_to_cefr_batch,
+    theta_to_curriculum,
+    theta_to_curriculum_batch,
+)
+
+
+class TestBatchMapping:
+
+    def test_rows_match_scalar_mapping(self):
+        rng = np.random.default_rng(0)
+        thetas = rng.uniform(-4, 4, 200)
+        ses = rng.uniform(0.1, 1.2, 200)
+        primary, probs = theta_to_cefr_batch(thetas, ses)
+        assert probs.shape == (200, len(CEFR_LEVELS))
+        for i, (theta, se) in enumerate(zip(thetas, ses)):
+            level, expected = theta_to_cefr(theta, se)
+            assert CEFR_LEVELS[primary[i]] == level
+            np.testing.assert_allclose(probs[i], list(expected.values()), atol=5e-5)
+
+    def test_curriculum_band_edges(self):
+        thetas = [-5.0, -0.8, 0.29, 0.3, 1.2, 3.0, 9.0]
+        bands = [CURRICULUM_LEVELS[i] for i in theta_to_curriculum_batch(thetas)]
+        assert bands == [theta_to_curriculum(t) for t in thetas]
+        assert bands[0].startswith("초등") and bands[-1].startswith("고등 이상")
+
+
+class TestRescoreSessions:
+
+    @pytest.fixture
+    def db(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'rescore.db'}")
+        Base.metadata.create_all(engine)
+        with sessionmaker(bind=engine)() as session:
+            yield session
+        engine.dispose()
+
+    def test_rescores_every_scored_session(self, db):
+        db.add(User(id="u1"))
+        thetas = np.linspace(-2.5, 2.5, 23)
+        for i, theta in enumerate(thetas):
+            db.add(StoredSession(id=f"s{i:03d}", user_id="u1", final_theta=float(theta), final_se=0.3,
+                               cefr_level="A1", curriculum_level="stale"))
+        db.add(StoredSession(id="unfinished", user_id="u1", cefr_level=None))
+        db.commit()
+
+        assert rescore_sessions(db, chunk_size=5) == len(thetas)
+        db.expire_all()
+        for i, theta in enumerate(thetas):
+            stored = db.get(StoredSession, f"s{i:03d}")
+            level, probs = theta_to_cefr(theta, 0.3)
+            assert stored.cefr_level == level
+            assert stored.cefr_probabilities == probs
+            assert stored.curriculum_level == theta_to_curriculum(theta)
+        assert db.scalar(select(StoredSession.cefr_level).where(StoredSession.id == "unfinished")) is None
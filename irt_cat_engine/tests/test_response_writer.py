@@ -0,0 +1,158 @@
+"""Tests for the write-behind response writer."""
+import threading
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from irt_cat_engine.api.response_writer import ResponseWriter
+from irt_cat_engine.data.database import Base
+from irt_cat_engine.data.db_models import Response
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'responses.db'}")
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def _row(seq: int, session_id: str = "s1") -> dict:
+    return dict(
+        session_id=session_id, item_id=seq, word=f"w{seq}", question_type=1,
+        is_correct=seq % 2 == 0, is_dont_know=False, response_time_ms=1000,
+        sequence=seq, theta_before=0.0, theta_after=0.1, se_before=1.0, se_after=0.9,
+        difficulty_b=0.0, discrimination_a=1.0,
+    )
+
+
+def _count(session_factory) -> int:
+    with session_factory() as db:
+        return db.scalar(select(func.count(Response.id)))
+
+
+class TestResponseWriter:
+
+    def test_flush_writes_queued_rows_in_batches(self, session_factory):
+        writer = ResponseWriter(session_factory, batch_size=20, linger_ms=5000)
+        for seq in range(50):
+            assert writer.offer(_row(seq))
+        assert writer.flush(timeout=10)
+        assert _count(session_factory) == 50
+        assert writer.batches_written == 3
+        writer.close()
+
+    def test_linger_writes_without_flush(self, session_factory):
+        writer = ResponseWriter(session_factory, batch_size=100, linger_ms=10)
+        writer.offer(_row(1))
+        for _ in range(200):
+            if writer.rows_written:
+                break
+            threading.Event().wait(0.01)
+        assert _count(session_factory) == 1
+        writer.close()
+
+    def test_full_queue_applies_backpressure(self, session_factory):
+        gate = threading.Event()
+
+        def gated():
+            gate.wait(10)
+            return session_factory()
+
+        writer = ResponseWriter(gated, batch_size=1, linger_ms=0, max_queue=2)
+        full_before = REGISTRY.get_sample_value("response_write_queue_full_total") or 0.0
+        accepted = 0
+        for seq in range(10):
+            if not writer.offer(_row(seq)):
+                break
+            accepted += 1
+        assert accepted < 10
+        assert REGISTRY.get_sample_value("response_write_queue_full_total") - full_before == 1
+
+        gate.set()
+        writer.put(_row(99))
+        assert writer.flush(timeout=10)
+        assert _count(session_factory) == accepted + 1
+        writer.close()
+
+    def test_failed_insert_is_retried(self, session_factory):
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("database is locked")
+            return session_factory()
+
+        writer = ResponseWriter(flaky, linger_ms=0)
+        writer.offer(_row(1))
+        assert writer.flush(timeout=10)
+        assert _count(session_factory) == 1
+        writer.close()
+
+    def test_flush_reports_rows_that_could_not_be_written(self, session_factory, monkeypatch):
+        monkeypatch.setattr("irt_cat_engine.api.response_writer._RETRY_SECONDS", 0.05)
+        down = threading.Event()
+        down.set()
+
+        def failing():
+            if down.is_set():
+                raise RuntimeError("database unavailable")
+            return session_factory()
+
+        writer = ResponseWriter(failing, linger_ms=0)
+        for seq in range(3):
+            writer.offer(_row(seq))
+        assert not writer.flush(timeout=10)
+        assert writer.stats()["failed_pending"] == 3
+        assert _count(session_factory) == 0
+
+        # The kept rows go out with the next batch once the database is back
+        down.clear()
+        writer.offer(_row(3))
+        assert writer.flush(timeout=10)
+        assert _count(session_factory) == 4
+        assert writer.stats()["failed_pending"] == 0
+        writer.close()
+
+    def test_flush_session_waits_for_that_session_only(self, session_factory):
+        writer = ResponseWriter(session_factory, batch_size=100, linger_ms=5000)
+        assert writer.flush_session("s1", timeout=1)  # Nothing queued
+        for seq in range(4):
+            writer.offer(_row(seq, "s1"))
+        assert writer.flush_session("s1", timeout=10)
+        # Written right away instead of after the 5 s linger
+        with session_factory() as db:
+            assert db.scalar(select(func.count()).where(Response.session_id == "s1")) == 4
+        writer.offer(_row(9, "s2"))
+        assert writer.flush_session("s1", timeout=1)
+        writer.close()
+        assert _count(session_factory) == 5
+
+    def test_flush_session_reports_failed_rows(self, session_factory, monkeypatch):
+        monkeypatch.setattr("irt_cat_engine.api.response_writer._RETRY_SECONDS", 0.05)
+        down = threading.Event()
+        down.set()
+
+        def failing():
+            if down.is_set():
+                raise RuntimeError("database unavailable")
+            return session_factory()
+
+        writer = ResponseWriter(failing, linger_ms=0)
+        writer.offer(_row(0, "s1"))
+        assert not writer.flush_session("s1", timeout=10)
+        assert writer.flush_session("s2", timeout=1)
+        down.clear()
+        assert writer.flush_session("s1", timeout=10)
+        assert _count(session_factory) == 1
+        writer.close()
+
+    def test_close_drains_queue(self, session_factory):
+        writer = ResponseWriter(session_factory, linger_ms=5000)
+        for seq in range(5):
+            writer.offer(_row(seq))
+        writer.close()
+        assert _count(session_factory) == 5
@@ -0,0 +1,72 @@
+"""Tests for the precomputed theta -> (vocab size, coverage) score curve."""
+import numpy as np
+import pytest
+
+from irt_cat_engine.item_bank.bank import ItemBank
+from irt_cat_engine.models.irt_2pl import ItemParameters
+from irt_cat_engine.reporting.score_mapper import (
+    _estimate_oxford_coverage,
+    generate_diagnostic_report,
+    get_score_curve,
+    theta_to_vocab_size,
+)
+
+
+def _items(n: int = 300, seed: int = 3) -> list[ItemParameters]:
+    rng = np.random.RandomState(seed)
+    return [
+        ItemParameters(
+            item_id=i, word=f"w{i}",
+            difficulty_b=float(rng.normal(0, 1.2)),
+            discrimination_a=float(rng.uniform(0.4, 2.5)),
+            guessing_c=[0.0, 0.0, 0.2, 0.6][i % 4],
+            cefr=["A1", "A2", "B1", "B2", "C1"][i % 5],
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def bank() -> ItemBank:
+    return ItemBank.from_items(_items())
+
+
+class TestScoreCurve:
+
+    def test_matches_full_bank_reductions(self, bank):
+        curve = get_score_curve(bank)
+        for theta in np.linspace(-3.5, 3.5, 141):
+            assert abs(curve.vocab_size(theta) - theta_to_vocab_size(theta, bank)) <= 1
+            assert curve.coverage(theta) == _estimate_oxford_coverage(theta, bank)
+
+    def test_cached_per_bank(self, bank):
+        curve = get_score_curve(bank)
+        assert get_score_curve(bank) is curve
+        core = bank.cefr_mask(("A1", "A2", "B1"))
+        recalibrated = bank.with_parameters(bank.a, np.where(core, 5.0, bank.b), bank.c)
+        other = get_score_curve(recalibrated)
+        assert other is not curve
+        assert other.coverage(3.0) == _estimate_oxford_coverage(3.0, recalibrated) < 0.3
+        assert curve.coverage(3.0) == _estimate_oxford_coverage(3.0, bank)
+
+    def test_no_core_items(self):
+        bank = ItemBank.from_items([
+            ItemParameters(item_id=i, word=f"w{i}", difficulty_b=0.0, discrimination_a=1.0, cefr="C1")
+            for i in range(5)
+        ])
+        assert get_score_curve(bank).coverage(0.0) == 0.0
+
+    def test_report_uses_curve_for_banks(self, bank):
+        items = _items()
+        from_bank = generate_diagnostic_report(0.4, 0.3, items[:5], [1, 0, 1, 1, 0], bank)
+        from_list = generate_diagnostic_report(0.4, 0.3, items[:5], [1, 0, 1, 1, 0], items)
+        assert bank._score_curve is not None
+        assert from_bank["oxford_coverage"] == from_list["oxford_coverage"]
+        assert abs(from_bank["vocab_size_estimate"] - from_list["vocab_size_estimate"]) <= 1
+
+
+def test_cefr_mask_is_cached_and_read_only(bank):
+    mask = bank.cefr_mask(("A1", "A2", "B1"))
+    assert bank.cefr_mask(("A1", "A2", "B1")) is mask
+    with pytest.raises(ValueError):
+        mask[0] = not mask[0]
@@ -0,0 +1,170 @@
+"""Tests for idle-session expiry."""
+import asyncio
+import time
+
+import pytest
+from prometheus_client import REGISTRY
+
+from irt_cat_engine.api.session_expiry import SessionExpiry
+from irt_cat_engine.api.session_manager import SessionManager
+from irt_cat_engine.api.session_store import RedisSessionStore
+from irt_cat_engine.config import SESSION_EXPIRY_INTERVAL, SESSION_TTL_SECONDS
+from irt_cat_engine.tests.test_session_store import DictRedis, _make_bank
+
+
+def _manager(backend: str = "memory", client=None, idle_seconds: float = 60) -> SessionManager:
+    manager = SessionManager(store_backend=backend, redis_client=client)
+    manager._items_by_type = {1: _make_bank()}
+    manager._expiry = SessionExpiry(idle_seconds)
+    return manager
+
+
+def _advance(client: DictRedis, seconds: float) -> None:
+    """Move the fake Redis clock forward by shifting every key's expiry back."""
+    client.data = {k: (v, None if exp is None else exp - seconds) for k, (v, exp) in client.data.items()}
+
+
+def _metric(name: str) -> float:
+    return REGISTRY.get_sample_value(name) or 0.0
+
+
+class TestSessionExpiry:
+
+    def test_pops_only_expired_in_deadline_order(self):
+        expiry = SessionExpiry(idle_seconds=10)
+        expiry.touch("b", 105.0)
+        expiry.touch("a", 100.0)
+        expiry.touch("c", 120.0)
+        assert expiry.pop_expired(now=109.0) == []
+        assert expiry.pop_expired(now=116.0) == [("a", 100.0), ("b", 105.0)]
+        assert len(expiry) == 1 and "c" in expiry
+
+    def test_touch_supersedes_earlier_deadline(self):
+        expiry = SessionExpiry(idle_seconds=10)
+        expiry.touch("a", 100.0)
+        expiry.touch("a", 130.0)
+        assert expiry.pop_expired(now=135.0) == []
+        assert expiry.pop_expired(now=140.0) == [("a", 130.0)]
+
+    def test_discard(self):
+        expiry = SessionExpiry(idle_seconds=10)
+        expiry.touch("a", 100.0)
+        expiry.discard("a")
+        assert len(expiry) == 0
+        assert expiry.pop_expired(now=1e9) == []
+
+    def test_superseded_entries_are_compacted(self):
+        expiry = SessionExpiry(idle_seconds=10)
+        for t in range(1000):
+            expiry.touch("a", float(t))
+        assert len(expiry._heap) <= 2 * len(expiry) + 64
+        assert expiry.pop_expired(now=1e9) == [("a", 999.0)]
+
+
+class TestExpireIdleSessions:
+
+    @pytest.mark.parametrize("backend", ["memory", "redis"])
+    def test_evicts_idle_sessions_only(self, backend):
+        manager = _manager(backend, DictRedis())
+        idle = manager.create_session("idle", "u1")
+        manager.create_session("busy", "u2")
+        idle.last_active -= 120
+        manager._store.put(idle)
+        manager._track(idle)
+
+        evicted = _metric("sessions_expired_total")
+        assert manager.expire_idle_sessions(now=time.time() + 1) == 1
+        assert manager.get_session("idle") is None
+        assert manager.get_session("busy") is not None
+        assert _metric("sessions_expired_total") - evicted == 1
+        assert _metric("active_sessions") == 1
+
+    def test_activity_postpones_eviction(self):
+        manager = _manager(idle_seconds=60)
+        active = manager.create_session("s1", "u1")
+        start = active.last_active
+        active.last_active = start + 50
+        manager._store.put(active)
+        manager._track(active)
+        assert manager.expire_idle_sessions(now=start + 70) == 0
+        assert manager.expire_idle_sessions(now=start + 111) == 1
+
+    def test_on_evict_receives_session(self):
+        manager = _manager()
+        manager.create_session("s1", "u1")
+        flushed = []
+        manager.expire_idle_sessions(now=time.time() + 61, on_evict=flushed.append)
+        assert [a.session_id for a in flushed] == ["s1"]
+
+    def test_failing_flush_still_evicts(self):
+        manager = _manager()
+        manager.create_session("s1", "u1")
+
+        def fail(active):
+            raise RuntimeError("db down")
+
+        assert manager.expire_idle_sessions(now=time.time() + 61, on_evict=fail) == 1
+        assert manager.get_session("s1") is None
+
+    def test_session_touched_by_another_worker_is_left_to_it(self):
+        client = DictRedis()
+        worker_a = _manager("redis", client)
+        worker_b = _manager("redis", client)
+        start = worker_a.create_session("s1", "u1").last_active
+
+        # Worker B serves the next request 30 s later
+        on_b = worker_b.get_session("s1")
+        on_b.last_active = start + 30
+        worker_b._store.put(on_b)
+        worker_b._track(on_b)
+
+        assert worker_a.expire_idle_sessions(now=start + 61) == 0
+        assert worker_a.get_session("s1") is not None
+        assert worker_b.expire_idle_sessions(now=start + 91) == 1
+        assert worker_a.get_session("s1") is None
+
+    def test_redis_key_outlives_idle_timeout_until_swept(self):
+        client = DictRedis()
+        manager = _manager("redis", client, idle_seconds=SESSION_TTL_SECONDS)
+        start = manager.create_session("s1", "u1").last_active
+
+        # The sweep runs up to one interval after the idle deadline
+        late = SESSION_TTL_SECONDS + SESSION_EXPIRY_INTERVAL
+        _advance(client, late)
+        assert client.get("irt:session:s1") is not None
+        flushed = []
+        assert manager.expire_idle_sessions(now=start + late, on_evict=flushed.append) == 1
+        assert [a.session_id for a in flushed] == ["s1"]
+
+    def test_key_expired_by_ttl_is_never_flushed(self):
+        # With TTL == idle timeout, Redis drops the key before the sweep can flush it
+        client = DictRedis()
+        manager = _manager("redis", client, idle_seconds=SESSION_TTL_SECONDS)
+        manager._store = RedisSessionStore(client, manager._restore_session, ttl_seconds=SESSION_TTL_SECONDS)
+        start = manager.create_session("s1", "u1").last_active
+        _advance(client, SESSION_TTL_SECONDS + 1)
+        flushed = []
+        assert manager.expire_idle_sessions(now=start + SESSION_TTL_SECONDS + 1, on_evict=flushed.append) == 0
+        assert flushed == [] and client.get("irt:session:s1") is None
+
+    def test_cleanup_endpoint_scan_untracks_sessions(self):
+        manager = _manager()
+        active = manager.create_session("s1", "u1")
+        active.last_active -= 7200
+        assert manager.cleanup_stale_sessions(max_age_seconds=3600) == 1
+        assert len(manager._expiry) == 0
+
+    def test_background_task(self):
+        manager = _manager(idle_seconds=0)
+        manager.create_session("s1", "u1")
+
+        async def run():
+            task = asyncio.create_task(manager.run_session_expiry(interval_seconds=0.01))
+            for _ in range(200):
+                await asyncio.sleep(0.01)
+                if manager.active_session_count == 0:
+                    break
+            task.cancel()
+
+        asyncio.run(run())
+        assert manager.get_session("s1") is None
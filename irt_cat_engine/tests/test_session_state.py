@@ -0,0 +1,73 @@
+"""Tests for the compact SessionState representation and codec."""
+import numpy as np
+import pytest
+
+from irt_cat_engine.cat.session_state import INITIAL_SE, SessionState
+from irt_cat_engine.config import CAT_MAX_ITEMS
+
+
+def _filled(n: int, seed: int = 0) -> SessionState:
+    rng = np.random.default_rng(seed)
+    state = SessionState(initial_theta=-0.4, capacity=CAT_MAX_ITEMS)
+    for i in range(n):
+        state.append(
+            item_id=int(rng.integers(0, 2**31 - 1)),
+            question_type=int(rng.integers(1, 7)),
+            response=int(rng.integers(0, 2)),
+            dont_know=bool(rng.random() < 0.2),
+            theta=float(rng.normal()),
+            se=float(rng.uniform(0.2, 1.0)),
+        )
+    return state
+
+
+class TestSessionState:
+
+    def test_new_state(self):
+        state = SessionState(initial_theta=0.7)
+        assert len(state) == 0
+        assert (state.theta, state.se) == (0.7, INITIAL_SE)
+        assert len(state.rows) == CAT_MAX_ITEMS
+        assert state.item_ids.tolist() == []
+
+    def test_append_updates_estimates(self):
+        state = SessionState()
+        state.append(42, 3, 1, True, 0.25, 0.8)
+        assert state.item_ids.tolist() == [42]
+        assert state.question_types.tolist() == [3]
+        assert state.responses.tolist() == [1]
+        assert state.dont_know.tolist() == [True]
+        assert (state.theta, state.se) == (0.25, 0.8)
+
+    @pytest.mark.parametrize("n", [0, 1, 17, CAT_MAX_ITEMS])
+    def test_roundtrip(self, n):
+        state = _filled(n)
+        state.is_complete = n > 0
+        state.termination_reason = "se_threshold" if n else ""
+        restored = SessionState.from_bytes(state.to_bytes())
+        assert len(restored) == n
+        assert restored.rows[:n].tobytes() == state.rows[:n].tobytes()
+        for name in ("initial_theta", "theta", "se", "is_complete", "termination_reason"):
+            assert getattr(restored, name) == getattr(state, name)
+
+    def test_encoded_size(self):
+        assert len(_filled(20).to_bytes()) < 400
+        assert len(_filled(CAT_MAX_ITEMS).to_bytes()) < 800
+
+    def test_grows_past_capacity(self):
+        state = SessionState(capacity=2)
+        for i in range(5):
+            state.append(i, 1, 1, False, 0.1 * i, 0.5)
+        assert state.item_ids.tolist() == [0, 1, 2, 3, 4]
+        assert SessionState.from_bytes(state.to_bytes(), capacity=2).item_ids.tolist() == [0, 1, 2, 3, 4]
+
+    def test_restored_state_is_writable(self):
+        restored = SessionState.from_bytes(_filled(3).to_bytes())
+        restored.append(7, 1, 0, False, 0.0, 0.9)
+        assert restored.item_ids[-1] == 7
+
+    def test_unknown_version(self):
+        data = bytearray(_filled(2).to_bytes())
+        data[0] = 99
+        with pytest.raises(ValueError):
+            SessionState.from_bytes(bytes(data))
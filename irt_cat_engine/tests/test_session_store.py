@@ -0,0 +1,285 @@
+"""Tests for CAT session state serialization and session store backends."""
+import fnmatch
+import time
+
+import numpy as np
+import pytest
+
+from irt_cat_engine.api.session_manager import SessionManager
+from irt_cat_engine.api.session_store import InMemorySessionStore, RedisSessionStore
+from irt_cat_engine.cat.session import CATSession
+from irt_cat_engine.cat.session_state import SessionState
+from irt_cat_engine.config import QUESTION_TYPE_B_MODIFIER
+from irt_cat_engine.data.load_vocabulary import VocabWord
+from irt_cat_engine.data.vocab_store import VocabStore
+from irt_cat_engine.item_bank.bank import ItemBank
+from irt_cat_engine.models.irt_2pl import ItemParameters
+
+
+class DictRedis:
+    """Embedded stand-in for the redis-py calls the session store and
+    shared exposure controller use."""
+
+    def __init__(self):
+        self.data: dict[str, tuple[bytes | dict, float | None]] = {}
+
+    def _live(self, key: str) -> bool:
+        entry = self.data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.time():
+            del self.data[key]
+        return key in self.data
+
+    def get(self, key: str) -> bytes | None:
+        return self.data[key][0] if self._live(key) else None
+
+    def set(self, key: str, value, ex: int | None = None, nx: bool = False) -> bool:
+        if nx and self._live(key):
+            return False
+        if isinstance(value, (int, str)):
+            value = str(value).encode("utf-8")
+        self.data[key] = (value, None if ex is None else time.time() + ex)
+        return True
+
+    def incrby(self, key: str, amount: int) -> int:
+        value = int(self.get(key) or 0) + amount
+        self.set(key, value)
+        return value
+
+    def _hash(self, key: str) -> dict:
+        if not self._live(key):
+            self.data[key] = ({}, None)
+        return self.data[key][0]
+
+    def hset(self, key: str, mapping: dict) -> int:
+        self._hash(key).update({str(f).encode("utf-8"): str(v).encode("utf-8") for f, v in mapping.items()})
+        return len(mapping)
+
+    def hincrby(self, key: str, field, amount: int) -> int:
+        h = self._hash(key)
+        field = str(field).encode("utf-8")
+        value = int(h.get(field, 0)) + amount
+        h[field] = str(value).encode("utf-8")
+        return value
+
+    def hgetall(self, key: str) -> dict:
+        return dict(self.data[key][0]) if self._live(key) else {}
+
+    def pipeline(self, transaction: bool = True) -> "DictPipeline":
+        return DictPipeline(self)
+
+    def delete(self, *keys: str) -> int:
+        return sum(self.data.pop(k, None) is not None for k in keys)
+
+    def scan_iter(self, match: str = "*"):
+        for key in list(self.data):
+            if self._live(key) and fnmatch.fnmatchcase(key, match):
+                yield key.encode("utf-8")
+
+
+class DictPipeline:
+    """Queues DictRedis calls and runs them on execute()."""
+
+    def __init__(self, client: DictRedis):
+        self._client = client
+        self._calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._calls.append((getattr(self._client, name), args, kwargs))
+            return self
+        return queue
+
+    def execute(self) -> list:
+        calls, self._calls = self._calls, []
+        return [call(*args, **kwargs) for call, args, kwargs in calls]
+
+
+def _redis_client():
+    try:
+        import fakeredis
+    except ImportError:
+        return DictRedis()
+    return fakeredis.FakeRedis()
+
+
+def _make_bank(n: int = 200, seed: int = 5) -> ItemBank:
+    rng = np.random.RandomState(seed)
+    return ItemBank.from_items([
+        ItemParameters(
+            item_id=1000 + i, word=f"w{i}",
+            difficulty_b=float(rng.normal(0, 1.2)),
+            discrimination_a=float(rng.uniform(0.5, 2.0)),
+            question_type=1,
+            topic=f"t{i % 5}",
+            is_loanword=bool(i % 11 == 0),
+        )
+        for i in range(n)
+    ])
+
+
+def _make_vocab(n: int = 200) -> VocabStore:
+    """Vocabulary for ``_make_bank`` words, with relation data for some types."""
+    return VocabStore.from_words([
+        VocabWord(
+            word_display=f"w{i}", freq_rank=i + 1, pos="NOUN", cefr="B1", meaning_ko="뜻", definition_en="def",
+            synonym=[f"s{i}"] if i % 2 == 0 else [],
+            antonym=[f"a{i}"] if i % 3 == 0 else [],
+            collocation=[f"c{i}"] if i % 5 != 0 else [],
+            sentence_1=f"A w{i} here." if i % 4 != 0 else "",
+        )
+        for i in range(n)
+    ])
+
+
+def _run(session: CATSession, steps: int, seed: int = 0) -> None:
+    rng = np.random.RandomState(seed)
+    for _ in range(steps):
+        item = session.get_next_item()
+        session.record_response(item, bool(rng.rand() < 0.6), is_dont_know=bool(rng.rand() < 0.1))
+
+
+def _assert_same(restored: CATSession, original: CATSession) -> None:
+    assert restored.current_theta == original.current_theta
+    assert restored.current_se == original.current_se
+    assert restored.theta_history == original.theta_history
+    assert restored.responses == original.responses
+    assert restored.dont_know_flags == original.dont_know_flags
+    assert restored.administered_items == original.administered_items
+    assert restored.response_records == original.response_records
+    assert vars(restored.content_tracker) == vars(original.content_tracker)
+    np.testing.assert_allclose(restored.quad_log_likelihood, original.quad_log_likelihood)
+
+
+class TestCATSessionState:
+
+    def test_roundtrip(self):
+        bank = _make_bank()
+        session = CATSession(item_pool=bank, initial_theta=0.3)
+        _run(session, 12)
+        restored = CATSession.from_state(SessionState.from_bytes(session.state.to_bytes()), bank)
+        _assert_same(restored, session)
+
+        # Both continue identically
+        restored.rng = np.random.default_rng(7)
+        session.rng = np.random.default_rng(7)
+        assert restored.get_next_item() == session.get_next_item()
+
+    def test_state_holds_item_ids_only(self):
+        session = CATSession(item_pool=_make_bank())
+        _run(session, 3)
+        assert session.state.item_ids.tolist() == [item.item_id for item in session.administered_items]
+        assert len(session.state.to_bytes()) < 100
+
+    def test_completed_session(self):
+        bank = _make_bank()
+        session = CATSession(item_pool=bank)
+        while not session.is_complete:
+            _run(session, 1)
+        restored = CATSession.from_state(SessionState.from_bytes(session.state.to_bytes()), bank)
+        assert restored.is_complete
+        assert restored.termination_reason == session.termination_reason
+        assert restored.get_results() == session.get_results()
+
+    def test_unknown_item(self):
+        session = CATSession(item_pool=_make_bank())
+        _run(session, 2)
+        with pytest.raises(KeyError):
+            CATSession.from_state(session.state, _make_bank(n=5))
+
+
+@pytest.fixture
+def manager_factory():
+    bank = _make_bank()
+    vocab = _make_vocab()
+
+    def make(backend: str, client=None) -> SessionManager:
+        manager = SessionManager(store_backend=backend, redis_client=client)
+        manager._items_by_type = {1: bank, 3: bank}
+        manager._vocab = vocab
+        return manager
+
+    return make
+
+
+class TestSessionStores:
+
+    @pytest.mark.parametrize("backend", ["memory", "redis"])
+    def test_put_get_delete(self, manager_factory, backend):
+        manager = manager_factory(backend, _redis_client())
+        active = manager.create_session("s1", "u1", question_type=3)
+        _run(active.cat_session, 4)
+        active.pending_item = active.cat_session.get_next_item()
+        manager.save_session(active)
+
+        loaded = manager.get_session("s1")
+        assert loaded.user_id == "u1" and loaded.question_type == 3
+        assert loaded.pending_item == active.pending_item
+        _assert_same(loaded.cat_session, active.cat_session)
+        assert manager.active_session_count == 1
+
+        manager.remove_session("s1")
+        assert manager.get_session("s1") is None
+        assert manager.active_session_count == 0
+
+    @pytest.mark.parametrize("backend", ["memory", "redis"])
+    def test_cleanup_stale_sessions(self, manager_factory, backend):
+        manager = manager_factory(backend, _redis_client())
+        old = manager.create_session("old", "u1")
+        old.last_active = time.time() - 7200
+        manager._store.put(old)
+        manager.create_session("new", "u2")
+        assert manager.cleanup_stale_sessions(max_age_seconds=3600) == 1
+        assert manager.get_session("old") is None
+        assert manager.get_session("new") is not None
+
+    def test_redis_sessions_are_shared_between_workers(self, manager_factory):
+        client = _redis_client()
+        worker_a = manager_factory("redis", client)
+        worker_b = manager_factory("redis", client)
+
+        active = worker_a.create_session("s1", "u1", question_type=0)
+        item = active.cat_session.get_next_item()
+        item = active.cat_session.serve_as(item, 4)
+        active.pending_item = item
+        worker_a.save_session(active)
+
+        # Another worker records the response and serves the next item
+        on_b = worker_b.get_session("s1")
+        assert on_b.pending_item == item
+        assert on_b.pending_item.difficulty_b == pytest.approx(
+            worker_b.get_item_pool(1).get(item.item_id).difficulty_b + QUESTION_TYPE_B_MODIFIER[4])
+        on_b.cat_session.record_response(on_b.pending_item, True)
+        on_b.pending_item = None
+        worker_b.save_session(on_b)
+
+        back_on_a = worker_a.get_session("s1")
+        assert back_on_a.cat_session.administered_items == [item]
+        assert back_on_a.cat_session.current_theta == on_b.cat_session.current_theta
+        assert back_on_a.cat_session.content_tracker.type_counts == {4: 1}
+
+    def test_redis_keys_expire(self):
+        client = _redis_client()
+        store = RedisSessionStore(client, restore=lambda state: state, ttl_seconds=60)
+        manager = SessionManager(store_backend="memory")
+        manager._items_by_type = {1: _make_bank()}
+        store.put(manager.create_session("s1", "u1"))
+        assert list(store.session_ids()) == ["s1"]
+        if isinstance(client, DictRedis):
+            value, expires = client.data["irt:session:s1"]
+            assert expires == pytest.approx(time.time() + 60, abs=5)
+            client.data["irt:session:s1"] = (value, time.time() - 1)
+            assert store.get("s1") is None
+            assert len(store) == 0
+
+    def test_memory_store_returns_live_objects(self):
+        store = InMemorySessionStore()
+        manager = SessionManager(store_backend="memory")
+        manager._items_by_type = {1: _make_bank()}
+        active = manager.create_session("s1", "u1")
+        store.put(active)
+        assert store.get("s1") is active
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            SessionManager(store_backend="memcached")
+
@@ -0,0 +1,148 @@
+"""Tests for exposure control shared across workers and its checkpoints."""
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from irt_cat_engine.api.session_manager import SessionManager
+from irt_cat_engine.api.shared_exposure import RedisExposureController
+from irt_cat_engine.cat.item_selector import ExposureController
+from irt_cat_engine.data.database import Base
+from irt_cat_engine.data.db_models import ItemExposure
+from irt_cat_engine.tests.test_session_store import DictRedis, _make_bank, _redis_client
+
+
+def _workers(n: int = 2, item_count: int = 10, client=None) -> list[RedisExposureController]:
+    client = client if client is not None else _redis_client()
+    workers = [RedisExposureController(client, item_count, target_max_rate=0.25) for _ in range(n)]
+    for w in workers:
+        w.seed(np.array([], dtype=np.int64), np.array([], dtype=np.int64), 0)
+    return workers
+
+
+def _run_tests(worker: RedisExposureController, n_tests: int, item_ids: list[int]):
+    for _ in range(n_tests):
+        worker.start_test()
+        worker.record_batch(np.array(item_ids))
+        worker.end_test()
+
+
+class TestRedisExposureController:
+
+    def test_counts_from_all_workers_are_combined(self):
+        a, b = _workers()
+        _run_tests(a, 6, [0, 1])
+        _run_tests(b, 9, [0, 2])
+        a.sync()
+        b.sync()
+        assert a.recalibrate()
+        assert a.total_tests == 15
+        assert a.admin_counts[:3].tolist() == [15, 6, 9]
+
+    def test_one_worker_recalibrates_per_interval_and_all_pick_up_k(self):
+        a, b = _workers()
+        _run_tests(a, 10, [0])
+        _run_tests(b, 10, [0, 1])
+        a.sync()
+        b.sync()
+        assert a.recalibrate()
+        assert not b.recalibrate()  # Lock held for this interval
+        b.sync()
+        assert a.k[0] < 1.0  # Administered in every test, target is 25%
+        assert b.k.tolist() == a.k.tolist()
+
+    def test_next_interval_starts_where_the_last_worker_stopped(self):
+        a, b = _workers()
+        _run_tests(a, 20, [0])
+        a.sync()
+        assert a.recalibrate()
+        k = a.k[0]
+        # Lock expired; no tests since: the other worker leaves k alone
+        a.client.delete("irt:exposure:recalibrate_lock")
+        assert not b.recalibrate()
+        b.sync()
+        assert b.k[0] == k
+
+    def test_buffered_counts_survive_a_failed_sync(self):
+        (a,) = _workers(1, client=DictRedis())
+        _run_tests(a, 3, [4])
+
+        def fail(*args, **kwargs):
+            raise ConnectionError("redis down")
+
+        healthy = a.client.pipeline
+        a.client.pipeline = fail
+        with pytest.raises(ConnectionError):
+            a.sync()
+        a.client.pipeline = healthy
+        a.sync()
+        assert int(a.client.hgetall("irt:exposure:admin")[b"4"]) == 3
+        assert int(a.client.get("irt:exposure:tests")) == 3
+
+    def test_first_worker_seeds_redis_others_load_it(self):
+        client = _redis_client()
+        first = RedisExposureController(client, 5)
+        first.seed(np.array([1, 3]), np.array([4, 7]), 20, k=np.array([0.5, 0.9]))
+        second = RedisExposureController(client, 5)
+        second.seed(np.array([], dtype=np.int64), np.array([], dtype=np.int64), 0)
+        assert second.k[[1, 3]].tolist() == [0.5, 0.9]
+        assert int(client.hgetall("irt:exposure:admin")[b"3"]) == 7
+
+    def test_grows_for_unseen_item_ids(self):
+        (a,) = _workers(1, item_count=2)
+        _run_tests(a, 1, [7])
+        a.sync()
+        assert int(a.client.hgetall("irt:exposure:admin")[b"7"]) == 1
+
+
+class TestSessionManagerExposure:
+
+    @pytest.fixture
+    def db(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'exposure.db'}")
+        Base.metadata.create_all(engine)
+        with sessionmaker(bind=engine)() as session:
+            yield session
+        engine.dispose()
+
+    def _manager(self, backend: str = "memory", client=None) -> SessionManager:
+        manager = SessionManager(store_backend=backend, redis_client=client, exposure_backend=backend)
+        manager._items_by_type = {1: _make_bank()}
+        return manager
+
+    def test_sessions_share_the_controller(self, db):
+        manager = self._manager("redis", DictRedis())
+        manager.seed_exposure(db)
+        active = manager.create_session("s1", "u1")
+        assert active.cat_session.exposure_controller is manager.exposure_controller
+        assert isinstance(manager.exposure_controller, RedisExposureController)
+        restored = manager.get_session("s1")
+        assert restored.cat_session.exposure_controller is manager.exposure_controller
+
+        item = restored.cat_session.get_next_item()
+        assert manager.exposure_controller.admin_counts[item.item_id] == 1
+
+    def test_checkpoint_writes_changed_k(self, db):
+        db.add_all([ItemExposure(item_id=1000 + i, word=f"w{i}", admin_count=0, correct_count=0) for i in range(3)])
+        db.commit()
+        manager = self._manager()
+        manager.seed_exposure(db)
+        assert manager.checkpoint_exposure(db) == len(manager.exposure_controller.k)
+
+        manager.exposure_controller.k[1001] = 0.4
+        assert manager.checkpoint_exposure(db) == 1
+        stored = dict(db.execute(select(ItemExposure.item_id, ItemExposure.exposure_k)).all())
+        assert stored == {1000: 1.0, 1001: 0.4, 1002: 1.0}
+
+        reseeded = self._manager()
+        reseeded.seed_exposure(db)
+        assert reseeded.exposure_controller.k[1001] == 0.4
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            SessionManager(exposure_backend="memcached")
+
+    def test_in_process_controller(self, db):
+        manager = self._manager()
+        manager.seed_exposure(db)
+        assert type(manager.exposure_controller) is ExposureController
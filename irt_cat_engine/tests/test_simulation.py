@@ -0,0 +1,120 @@
+"""Tests for the batch CAT simulator and its vectorized building blocks."""
+import numpy as np
+import pytest
+
+from irt_cat_engine.cat.item_selector import ExposureController, select_next_item
+from irt_cat_engine.cat.session import CATSession
+from irt_cat_engine.cat.simulation import main, simulate, synthetic_bank
+from irt_cat_engine.cat.stopping_rules import StoppingRules
+from irt_cat_engine.item_bank.information_table import get_information_table
+from irt_cat_engine.models.ability_estimator import get_eap_estimator
+
+
+class TestBatchBuildingBlocks:
+
+    def test_summarize_batch_matches_scalar(self):
+        est = get_eap_estimator()
+        rng = np.random.default_rng(0)
+        log_lik = np.zeros((6, est.n_points))
+        for _ in range(12):
+            a, b = rng.uniform(0.5, 2.0, 6), rng.normal(0, 1, 6)
+            c, r = rng.choice([0.0, 0.2], 6), rng.integers(0, 2, 6)
+            log_lik += est.response_log_likelihood_batch(a, b, c, r)
+            for i in range(6):
+                np.testing.assert_allclose(
+                    est.response_log_likelihood_batch(a, b, c, r)[i],
+                    est.response_log_likelihood(a[i], b[i], c[i], r[i]),
+                )
+        theta, se = est.summarize_batch(log_lik)
+        for i in range(6):
+            t, s = est.summarize(log_lik[i])
+            assert theta[i] == pytest.approx(t, abs=1e-12)
+            assert se[i] == pytest.approx(s, abs=1e-12)
+
+    @pytest.mark.parametrize("items_completed", [3, 15, 20, 40])
+    def test_should_stop_batch_matches_scalar(self, items_completed):
+        rules = StoppingRules()
+        rng = np.random.default_rng(items_completed)
+        se = rng.uniform(0.2, 0.4, 50)
+        history = np.cumsum(rng.normal(0, 0.03, (50, items_completed + 1)), axis=1)
+        stop, reasons = rules.should_stop_batch(items_completed, se, history)
+        for i in range(50):
+            expected = rules.should_stop(items_completed, float(se[i]), history[i].tolist())
+            assert (bool(stop[i]), reasons[i]) == expected
+
+
+class TestSimulationParity:
+    """With top_n=1 and deterministic responses, a batch run must replay CATSession."""
+
+    @staticmethod
+    def _run_session(bank, correct: bool):
+        session = CATSession(item_pool=bank, initial_theta=0.0)
+        while not session.is_complete:
+            session.record_response(_select(session), is_correct=correct)
+        return session
+
+    @pytest.mark.parametrize("with_table", [False, True])
+    def test_matches_cat_session(self, with_table):
+        bank = synthetic_bank(600, seed=4)
+        if with_table:
+            get_information_table(bank)
+        result = simulate(bank, np.array([60.0, -60.0]), top_n=1, rng=np.random.default_rng(1))
+        for i, correct in enumerate([True, False]):
+            session = self._run_session(bank, correct)
+            assert result.n_items[i] == len(session.responses)
+            assert result.termination_reasons[i] == session.termination_reason
+            assert result.theta_hat[i] == pytest.approx(session.current_theta, abs=1e-12)
+            assert result.se[i] == pytest.approx(session.current_se, abs=1e-12)
+
+
+def _select(session):
+    return select_next_item(
+        theta=session.current_theta,
+        item_pool=session.item_pool,
+        administered_ids={item.item_id for item in session.administered_items},
+        content_tracker=session.content_tracker,
+        top_n=1,
+        rng=session.rng,
+    )
+
+
+class TestSimulation:
+
+    def test_report(self):
+        bank = synthetic_bank(1500, seed=1)
+        get_information_table(bank)
+        rng = np.random.default_rng(7)
+        theta_true = rng.uniform(-2, 2, 400)
+        result = simulate(bank, theta_true, rng=rng, chunk_size=128)
+        report = result.summary()
+        assert report["simulees"] == 400
+        assert report["rmse"] < 0.45
+        assert report["correlation"] > 0.92
+        assert report["test_length"]["min"] >= StoppingRules().min_items
+        assert sum(report["termination_reasons"].values()) == 400
+        assert result.exposure_counts.sum() == result.n_items.sum()
+
+    def test_exposure_controller_is_updated(self):
+        bank = synthetic_bank(800, seed=2)
+        ctrl = ExposureController(len(bank))
+        result = simulate(bank, np.zeros(50), exposure_controller=ctrl, rng=np.random.default_rng(3))
+        assert ctrl.total_tests == 50
+        np.testing.assert_array_equal(ctrl.admin_counts, result.exposure_counts)
+
+    def test_seeded_runs_are_reproducible(self):
+        bank = synthetic_bank(500, seed=5)
+        theta = np.linspace(-2, 2, 30)
+        a = simulate(bank, theta, rng=np.random.default_rng(11))
+        b = simulate(bank, theta, rng=np.random.default_rng(11))
+        np.testing.assert_array_equal(a.theta_hat, b.theta_hat)
+
+    def test_pool_exhaustion(self):
+        bank = synthetic_bank(10, seed=6)
+        result = simulate(bank, np.zeros(3), rng=np.random.default_rng(0))
+        assert set(result.termination_reasons) == {"pool_exhausted"}
+        assert result.n_items.tolist() == [10, 10, 10]
+
+    def test_cli(self, capsys):
+        report = main(["--simulees", "200", "--synthetic-pool", "500", "--exposure", "--json"])
+        assert report["simulees"] == 200
+        assert '"rmse"' in capsys.readouterr().out
@@ -0,0 +1,144 @@
+"""Tests for the compiled vocabulary/item-bank snapshot."""
+import json
+
+import numpy as np
+import pytest
+
+from irt_cat_engine.config import VOCAB_DB_PATH
+from irt_cat_engine.data.graph_connector import VocabGraph
+from irt_cat_engine.data.load_vocabulary import load_vocabulary
+from irt_cat_engine.data import snapshot as snapshot_module
+from irt_cat_engine.data.snapshot import Snapshot, open_snapshot, prune_snapshots, snapshot_key
+from irt_cat_engine.item_bank.bank import ItemBank
+from irt_cat_engine.item_bank.distractor_engine import POOL_STRATEGIES, DistractorEngine
+from irt_cat_engine.item_bank.information_table import InformationTable, get_information_table
+from irt_cat_engine.item_bank.parameter_initializer import initialize_item_parameters
+
+pytestmark = pytest.mark.skipif(not VOCAB_DB_PATH.exists(), reason="vocabulary CSV not available")
+
+_BANK_COLUMNS = ("item_ids", "a", "b", "c", "question_type", "pos_code", "topic_code",
+                 "cefr_code", "is_loanword")
+
+
+@pytest.fixture
+def sources(tmp_path):
+    lines = VOCAB_DB_PATH.read_text(encoding="utf-8-sig").splitlines(keepends=True)
+    vocab_path = tmp_path / "vocab.csv"
+    vocab_path.write_text("".join(lines[:301]), encoding="utf-8")
+    graph_path = tmp_path / "graph.json"
+    graph_path.write_text(json.dumps({
+        "nodes": [{"id": "word:happy", "type": "Word", "properties": {"text": "happy", "cefr": "A1"}}],
+        "edges": [
+            {"source": "word:happy", "target": "word:glad", "type": "SYNONYM_OF"},
+            {"source": "word:happy", "target": "word:sad", "type": "ANTONYM_OF"},
+            {"source": "word:emotion", "target": "word:happy", "type": "HYPERNYM_OF"},
+            {"source": "word:emotion", "target": "word:sad", "type": "HYPERNYM_OF"},
+        ],
+    }), encoding="utf-8")
+    return vocab_path, graph_path, tmp_path / "snapshots"
+
+
+class TestSnapshot:
+
+    def test_roundtrip_matches_source_pipeline(self, sources):
+        vocab_path, graph_path, directory = sources
+        snap = open_snapshot(vocab_path, graph_path, directory)
+        vocab = load_vocabulary(vocab_path)
+        assert snap.vocabulary() == vocab
+        for question_type in range(1, 7):
+            bank = snap.item_bank(question_type)
+            expected = ItemBank.from_items(initialize_item_parameters(vocab, question_type))
+            for name in _BANK_COLUMNS:
+                np.testing.assert_array_equal(getattr(bank, name), getattr(expected, name))
+            assert bank.words == expected.words
+            assert bank.topic_labels == expected.topic_labels
+
+    def test_vocab_store_is_memory_mapped(self, sources):
+        vocab_path, graph_path, directory = sources
+        store = open_snapshot(vocab_path, graph_path, directory).vocab_store()
+        assert isinstance(store.codes["pos"], np.memmap)
+        vocab = load_vocabulary(vocab_path)
+        assert store.get(vocab[5].word_display).meaning_ko == vocab[5].meaning_ko
+
+    def test_distractor_pools_are_stored(self, sources):
+        store_snap = open_snapshot(*sources)
+        store = store_snap.vocab_store()
+        pools = store_snap.distractor_pools()
+        engine = DistractorEngine(store)
+        pooled = DistractorEngine(store, pools=pools)
+        for row in range(0, len(store), 17):
+            for strategy in POOL_STRATEGIES:
+                rows, n_preferred = pooled._pool(strategy, store[row])
+                expected, expected_preferred = engine.compute_pool(strategy, store[row])
+                assert rows.tolist() == expected.tolist()
+                assert n_preferred == expected_preferred
+
+    def test_information_table_is_stored(self, sources):
+        snap = open_snapshot(*sources)
+        bank = snap.item_bank(1)
+        table = get_information_table(bank, build=False)
+        assert table is not None
+        rebuilt = InformationTable(bank)
+        np.testing.assert_array_equal(table.table, rebuilt.table)
+        np.testing.assert_array_equal(table.top_rows, rebuilt.top_rows)
+        assert get_information_table(snap.item_bank(2), build=False) is None
+
+    def test_arrays_are_copy_on_write(self, sources):
+        snap = open_snapshot(*sources)
+        bank = snap.item_bank(1)
+        original = float(bank.b[0])
+        bank.b[0] = original + 1.0
+        assert snap.item_bank(1).b[0] == original
+
+    def test_graph_adjacency(self, sources):
+        vocab_path, graph_path, directory = sources
+        graph = VocabGraph()
+        assert graph.load_snapshot(open_snapshot(vocab_path, graph_path, directory))
+        reference = VocabGraph()
+        reference.load(graph_path)
+        for word in ("happy", "sad", "glad", "emotion"):
+            assert graph.get_synonyms(word) == reference.get_synonyms(word)
+            assert graph.get_antonyms(word) == reference.get_antonyms(word)
+            assert graph.get_siblings(word) == reference.get_siblings(word)
+        assert graph.word_count == reference.word_count == 1
+
+    def test_missing_graph(self, sources):
+        vocab_path, graph_path, directory = sources
+        snap = open_snapshot(vocab_path, graph_path.with_name("missing.json"), directory)
+        assert not snap.has_graph
+        assert not VocabGraph().load_snapshot(snap)
+
+    def test_reused_until_sources_change(self, sources, monkeypatch):
+        vocab_path, graph_path, directory = sources
+        first = open_snapshot(vocab_path, graph_path, directory)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("snapshot should not be rebuilt")
+
+        monkeypatch.setattr(snapshot_module, "load_vocabulary", fail)
+        assert open_snapshot(vocab_path, graph_path, directory).path == first.path
+        monkeypatch.undo()
+
+        with open(vocab_path, "a", encoding="utf-8") as f:
+            f.write("\n")
+        assert snapshot_key(vocab_path, graph_path) != first.key
+        assert open_snapshot(vocab_path, graph_path, directory, build=False) is None
+        second = open_snapshot(vocab_path, graph_path, directory)
+        assert second.path != first.path
+        assert Snapshot(first.path).key == first.key
+
+        # The previous snapshot is kept; the one before it is pruned
+        with open(vocab_path, "a", encoding="utf-8") as f:
+            f.write("\n")
+        third = open_snapshot(vocab_path, graph_path, directory)
+        assert sorted(p.name for p in directory.iterdir()) == sorted([second.key, third.key])
+
+    def test_prune_keeps_newest_and_current(self, tmp_path):
+        for i, key in enumerate(["a", "b", "c", "d"]):
+            (tmp_path / key).mkdir()
+            (tmp_path / key / "manifest.json").write_text(json.dumps({"created_at": i}), encoding="utf-8")
+        (tmp_path / ".e-tmp").mkdir()   # in-progress write
+        (tmp_path / "f").mkdir()        # no manifest: falls back to mtime (newest)
+
+        assert sorted(prune_snapshots(tmp_path, keep=3, current="a")) == ["b", "c"]
+        assert sorted(p.name for p in tmp_path.iterdir()) == [".e-tmp", "a", "d", "f"]
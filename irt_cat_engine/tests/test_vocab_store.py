@@ -0,0 +1,190 @@
+"""Tests for the columnar VocabStore and its word views."""
+import dataclasses
+import random
+
+import numpy as np
+import pytest
+
+from irt_cat_engine.data.load_vocabulary import VocabWord
+from irt_cat_engine.data.vocab_store import StringColumn, VocabStore, as_vocab_store
+from irt_cat_engine.item_bank.distractor_engine import (
+    POOL_STRATEGIES,
+    DistractorEngine,
+    DistractorPools,
+)
+
+
+def _word(word: str, pos: str = "noun", cefr: str = "A1", **kwargs) -> VocabWord:
+    defaults = dict(freq_rank=100, meaning_ko=f"{word} 뜻", definition_en=f"meaning of {word}")
+    return VocabWord(word_display=word, pos=pos, cefr=cefr, **{**defaults, **kwargs})
+
+
+@pytest.fixture
+def words():
+    return [
+        _word("happy", pos="adj", topic="emotion", synonym=["Glad", "cheerful"], antonym=["sad"],
+              gse=32.5, educational_value=4, sentence_1="I am happy."),
+        _word("glad", pos="adj", topic="emotion", synonym=["happy"]),
+        _word("sad", pos="adj", cefr="A2", topic="emotion", antonym=["happy"], is_loanword=True),
+        _word("apple", meaning_ko="사과", topic="food", word_family=["apples"],
+              collocation=["eat an apple"]),
+        _word("Apple", cefr="B1", meaning_ko="애플", topic="company"),
+    ]
+
+
+class TestStringColumn:
+
+    def test_roundtrip(self):
+        values = ["", "사과", "naïve", "", "a b"]
+        column = StringColumn.from_values(values)
+        assert len(column) == 5
+        assert [column[i] for i in range(5)] == values
+        assert column.to_list() == values
+        assert StringColumn.from_values([]).to_list() == []
+
+    def test_rejects_nul(self):
+        with pytest.raises(ValueError):
+            StringColumn.from_values(["a\0b"])
+
+
+class TestVocabStore:
+
+    def test_views_match_words(self, words):
+        store = VocabStore.from_words(words)
+        assert len(store) == len(words)
+        for word, view in zip(words, store):
+            for field in dataclasses.fields(VocabWord):
+                assert getattr(view, field.name) == getattr(word, field.name), field.name
+        assert store.to_words() == words
+        assert store[1].gse is None and store[1].educational_value is None
+        assert store[-1].row == len(words) - 1
+        with pytest.raises(IndexError):
+            store[len(words)]
+
+    def test_categories_are_interned(self, words):
+        store = VocabStore.from_words(words)
+        assert store.labels["pos"] == ("adj", "noun")
+        assert store.codes["pos"].dtype == np.int16
+        assert store.codes["pos"].tolist() == [0, 0, 0, 1, 1]
+        assert store.code_of("cefr", "A2") == 1
+        assert store.code_of("cefr", "C1") == -1
+
+    def test_relations_share_term_table(self, words):
+        store = VocabStore.from_words(words)
+        # "happy" is both a word and a synonym of "glad": one term
+        assert store.relation_ids("synonym", 1).tolist() == [store.word_lower[0]]
+        glad = store.relation_ids("synonym", 0)[0]
+        assert store.terms[glad] == "Glad"
+        assert store.term_lower[glad] == store.word_lower[1]
+        assert store.relation("word_family", 3) == ["apples"]
+
+    def test_lookup_is_case_insensitive_last_wins(self, words):
+        store = VocabStore.from_words(words)
+        assert store.row_of("HAPPY") == 0
+        assert store.get("apple").meaning_ko == "애플"
+        assert store.get("missing") is None
+        assert store.canonical_rows.tolist() == [0, 1, 2, 4, 4]
+
+    def test_rebuild_from_arrays(self, words):
+        store = VocabStore.from_words(words)
+        rebuilt = VocabStore(store.arrays(), store.labels)
+        assert rebuilt.to_words() == words
+        assert store.nbytes == sum(a.nbytes for a in store.arrays().values())
+        assert as_vocab_store(store) is store
+
+    def test_views_compare_by_row(self, words):
+        store = VocabStore.from_words(words)
+        assert store[0] == store[0]
+        assert store[0] != store[1]
+        assert len({store[0], store[0], store[2]}) == 2
+
+
+class TestDistractorEngineOnStore:
+
+    def test_store_and_list_give_same_items(self, words):
+        words = words + [_word(f"noun{i}", meaning_ko=f"명사 {i}번", topic="food") for i in range(6)]
+        store = VocabStore.from_words(words)
+        from_list = DistractorEngine(words)
+        from_store = DistractorEngine(store)
+        for i, word in enumerate(words):
+            for question_type in range(1, 7):
+                random.seed(i)
+                expected = from_list.generate_item(word, question_type)
+                random.seed(i)
+                assert from_store.generate_item(store[i], question_type) == expected
+
+    def test_excludes_synonyms_in_both_directions(self, words):
+        engine = DistractorEngine(words + [_word("joyful", pos="adj", synonym=["happy"])])
+        assert engine._is_synonym_of("happy", "GLAD")
+        assert engine._is_synonym_of("joyful", "happy")
+        assert engine._is_synonym_of("happy", "joyful")
+        assert not engine._is_synonym_of("happy", "sad")
+        assert not engine._is_synonym_of("happy", "unknown")
+
+
+class TestDistractorPools:
+
+    @pytest.fixture
+    def vocab(self, words):
+        extra = [_word(f"adj{i}", pos="adj", cefr="A1" if i % 2 else "A2", freq_rank=100 + i,
+                       topic="emotion" if i < 3 else "food", meaning_ko=f"형용사 {i}번")
+                 for i in range(40)]
+        return VocabStore.from_words(words + extra)
+
+    def test_pools_match_on_the_fly_computation(self, vocab):
+        plain = DistractorEngine(vocab)
+        pooled = DistractorEngine(vocab, pools=DistractorPools.build(plain))
+        for row in range(len(vocab)):
+            for strategy in POOL_STRATEGIES:
+                rows, n_preferred = pooled._pool(strategy, vocab[row])
+                expected, expected_preferred = plain.compute_pool(strategy, vocab[row])
+                assert rows.tolist() == expected.tolist()
+                assert n_preferred == expected_preferred
+
+    def test_meaning_pool_keeps_every_valid_candidate(self, vocab):
+        engine = DistractorEngine(vocab)
+        happy = vocab.get("happy")
+        rows, n_preferred = engine.compute_pool("meaning", happy)
+        words = [vocab[r].word_display for r in rows]
+        assert "glad" not in words and "happy" not in words
+        # All 40 extra adjectives are same POS, adjacent CEFR and unrelated
+        assert {f"adj{i}" for i in range(40)} <= set(words)
+        assert all("emotion" in vocab[r].topic for r in rows[:n_preferred])
+        assert all("emotion" not in vocab[r].topic for r in rows[n_preferred:])
+
+    def test_every_candidate_can_be_drawn(self, vocab):
+        engine = DistractorEngine(vocab)
+        engine.build_pools()
+        target = vocab.get("adj5")
+        pool = {vocab[r].word_display for r in engine.compute_pool("synonym", target)[0]}
+        assert len(pool) > 32
+        seen = set()
+        random.seed(0)
+        for _ in range(300):
+            seen.update(engine.generate_synonym_distractors(target, n=3))
+        assert seen == pool
+
+    def test_loanword_redirect_keeps_shuffle_options(self, vocab):
+        loanwords = [_word("taxi", pos="adj", synonym=["cab"], is_loanword=True),
+                     _word("radio", pos="adj", sentence_1="I like the radio.", is_loanword=True)]
+        engine = DistractorEngine(VocabStore.from_words(vocab.to_words() + loanwords))
+        for word, redirected in (("taxi", 3), ("radio", 5)):
+            item = engine.generate_item(engine.store.get(word), question_type=1, shuffle_options=False)
+            assert item["question_type"] == redirected
+            assert "options" not in item
+
+    def test_precomputed_pools_give_same_items(self, vocab):
+        plain = DistractorEngine(vocab)
+        pooled = DistractorEngine(vocab)
+        pooled.build_pools()
+        for row in range(len(vocab)):
+            for question_type in range(1, 7):
+                random.seed(row)
+                expected = plain.generate_item(vocab[row], question_type)
+                random.seed(row)
+                assert pooled.generate_item(vocab[row], question_type) == expected
+
+    def test_pools_must_match_vocabulary(self, vocab, words):
+        pools = DistractorEngine(vocab).build_pools()
+        with pytest.raises(ValueError):
+            DistractorEngine(words, pools=pools)